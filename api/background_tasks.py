@@ -1,8 +1,6 @@
 # Copyright notice.
 
 import asyncio
-import hashlib
-import json
 import logging
 import subprocess  # nosec
 import traceback
@@ -12,10 +10,8 @@ from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
 
 from api.routers.websocket_router import manager
-from libs.core.session_manager import SessionManager
-from libs.dashboard.health_calculator import HealthCalculator
-from libs.tmux_manager import TmuxManager
-from libs.yesman_config import YesmanConfig
+from libs.core.services import get_session_snapshot_service
+from libs.dashboard.health_calculator import HealthCalculator, ProjectHealth
 
 # Copyright (c) 2024 Yesman Claude Project
 # Licensed under the MIT License
@@ -39,7 +35,6 @@ class TaskState:
 
     name: str
     last_run: datetime | None = None
-    last_data_hash: str | None = None
     error_count: int = 0
     is_running: bool = False
 
@@ -54,7 +49,8 @@ class BackgroundTaskRunner:
         self.task_states: dict[str, TaskState] = {}
 
         # Initialize managers
-        self.session_manager = SessionManager()
+        self.snapshot_service = get_session_snapshot_service()
+        self.session_manager = self.snapshot_service.session_manager
         self.health_calculator = HealthCalculator()
 
         # Task intervals (in seconds)
@@ -65,9 +61,6 @@ class BackgroundTaskRunner:
             "cleanup": 300,  # Clean up every 5 minutes
         }
 
-        # Data caches for change detection
-        self.last_data = {"sessions": None, "health": None, "activity": None}
-
     async def start(self) -> None:
         """Start all background tasks."""
         if self.is_running:
@@ -103,16 +96,6 @@ class BackgroundTaskRunner:
         self.tasks = []
         logger.info("Background tasks stopped")
 
-    @staticmethod
-    def _calculate_data_hash(data: object) -> str:
-        """Calculate hash of data for change detection.
-
-        Returns:
-        str: Description of return value.
-        """
-        json_str = json.dumps(data, sort_keys=True, default=str)
-        return hashlib.md5(json_str.encode(), usedforsecurity=False).hexdigest()
-
     async def _run_task_safely(
         self,
         task_name: str,
@@ -155,49 +138,28 @@ class BackgroundTaskRunner:
 
         async def check_sessions() -> None:
             try:
-                # Get current session data
-                sessions = self.session_manager.get_all_sessions()
-
-                # Get project configuration
-                config = YesmanConfig()
-                # Load projects using tmux_manager
-
-                tmux_manager = TmuxManager(config)
-                project_sessions = tmux_manager.load_projects().get("sessions", {})
-
-                # Format session data
-                formatted_sessions = []
-                for project_name, project_config in project_sessions.items():
-                    session_name = project_config.get("override", {}).get(
-                        "session_name",
-                        project_name,
-                    )
-                    session_exists = any(s.session_name == session_name for s in sessions)
-                    session_detail = self.session_manager._get_session_info(project_name, project_config) if session_exists else None
-
-                    formatted_sessions.append(
-                        {
-                            "session_name": session_name,
-                            "project_name": project_name,
-                            "template": project_config.get("template_name", "default"),
-                            "status": "active" if session_exists else "stopped",
-                            "exists": session_exists,
-                            "windows": (len(session_detail.windows) if session_detail else 0),
-                            "panes": (sum(len(w.panes) for w in session_detail.windows) if session_detail else 0),
-                            "claude_active": (any(p.is_claude for w in session_detail.windows for p in w.panes) if session_detail else False),
-                        },
-                    )
-
-                # Calculate data hash
-                data_hash = self._calculate_data_hash(formatted_sessions)
-
-                # Check if data has changed
-                if self.last_data["sessions"] != data_hash:
-                    self.last_data["sessions"] = data_hash  # type: ignore[assignment]
-
-                    # Broadcast update via WebSocket
-                    await manager.broadcast_session_update({"sessions": formatted_sessions})
-
+                # Shared with the REST endpoints; refreshed at most once per interval
+                snapshot = await self.snapshot_service.get_async()
+
+                formatted_sessions = [
+                    {
+                        "session_name": session.session_name,
+                        "project_name": session.project_name,
+                        "template": session.template,
+                        "status": "active" if session.exists else "stopped",
+                        "exists": session.exists,
+                        "windows": len(session.windows),
+                        "panes": sum(len(w.panes) for w in session.windows),
+                        "claude_active": any(p.is_claude for w in session.windows for p in w.panes),
+                    }
+                    for session in snapshot.sessions
+                ]
+
+                # Keyed by session name so a change patches only that session
+                sessions_state = {"sessions": {session["session_name"]: session for session in formatted_sessions}}
+
+                # Broadcast the changes, if any, via WebSocket
+                if await manager.publish_state("sessions", sessions_state):
                     logger.debug(
                         "Session data updated and broadcast (%d sessions)",
                         len(formatted_sessions),
@@ -213,86 +175,86 @@ class BackgroundTaskRunner:
             self.intervals["sessions"],
         )
 
+    def _format_health(self, health_data: ProjectHealth) -> dict[str, object]:
+        """Format a ProjectHealth for the health WebSocket channel.
+
+        Returns:
+        Dict containing category scores, statuses and suggestions.
+        """
+        # Get category scores from health data
+        category_scores = health_data.category_scores
+
+        # Format health data
+        formatted_health = {
+            "overall_score": health_data.overall_score,
+            "categories": {
+                "build": {
+                    "score": category_scores.get("build", 0),
+                    "status": self._get_status(
+                        category_scores.get("build", 0),
+                    ),
+                },
+                "tests": {
+                    "score": category_scores.get("tests", 0),
+                    "status": self._get_status(
+                        category_scores.get("tests", 0),
+                    ),
+                },
+                "dependencies": {
+                    "score": category_scores.get("dependencies", 0),
+                    "status": self._get_status(
+                        category_scores.get("dependencies", 0),
+                    ),
+                },
+                "security": {
+                    "score": category_scores.get("security", 0),
+                    "status": self._get_status(
+                        category_scores.get("security", 0),
+                    ),
+                },
+                "performance": {
+                    "score": category_scores.get("performance", 0),
+                    "status": self._get_status(
+                        category_scores.get("performance", 0),
+                    ),
+                },
+                "code_quality": {
+                    "score": category_scores.get("code_quality", 0),
+                    "status": self._get_status(
+                        category_scores.get("code_quality", 0),
+                    ),
+                },
+                "git": {
+                    "score": category_scores.get("git", 0),
+                    "status": self._get_status(category_scores.get("git", 0)),
+                },
+                "documentation": {
+                    "score": category_scores.get("documentation", 0),
+                    "status": self._get_status(
+                        category_scores.get("documentation", 0),
+                    ),
+                },
+            },
+            "suggestions": [metric.description for metric in health_data.metrics if metric.description],
+            "last_updated": datetime.now(UTC).isoformat(),
+        }
+        return formatted_health
+
     async def monitor_health(self) -> None:
         """Monitor project health and broadcast updates."""
 
         async def check_health() -> None:
             try:
-                # Calculate health metrics
-                health_data = await self.health_calculator.calculate_health()
-
-                # Get category scores from health data
-                category_scores = health_data.category_scores
-
-                # Format health data
-                formatted_health = {
-                    "overall_score": health_data.overall_score,
-                    "categories": {
-                        "build": {
-                            "score": category_scores.get("build", 0),
-                            "status": self._get_status(
-                                category_scores.get("build", 0),
-                            ),
-                        },
-                        "tests": {
-                            "score": category_scores.get("tests", 0),
-                            "status": self._get_status(
-                                category_scores.get("tests", 0),
-                            ),
-                        },
-                        "dependencies": {
-                            "score": category_scores.get("dependencies", 0),
-                            "status": self._get_status(
-                                category_scores.get("dependencies", 0),
-                            ),
-                        },
-                        "security": {
-                            "score": category_scores.get("security", 0),
-                            "status": self._get_status(
-                                category_scores.get("security", 0),
-                            ),
-                        },
-                        "performance": {
-                            "score": category_scores.get("performance", 0),
-                            "status": self._get_status(
-                                category_scores.get("performance", 0),
-                            ),
-                        },
-                        "code_quality": {
-                            "score": category_scores.get("code_quality", 0),
-                            "status": self._get_status(
-                                category_scores.get("code_quality", 0),
-                            ),
-                        },
-                        "git": {
-                            "score": category_scores.get("git", 0),
-                            "status": self._get_status(category_scores.get("git", 0)),
-                        },
-                        "documentation": {
-                            "score": category_scores.get("documentation", 0),
-                            "status": self._get_status(
-                                category_scores.get("documentation", 0),
-                            ),
-                        },
-                    },
-                    "suggestions": [metric.description for metric in health_data.metrics if metric.description],
-                    "last_updated": datetime.now(UTC).isoformat(),
-                }
+                # Categories are reassessed concurrently; broadcast as each one finishes
+                async for health_data in self.health_calculator.stream_health():
+                    formatted_health = self._format_health(health_data)
 
-                # Calculate data hash
-                data_hash = self._calculate_data_hash(formatted_health)
-
-                # Check if data has changed
-                if self.last_data["health"] != data_hash:
-                    self.last_data["health"] = data_hash  # type: ignore[assignment]
-
-                    # Broadcast update via WebSocket
-                    await manager.broadcast_health_update(formatted_health)
-
-                    logger.debug(
-                        "Health data updated and broadcast (score: %s)",
-                        formatted_health["overall_score"],
-                    )
+                    # Broadcast the changes, if any, via WebSocket
+                    if await manager.publish_state("health", formatted_health):
+                        logger.debug(
+                            "Health data updated and broadcast (score: %s)",
+                            formatted_health["overall_score"],
+                        )
 
             except Exception:
                 logger.exception("Error monitoring health")
@@ -361,16 +323,8 @@ class BackgroundTaskRunner:
                     "avg_activity": avg_activity,
                 }
 
-                # Calculate data hash
-                data_hash = self._calculate_data_hash(formatted_activity)
-
-                # Check if data has changed
-                if self.last_data["activity"] != data_hash:
-                    self.last_data["activity"] = data_hash  # type: ignore[assignment]
-
-                    # Broadcast update via WebSocket
-                    await manager.broadcast_activity_update(formatted_activity)
-
+                # Broadcast the changes, if any, via WebSocket
+                if await manager.publish_state("activity", formatted_activity):
                     logger.debug(
                         "Activity data updated and broadcast (%d active days)",
                         active_days,
@@ -420,3 +420,16 @@ def stop_all_controllers() -> object:
         raise
     except (ImportError, AttributeError, RuntimeError) as e:
         raise HTTPException(status_code=500, detail=f"Failed to stop all controllers: {e!s}")
+
+
+@router.get("/controllers/tick-stats", status_code=200)
+def get_controller_tick_stats() -> object:
+    """모든 컨트롤러의 세션별 모니터 tick 지연 통계를 반환합니다.
+
+    Returns:
+        Object object.
+    """
+    return {
+        "active_sessions": cm.hub.active_session_count,
+        "sessions": cm.get_tick_stats(),
+    }
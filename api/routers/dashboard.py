@@ -7,10 +7,11 @@ from collections import defaultdict
 from datetime import UTC, datetime, timedelta
 from typing import Annotated, TypedDict
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Header, HTTPException, Query, Response
 from fastapi.templating import Jinja2Templates
 
-from libs.core.session_manager import SessionManager
+from libs.core.services import get_session_snapshot_service
+from libs.core.session_snapshot import SessionSnapshot, etag_matches, make_etag
 from libs.dashboard.widgets.activity_heatmap import ActivityHeatmapGenerator
 from libs.dashboard.widgets.project_health import ProjectHealth
 from libs.yesman_config import YesmanConfig
@@ -36,65 +37,94 @@ router = APIRouter(tags=["web-dashboard"])
 templates = Jinja2Templates(directory="web-dashboard/static/templates")
 
 # Initialize managers
-session_manager = SessionManager()
 config = YesmanConfig()
 heatmap_generator = ActivityHeatmapGenerator(config)
 
 # Legacy HTML dashboard route removed - now using SvelteKit at root
 
 
-@router.get("/api/dashboard/sessions")
-async def get_sessions():
-    """Get session list."""
-    try:
-        # Get session information from SessionManager
-        sessions = session_manager.get_all_sessions()
-
-        # Convert SessionInfo objects to web-friendly format
-        web_sessions = []
-        for session in sessions:
-            # Get accurate controller status using ClaudeManager
-            # (same as individual controller status API)
-            try:
-                controller = claude_manager.get_controller(session.session_name)
-                actual_controller_status = "running" if controller.is_running else "stopped"
-            except Exception:
-                # Fallback to original status if controller lookup fails
-                actual_controller_status = session.controller_status
-
-            web_sessions.append(
+def _controller_statuses(snapshot: SessionSnapshot) -> list[str]:
+    """Look up the live controller status of every session in a snapshot.
+
+    Returns:
+        List of statuses in snapshot order.
+    """
+    statuses = []
+    for session in snapshot.sessions:
+        # Get accurate controller status using ClaudeManager
+        # (same as individual controller status API)
+        try:
+            controller = claude_manager.get_controller(session.session_name)
+            statuses.append("running" if controller.is_running else "stopped")
+        except Exception:
+            # Fallback to original status if controller lookup fails
+            statuses.append(session.controller_status)
+    return statuses
+
+
+def _web_sessions(snapshot: SessionSnapshot, controller_statuses: list[str]) -> list[dict[str, object]]:
+    """Convert a session snapshot to the web dashboard format.
+
+    Returns:
+        List of session dictionaries.
+    """
+    return [
+        {
+            "session_name": session.session_name,
+            "project_name": session.project_name,
+            "template": session.template,
+            "status": session.status,
+            "exists": session.exists,
+            "controller_status": controller_status,
+            "windows": [
                 {
-                    "session_name": session.session_name,
-                    "project_name": session.project_name,
-                    "template": session.template,
-                    "status": session.status,
-                    "exists": session.exists,
-                    "controller_status": actual_controller_status,
-                    "windows": [
+                    "name": w.name,
+                    "index": w.index,
+                    "panes": [
                         {
-                            "name": w.name,
-                            "index": w.index,
-                            "panes": [
-                                {
-                                    "id": p.id,
-                                    "command": p.command,
-                                    "is_claude": p.is_claude,
-                                    "is_controller": p.is_controller,
-                                    "current_task": getattr(p, "current_task", None),
-                                    "activity_score": getattr(p, "activity_score", 0),
-                                }
-                                for p in w.panes
-                            ],
+                            "id": p.id,
+                            "command": p.command,
+                            "is_claude": p.is_claude,
+                            "is_controller": p.is_controller,
+                            "current_task": getattr(p, "current_task", None),
+                            "activity_score": getattr(p, "activity_score", 0),
                         }
-                        for w in session.windows
+                        for p in w.panes
                     ],
-                    "panes": sum(len(w.panes) for w in session.windows),
-                    "claude_active": any(p.is_claude for w in session.windows for p in w.panes),
                 }
-            )
+                for w in session.windows
+            ],
+            "panes": sum(len(w.panes) for w in session.windows),
+            "claude_active": any(p.is_claude for w in session.windows for p in w.panes),
+        }
+        for session, controller_status in zip(snapshot.sessions, controller_statuses, strict=True)
+    ]
 
-        return web_sessions
-    except Exception:
+
+async def get_sessions() -> list[dict[str, object]]:
+    """Get session list from the shared session snapshot.
+
+    Returns:
+        List of session dictionaries.
+    """
+    snapshot = await get_session_snapshot_service().get_async()
+    return _web_sessions(snapshot, _controller_statuses(snapshot))
+
+
+@router.get("/api/dashboard/sessions")
+async def list_sessions(response: Response, if_none_match: Annotated[str | None, Header()] = None):
+    """Get session list, answering 304 when the client's copy is current."""
+    try:
+        snapshot = await get_session_snapshot_service().get_async()
+        controller_statuses = _controller_statuses(snapshot)
+        etag = make_etag([snapshot.etag, controller_statuses])
+        if etag_matches(etag, if_none_match):
+            return Response(status_code=304, headers={"ETag": etag})
+
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = "no-cache"
+        return _web_sessions(snapshot, controller_statuses)
+    except Exception as e:
         logger.exception("Failed to get sessions")  # noqa: G004
         raise HTTPException(status_code=500, detail=f"Failed to get sessions: {e!s}")
 
@@ -1,7 +1,6 @@
 # Copyright notice.
 
 import logging
-import re
 from datetime import UTC, datetime
 from pathlib import Path
 from typing import Annotated
@@ -10,6 +9,8 @@ from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
 
 from libs.core.services import get_config
+from libs.logging.log_query import LogPage, LogQueryService
+from libs.logging.log_query import parse_log_line as parse_line
 
 # Copyright (c) 2024 Yesman Claude Project
 # Licensed under the MIT License
@@ -26,8 +27,26 @@ class LogEntry(BaseModel):
     raw: str
 
 
+class LogPageResponse(BaseModel):
+    entries: list[LogEntry]
+    next_cursor: str | None
+
+
 router = APIRouter()
 
+LOG_FILE_NAMES = ("yesman.log", "claude_manager.log", "dashboard.log")
+
+
+def get_log_dir() -> Path:
+    config = get_config()
+    return Path(config.get("log_path", "~/.scripton/yesman/logs/")).expanduser()
+
+
+def _query_logs(limit: int, level: str | None, source: str | None, search: str | None, cursor: str | None) -> LogPage:
+    log_dir = get_log_dir()
+    service = LogQueryService.for_directory(log_dir)
+    return service.query([log_dir / name for name in LOG_FILE_NAMES], limit=limit, level=level, source=source, search=search, cursor=cursor)
+
 
 @router.get("/sessions/{session_name}/logs", response_model=list[str])
 def get_session_logs(session_name: str, limit: int = 100) -> object:
@@ -52,11 +71,8 @@ def get_session_logs(session_name: str, limit: int = 100) -> object:
                     detail=f"Log file for session '{session_name}' not found.",
                 )
 
-        with open(log_file, encoding="utf-8") as f:
-            # 큰 로그 파일을 효율적으로 읽기 위해 마지막 N줄만 읽는 것이 좋지만,
-            # 여기서는 간단하게 모든 줄을 읽고 마지막 부분만 반환합니다.
-            lines = f.readlines()
-            return lines[-limit:]
+        lines = LogQueryService.for_directory(log_file.parent).tail(log_file, limit)
+        return [f"{line}\n" for line in lines]
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to read log file: {e!s}")
@@ -70,46 +86,10 @@ def parse_log_line(line: str) -> LogEntry | None:
 
 
     """
-    line = line.strip()
-    if not line:
+    parsed = parse_line(line)
+    if parsed is None:
         return None
-
-    # Try to parse structured log format: [timestamp] [level] [source] message
-    log_pattern = r"^\[([^\]]+)\]\s*\[([^\]]+)\]\s*\[([^\]]+)\]\s*(.+)$"
-    match = re.match(log_pattern, line)
-
-    if match:
-        timestamp_str, level, source, message = match.groups()
-        return LogEntry(
-            level=level.lower(),
-            timestamp=timestamp_str,
-            source=source,
-            message=message,
-            raw=line,
-        )
-
-    # Try simplified format: [timestamp] [level] message
-    simple_pattern = r"^\[([^\]]+)\]\s*\[([^\]]+)\]\s*(.+)$"
-    match = re.match(simple_pattern, line)
-
-    if match:
-        timestamp_str, level, message = match.groups()
-        return LogEntry(
-            level=level.lower(),
-            timestamp=timestamp_str,
-            source="yesman",
-            message=message,
-            raw=line,
-        )
-
-    # Fallback: treat as unstructured log
-    return LogEntry(
-        level="info",
-        timestamp=datetime.now(UTC).isoformat(),
-        source="unknown",
-        message=line,
-        raw=line,
-    )
+    return LogEntry(**parsed.to_dict())
 
 
 @router.get("/logs", response_model=list[LogEntry])
@@ -125,48 +105,36 @@ def get_logs(
         object: Description of return value.
     """
     try:
-        config = get_config()
-        log_path_str = config.get("log_path", "~/.scripton/yesman/logs/")
-        log_files = [
-            Path(log_path_str).expanduser() / "yesman.log",
-            Path(log_path_str).expanduser() / "claude_manager.log",
-            Path(log_path_str).expanduser() / "dashboard.log",
-        ]
-
-        all_logs = []
-
-        for log_file in log_files:
-            if log_file.exists():
-                try:
-                    with open(log_file, encoding="utf-8") as f:
-                        lines = f.readlines()
-                        for line in lines[-limit:]:  # Take last N lines from each file
-                            log_entry = parse_log_line(line)
-                            if log_entry:
-                                all_logs.append(log_entry)
-                except Exception:
-                    continue
+        page = _query_logs(limit, level, source, search, None)
+        return [LogEntry(**entry.to_dict()) for entry in page.entries]
 
-        # Sort by timestamp (newest first)
-        all_logs.sort(key=lambda x: x.timestamp, reverse=True)
-
-        # Apply filters
-        filtered_logs = all_logs
-
-        if level:
-            filtered_logs = [log for log in filtered_logs if log.level == level.lower()]
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to read logs: {e!s}")
 
-        if source:
-            filtered_logs = [log for log in filtered_logs if log.source == source]
 
-        if search:
-            search_lower = search.lower()
-            filtered_logs = [log for log in filtered_logs if search_lower in log.message.lower()]
+@router.get("/logs/page", response_model=LogPageResponse)
+def get_logs_page(
+    limit: Annotated[int, Query(ge=1, le=1000)] = 100,
+    level: Annotated[str | None, Query()] = None,
+    source: Annotated[str | None, Query()] = None,
+    search: Annotated[str | None, Query()] = None,
+    cursor: Annotated[str | None, Query()] = None,
+) -> LogPageResponse:
+    """Get one page of parsed log entries, newest first.
 
-        return filtered_logs[:limit]
+    Pass ``next_cursor`` from the previous page as ``cursor`` to continue
+    with older entries; it is None on the last page.
 
+    Returns:
+        LogPageResponse: The entries and the cursor of the next page.
+    """
+    try:
+        page = _query_logs(limit, level, source, search, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to read logs: {e!s}")
+    return LogPageResponse(entries=[LogEntry(**entry.to_dict()) for entry in page.entries], next_cursor=page.next_cursor)
 
 
 @router.get("/logs/sources")
@@ -177,32 +145,9 @@ def get_log_sources() -> object:
         object: Description of return value.
     """
     try:
-        config = get_config()
-        log_path_str = config.get("log_path", "~/.scripton/yesman/logs/")
-        log_files = [
-            Path(log_path_str).expanduser() / "yesman.log",
-            Path(log_path_str).expanduser() / "claude_manager.log",
-            Path(log_path_str).expanduser() / "dashboard.log",
-        ]
-
-        sources = set()
-
-        for log_file in log_files:
-            if log_file.exists():
-                try:
-                    with open(log_file, encoding="utf-8") as f:
-                        # Sample first 50 lines to get sources
-                        for i, line in enumerate(f):
-                            if i >= 50:
-                                break
-                            log_entry = parse_log_line(line)
-                            if log_entry:
-                                sources.add(log_entry.source)
-                except Exception as e:
-                    logger.warning(f"Failed to parse log file {log_file}: {e}")  # noqa: G004
-                    continue
-
-        return {"sources": sorted(sources)}
+        log_dir = get_log_dir()
+        service = LogQueryService.for_directory(log_dir)
+        return {"sources": service.sources([log_dir / name for name in LOG_FILE_NAMES])}
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get log sources: {e!s}")
@@ -1,12 +1,14 @@
 import logging
 import subprocess
+from typing import Annotated
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Header, HTTPException, Response, status
 
 from api import models
 from libs.core.error_handling import ErrorCategory, YesmanError
-from libs.core.services import get_session_manager, get_tmux_manager
+from libs.core.services import get_session_manager, get_session_snapshot_service, get_tmux_manager
 from libs.core.session_manager import SessionManager
+from libs.core.session_snapshot import SessionSnapshot, SessionSnapshotService
 from libs.core.types import SessionAPIData
 from libs.tmux_manager import TmuxManager
 
@@ -28,19 +30,25 @@ logger = logging.getLogger("yesman.api.sessions")
 class SessionService:
     """Service class for session operations."""
 
-    def __init__(self, session_manager: SessionManager, tmux_manager: TmuxManager) -> None:
+    def __init__(
+        self,
+        session_manager: SessionManager,
+        tmux_manager: TmuxManager,
+        snapshot_service: SessionSnapshotService | None = None,
+    ) -> None:
         self.session_manager = session_manager
         self.tmux_manager = tmux_manager
+        self.snapshot_service = snapshot_service or SessionSnapshotService(session_manager)
         self.logger = logging.getLogger("yesman.api.sessions.service")
 
-    def get_all_sessions(self) -> list[SessionAPIData]:
+    def get_all_sessions(self, snapshot: SessionSnapshot | None = None) -> list[SessionAPIData]:
         """Get all sessions with error handling.
 
         Returns:
         List of the requested data.
         """
         try:
-            sessions_data = self.session_manager.get_all_sessions()
+            sessions_data = (snapshot or self.snapshot_service.get()).sessions
             return [self._convert_session_to_api_data(session) for session in sessions_data]
         except Exception as e:
             self.logger.exception("Failed to get sessions")
@@ -58,24 +66,8 @@ class SessionService:
         Sessionapidata | None object the requested data.
         """
         try:
-            # Load projects configuration to get project_conf
-            projects = self.tmux_manager.load_projects().get("sessions", {})
-
-            # Find the project that matches this session name
-            project_name = None
-            project_conf = None
-            for proj_name, proj_conf in projects.items():
-                session_name_in_conf = proj_conf.get("override", {}).get("session_name", proj_name)
-                if session_name_in_conf == session_name:
-                    project_name = proj_name
-                    project_conf = proj_conf
-                    break
-
-            if not project_name:
-                # Session not found in configuration
-                return None
-
-            session_data = self.session_manager._get_session_info(project_name, project_conf)
+            # None when the session is not in the configuration
+            session_data = self.snapshot_service.get().get(session_name)
             if session_data:
                 return self._convert_session_to_api_data(session_data)
             return None
@@ -114,6 +106,7 @@ class SessionService:
 
             # Set up session (this would integrate with the improved setup logic)
             result = self._setup_session_internal(session_name, projects[session_name])
+            self.snapshot_service.invalidate()
 
             return {
                 "session_name": session_name,
@@ -148,6 +141,7 @@ class SessionService:
 
             # Teardown session
             self._teardown_session_internal(session_name)
+            self.snapshot_service.invalidate()
 
             return {
                 "session_name": session_name,
@@ -172,28 +166,8 @@ class SessionService:
         Dict containing status information.
         """
         try:
-            # Load projects configuration to get project_conf
-            projects = self.tmux_manager.load_projects().get("sessions", {})
-
-            # Find the project that matches this session name
-            project_name = None
-            project_conf = None
-            for proj_name, proj_conf in projects.items():
-                session_name_in_conf = proj_conf.get("override", {}).get("session_name", proj_name)
-                if session_name_in_conf == session_name:
-                    project_name = proj_name
-                    project_conf = proj_conf
-                    break
-
-            if not project_name:
-                # Session not found in configuration
-                return {
-                    "session_name": session_name,
-                    "status": "not_found",
-                    "exists": False,
-                }
-
-            session_data = self.session_manager._get_session_info(project_name, project_conf)
+            # None when the session is not in the configuration
+            session_data = self.snapshot_service.get().get(session_name)
             if not session_data:
                 return {
                     "session_name": session_name,
@@ -240,6 +214,7 @@ class SessionService:
                     self.logger.exception("Failed to setup session '{session_name}': {e}")
                     failed.append({"session_name": session_name, "error": str(e)})
 
+            self.snapshot_service.invalidate()
             return {
                 "successful": successful,
                 "failed": failed,
@@ -263,7 +238,7 @@ class SessionService:
         Dict containing.
         """
         try:
-            sessions = self.session_manager.get_all_sessions()
+            sessions = self.snapshot_service.get(max_age=0).sessions
             successful = []
             failed = []
 
@@ -276,6 +251,7 @@ class SessionService:
                     self.logger.exception("Failed to teardown session '{session_name}': {e}")
                     failed.append({"session_name": session_name, "error": str(e)})
 
+            self.snapshot_service.invalidate()
             return {
                 "successful": successful,
                 "failed": failed,
@@ -309,6 +285,7 @@ class SessionService:
             # Attach to the session
 
             subprocess.run(["tmux", "attach-session", "-t", session_name], check=False)
+            self.snapshot_service.invalidate()
 
             return {
                 "session_name": session_name,
@@ -342,6 +319,7 @@ class SessionService:
 
             # Kill the session
             self._teardown_session_internal(session_name)
+            self.snapshot_service.invalidate()
 
             return {
                 "session_name": session_name,
@@ -403,8 +381,7 @@ class SessionService:
         Boolean indicating.
         """
         try:
-            sessions = self.session_manager.get_all_sessions()
-            return any(session.session_name == session_name for session in sessions)
+            return self.snapshot_service.get().get(session_name) is not None
         except Exception:
             return False
 
@@ -443,17 +420,25 @@ router = APIRouter(tags=["sessions"])
     summary="Get all sessions",
     description="Retrieve information about all active tmux sessions",
 )
-def get_all_sessions() -> object:
+def get_all_sessions(response: Response, if_none_match: Annotated[str | None, Header()] = None) -> object:
     """Get all tmux sessions with detailed information.
 
     Returns:
-        Object object the requested data.
+        Object object the requested data, or an empty 304 response if the
+        client's ETag is current.
     """
     try:
         session_manager = get_session_manager()
         tmux_manager = get_tmux_manager()
-        service = SessionService(session_manager, tmux_manager)
-        sessions_data = service.get_all_sessions()
+        snapshot_service = get_session_snapshot_service()
+        service = SessionService(session_manager, tmux_manager, snapshot_service)
+
+        snapshot = snapshot_service.get()
+        if snapshot.matches(if_none_match):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": snapshot.etag})
+        response.headers["ETag"] = snapshot.etag
+        response.headers["Cache-Control"] = "no-cache"
+        sessions_data = service.get_all_sessions(snapshot)
 
         # Convert to Pydantic models
         return [
@@ -510,7 +495,7 @@ def get_session(session_name: str) -> object:
     try:
         session_manager = get_session_manager()
         tmux_manager = get_tmux_manager()
-        service = SessionService(session_manager, tmux_manager)
+        service = SessionService(session_manager, tmux_manager, get_session_snapshot_service())
         session_data = service.get_session_by_name(session_name)
 
         if not session_data:
@@ -572,7 +557,7 @@ def setup_session(session_name: str) -> object:
     try:
         session_manager = get_session_manager()
         tmux_manager = get_tmux_manager()
-        service = SessionService(session_manager, tmux_manager)
+        service = SessionService(session_manager, tmux_manager, get_session_snapshot_service())
         return service.setup_session(session_name)
 
     except YesmanError as e:
@@ -601,7 +586,7 @@ def teardown_session(session_name: str) -> object:
     try:
         session_manager = get_session_manager()
         tmux_manager = get_tmux_manager()
-        service = SessionService(session_manager, tmux_manager)
+        service = SessionService(session_manager, tmux_manager, get_session_snapshot_service())
         return service.teardown_session(session_name)
 
     except YesmanError as e:
@@ -630,7 +615,7 @@ def get_session_status(session_name: str) -> object:
     try:
         session_manager = get_session_manager()
         tmux_manager = get_tmux_manager()
-        service = SessionService(session_manager, tmux_manager)
+        service = SessionService(session_manager, tmux_manager, get_session_snapshot_service())
         return service.get_session_status(session_name)
 
     except YesmanError as e:
@@ -661,7 +646,7 @@ def setup_all_sessions() -> object:
     try:
         session_manager = get_session_manager()
         tmux_manager = get_tmux_manager()
-        service = SessionService(session_manager, tmux_manager)
+        service = SessionService(session_manager, tmux_manager, get_session_snapshot_service())
         return service.setup_all_sessions()
 
     except YesmanError as e:
@@ -692,7 +677,7 @@ def teardown_all_sessions() -> object:
     try:
         session_manager = get_session_manager()
         tmux_manager = get_tmux_manager()
-        service = SessionService(session_manager, tmux_manager)
+        service = SessionService(session_manager, tmux_manager, get_session_snapshot_service())
         return service.teardown_all_sessions()
 
     except YesmanError as e:
@@ -723,7 +708,7 @@ def start_session(session_name: str) -> object:
     try:
         session_manager = get_session_manager()
         tmux_manager = get_tmux_manager()
-        service = SessionService(session_manager, tmux_manager)
+        service = SessionService(session_manager, tmux_manager, get_session_snapshot_service())
         return service.start_session(session_name)
 
     except YesmanError as e:
@@ -752,7 +737,7 @@ def stop_session(session_name: str) -> object:
     try:
         session_manager = get_session_manager()
         tmux_manager = get_tmux_manager()
-        service = SessionService(session_manager, tmux_manager)
+        service = SessionService(session_manager, tmux_manager, get_session_snapshot_service())
         return service.stop_session(session_name)
 
     except YesmanError as e:
@@ -4,11 +4,14 @@ import asyncio
 import logging
 from collections import defaultdict
 from datetime import UTC, datetime
+from pathlib import Path
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
-from api.routers.logs import get_logs
-from api.utils import BatchConfig, WebSocketBatchProcessor
+from api.routers.logs import LOG_FILE_NAMES, get_log_dir, get_logs
+from api.utils import BatchConfig, ClientSender, VersionedState, WebSocketBatchProcessor, encode_message
+from libs.logging.log_query import parse_log_line
+from libs.logging.log_watcher import LogWatcher
 
 # Copyright (c) 2024 Yesman Claude Project
 # Licensed under the MIT License
@@ -20,6 +23,13 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/ws", tags=["websocket"])
 
+# Channels that receive the patches of each versioned state
+STATE_CHANNELS = {
+    "sessions": ("sessions", "dashboard"),
+    "health": ("health", "dashboard"),
+    "activity": ("activity", "dashboard"),
+}
+
 
 class ConnectionManager:
     """Manages WebSocket connections and broadcasting."""
@@ -34,6 +44,10 @@ class ConnectionManager:
         # Connection metadata
         self.connection_metadata: dict[WebSocket, dict] = {}
 
+        # Outbound queue and writer task per connection
+        self.senders: dict[WebSocket, ClientSender] = {}
+        self.max_client_queue_size = 100
+
         # Ping interval in seconds
         self.ping_interval = 30
 
@@ -45,6 +59,12 @@ class ConnectionManager:
         )
         self.batch_processor = WebSocketBatchProcessor(batch_config)
 
+        # Versioned dashboard state, broadcast as patches
+        self.states = {name: VersionedState(name) for name in STATE_CHANNELS}
+
+        # Follows the log files while at least one client is on the logs channel
+        self._log_watch_task: asyncio.Task | None = None
+
         # Register message handlers for each channel
         self._register_batch_handlers()
 
@@ -81,31 +101,31 @@ class ConnectionManager:
 
     async def _broadcast_messages_to_channel(self, channel: str, messages: list[dict]) -> None:
         """Broadcast multiple messages to a specific channel."""
-        connections = self.channel_connections.get(channel, set())
-        disconnected = []
-
-        for connection in connections:
-            try:
-                # Send batch as a single WebSocket message or multiple messages
-                if len(messages) == 1:
-                    await connection.send_json(messages[0])
-                else:
-                    # Send as message batch
-                    batch_message = {
-                        "type": "message_batch",
-                        "timestamp": datetime.now(UTC).isoformat(),
-                        "channel": channel,
-                        "messages": messages,
-                        "count": len(messages),
-                    }
-                    await connection.send_json(batch_message)
-            except Exception:
-                logger.exception(f"Error broadcasting batch to {channel}:")  # noqa: G004
-                disconnected.append(connection)
+        connections = self.channel_connections.get(channel)
+        if not connections:
+            return
+
+        # Send batch as a single WebSocket message or multiple messages
+        if len(messages) == 1:
+            payload = encode_message(messages[0])
+        else:
+            payload = encode_message(
+                {
+                    "type": "message_batch",
+                    "timestamp": datetime.now(UTC).isoformat(),
+                    "channel": channel,
+                    "messages": messages,
+                    "count": len(messages),
+                }
+            )
+        self._fan_out(connections, payload)
 
-        # Clean up disconnected clients
-        for conn in disconnected:
-            self.disconnect(conn)
+    def _fan_out(self, connections: object, payload: str, key: str | None = None) -> None:
+        """Queue one encoded payload on every connection's sender."""
+        for connection in list(connections):
+            sender = self.senders.get(connection)
+            if sender is not None:
+                sender.send(payload, key)
 
     def start_background_tasks(self) -> None:
         """Start background tasks for connection management."""
@@ -115,6 +135,9 @@ class ConnectionManager:
     async def connect(self, websocket: WebSocket, channel: str = "dashboard") -> None:
         """Accept a new WebSocket connection."""
         await websocket.accept()
+        sender = ClientSender(websocket, max_queue_size=self.max_client_queue_size, on_close=self.disconnect)
+        sender.start()
+        self.senders[websocket] = sender
         self.active_connections.append(websocket)
         self.channel_connections[channel].add(websocket)
 
@@ -126,6 +149,7 @@ class ConnectionManager:
         }
 
         logger.info(f"WebSocket connected to channel: {channel}")  # noqa: G004
+        self._update_log_watch()
 
         # Send initial data
         await self.send_initial_data(websocket, channel)
@@ -144,10 +168,72 @@ class ConnectionManager:
         if websocket in self.connection_metadata:
             del self.connection_metadata[websocket]
 
+        sender = self.senders.pop(websocket, None)
+        if sender is not None:
+            sender.close()
+
+        self._update_log_watch()
         logger.info("WebSocket disconnected")
 
-    @staticmethod
-    async def send_initial_data(websocket: WebSocket, channel: str) -> None:
+    def _update_log_watch(self) -> None:
+        """Run the log watcher only while someone listens on the logs channel."""
+        watching = self._log_watch_task is not None and not self._log_watch_task.done()
+        if self.channel_connections.get("logs") and not watching:
+            self._log_watch_task = asyncio.create_task(self._watch_logs())
+        elif not self.channel_connections.get("logs") and watching:
+            self._log_watch_task.cancel()
+            self._log_watch_task = None
+
+    async def _watch_logs(self) -> None:
+        """Push lines appended to the log files to the logs channel."""
+        watcher = LogWatcher(get_log_dir(), patterns=LOG_FILE_NAMES)
+        try:
+            await watcher.watch(self._queue_log_lines)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Log watcher stopped:")
+        finally:
+            watcher.close()
+
+    def _queue_log_lines(self, path: Path, lines: list[str]) -> None:
+        """Queue new log lines as log updates; the batch processor merges bursts."""
+        timestamp = datetime.now(UTC).isoformat()
+        for line in lines:
+            entry = parse_log_line(line)
+            if entry is not None:
+                self.batch_processor.queue_message(
+                    "logs",
+                    {"type": "log_update", "timestamp": timestamp, "data": {**entry.to_dict(), "file": path.name}},
+                )
+
+    async def publish_state(self, name: str, data: object) -> bool:
+        """Update a versioned state and broadcast the patch if it changed.
+
+        Returns:
+        bool: True if the state changed and a patch was queued.
+        """
+        patch = self.states[name].update(data)
+        if patch is None:
+            return False
+
+        message = patch.to_message()
+        for channel in STATE_CHANNELS[name]:
+            await self.broadcast_to_channel(channel, message)
+        return True
+
+    async def send_state(self, websocket: WebSocket, name: str, version: int | None = None) -> None:
+        """Bring one client's copy of a state up to date from ``version``."""
+        state = self.states.get(name)
+        if state is None:
+            logger.warning("Resync requested for unknown state: %s", name)
+            return
+
+        message = state.changes_since(version)
+        if message is not None:
+            await self.send_personal_message(message, websocket)
+
+    async def send_initial_data(self, websocket: WebSocket, channel: str) -> None:
         """Send initial data when a client connects."""
         try:
             from api.routers.dashboard import (
@@ -182,33 +268,27 @@ class ConnectionManager:
                 "data": initial_data,
             }
 
-            await websocket.send_json(message)
+            await self.send_personal_message(message, websocket)
+
+            # Base versions for the patches that follow
+            for name, channels in STATE_CHANNELS.items():
+                if channel in channels and self.states[name].version:
+                    await self.send_personal_message(self.states[name].snapshot_message(), websocket)
 
         except Exception:
             logger.exception("Error sending initial data:")
 
     async def send_personal_message(self, message: dict, websocket: WebSocket) -> None:
         """Send message to specific connection."""
-        try:
-            await websocket.send_json(message)
-        except Exception:
-            logger.exception("Error sending personal message:")
-            self.disconnect(websocket)
+        sender = self.senders.get(websocket)
+        if sender is None:
+            logger.warning("Dropping personal message for an unknown connection")
+            return
+        sender.send(encode_message(message))
 
     async def broadcast(self, message: dict) -> None:
         """Broadcast message to all connected clients."""
-        disconnected = []
-
-        for connection in self.active_connections:
-            try:
-                await connection.send_json(message)
-            except Exception:
-                logger.exception("Error broadcasting message:")
-                disconnected.append(connection)
-
-        # Clean up disconnected clients
-        for conn in disconnected:
-            self.disconnect(conn)
+        self._fan_out(self.active_connections, encode_message(message))
 
     async def broadcast_to_channel(self, channel: str, message: dict) -> None:
         """Broadcast message to specific channel (using batch processor)."""
@@ -219,39 +299,6 @@ class ConnectionManager:
         """Broadcast message immediately without batching (for urgent messages)."""
         await self.batch_processor.send_immediate(channel, message)
 
-    async def broadcast_session_update(self, session_data: dict) -> None:
-        """Broadcast session update to relevant channels."""
-        message = {
-            "type": "session_update",
-            "timestamp": datetime.now(UTC).isoformat(),
-            "data": session_data,
-        }
-
-        await self.broadcast_to_channel("sessions", message)
-        await self.broadcast_to_channel("dashboard", message)
-
-    async def broadcast_health_update(self, health_data: dict) -> None:
-        """Broadcast health update to relevant channels."""
-        message = {
-            "type": "health_update",
-            "timestamp": datetime.now(UTC).isoformat(),
-            "data": health_data,
-        }
-
-        await self.broadcast_to_channel("health", message)
-        await self.broadcast_to_channel("dashboard", message)
-
-    async def broadcast_activity_update(self, activity_data: dict) -> None:
-        """Broadcast activity update to relevant channels."""
-        message = {
-            "type": "activity_update",
-            "timestamp": datetime.now(UTC).isoformat(),
-            "data": activity_data,
-        }
-
-        await self.broadcast_to_channel("activity", message)
-        await self.broadcast_to_channel("dashboard", message)
-
     async def broadcast_log_update(self, log_entry: dict) -> None:
         """Broadcast log update to relevant channels."""
         message = {
@@ -268,27 +315,11 @@ class ConnectionManager:
         while True:
             await asyncio.sleep(self.ping_interval)
 
-            disconnected = []
-            for connection in self.active_connections:
-                try:
-                    await connection.send_json(
-                        {
-                            "type": "ping",
-                            "timestamp": datetime.now(UTC).isoformat(),
-                        }
-                    )
-
-                    # Update last ping time
-                    if connection in self.connection_metadata:
-                        self.connection_metadata[connection]["last_ping"] = datetime.now(UTC)
-
-                except Exception:
-                    logger.exception("Error pinging connection:")
-                    disconnected.append(connection)
-
-            # Clean up disconnected clients
-            for conn in disconnected:
-                self.disconnect(conn)
+            # A ping still queued for a slow client is replaced, not stacked
+            now = datetime.now(UTC)
+            self._fan_out(self.active_connections, encode_message({"type": "ping", "timestamp": now.isoformat()}), key="ping")
+            for metadata in self.connection_metadata.values():
+                metadata["last_ping"] = now
 
     def get_connection_stats(self) -> object:
         """Get statistics about active connections.
@@ -304,16 +335,30 @@ class ConnectionManager:
         for channel, connections in self.channel_connections.items():
             stats["channels"][channel] = len(connections)
 
+        stats["outbound"] = {
+            "queued": sum(sender.queue_size for sender in self.senders.values()),
+            "dropped": sum(sender.stats["dropped"] for sender in self.senders.values()),
+            "coalesced": sum(sender.stats["coalesced"] for sender in self.senders.values()),
+        }
+
         return stats
 
     async def shutdown(self) -> None:
         """Shutdown the connection manager and batch processor."""
         logger.info("Shutting down WebSocket connection manager...")
 
+        if self._log_watch_task is not None:
+            self._log_watch_task.cancel()
+            self._log_watch_task = None
+
         # Stop batch processor
         await self.batch_processor.stop()
 
         # Disconnect all active connections
+        for sender in self.senders.values():
+            sender.close()
+        self.senders.clear()
+
         for connection in self.active_connections.copy():
             try:
                 await connection.close()
@@ -354,6 +399,9 @@ async def websocket_dashboard(websocket: WebSocket) -> None:
                 # Client responded to ping
                 logger.debug("Received pong from dashboard client")
 
+            elif data.get("type") == "resync":
+                await manager.send_state(websocket, data.get("state", ""), data.get("version"))
+
             elif data.get("type") == "subscribe":
                 # Client wants to subscribe to specific updates
                 channels = data.get("channels", [])
@@ -404,6 +452,9 @@ async def websocket_sessions(websocket: WebSocket) -> None:
                 # Client requests fresh session data
                 await manager.send_initial_data(websocket, "sessions")
 
+            elif data.get("type") == "resync":
+                await manager.send_state(websocket, data.get("state", "sessions"), data.get("version"))
+
     except WebSocketDisconnect:
         manager.disconnect(websocket)
         logger.info("Sessions WebSocket disconnected")
@@ -428,6 +479,9 @@ async def websocket_health(websocket: WebSocket) -> None:
                 # Client requests fresh health data
                 await manager.send_initial_data(websocket, "health")
 
+            elif data.get("type") == "resync":
+                await manager.send_state(websocket, data.get("state", "health"), data.get("version"))
+
     except WebSocketDisconnect:
         manager.disconnect(websocket)
         logger.info("Health WebSocket disconnected")
@@ -452,6 +506,9 @@ async def websocket_activity(websocket: WebSocket) -> None:
                 # Client requests fresh activity data
                 await manager.send_initial_data(websocket, "activity")
 
+            elif data.get("type") == "resync":
+                await manager.send_state(websocket, data.get("state", "activity"), data.get("version"))
+
     except WebSocketDisconnect:
         manager.disconnect(websocket)
         logger.info("Activity WebSocket disconnected")
@@ -1,6 +1,7 @@
 # Copyright notice.
 
 import asyncio
+import json
 from collections import deque
 from unittest.mock import AsyncMock
 
@@ -279,23 +280,58 @@ class TestWebSocketBatchProcessor:
         await processor.stop()
         assert processor._processing_task.done()  # noqa: SLF001
 
+    @pytest.mark.asyncio
     @staticmethod
-    def test_memory_size_calculation(processor: WebSocketBatchProcessor) -> None:
-        """Test memory size calculation for queues."""
-        test_queue = deque(
-            [
-                {"type": "test", "data": "small"},
-                {"type": "test", "data": "larger message content"},
-                {
-                    "type": "test",
-                    "data": {"complex": "object", "with": ["multiple", "values"]},
-                },
-            ]
-        )
+    async def test_idle_processor_does_not_wake_up(processor: WebSocketBatchProcessor, mock_handler: AsyncMock) -> None:
+        """Test that an idle processor sleeps instead of polling."""
+        processor.register_message_handler("test_channel", mock_handler)
+        await processor.start()
+
+        try:
+            await asyncio.sleep(0.2)
+            assert processor.stats["wakeups"] == 0
+
+            processor.queue_message("test_channel", {"type": "test"})
+            await asyncio.sleep(0.2)
 
-        size = processor._get_queue_memory_size(test_queue)  # noqa: SLF001
-        assert size > 0
-        assert isinstance(size, int)
+            mock_handler.assert_called_once()
+            # One wakeup for the queued message and one for its deadline
+            assert processor.stats["wakeups"] <= 2
+        finally:
+            await processor.stop()
+
+    @pytest.mark.asyncio
+    @staticmethod
+    async def test_burst_flushes_without_waiting_for_deadline(mock_handler: AsyncMock) -> None:
+        """Test that a channel over a size limit is flushed straight away."""
+        processor = WebSocketBatchProcessor(BatchConfig(max_batch_size=3, max_batch_time=10.0, max_memory_size=200))
+        processor.register_message_handler("test_channel", mock_handler)
+        await processor.start()
+
+        try:
+            for i in range(7):
+                processor.queue_message("test_channel", {"type": "test", "id": i})
+            await asyncio.sleep(0.01)
+            assert [len(call.args[0]) for call in mock_handler.call_args_list] == [3, 3]
+
+            processor.queue_message("other_channel", {"type": "test", "data": "x" * 300})
+            await asyncio.sleep(0.01)
+            assert processor.pending_messages["other_channel"] == deque()
+            assert processor.get_statistics()["pending_bytes_by_channel"]["other_channel"] == 0
+        finally:
+            await processor.stop()
+
+    @staticmethod
+    def test_pending_bytes_tracked_at_enqueue(processor: WebSocketBatchProcessor) -> None:
+        """Test that queued sizes are kept as a running total."""
+        processor.queue_message("test_channel", {"type": "test", "data": "hello"})
+        processor.queue_message("test_channel", {"type": "test", "data": "larger message content"})
+
+        queue = processor.pending_messages["test_channel"]
+        assert processor.get_statistics()["pending_bytes_by_channel"]["test_channel"] == sum(len(json.dumps(message, default=str)) for message in queue)
+
+        processor.clear_channel("test_channel")
+        assert processor.get_statistics()["pending_bytes_by_channel"]["test_channel"] == 0
 
 
 if __name__ == "__main__":
@@ -0,0 +1,117 @@
+# Copyright notice.
+
+import asyncio
+import json
+
+import pytest
+
+from api.utils import ClientSender, encode_message
+
+# Copyright (c) 2024 Yesman Claude Project
+# Licensed under the MIT License
+
+"""Tests for serialize-once WebSocket fan-out."""
+
+
+class FakeWebSocket:
+    """WebSocket stand-in that records sent text and can be made slow or broken."""
+
+    def __init__(self, delay: float = 0.0, fail: bool = False) -> None:  # noqa: FBT001, FBT002
+        self.delay = delay
+        self.fail = fail
+        self.client = "fake"
+        self.sent: list[str] = []
+
+    async def send_text(self, data: str) -> None:
+        if self.fail:
+            msg = "client went away"
+            raise ConnectionError(msg)
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.sent.append(data)
+
+
+def test_encode_message() -> None:
+    """Test that messages encode to compact JSON text."""
+    payload = encode_message({"type": "test", "data": {"name": "séance", "count": 2}})
+
+    assert isinstance(payload, str)
+    assert json.loads(payload) == {"type": "test", "data": {"name": "séance", "count": 2}}
+    assert ": " not in payload
+
+
+class TestClientSender:
+    """Test ClientSender class."""
+
+    @pytest.mark.asyncio
+    @staticmethod
+    async def test_same_payload_reaches_every_client() -> None:
+        """Test that one encoded payload is delivered to all clients in order."""
+        sockets = [FakeWebSocket() for _ in range(3)]
+        senders = [ClientSender(socket) for socket in sockets]
+        for sender in senders:
+            sender.start()
+
+        first, second = encode_message({"id": 1}), encode_message({"id": 2})
+        for sender in senders:
+            sender.send(first)
+            sender.send(second)
+        await asyncio.sleep(0.01)
+
+        assert all(socket.sent == [first, second] for socket in sockets)
+        assert all(socket.sent[0] is first for socket in sockets)
+        for sender in senders:
+            sender.close()
+
+    @pytest.mark.asyncio
+    @staticmethod
+    async def test_slow_client_does_not_stall_others() -> None:
+        """Test that a slow client only fills its own bounded queue."""
+        slow, fast = FakeWebSocket(delay=1.0), FakeWebSocket()
+        slow_sender, fast_sender = ClientSender(slow, max_queue_size=5), ClientSender(fast, max_queue_size=5)
+        slow_sender.start()
+        fast_sender.start()
+
+        for index in range(20):
+            payload = encode_message({"id": index})
+            slow_sender.send(payload)
+            fast_sender.send(payload)
+            await asyncio.sleep(0.001)
+        await asyncio.sleep(0.01)
+
+        assert len(fast.sent) == 20
+        assert slow_sender.queue_size == 5
+        assert slow_sender.stats["dropped"] == 14
+        slow_sender.close()
+        fast_sender.close()
+
+    @staticmethod
+    def test_coalesce_replaces_queued_payload() -> None:
+        """Test that payloads with the same key replace each other while queued."""
+        sender = ClientSender(FakeWebSocket())
+
+        sender.send("a", key="ping")
+        sender.send("b")
+        sender.send("c", key="ping")
+
+        assert [payload for _, payload in sender._queue] == ["c", "b"]  # noqa: SLF001
+        assert sender.stats["coalesced"] == 1
+
+    @pytest.mark.asyncio
+    @staticmethod
+    async def test_failed_send_closes_sender() -> None:
+        """Test that a failing client is dropped and reported once."""
+        closed = []
+        sender = ClientSender(FakeWebSocket(fail=True), on_close=closed.append)
+        sender.start()
+
+        sender.send("payload")
+        await asyncio.sleep(0.01)
+
+        assert sender.closed
+        assert closed == [sender.websocket]
+        assert not sender.send("late")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
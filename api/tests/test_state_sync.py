@@ -0,0 +1,103 @@
+# Copyright notice.
+
+import copy
+
+import pytest
+
+from api.utils import VersionedState, apply_patch, diff_state
+
+# Copyright (c) 2024 Yesman Claude Project
+# Licensed under the MIT License
+
+"""Tests for versioned dashboard state and JSON-Patch deltas."""
+
+
+def _sessions(count: int, **overrides: object) -> dict[str, object]:
+    sessions = {}
+    for index in range(count):
+        name = f"project{index}"
+        sessions[name] = {"session_name": name, "status": "active", "windows": 2, "panes": 4, "claude_active": False}
+        sessions[name].update(overrides.get(name, {}))
+    return {"sessions": sessions}
+
+
+class TestDiffState:
+    """Test diff_state and apply_patch."""
+
+    @staticmethod
+    def test_keyed_diff_only_touches_changed_fields() -> None:
+        """Test that one changed session yields one small operation."""
+        old, new = _sessions(300), _sessions(300, project7={"status": "stopped"})
+
+        ops = diff_state(old, new)
+
+        assert ops == [{"op": "replace", "path": "/sessions/project7/status", "value": "stopped"}]
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        ("old", "new"),
+        [
+            (_sessions(3), _sessions(2)),
+            (_sessions(2), _sessions(4, project3={"panes": 9})),
+            ({"a/b": {"~x": 1}}, {"a/b": {"~x": 2}}),
+            ({"activities": [1, 2, 3]}, {"activities": [1, 5, 3]}),
+            ({"activities": [1, 2, 3]}, {"activities": [1, 2]}),
+            (None, {"fresh": True}),
+        ],
+    )
+    def test_patch_round_trip(old: object, new: object) -> None:
+        """Test that applying the diff reproduces the new state."""
+        assert apply_patch(copy.deepcopy(old), diff_state(old, new)) == new
+
+
+class TestVersionedState:
+    """Test VersionedState class."""
+
+    @staticmethod
+    def test_versions_and_unchanged_updates() -> None:
+        """Test that only real changes bump the version."""
+        state = VersionedState("sessions")
+
+        first = state.update(_sessions(2))
+        assert (first.base_version, first.version) == (0, 1)
+        assert state.update(_sessions(2)) is None
+
+        second = state.update(_sessions(2, project1={"claude_active": True}))
+        message = second.to_message()
+        assert message["type"] == "state_patch"
+        assert (message["base_version"], message["version"]) == (1, 2)
+        assert message["ops"] == [{"op": "replace", "path": "/sessions/project1/claude_active", "value": True}]
+
+    @staticmethod
+    def test_large_patch_falls_back_to_replace() -> None:
+        """Test that a patch bigger than the state is sent as a replace."""
+        state = VersionedState("activity")
+        state.update({"activities": list(range(50))})
+
+        patch = state.update({"activities": list(range(1, 51))})
+
+        assert patch.ops == [{"op": "replace", "path": "", "value": {"activities": list(range(1, 51))}}]
+
+    @staticmethod
+    def test_changes_since_composes_history() -> None:
+        """Test catch-up patches for clients that missed messages."""
+        state = VersionedState("sessions", history_size=3)
+        client_copy = None
+        for version in range(1, 6):
+            state.update(_sessions(4, project0={"panes": version}))
+            if version == 2:
+                client_copy = copy.deepcopy(state.data)
+
+        catch_up = state.changes_since(2)
+        assert catch_up["type"] == "state_patch"
+        assert (catch_up["base_version"], catch_up["version"]) == (2, 5)
+        assert apply_patch(client_copy, catch_up["ops"]) == state.data
+
+        assert state.changes_since(5) is None
+        assert state.changes_since(1)["type"] == "state_snapshot"
+        snapshot = state.changes_since(None)
+        assert (snapshot["type"], snapshot["version"], snapshot["data"]) == ("state_snapshot", 5, state.data)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -1,6 +1,8 @@
 # Copyright notice.
 
 from .batch_processor import BatchConfig, MessageBatch, WebSocketBatchProcessor
+from .fanout import ClientSender, encode_message
+from .state_sync import StatePatch, VersionedState, apply_patch, diff_state
 
 # Copyright (c) 2024 Yesman Claude Project
 # Licensed under the MIT License
@@ -8,4 +10,14 @@ from .batch_processor import BatchConfig, MessageBatch, WebSocketBatchProcessor
 """API utilities for WebSocket batch processing and optimizations."""
 
 
-__all__ = ["BatchConfig", "MessageBatch", "WebSocketBatchProcessor"]
+__all__ = [
+    "BatchConfig",
+    "ClientSender",
+    "MessageBatch",
+    "StatePatch",
+    "VersionedState",
+    "WebSocketBatchProcessor",
+    "apply_patch",
+    "diff_state",
+    "encode_message",
+]
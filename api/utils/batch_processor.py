@@ -12,7 +12,19 @@ from datetime import UTC, datetime
 # Copyright (c) 2024 Yesman Claude Project
 # Licensed under the MIT License
 
-"""WebSocket message batch processor for optimized real-time updates."""
+"""WebSocket message batch processor for optimized real-time updates.
+
+Each channel with pending messages has a flush deadline ``max_batch_time``
+after its first queued message. The processing loop sleeps until the nearest
+deadline or until ``queue_message`` wakes it, so an idle processor does no work
+at all, and a channel that reaches ``max_batch_size`` messages or
+``max_memory_size`` bytes is flushed straight away. Message sizes are measured
+once when they are queued and kept as running totals per channel.
+"""
+
+# Retries of a failed batch back off from max_batch_time by this factor
+RETRY_BACKOFF = 2.0
+MAX_RETRIES = 3
 
 
 @dataclass
@@ -56,6 +68,16 @@ class WebSocketBatchProcessor:
         self.last_flush_time: dict[str, float] = {}
         self.batch_counter = 0
 
+        # Serialized size of each pending message and the running total per channel
+        self._pending_sizes: dict[str, deque[int]] = {}
+        self._pending_bytes: dict[str, int] = {}
+
+        # Flush scheduling: monotonic deadline per non-empty channel, and the
+        # channels that hit a size limit and must be flushed without waiting
+        self._deadlines: dict[str, float] = {}
+        self._ready: set[str] = set()
+        self._next_wakeup: float | None = None
+
         # Statistics tracking
         self.stats = {
             "batches_sent": 0,
@@ -64,11 +86,13 @@ class WebSocketBatchProcessor:
             "avg_batch_size": 0,
             "compression_ratio": 1.0,
             "channels_active": 0,
+            "wakeups": 0,
         }
 
         # Processing control
         self._processing_task: asyncio.Task | None = None
         self._stop_event = asyncio.Event()
+        self._wakeup = asyncio.Event()
         self._message_handlers: dict[str, Callable[[list[dict[str, object]]], Awaitable[None]]] = {}
 
         self.logger = logging.getLogger("yesman.websocket_batch")
@@ -85,6 +109,7 @@ class WebSocketBatchProcessor:
             return
 
         self._stop_event.clear()
+        self._wakeup.clear()
         self._processing_task = asyncio.create_task(self._processing_loop())
         self.logger.info("WebSocket batch processor started")
 
@@ -94,6 +119,7 @@ class WebSocketBatchProcessor:
             return
 
         self._stop_event.set()
+        self._wakeup.set()
 
         try:
             await asyncio.wait_for(self._processing_task, timeout=5.0)
@@ -111,6 +137,8 @@ class WebSocketBatchProcessor:
         # Initialize channel if not exists
         if channel not in self.pending_messages:
             self.pending_messages[channel] = deque()
+            self._pending_sizes[channel] = deque()
+            self._pending_bytes[channel] = 0
             self.last_flush_time[channel] = time.time()
 
         # Add message to queue
@@ -120,13 +148,18 @@ class WebSocketBatchProcessor:
             "batch_eligible": True,
         }
 
+        size = len(json.dumps(message_with_metadata, default=str))
         self.pending_messages[channel].append(message_with_metadata)
+        self._pending_sizes[channel].append(size)
+        self._pending_bytes[channel] += size
 
-        # Check if immediate flush is needed
-        queue_size = len(self.pending_messages[channel])
-        if queue_size >= self.config.max_batch_size:
-            # Schedule immediate flush for this channel
-            asyncio.create_task(self._flush_channel(channel))
+        if self._over_limit(channel):
+            # Flush this channel on the next turn of the processing loop
+            if channel not in self._ready:
+                self._ready.add(channel)
+                self._wakeup.set()
+        elif channel not in self._deadlines:
+            self._schedule(channel, time.monotonic() + self.config.max_batch_time)
 
     async def send_immediate(self, channel: str, message: dict[str, object]) -> None:
         """Send a message immediately without batching (for urgent messages)."""
@@ -144,32 +177,62 @@ class WebSocketBatchProcessor:
         """Main processing loop for batch management."""
         try:
             while not self._stop_event.is_set():
-                await asyncio.sleep(0.01)  # Check every 10ms
+                self._wakeup.clear()
 
-                current_time = time.time()
-                channels_to_flush = []
-
-                # Check each channel for flush conditions
-                for channel in list(self.pending_messages.keys()):
-                    queue = self.pending_messages[channel]
-                    last_flush = self.last_flush_time[channel]
-
-                    should_flush = (
-                        len(queue) >= self.config.max_batch_size
-                        or (len(queue) > 0 and current_time - last_flush >= self.config.max_batch_time)
-                        or self._get_queue_memory_size(queue) >= self.config.max_memory_size
-                    )
+                for channel in self._due_channels():
+                    await self._flush_channel(channel)
 
-                    if should_flush:
-                        channels_to_flush.append(channel)
+                if self._ready or self._stop_event.is_set():
+                    continue
 
-                # Flush channels that need it
-                for channel in channels_to_flush:
-                    await self._flush_channel(channel)
+                # Sleep until the nearest deadline, or indefinitely when idle
+                self._next_wakeup = min(self._deadlines.values(), default=None)
+                timeout = None if self._next_wakeup is None else max(0.0, self._next_wakeup - time.monotonic())
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except TimeoutError:
+                    pass
+                self._next_wakeup = None
+                self.stats["wakeups"] += 1
 
         except Exception:
             self.logger.error("Error in batch processing loop", exc_info=True)
 
+    def _over_limit(self, channel: str) -> bool:
+        return len(self.pending_messages[channel]) >= self.config.max_batch_size or self._pending_bytes[channel] >= self.config.max_memory_size
+
+    def _schedule(self, channel: str, deadline: float) -> None:
+        """Set a channel's flush deadline, waking the loop if it is sleeping past it."""
+        self._deadlines[channel] = deadline
+        if self._next_wakeup is None or deadline < self._next_wakeup:
+            self._wakeup.set()
+
+    def _due_channels(self) -> list[str]:
+        """Take the channels that are over a size limit or past their deadline.
+
+        Returns:
+        list[str]: Channels to flush now.
+        """
+        now = time.monotonic()
+        due = [channel for channel, deadline in self._deadlines.items() if deadline <= now and channel not in self._ready]
+        due[:0] = self._ready
+        self._ready.clear()
+        for channel in due:
+            self._deadlines.pop(channel, None)
+        return due
+
+    def _reschedule(self, channel: str) -> None:
+        """Schedule whatever is still pending on a channel after a flush."""
+        if not self.pending_messages[channel]:
+            self._deadlines.pop(channel, None)
+            self._ready.discard(channel)
+        elif self._over_limit(channel):
+            self._deadlines.pop(channel, None)
+            self._ready.add(channel)
+            self._wakeup.set()
+        else:
+            self._schedule(channel, time.monotonic() + self.config.max_batch_time)
+
     async def _flush_channel(self, channel: str) -> None:
         """Flush pending messages for a specific channel."""
         if channel not in self.pending_messages:
@@ -180,15 +243,11 @@ class WebSocketBatchProcessor:
             return
 
         # Collect messages for this batch
-        messages = []
+        sizes = self._pending_sizes[channel]
         batch_size = min(len(queue), self.config.max_batch_size)
-
-        for _ in range(batch_size):
-            if queue:
-                messages.append(queue.popleft())
-
-        if not messages:
-            return
+        messages = [queue.popleft() for _ in range(batch_size)]
+        message_sizes = [sizes.popleft() for _ in range(batch_size)]
+        self._pending_bytes[channel] -= sum(message_sizes)
 
         # Create batch
         batch = MessageBatch(
@@ -196,6 +255,7 @@ class WebSocketBatchProcessor:
             timestamp=time.time(),
             batch_id=f"batch_{self.batch_counter:06d}",
             channel=channel,
+            size_bytes=sum(message_sizes),
         )
 
         try:
@@ -204,27 +264,38 @@ class WebSocketBatchProcessor:
             # Update statistics
             self.stats["batches_sent"] += 1
             self.stats["messages_processed"] += len(messages)
-            self.stats["avg_batch_size"] = self.stats["messages_processed"] / self.stats["batches_sent"]
 
             self.last_flush_time[channel] = time.time()
             self.batch_counter += 1
 
             self.logger.debug("Flushed batch %s to %s: %d messages", batch.batch_id, channel, len(messages))
+            self._reschedule(channel)
 
         except Exception:
             self.logger.exception("Failed to send batch %s to %s", batch.batch_id, channel)
             # Re-queue messages for retry (with retry limit to prevent infinite loops)
-            retry_messages = []
-            for msg in messages:
+            retry_messages, retry_sizes = [], []
+            for msg, size in zip(messages, message_sizes, strict=True):
                 retry_count = msg.get("retry_count", 0)
-                if retry_count < 3:  # Max 3 retries
+                if retry_count < MAX_RETRIES:
                     msg["retry_count"] = retry_count + 1
                     retry_messages.append(msg)
+                    retry_sizes.append(size)
                 else:
-                    self.logger.warning("Dropping message after 3 failed retries: %s", msg)
+                    self.logger.warning("Dropping message after %d failed retries: %s", MAX_RETRIES, msg)
 
             if retry_messages:
-                self.pending_messages[channel].extendleft(reversed(retry_messages))
+                queue.extendleft(reversed(retry_messages))
+                sizes.extendleft(reversed(retry_sizes))
+                self._pending_bytes[channel] += sum(retry_sizes)
+
+            if queue:
+                # Back off instead of retrying a failing handler on every wakeup
+                attempts = max((msg.get("retry_count", 0) for msg in retry_messages), default=1)
+                self._ready.discard(channel)
+                self._schedule(channel, time.monotonic() + self.config.max_batch_time * RETRY_BACKOFF**attempts)
+            else:
+                self._reschedule(channel)
 
     async def _send_batch(self, batch: MessageBatch) -> None:
         """Send a batch of messages using the registered handler."""
@@ -238,7 +309,7 @@ class WebSocketBatchProcessor:
 
         # Calculate compression savings
         original_size = batch.size_bytes
-        optimized_size = sum(len(json.dumps(msg)) for msg in optimized_messages)
+        optimized_size = original_size if optimized_messages is batch.messages else sum(len(json.dumps(msg, default=str)) for msg in optimized_messages)
 
         if original_size > optimized_size:
             self.stats["bytes_saved"] += original_size - optimized_size
@@ -347,15 +418,6 @@ class WebSocketBatchProcessor:
             },
         }
 
-    @staticmethod
-    def _get_queue_memory_size(queue: deque) -> int:
-        """Estimate memory usage of a message queue.
-
-        Returns:
-        int: Description of return value.
-        """
-        return sum(len(json.dumps(msg)) for msg in queue)
-
     async def _flush_all_channels(self) -> None:
         """Flush all pending messages from all channels."""
         for channel in list(self.pending_messages.keys()):
@@ -369,12 +431,15 @@ class WebSocketBatchProcessor:
         """
         active_channels = len([ch for ch, queue in self.pending_messages.items() if queue])
         total_pending = sum(len(queue) for queue in self.pending_messages.values())
+        batches_sent = self.stats["batches_sent"]
 
         return {
             **self.stats,
+            "avg_batch_size": self.stats["messages_processed"] / batches_sent if batches_sent else 0,
             "active_channels": active_channels,
             "total_pending_messages": total_pending,
             "pending_by_channel": {ch: len(queue) for ch, queue in self.pending_messages.items()},
+            "pending_bytes_by_channel": dict(self._pending_bytes),
             "config": {
                 "max_batch_size": self.config.max_batch_size,
                 "max_batch_time": self.config.max_batch_time,
@@ -396,4 +461,8 @@ class WebSocketBatchProcessor:
         if channel in self.pending_messages:
             cleared_count = len(self.pending_messages[channel])
             self.pending_messages[channel].clear()
+            self._pending_sizes[channel].clear()
+            self._pending_bytes[channel] = 0
+            self._deadlines.pop(channel, None)
+            self._ready.discard(channel)
             self.logger.info("Cleared %d pending messages from %s", cleared_count, channel)
@@ -0,0 +1,125 @@
+# Copyright notice.
+
+import asyncio
+import json
+import logging
+from collections import deque
+from collections.abc import Callable
+
+from fastapi import WebSocket
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Copyright (c) 2024 Yesman Claude Project
+# Licensed under the MIT License
+
+"""Serialize-once fan-out of WebSocket messages to many clients.
+
+A broadcast is encoded to JSON text once with ``encode_message`` and the same
+string is handed to every subscriber. Each client has a ``ClientSender`` that
+owns a bounded outbound queue and a writer task, so clients receive their
+messages concurrently and a slow or stalled client only fills its own queue:
+when the queue is full the oldest payload is dropped, and payloads sent with a
+coalesce key replace a still-queued payload with the same key.
+"""
+
+
+def encode_message(message: dict[str, object]) -> str:
+    """Encode a message once for sending to any number of clients.
+
+    Returns:
+        str: Compact JSON text, encoded with orjson when it is installed.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(message, default=str).decode()
+        except TypeError:
+            pass
+    return json.dumps(message, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+class ClientSender:
+    """Bounded outbound queue and writer task for one WebSocket client."""
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        max_queue_size: int = 100,
+        send_timeout: float = 10.0,
+        on_close: Callable[[WebSocket], None] | None = None,
+    ) -> None:
+        self.websocket = websocket
+        self.max_queue_size = max_queue_size
+        self.send_timeout = send_timeout
+        self.on_close = on_close
+
+        self._queue: deque[tuple[str | None, str]] = deque()
+        self._pending = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self.closed = False
+
+        self.stats = {"sent": 0, "dropped": 0, "coalesced": 0}
+        self.logger = logging.getLogger("yesman.websocket_fanout")
+
+    @property
+    def queue_size(self) -> int:
+        """Number of payloads waiting to be sent."""
+        return len(self._queue)
+
+    def start(self) -> None:
+        """Start the writer task."""
+        if self._task is None and not self.closed:
+            self._task = asyncio.create_task(self._writer())
+
+    def send(self, payload: str, key: str | None = None) -> bool:
+        """Queue an encoded payload without waiting for the client.
+
+        Returns:
+            bool: False if the sender is closed and the payload was discarded.
+        """
+        if self.closed:
+            return False
+
+        if key is not None:
+            for index, (queued_key, _) in enumerate(self._queue):
+                if queued_key == key:
+                    self._queue[index] = (key, payload)
+                    self.stats["coalesced"] += 1
+                    return True
+
+        if len(self._queue) >= self.max_queue_size:
+            self._queue.popleft()
+            self.stats["dropped"] += 1
+            self.logger.debug("Outbound queue full, dropped oldest message for %s", self.websocket.client)
+
+        self._queue.append((key, payload))
+        self._pending.set()
+        return True
+
+    def close(self) -> None:
+        """Stop sending and discard whatever is still queued."""
+        self.closed = True
+        self._queue.clear()
+        if self._task is not None and self._task is not asyncio.current_task():
+            self._task.cancel()
+
+    async def _writer(self) -> None:
+        while not self.closed:
+            await self._pending.wait()
+            while self._queue and not self.closed:
+                _, payload = self._queue.popleft()
+                try:
+                    await asyncio.wait_for(self.websocket.send_text(payload), self.send_timeout)
+                except asyncio.CancelledError:
+                    raise
+                except Exception:
+                    self.logger.warning("Dropping WebSocket client %s after a failed send", self.websocket.client, exc_info=True)
+                    self.close()
+                    if self.on_close is not None:
+                        self.on_close(self.websocket)
+                    return
+                self.stats["sent"] += 1
+            self._pending.clear()
@@ -0,0 +1,183 @@
+# Copyright notice.
+
+import json
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+
+# Copyright (c) 2024 Yesman Claude Project
+# Licensed under the MIT License
+
+"""Versioned dashboard state with JSON-Patch deltas for WebSocket clients.
+
+A ``VersionedState`` holds the latest value of one piece of dashboard state
+(sessions, health, activity). Every ``update`` that changes it bumps the
+version and yields a ``state_patch`` message with RFC 6902 ``add`` / ``remove``
+/ ``replace`` operations from the previous version, which is what gets
+broadcast. Dicts are diffed key by key (so sessions keyed by name produce one
+small operation per changed field) and lists of equal length element by
+element; anything else, or a patch larger than the value itself, becomes a
+``replace``.
+
+Clients keep the version they last applied. A patch whose ``base_version``
+does not match it means messages were missed (a dropped message or a late
+subscription); the client then sends ``{"type": "resync", "state": name,
+"version": n}`` and gets either one patch composed from the recent history or,
+if ``n`` is too old, a full ``state_snapshot``.
+"""
+
+
+def _escape(key: object) -> str:
+    return str(key).replace("~", "~0").replace("/", "~1")
+
+
+def _unescape(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def diff_state(old: object, new: object, path: str = "") -> list[dict[str, object]]:
+    """Compute JSON-Patch operations turning ``old`` into ``new``.
+
+    Returns:
+        list[dict[str, object]]: Operations in application order.
+    """
+    if old == new:
+        return []
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops: list[dict[str, object]] = [{"op": "remove", "path": f"{path}/{_escape(key)}"} for key in old if key not in new]
+        for key, value in new.items():
+            child = f"{path}/{_escape(key)}"
+            if key not in old:
+                ops.append({"op": "add", "path": child, "value": value})
+            else:
+                ops.extend(diff_state(old[key], value, child))
+        return ops
+    if isinstance(old, list) and isinstance(new, list) and len(old) == len(new):
+        ops = []
+        for index, (old_item, new_item) in enumerate(zip(old, new, strict=True)):
+            ops.extend(diff_state(old_item, new_item, f"{path}/{index}"))
+        return ops
+    return [{"op": "replace", "path": path, "value": new}]
+
+
+def apply_patch(document: object, ops: list[dict[str, object]]) -> object:
+    """Apply JSON-Patch operations to ``document`` in place.
+
+    Returns:
+        object: The patched document (a new object if the root was replaced).
+    """
+    for op in ops:
+        path = op["path"]
+        if not path:
+            if op["op"] == "remove":
+                document = None
+            else:
+                document = op["value"]
+            continue
+
+        *parents, last = [_unescape(token) for token in path.split("/")[1:]]
+        target = document
+        for token in parents:
+            target = target[int(token)] if isinstance(target, list) else target[token]
+
+        if isinstance(target, list):
+            index = len(target) if last == "-" else int(last)
+            if op["op"] == "add":
+                target.insert(index, op["value"])
+            elif op["op"] == "remove":
+                del target[index]
+            else:
+                target[index] = op["value"]
+        elif op["op"] == "remove":
+            del target[last]
+        else:
+            target[last] = op["value"]
+    return document
+
+
+def _timestamp() -> str:
+    return datetime.now(UTC).isoformat()
+
+
+@dataclass
+class StatePatch:
+    """Operations moving a state from ``base_version`` to ``version``."""
+
+    state: str
+    base_version: int
+    version: int
+    ops: list[dict[str, object]] = field(default_factory=list)
+
+    def to_message(self) -> dict[str, object]:
+        """Build the ``state_patch`` WebSocket message.
+
+        Returns:
+            dict[str, object]: Message for the state's channels.
+        """
+        return {
+            "type": "state_patch",
+            "timestamp": _timestamp(),
+            "state": self.state,
+            "base_version": self.base_version,
+            "version": self.version,
+            "ops": self.ops,
+        }
+
+
+class VersionedState:
+    """Latest value of one dashboard state plus a short history of patches."""
+
+    def __init__(self, name: str, history_size: int = 64) -> None:
+        self.name = name
+        self.version = 0
+        self.data: object = None
+        self._history: deque[StatePatch] = deque(maxlen=history_size)
+
+    def update(self, data: object) -> StatePatch | None:
+        """Replace the state with ``data``, which must not be mutated afterwards.
+
+        Returns:
+            StatePatch | None: The patch from the previous version, or None if
+            nothing changed.
+        """
+        ops = diff_state(self.data, data)
+        if not ops:
+            return None
+        if len(json.dumps(ops, default=str)) > len(json.dumps(data, default=str)):
+            ops = [{"op": "replace", "path": "", "value": data}]
+
+        patch = StatePatch(state=self.name, base_version=self.version, version=self.version + 1, ops=ops)
+        self.data = data
+        self.version = patch.version
+        self._history.append(patch)
+        return patch
+
+    def snapshot_message(self) -> dict[str, object]:
+        """Build a ``state_snapshot`` message with the full current value.
+
+        Returns:
+            dict[str, object]: Message for one client.
+        """
+        return {
+            "type": "state_snapshot",
+            "timestamp": _timestamp(),
+            "state": self.name,
+            "version": self.version,
+            "data": self.data,
+        }
+
+    def changes_since(self, version: int | None) -> dict[str, object] | None:
+        """Build what a client at ``version`` needs to catch up.
+
+        Returns:
+            dict[str, object] | None: A composed ``state_patch`` when the
+            history still reaches ``version``, a ``state_snapshot`` otherwise,
+            or None if the client is up to date.
+        """
+        if version == self.version:
+            return None
+        if version is None or version > self.version or not self._history or version < self._history[0].base_version:
+            return self.snapshot_message()
+
+        ops = [op for patch in self._history if patch.base_version >= version for op in patch.ops]
+        return StatePatch(state=self.name, base_version=version, version=self.version, ops=ops).to_message()
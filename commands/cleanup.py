@@ -9,6 +9,8 @@ from rich.progress import track
 from rich.table import Table
 
 from libs.core.base_command import BaseCommand, ConfigCommandMixin
+from libs.core.interaction_store import StoreLockedError, migrate_legacy_files
+from libs.utils import get_default_log_path
 
 # Copyright notice.
 # Copyright (c) 2024 Yesman Claude Project
@@ -29,6 +31,7 @@ class CleanupCommand(BaseCommand, ConfigCommandMixin):
         dry_run: bool = False,  # noqa: FBT001
         force: bool = False,  # noqa: FBT001
         cleanup_all: bool = False,  # noqa: FBT001
+        migrate_interactions: bool = False,  # noqa: FBT001
         **kwargs: Any,  # noqa: ARG002
     ) -> dict:
         """Execute the cleanup command.
@@ -38,6 +41,9 @@ class CleanupCommand(BaseCommand, ConfigCommandMixin):
 
 
         """
+        if migrate_interactions:
+            return self._migrate_interactions(dry_run)
+
         # Find cache files to clean
         cache_paths = self._find_cache_files(cleanup_all)
         total_size = sum(size for _, _, size in cache_paths)
@@ -176,6 +182,52 @@ class CleanupCommand(BaseCommand, ConfigCommandMixin):
             if len(errors) > 5:
                 self.console.print(f"   ... and {len(errors) - 5} more")
 
+    def _migrate_interactions(self, dry_run: bool) -> dict:  # noqa: FBT001
+        """Convert per-file Claude interaction logs into compressed segment stores.
+
+        Returns:
+        dict: Migrated and failed file counts per session.
+        """
+        collection_dir = get_default_log_path().expanduser() / "claude_interactions"
+        session_dirs = sorted(path for path in collection_dir.iterdir() if path.is_dir()) if collection_dir.exists() else []
+
+        table = Table(title="Interaction Log Migration")
+        table.add_column("Session", style="cyan")
+        table.add_column("Legacy files", style="yellow", justify="right")
+        table.add_column("Failed", style="red", justify="right")
+        table.add_column("Status")
+
+        results = {}
+        for session_dir in session_dirs:
+            legacy_count = sum(1 for _ in session_dir.glob("interaction_*.json")) + sum(1 for _ in session_dir.glob("raw_*.json"))
+            if not legacy_count:
+                continue
+            status = "dry run"
+            if dry_run:
+                results[session_dir.name] = {"migrated": 0, "failed": 0, "found": legacy_count}
+            else:
+                try:
+                    results[session_dir.name] = migrate_legacy_files(session_dir)
+                    status = "migrated"
+                except StoreLockedError:
+                    # A running monitor owns the store; migrate after it has stopped
+                    results[session_dir.name] = {"migrated": 0, "failed": 0, "skipped": legacy_count}
+                    status = "skipped: monitor running"
+            table.add_row(session_dir.name, str(legacy_count), str(results[session_dir.name]["failed"]), status)
+
+        if not results:
+            self.print_success("No legacy interaction files found")
+            return {"migrated_sessions": {}}
+
+        self.console.print(table)
+        if dry_run:
+            self.print_warning("🔍 Dry run mode - no files will be migrated")
+            return {"dry_run": True, "migrated_sessions": results}
+
+        migrated = sum(result["migrated"] for result in results.values())
+        self.print_success(f"Migrated {migrated} interaction files in {len(results)} sessions")
+        return {"migrated_sessions": results}
+
     @staticmethod
     def _human_readable_size(size_bytes: int) -> str:
         """Convert bytes to human readable format.
@@ -203,10 +255,15 @@ class CleanupCommand(BaseCommand, ConfigCommandMixin):
 )
 @click.option("--force", "-f", is_flag=True, help="Force cleanup without confirmation")
 @click.option("--all", "cleanup_all", is_flag=True, help="Clean all cache types including logs")
-def cleanup(dry_run: bool, force: bool, cleanup_all: bool) -> None:  # noqa: FBT001
+@click.option(
+    "--migrate-interactions",
+    is_flag=True,
+    help="Convert per-file Claude interaction logs into compressed segment stores",
+)
+def cleanup(dry_run: bool, force: bool, cleanup_all: bool, migrate_interactions: bool) -> None:  # noqa: FBT001
     """Clean up excessive cache files and temporary data."""
     command = CleanupCommand()
-    command.run(dry_run=dry_run, force=force, cleanup_all=cleanup_all)
+    command.run(dry_run=dry_run, force=force, cleanup_all=cleanup_all, migrate_interactions=migrate_interactions)
 
 
 if __name__ == "__main__":
@@ -5,7 +5,7 @@ import json
 import time
 from collections import defaultdict
 from pathlib import Path
-from typing import Any
+from typing import Any, ClassVar
 
 import click
 from rich.console import Console
@@ -14,6 +14,8 @@ from rich.table import Table
 
 from libs.core.base_command import BaseCommand, CommandError
 from libs.logging import AsyncLogger, AsyncLoggerConfig, LogLevel
+from libs.logging.log_query import LogFilter, LogQueryService
+from libs.logging.log_watcher import LogWatcher
 
 # Copyright (c) 2024 Yesman Claude Project
 # Licensed under the MIT License
@@ -153,6 +155,10 @@ class LogsAnalyzeCommand(BaseCommand):
         cutoff_time = time.time() - (last_hours * 3600)
 
         for log_file in log_files:
+            if log_file.suffix == ".log":
+                self._analyze_text_log(log_file, cutoff_time, level_filter, stats)
+                continue
+
             try:
                 # Handle compressed files
                 opener = gzip.open if log_file.suffix == ".gz" else open
@@ -199,6 +205,25 @@ class LogsAnalyzeCommand(BaseCommand):
 
         return stats
 
+    def _analyze_text_log(self, log_file: Path, cutoff_time: float, level_filter: str | None, stats: dict[str, object]) -> None:
+        """Add the entries of a plain-text log newer than ``cutoff_time`` to ``stats``.
+
+        The file is read backwards and only up to the first block older than
+        the cutoff.
+        """
+        service = LogQueryService.for_directory(log_file.parent)
+        try:
+            for entry in service.iter_entries(log_file, log_filter=LogFilter(level=level_filter, since=cutoff_time)):
+                level = entry.level.upper()
+                stats["total_entries"] += 1
+                stats["level_counts"][level] += 1
+                if entry.time is not None:
+                    stats["hourly_counts"][int(entry.time // 3600)] += 1
+                if level in {"ERROR", "CRITICAL"} and len(stats["error_messages"]) < 10:
+                    stats["error_messages"].append(entry.message)
+        except Exception as e:
+            self.logger.warning(f"Failed to process log file {log_file}: {e}")  # noqa: G004
+
     def _display_log_statistics(self, stats: dict[str, object]) -> None:
         """Display log analysis statistics."""
         # Overview
@@ -280,52 +305,29 @@ class LogsTailCommand(BaseCommand):
             msg = f"Error tailing logs: {e}"
             raise CommandError(msg) from e
 
+    LEVEL_COLORS: ClassVar[dict[str, str]] = {
+        "ERROR": "red",
+        "CRITICAL": "bright_red",
+        "WARNING": "yellow",
+        "INFO": "white",
+        "DEBUG": "dim",
+    }
+    FOLLOW_PATTERNS: ClassVar[tuple[str, ...]] = ("*.log", "*.jsonl")
+
     def _follow_log_file(self, log_file: Path, level_filter: str | None = None) -> None:
-        """Follow a log file like tail -f."""
+        """Follow a log file like tail -f.
+
+        The other log files in the same directory, and files replacing them
+        after rotation, are followed too; their lines are prefixed with the
+        file name.
+        """
         self.console.print(f"📋 Following {log_file.name} (Press Ctrl+C to stop)")
         self.console.print("=" * 60)
 
-        # Start from end of file
-        with open(log_file, encoding="utf-8") as f:
-            f.seek(0, 2)  # Seek to end
-
-            while True:
-                line = f.readline()
-                if line:
-                    line = line.strip()
-
-                    try:
-                        # Try to parse as JSON
-                        entry = json.loads(line)
-                        level = entry.get("level", "INFO")
-
-                        if level_filter and level != level_filter:
-                            continue
-
-                        timestamp = time.strftime(
-                            "%H:%M:%S",
-                            time.localtime(entry.get("timestamp", time.time())),
-                        )
-                        message = entry.get("message", "")
-
-                        # Color code by level
-                        level_colors = {
-                            "ERROR": "red",
-                            "CRITICAL": "bright_red",
-                            "WARNING": "yellow",
-                            "INFO": "white",
-                            "DEBUG": "dim",
-                        }
-
-                        level_color = level_colors.get(level, "white")
-                        self.console.print(f"[dim]{timestamp}[/] [{level_color}]{level:8}[/] {message}")
-
-                    except json.JSONDecodeError:
-                        # Handle text format
-                        if not level_filter:
-                            self.console.print(line)
-                else:
-                    time.sleep(0.1)
+        with LogWatcher(log_file.parent, patterns=self.FOLLOW_PATTERNS) as watcher:
+            for path, line in watcher.follow():
+                prefix = "" if path.name == log_file.name else f"[dim]{path.name}[/] "
+                self._print_line(line, level_filter, prefix)
 
     def _show_recent_logs(self, log_file: Path, lines: int, level_filter: str | None = None) -> None:
         """Show recent log entries."""
@@ -333,46 +335,34 @@ class LogsTailCommand(BaseCommand):
         self.console.print("=" * 60)
 
         try:
-            with open(log_file, encoding="utf-8") as f:
-                all_lines = f.readlines()
-                recent_lines = all_lines[-lines:]
-
-                for raw_line in recent_lines:
-                    line = raw_line.strip()
-                    if not line:
-                        continue
-
-                    try:
-                        entry = json.loads(line)
-                        level = entry.get("level", "INFO")
-
-                        if level_filter and level != level_filter:
-                            continue
-
-                        timestamp = time.strftime(
-                            "%H:%M:%S",
-                            time.localtime(entry.get("timestamp", time.time())),
-                        )
-                        message = entry.get("message", "")
-
-                        level_colors = {
-                            "ERROR": "red",
-                            "CRITICAL": "bright_red",
-                            "WARNING": "yellow",
-                            "INFO": "white",
-                            "DEBUG": "dim",
-                        }
-
-                        level_color = level_colors.get(level, "white")
-                        self.console.print(f"[dim]{timestamp}[/] [{level_color}]{level:8}[/] {message}")
-
-                    except json.JSONDecodeError:
-                        if not level_filter:
-                            self.console.print(line)
+            for line in LogQueryService.for_directory(log_file.parent).tail(log_file, lines):
+                self._print_line(line, level_filter)
 
         except Exception as e:
             self.console.print(f"[red]Error reading log file: {e}[/]")
 
+    def _print_line(self, raw_line: str, level_filter: str | None, prefix: str = "") -> None:
+        """Print one log line, color-coded by level if it is a JSON entry."""
+        line = raw_line.strip()
+        if not line:
+            return
+
+        try:
+            entry = json.loads(line)
+        except json.JSONDecodeError:
+            # Handle text format
+            if not level_filter:
+                self.console.print(f"{prefix}{line}")
+            return
+
+        level = entry.get("level", "INFO")
+        if level_filter and level != level_filter:
+            return
+
+        timestamp = time.strftime("%H:%M:%S", time.localtime(entry.get("timestamp", time.time())))
+        level_color = self.LEVEL_COLORS.get(level, "white")
+        self.console.print(f"{prefix}[dim]{timestamp}[/] [{level_color}]{level:8}[/] {entry.get('message', '')}")
+
 
 class LogsCleanupCommand(BaseCommand):
     """Clean up old log files."""
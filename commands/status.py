@@ -78,15 +78,10 @@ class StatusDashboard:
     def update_data(self) -> None:
         """Update all dashboard data."""
         try:
-            # Update session data
-            sessions_list = self.tmux_manager.get_cached_sessions_list()
-            detailed_sessions = []
-
-            for session_info in sessions_list:
-                session_name = session_info["session_name"]
-                detailed_info = self.tmux_manager.get_session_info(session_name)
-                detailed_sessions.append(detailed_info)
+            # Update session data (one tmux snapshot for all sessions)
+            detailed_sessions = self.tmux_manager.get_all_session_info()
 
+            for detailed_info in detailed_sessions:
                 # Calculate activity for heatmap
                 self._calculate_session_activity(detailed_info)
                 # Note: add_activity_point method not available, skip heatmap update
@@ -1,37 +1,35 @@
-from typing import Any
+# Copyright notice.
+
+# Copyright (c) 2024 Yesman Claude Project
+# Licensed under the MIT License
+
+"""Async comprehensive project status dashboard command with performance optimizations."""
+
 import asyncio
 import time
 from pathlib import Path
+from typing import Any
+
 import click
 from rich.console import Console
 from rich.layout import Layout
 from rich.live import Live
 from rich.panel import Panel
+from rich.table import Table
+from rich.text import Text
+
+from commands.status import StatusCommand as SyncStatusCommand
 from libs.core.async_base_command import AsyncMonitoringCommand, CommandError
 from libs.core.base_command import SessionCommandMixin
 from libs.core.session_manager import SessionManager
 from libs.dashboard.widgets import (
-from libs.dashboard.widgets.session_progress import SessionProgressWidget
-from rich.table import Table
-from rich.text import Text
-from rich.table import Table
-from commands.status import StatusCommand as SyncStatusCommand
-
-
-# Copyright notice.
-# Copyright (c) 2024 Yesman Claude Project
-# Licensed under the MIT License
-
-"""Async comprehensive project status dashboard command with performance optimizations."""
-
-
-
     ActivityHeatmapGenerator,
     GitActivityWidget,
     ProgressTracker,
     ProjectHealth,
     SessionBrowser,
 )
+from libs.dashboard.widgets.session_progress import SessionProgressWidget
 
 
 class AsyncStatusDashboard:
@@ -117,44 +115,22 @@ class AsyncStatusDashboard:
 
     async def _update_session_data(self) -> None:
         """Async update of session data."""
-        # Get session information using cached method
+        # One tmux snapshot covers every session, so a single executor call is enough
         loop = asyncio.get_event_loop()
-        sessions_list = await loop.run_in_executor(None, self.tmux_manager.get_cached_sessions_list)
-
-        detailed_sessions = []
-
-        # Process sessions concurrently
-        session_tasks = []
-        for session_info in sessions_list:
-            session_name = session_info["session_name"]
-            task = self._get_session_detail_async(session_name)
-            session_tasks.append(task)
-
-        if session_tasks:
-            session_details = await asyncio.gather(*session_tasks, return_exceptions=True)
-
-            for session_detail in session_details:
-                if isinstance(session_detail, Exception):
-                    self.console.print(f"[yellow]Warning: Session detail error: {session_detail}[/]")
-                    continue
-                if isinstance(session_detail, dict):
-                    detailed_sessions.append(session_detail)
+        try:
+            detailed_sessions = await loop.run_in_executor(None, self.tmux_manager.get_all_session_info)
+        except Exception as e:
+            self.console.print(f"[yellow]Warning: Session detail error: {e}[/]")
+            detailed_sessions = []
 
-                    # Calculate activity for heatmap
-                    self._calculate_session_activity(session_detail)
-                    # Use activity collection method instead of add_activity_point
-                    session_name = session_detail.get("session_name", "unknown")
-                    # Store activity data for later rendering
+        for session_detail in detailed_sessions:
+            # Calculate activity for heatmap
+            self._calculate_session_activity(session_detail)
 
         # Update session browser
         self.session_browser.update_sessions(detailed_sessions)
         self._data_cache["sessions"] = detailed_sessions
 
-    async def _get_session_detail_async(self, session_name: str):
-        """Async wrapper for getting session details."""
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, self.tmux_manager.get_session_info, session_name)
-
     async def _update_project_health(self) -> None:
         """Async update of project health."""
         loop = asyncio.get_event_loop()
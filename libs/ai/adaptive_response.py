@@ -3,6 +3,7 @@
 import asyncio
 import json
 import logging
+import threading
 import time
 from dataclasses import dataclass
 from pathlib import Path
@@ -40,6 +41,10 @@ class AdaptiveResponse:
         self._response_queue: list[tuple[str, str, str, str]] = []
         self._learning_cache: dict[str, object] = {}
         self._last_pattern_update = time.time()
+        # Serializes learning, which runs on monitor worker threads and writes the
+        # journal. Predictions run on the event loop and only take the analyzer's
+        # in-memory pattern lock, so slow disks never delay a prompt response.
+        self._analyzer_lock = threading.Lock()
 
         logger.info("Adaptive response system initialized")
 
@@ -106,7 +111,8 @@ class AdaptiveResponse:
         try:
             # Record the response for learning
             if success:
-                self.analyzer.record_response(prompt_text, response, context, project_name)
+                with self._analyzer_lock:
+                    self.analyzer.record_response(prompt_text, response, context, project_name)
                 logger.debug("Recorded successful response: {response}")
             else:
                 # For failed responses, we might want to adjust confidence
@@ -128,29 +134,42 @@ class AdaptiveResponse:
 
         try:
             # Record manual response for learning
-            self.analyzer.record_response(prompt_text, user_response, context, project_name)
+            with self._analyzer_lock:
+                self.analyzer.record_response(prompt_text, user_response, context, project_name)
             logger.debug("Learned from manual response: {user_response}")
 
         except Exception:
             logger.exception("Failed to learn from manual response: {e}")
 
+    def is_pattern_update_due(self) -> bool:
+        """Check whether the periodic pattern update should run."""
+        return (time.time() - self._last_pattern_update) >= self.config.pattern_update_interval
+
     async def update_patterns(self) -> None:
         """Periodically update and optimize response patterns."""
-        current_time = time.time()
+        self.refresh_patterns()
+
+    def refresh_patterns(self) -> None:
+        """Update and optimize response patterns if the update interval has passed.
 
-        if (current_time - self._last_pattern_update) < self.config.pattern_update_interval:
+        Blocking counterpart of ``update_patterns`` for callers that run it on a
+        worker thread.
+        """
+        if not self.is_pattern_update_due():
             return
+        current_time = time.time()
 
         try:
             logger.info("Updating response patterns...")
 
-            # Cleanup old data to keep learning fresh
-            removed_count = self.analyzer.cleanup_old_data(days_to_keep=30)
-            if removed_count > 0:
-                logger.info("Cleaned up {removed_count} old response records")
+            with self._analyzer_lock:
+                # Cleanup old data to keep learning fresh
+                removed_count = self.analyzer.cleanup_old_data(days_to_keep=30)
+                if removed_count > 0:
+                    logger.info("Cleaned up {removed_count} old response records")
 
-            # Get statistics
-            stats = self.analyzer.get_statistics()
+                # Get statistics
+                stats = self.analyzer.get_statistics()
             logger.info("Pattern statistics: {stats}")
 
             # Update cache with new patterns
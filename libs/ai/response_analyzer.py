@@ -1,21 +1,63 @@
 # Copyright notice.
 
+import functools
 import json
 import logging
+import os
 import re
+import shutil
+import threading
 import time
-from collections import Counter
-from dataclasses import asdict, dataclass
+from collections import Counter, deque
+from collections.abc import Iterator
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
 
 # Copyright (c) 2024 Yesman Claude Project
 # Licensed under the MIT License
 
-"""Response pattern analysis and learning engine."""
+"""Response pattern analysis and learning engine.
+
+Learned data is persisted as a write-ahead journal plus a periodic snapshot.
+Every recorded response is appended to ``response_journal.jsonl`` as one line
+with a sequence number. Every ``SNAPSHOT_INTERVAL`` records the learned
+patterns and running statistics are written to ``response_snapshot.json``
+together with the journal offset they cover. Startup loads the snapshot and
+replays only the journal tail; the full history is parsed on first access.
+"""
 
 
 logger = logging.getLogger(__name__)
 
+RECENT_ACTIVITY_SECONDS = 7 * 24 * 3600
+
+_YES_NO_PROMPT = re.compile(r"\b(yes|no)\b.*\?")
+_NUMBERED_OPTION = re.compile(r"\b[1-9]\d*\)")
+_SELECT_NUMBER = re.compile(r"select.*[1-9]")
+_CHOICE_WORD = re.compile(r"choose|select|pick")
+
+
+@functools.lru_cache(maxsize=4096)
+def _classify_normalized_prompt(text: str) -> str:
+    """Classify an already lower-cased and stripped prompt.
+
+    Returns:
+    The prompt type.
+    """
+    if _YES_NO_PROMPT.search(text):
+        return "yes_no"
+    if _NUMBERED_OPTION.search(text) or _SELECT_NUMBER.search(text):
+        return "numbered_selection"
+    if "overwrite" in text or "replace" in text:
+        return "overwrite_confirmation"
+    if "continue" in text or "proceed" in text:
+        return "proceed_confirmation"
+    if "trust" in text and "code" in text:
+        return "trust_confirmation"
+    if _CHOICE_WORD.search(text):
+        return "choice_selection"
+    return "unknown"
+
 
 @dataclass
 class ResponseRecord:
@@ -43,53 +85,322 @@ class PromptPattern:
     last_updated: float
 
 
+@dataclass
+class PatternIndexEntry:
+    """Precomputed lookup data for one learned pattern.
+
+    Keeps the compiled regex and running response totals so a prediction never
+    recompiles the pattern or rescans its response counts.
+    """
+
+    regex: re.Pattern | None
+    total_responses: int = 0
+    best_response: str | None = None
+    best_count: int = 0
+    response_order: dict[str, int] = field(default_factory=dict)
+
+    @classmethod
+    def from_pattern(cls, pattern: PromptPattern) -> "PatternIndexEntry":
+        """Build the index entry for a loaded or newly created pattern.
+
+        Returns:
+        The populated PatternIndexEntry.
+        """
+        try:
+            regex = re.compile(pattern.regex_pattern)
+        except re.error:
+            regex = None
+
+        entry = cls(regex=regex)
+        for response, count in pattern.common_responses.items():
+            entry.record(response, count)
+        return entry
+
+    def record(self, response: str, count: int, increment: int | None = None) -> None:
+        """Account for ``response`` now having been seen ``count`` times.
+
+        Ties keep the response that was seen first, matching ``max()`` over
+        the pattern's insertion-ordered response counts.
+        """
+        rank = self.response_order.setdefault(response, len(self.response_order))
+        self.total_responses += count if increment is None else increment
+        if self.best_response is None or count > self.best_count or (count == self.best_count and rank < self.response_order[self.best_response]):
+            self.best_response = response
+            self.best_count = count
+
+
+class ActivityWindow:
+    """Counts events inside a sliding time window using fixed-size buckets.
+
+    Memory and snapshot size depend on the window length, not on the number of
+    events. Counts may include events up to one bucket older than the window.
+    """
+
+    def __init__(self, window_seconds: float = RECENT_ACTIVITY_SECONDS, bucket_seconds: float = 3600.0) -> None:
+        self.window_seconds = window_seconds
+        self.bucket_seconds = bucket_seconds
+        self.buckets: deque[list] = deque()  # [bucket_start, count], oldest first
+        self.total = 0
+
+    def add(self, timestamp: float, count: int = 1) -> None:
+        """Count an event that happened at ``timestamp``."""
+        start = timestamp - timestamp % self.bucket_seconds
+        if start + self.bucket_seconds <= time.time() - self.window_seconds:
+            return
+
+        if not self.buckets or self.buckets[-1][0] < start:
+            self.buckets.append([start, count])
+        else:
+            # Out-of-order events (migration, clock changes) are rare: insert in place
+            for index, bucket in enumerate(self.buckets):
+                if bucket[0] == start:
+                    bucket[1] += count
+                    break
+                if bucket[0] > start:
+                    self.buckets.insert(index, [start, count])
+                    break
+        self.total += count
+
+    def expire(self, before: float) -> None:
+        """Drop buckets that only hold events older than ``before``."""
+        while self.buckets and self.buckets[0][0] + self.bucket_seconds <= before:
+            self.total -= self.buckets.popleft()[1]
+
+    def count(self) -> int:
+        """Number of events in the window ending now.
+
+        Returns:
+        The event count.
+        """
+        self.expire(time.time() - self.window_seconds)
+        return self.total
+
+    def to_list(self) -> list[list]:
+        """Serialize the live buckets.
+
+        Returns:
+        List of [bucket_start, count] pairs.
+        """
+        self.expire(time.time() - self.window_seconds)
+        return [list(bucket) for bucket in self.buckets]
+
+    @classmethod
+    def from_list(cls, buckets: list[list]) -> "ActivityWindow":
+        """Restore a window serialized with :meth:`to_list`.
+
+        Returns:
+        The restored ActivityWindow.
+        """
+        window = cls()
+        for start, count in buckets:
+            window.add(start, count)
+        return window
+
+
 class ResponseAnalyzer:
     """Analyzes user response patterns and learns optimal responses."""
 
+    SNAPSHOT_INTERVAL = 100
+
     def __init__(self, data_dir: Path | None = None) -> None:
         self.data_dir = data_dir or Path.home() / ".scripton" / "yesman" / "ai_data"
         self.data_dir.mkdir(parents=True, exist_ok=True)
 
+        self.journal_file = self.data_dir / "response_journal.jsonl"
+        self.snapshot_file = self.data_dir / "response_snapshot.json"
+        # Legacy whole-file layout, only read to migrate it into the journal
         self.responses_file = self.data_dir / "response_history.json"
         self.patterns_file = self.data_dir / "learned_patterns.json"
 
-        self.response_history: list[ResponseRecord] = []
         self.learned_patterns: dict[str, PromptPattern] = {}
+        # Guards the patterns and their index only, never held during file I/O,
+        # so predictions do not wait for journal writes or compaction
+        self._patterns_lock = threading.Lock()
+        self._history: list[ResponseRecord] | None = None
+
+        # Running aggregates so predictions and statistics never rescan the history
+        self._pattern_index: dict[str, PatternIndexEntry] = {}
+        self._total_responses = 0
+        self._type_counts: Counter[str] = Counter()
+        self._project_counts: Counter[str] = Counter()
+        self._recent_activity = ActivityWindow()
+
+        # Journal position: last written sequence number and the byte offset after it
+        self._sequence = 0
+        self._journal_offset = 0
+        self._snapshot_sequence = 0
+        self._journal_handle = None
 
         self._load_data()
 
+    @property
+    def response_history(self) -> list[ResponseRecord]:
+        """All recorded responses, read from the journal on first access."""
+        if self._history is None:
+            self._history = [record for _sequence, record, _end in self._read_journal()]
+        return self._history
+
     def _load_data(self) -> None:
-        """Load existing response history and patterns."""
+        """Load the snapshot and replay journal entries written after it."""
         try:
-            if self.responses_file.exists():
-                with open(self.responses_file, encoding="utf-8") as f:
-                    data = json.load(f)
-                    self.response_history = [ResponseRecord(**record) for record in data]
-                logger.info("Loaded %d response records", len(self.response_history))
-
-            if self.patterns_file.exists():
-                with open(self.patterns_file, encoding="utf-8") as f:
-                    data = json.load(f)
-                    self.learned_patterns = {pid: PromptPattern(**pattern) for pid, pattern in data.items()}
-                logger.info("Loaded %d learned patterns", len(self.learned_patterns))
+            if self.snapshot_file.exists():
+                self._load_snapshot()
+            elif not self.journal_file.exists() and (self.responses_file.exists() or self.patterns_file.exists()):
+                self._migrate_legacy_files()
+
+            self._pattern_index = {pattern_id: PatternIndexEntry.from_pattern(pattern) for pattern_id, pattern in self.learned_patterns.items()}
+            replayed = self._replay_journal()
+            logger.info("Loaded %d learned patterns and %d journaled responses", len(self.learned_patterns), replayed)
 
         except Exception:
             logger.exception("Error loading AI data")
 
+    def _load_snapshot(self) -> None:
+        with open(self.snapshot_file, encoding="utf-8") as f:
+            data = json.load(f)
+
+        self.learned_patterns = {pid: PromptPattern(**pattern) for pid, pattern in data.get("patterns", {}).items()}
+        self._total_responses = data.get("total_responses", 0)
+        self._type_counts = Counter(data.get("type_counts", {}))
+        self._project_counts = Counter(data.get("project_counts", {}))
+        self._recent_activity = ActivityWindow.from_list(data.get("recent_activity", []))
+        self._sequence = self._snapshot_sequence = data.get("sequence", 0)
+        self._journal_offset = data.get("journal_offset", 0)
+
+    def _read_journal(self, offset: int = 0) -> Iterator[tuple[int, ResponseRecord, int]]:
+        """Iterate journal entries starting at a byte offset.
+
+        Stops at the first torn or unreadable line, which can only be the
+        tail of an interrupted write.
+
+        Returns:
+        Iterator of (sequence, record, end offset) tuples.
+        """
+        if not self.journal_file.exists():
+            return
+
+        self._flush_journal()
+        with open(self.journal_file, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    data = json.loads(line)
+                    sequence = data.pop("seq")
+                    record = ResponseRecord(**data)
+                except (ValueError, TypeError, KeyError):
+                    break
+                offset += len(line)
+                yield sequence, record, offset
+
+    def _replay_journal(self) -> int:
+        """Apply journal entries newer than the snapshot.
+
+        Returns:
+        Number of replayed records.
+        """
+        entries = self._read_journal(self._journal_offset)
+        first = next(entries, None)
+        if first is not None and first[0] != self._sequence + 1:
+            # The journal was rewritten after the snapshot: find our place by sequence
+            entries = self._read_journal()
+            first = next(entries, None)
+            self._journal_offset = 0
+
+        replayed = 0
+        for sequence, record, end in [first, *entries] if first is not None else []:
+            if sequence > self._sequence:
+                self._apply_record(record)
+                self._sequence = sequence
+                replayed += 1
+            self._journal_offset = end
+
+        # Drop a torn tail so new entries start on a line boundary
+        if self.journal_file.exists() and self.journal_file.stat().st_size > self._journal_offset:
+            with open(self.journal_file, "r+b") as f:
+                f.truncate(self._journal_offset)
+        return replayed
+
+    def _migrate_legacy_files(self) -> None:
+        """Move the whole-file JSON layout into the journal and a snapshot."""
+        records = []
+        if self.responses_file.exists():
+            with open(self.responses_file, encoding="utf-8") as f:
+                records = [ResponseRecord(**record) for record in json.load(f)]
+
+        if self.patterns_file.exists():
+            with open(self.patterns_file, encoding="utf-8") as f:
+                self.learned_patterns = {pid: PromptPattern(**pattern) for pid, pattern in json.load(f).items()}
+
+        # Patterns already include these responses, so only the statistics are rebuilt
+        for record in records:
+            self._append_journal(record)
+            self._count_record(record)
+        self._flush_journal()
+        self._write_snapshot()
+
+        for legacy_file in (self.responses_file, self.patterns_file):
+            if legacy_file.exists():
+                legacy_file.rename(legacy_file.with_name(f"{legacy_file.name}.migrated"))
+        logger.info("Migrated %d response records into the journal", len(records))
+
+    def _count_record(self, record: ResponseRecord) -> None:
+        self._total_responses += 1
+        self._type_counts[record.prompt_type] += 1
+        self._project_counts[record.project_name or "global"] += 1
+        self._recent_activity.add(record.timestamp)
+        if self._history is not None:
+            self._history.append(record)
+
+    def _apply_record(self, record: ResponseRecord) -> None:
+        """Fold a new record into the statistics and learned patterns."""
+        self._count_record(record)
+        with self._patterns_lock:
+            self._update_patterns(record)
+
+    def _append_journal(self, record: ResponseRecord) -> None:
+        """Append one record to the journal (O(1), no rewrite)."""
+        self._sequence += 1
+        line = (json.dumps({"seq": self._sequence, **asdict(record)}, ensure_ascii=False) + "\n").encode("utf-8")
+        if self._journal_handle is None:
+            self._journal_handle = open(self.journal_file, "ab")  # noqa: SIM115
+        self._journal_handle.write(line)
+        self._journal_offset += len(line)
+
+    def _flush_journal(self) -> None:
+        if self._journal_handle is not None:
+            self._journal_handle.flush()
+
+    def _close_journal(self) -> None:
+        if self._journal_handle is not None:
+            self._journal_handle.close()
+            self._journal_handle = None
+
+    def _write_snapshot(self) -> None:
+        """Atomically write patterns and statistics covering the journal so far."""
+        snapshot = {
+            "version": 1,
+            "sequence": self._sequence,
+            "journal_offset": self._journal_offset,
+            "total_responses": self._total_responses,
+            "type_counts": dict(+self._type_counts),
+            "project_counts": dict(+self._project_counts),
+            "recent_activity": self._recent_activity.to_list(),
+        }
+        with self._patterns_lock:
+            snapshot["patterns"] = {pid: asdict(pattern) for pid, pattern in self.learned_patterns.items()}
+        temp_file = self.snapshot_file.with_suffix(".tmp")
+        with open(temp_file, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f)
+        os.replace(temp_file, self.snapshot_file)
+        self._snapshot_sequence = self._sequence
+
     def _save_data(self) -> None:
-        """Save response history and patterns to disk."""
+        """Flush the journal and compact learned state into a snapshot."""
         try:
-            # Save response history
-            with open(self.responses_file, "w", encoding="utf-8") as f:
-                json.dump([asdict(record) for record in self.response_history], f, indent=2)
-
-            # Save patterns
-            with open(self.patterns_file, "w", encoding="utf-8") as f:
-                json.dump(
-                    {pid: asdict(pattern) for pid, pattern in self.learned_patterns.items()},
-                    f,
-                    indent=2,
-                )
+            self._flush_journal()
+            self._write_snapshot()
 
         except Exception:
             logger.exception("Error saving AI data")
@@ -117,13 +428,17 @@ class ResponseAnalyzer:
             project_name=project_name,
         )
 
-        self.response_history.append(record)
+        try:
+            self._append_journal(record)
+            self._flush_journal()
+        except OSError:
+            logger.exception("Error journaling response")
 
-        # Update patterns
-        self._update_patterns(record)
+        # Update statistics and patterns
+        self._apply_record(record)
 
-        # Save periodically
-        if len(self.response_history) % 10 == 0:
+        # Compact periodically
+        if self._sequence - self._snapshot_sequence >= self.SNAPSHOT_INTERVAL:
             self._save_data()
 
         logger.debug("Recorded response: %s -> %s", prompt_type, user_response)
@@ -135,22 +450,8 @@ class ResponseAnalyzer:
         Returns:
         str: Description of return value.
         """
-        text = prompt_text.lower().strip()
-
-        # Common prompt patterns
-        if re.search(r"\b(yes|no)\b.*\?", text):
-            return "yes_no"
-        if re.search(r"\b[1-9]\d*\)", text) or re.search(r"select.*[1-9]", text):
-            return "numbered_selection"
-        if "overwrite" in text or "replace" in text:
-            return "overwrite_confirmation"
-        if "continue" in text or "proceed" in text:
-            return "proceed_confirmation"
-        if "trust" in text and "code" in text:
-            return "trust_confirmation"
-        if re.search(r"choose|select|pick", text):
-            return "choice_selection"
-        return "unknown"
+        # Repeated prompts are answered from the cache keyed by normalized text
+        return _classify_normalized_prompt(prompt_text.lower().strip())
 
     def _update_patterns(self, record: ResponseRecord) -> None:
         """Update learned patterns based on new response record."""
@@ -169,11 +470,13 @@ class ResponseAnalyzer:
             )
 
         pattern = self.learned_patterns[pattern_id]
+        entry = self._index_entry(pattern)
 
         # Update response frequencies
         if record.user_response not in pattern.common_responses:
             pattern.common_responses[record.user_response] = 0
         pattern.common_responses[record.user_response] += 1
+        entry.record(record.user_response, pattern.common_responses[record.user_response], increment=1)
 
         # Update context factors
         if record.context:
@@ -228,19 +531,20 @@ class ResponseAnalyzer:
         object: Description of return value.
         """
         prompt_type = self._classify_prompt_type(prompt_text)
+        with self._patterns_lock:
+            return self._predict_from_patterns(prompt_type, prompt_text, context, project_name)
+
+    def _predict_from_patterns(self, prompt_type: str, prompt_text: str, context: str, project_name: str | None) -> tuple[str, float]:
         pattern_id = f"{prompt_type}_{project_name or 'global'}"
 
         # Try project-specific pattern first
-        if pattern_id in self.learned_patterns:
-            pattern = self.learned_patterns[pattern_id]
-        else:
+        if pattern_id not in self.learned_patterns:
             # Fall back to global pattern
-            global_pattern_id = f"{prompt_type}_global"
-            if global_pattern_id in self.learned_patterns:
-                pattern = self.learned_patterns[global_pattern_id]
-            else:
+            pattern_id = f"{prompt_type}_global"
+            if pattern_id not in self.learned_patterns:
                 # No learned pattern, use defaults
                 return self._get_default_response(prompt_type)
+        pattern = self.learned_patterns[pattern_id]
 
         # Calculate confidence based on pattern matching and context
         confidence = self._calculate_confidence(pattern, prompt_text, context)
@@ -248,12 +552,23 @@ class ResponseAnalyzer:
         if confidence < pattern.confidence_threshold:
             return self._get_default_response(prompt_type)
 
-        # Get most common response
-        if pattern.common_responses:
-            best_response = max(pattern.common_responses.items(), key=lambda x: x[1])[0]
+        # Most common response is tracked incrementally by the index
+        best_response = self._index_entry(pattern).best_response
+        if best_response is not None:
             return best_response, confidence
         return self._get_default_response(prompt_type)
 
+    def _index_entry(self, pattern: PromptPattern) -> PatternIndexEntry:
+        """Get the index entry for a pattern, building it if the pattern is new.
+
+        Returns:
+        The pattern's PatternIndexEntry.
+        """
+        entry = self._pattern_index.get(pattern.pattern_id)
+        if entry is None:
+            entry = self._pattern_index[pattern.pattern_id] = PatternIndexEntry.from_pattern(pattern)
+        return entry
+
     def _calculate_confidence(self, pattern: PromptPattern, prompt_text: str, context: str) -> float:
         """Calculate confidence score for a prediction.
 
@@ -261,13 +576,11 @@ class ResponseAnalyzer:
         float: Description of return value.
         """
         base_confidence = 0.5
+        entry = self._index_entry(pattern)
 
-        # Pattern matching confidence
-        try:
-            if re.search(pattern.regex_pattern, prompt_text.lower()):
-                base_confidence += 0.3
-        except re.error:
-            pass
+        # Pattern matching confidence (regex compiled once per pattern)
+        if entry.regex is not None and entry.regex.search(prompt_text.lower()):
+            base_confidence += 0.3
 
         # Context confidence
         if context:
@@ -276,8 +589,7 @@ class ResponseAnalyzer:
                 base_confidence += pattern.context_factors[context_key] * 0.2
 
         # Response frequency confidence
-        total_responses = sum(pattern.common_responses.values())
-        if total_responses > 5:  # Enough data
+        if entry.total_responses > 5:  # Enough data
             base_confidence += 0.2
 
         return min(1.0, base_confidence)
@@ -307,24 +619,12 @@ class ResponseAnalyzer:
         Returns:
         object: Description of return value.
         """
-        total_responses = len(self.response_history)
-
-        # Response type distribution
-        type_counts = Counter(record.prompt_type for record in self.response_history)
-
-        # Project distribution
-        project_counts = Counter(record.project_name or "global" for record in self.response_history)
-
-        # Recent activity (last 7 days)
-        week_ago = time.time() - (7 * 24 * 3600)
-        recent_responses = [r for r in self.response_history if r.timestamp > week_ago]
-
         return {
-            "total_responses": total_responses,
+            "total_responses": self._total_responses,
             "total_patterns": len(self.learned_patterns),
-            "response_types": dict(type_counts),
-            "project_distribution": dict(project_counts),
-            "recent_activity": len(recent_responses),
+            "response_types": dict(+self._type_counts),
+            "project_distribution": dict(+self._project_counts),
+            "recent_activity": self._recent_activity.count(),  # last 7 days
             "data_directory": str(self.data_dir),
         }
 
@@ -336,12 +636,35 @@ class ResponseAnalyzer:
         """
         cutoff_time = time.time() - (days_to_keep * 24 * 3600)
 
-        old_count = len(self.response_history)
-        self.response_history = [record for record in self.response_history if record.timestamp > cutoff_time]
+        # The journal is in recording order, so expired records form its head
+        removed = 0
+        keep_from = 0
+        for _sequence, record, end in self._read_journal():
+            if record.timestamp > cutoff_time:
+                break
+            removed += 1
+            keep_from = end
+            self._total_responses -= 1
+            self._type_counts[record.prompt_type] -= 1
+            self._project_counts[record.project_name or "global"] -= 1
 
-        removed = old_count - len(self.response_history)
         if removed > 0:
+            self._truncate_journal_head(keep_from)
+            if self._history is not None:
+                del self._history[:removed]
+            self._recent_activity.expire(cutoff_time)
+
             logger.info("Cleaned up %d old response records", removed)
             self._save_data()
 
         return removed
+
+    def _truncate_journal_head(self, offset: int) -> None:
+        """Rewrite the journal without its first ``offset`` bytes."""
+        self._close_journal()
+        temp_file = self.journal_file.with_suffix(".tmp")
+        with open(self.journal_file, "rb") as source, open(temp_file, "wb") as target:
+            source.seek(offset)
+            shutil.copyfileobj(source, target)
+        os.replace(temp_file, self.journal_file)
+        self._journal_offset -= offset
@@ -165,13 +165,16 @@ class AutomationManager:
                 except Exception as e:
                     self.logger.exception("Workflow trigger callback error")
 
-    def analyze_content_for_context(self, content: str, session_name: str | None = None) -> list[ContextInfo]:
+    def analyze_content_for_context(self, content: str, session_name: str | None = None, incremental: bool = False) -> list[ContextInfo]:  # noqa: FBT001
         """Analyze content (e.g., tmux pane output) for context clues.
 
+        With ``incremental`` only lines not seen in the session's previous
+        content are analyzed.
+
         Returns:
         object: Description of return value.
         """
-        return self.context_detector.detect_context_from_content(content, session_name)
+        return self.context_detector.detect_context_from_content(content, session_name, incremental)
 
     def analyze_claude_idle(self, last_activity_time: float, idle_threshold: int = 30) -> ContextInfo | None:
         """Analyze Claude idle state for potential automation.
@@ -4,6 +4,7 @@ import logging
 import re
 import subprocess
 import time
+from collections import Counter
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
@@ -16,6 +17,11 @@ from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+PATTERN_FLAGS = re.IGNORECASE | re.MULTILINE
+
+# Constructs that let a pattern match across a newline
+_MULTILINE_TOKENS = ("\\s", "\\n", "\\W", "\\D", "\\S", "[^", "(?s")
+
 
 class ContextType(Enum):
     """Types of workflow contexts that can be detected."""
@@ -59,6 +65,177 @@ class ContextInfo:
         }
 
 
+def required_literals(pattern: str) -> list[str] | None:
+    """Extract lowercase literals that any match of the pattern must contain.
+
+    One literal is returned per top-level alternative. Returns None when some
+    alternative has no required literal, so the pattern cannot be prefiltered.
+
+    Returns:
+    List of literals, or None.
+    """
+    literals = []
+    for branch in _split_top_level(pattern):
+        runs = [""]
+        index = 0
+        while index < len(branch):
+            char = branch[index]
+            if char == "\\" and index + 1 < len(branch):
+                escaped = branch[index + 1]
+                if escaped.isalnum():
+                    runs.append("")  # Character class such as \d or \s
+                else:
+                    runs[-1] += escaped
+                index += 2
+                continue
+            if char in "?*{":
+                runs[-1] = runs[-1][:-1]  # The previous character is optional
+                runs.append("")
+                if char == "{":
+                    index = branch.find("}", index) if "}" in branch[index:] else len(branch)
+            elif char == "[":
+                index = _skip_group(branch, index, "[", "]")
+                runs.append("")
+            elif char == "(":
+                index = _skip_group(branch, index, "(", ")")
+                runs.append("")
+            elif char in ".^$+)]":
+                runs.append("")
+            else:
+                runs[-1] += char
+            index += 1
+        longest = max(runs, key=len)
+        if not longest:
+            return None
+        literals.append(longest.lower())
+    return literals
+
+
+def _split_top_level(pattern: str) -> list[str]:
+    branches = [""]
+    depth = 0
+    index = 0
+    while index < len(pattern):
+        char = pattern[index]
+        if char == "\\":
+            branches[-1] += pattern[index : index + 2]
+            index += 2
+            continue
+        if char == "[":
+            end = _skip_group(pattern, index, "[", "]")
+            branches[-1] += pattern[index : end + 1]
+            index = end + 1
+            continue
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "|" and depth == 0:
+            branches.append("")
+            index += 1
+            continue
+        branches[-1] += char
+        index += 1
+    return branches
+
+
+def _skip_group(pattern: str, index: int, opening: str, closing: str) -> int:
+    """Find the index of the bracket closing the group opened at ``index``.
+
+    Returns:
+    Index of the closing bracket, or the last index if it is missing.
+    """
+    depth = 0
+    while index < len(pattern):
+        char = pattern[index]
+        if char == "\\":
+            index += 2
+            continue
+        if char == opening and (depth == 0 or opening == "("):
+            depth += 1
+        elif char == closing:
+            depth -= 1
+            if depth == 0:
+                return index
+        index += 1
+    return len(pattern) - 1
+
+
+@dataclass
+class CompiledContextPattern:
+    """A context pattern with its compiled regex and prefilter literals."""
+
+    context_type: ContextType
+    pattern: str
+    regex: re.Pattern
+    literals: list[str] | None
+    line_local: bool
+
+
+class ContextPatternMatcher:
+    """Finds every context pattern in content using a literal-anchor prefilter.
+
+    Each pattern is compiled once together with the literals a match must
+    contain. The lowercased content is searched for those literals first, and a
+    pattern's regex only runs when one of them occurs, starting at the line of
+    the first occurrence. Matches are reported in the same order as scanning
+    with each pattern separately.
+    """
+
+    def __init__(self, patterns: dict[ContextType, list[str]]) -> None:
+        self.signature = self.signature_of(patterns)
+        self.entries = [
+            CompiledContextPattern(
+                context_type=context_type,
+                pattern=pattern,
+                regex=re.compile(pattern, PATTERN_FLAGS),
+                literals=required_literals(pattern),
+                line_local=not any(token in pattern for token in _MULTILINE_TOKENS),
+            )
+            for context_type, pattern_list in patterns.items()
+            for pattern in pattern_list
+        ]
+
+    @staticmethod
+    def signature_of(patterns: dict[ContextType, list[str]]) -> tuple:
+        """Build a hashable snapshot of a pattern table to detect changes.
+
+        Returns:
+        Tuple of (context type, patterns) pairs.
+        """
+        return tuple((context_type, tuple(pattern_list)) for context_type, pattern_list in patterns.items())
+
+    def find_matches(self, content: str, ranges: list[tuple[int, int]] | None = None, content_lower: str | None = None) -> list[tuple[ContextType, str, re.Match]]:
+        """Find all pattern matches in the content, or only within the given line ranges.
+
+        Returns:
+        List of (context type, pattern, match) tuples in pattern order.
+        """
+        if ranges is None:
+            ranges = [(0, len(content))]
+        if content_lower is None:
+            content_lower = content.lower()
+        # Lowercasing may change offsets for a few non-ASCII characters
+        aligned = len(content_lower) == len(content)
+
+        results = []
+        for entry in self.entries:
+            for start, end in ranges:
+                scan_from = start
+                if entry.literals is not None:
+                    if not aligned:
+                        if not any(literal in content_lower for literal in entry.literals):
+                            continue
+                    else:
+                        positions = [position for literal in entry.literals if (position := content_lower.find(literal, start, end)) != -1]
+                        if not positions:
+                            continue
+                        if entry.line_local:
+                            scan_from = max(content.rfind("\n", start, min(positions)) + 1, start)
+                results.extend((entry.context_type, entry.pattern, match) for match in entry.regex.finditer(content, scan_from, end))
+        return results
+
+
 class ContextDetector:
     """Detects workflow contexts from various sources."""
 
@@ -119,37 +296,92 @@ class ContextDetector:
         self._last_git_hash: str | None = None
         self._last_file_mtimes: dict[str, float] = {}
 
-    def detect_context_from_content(self, content: str, session_name: str | None = None) -> list[ContextInfo]:
+        self._matcher: ContextPatternMatcher | None = None
+        # Lines of the previous capture per session, for incremental detection
+        self._previous_lines: dict[str | None, Counter[str]] = {}
+
+    def _get_matcher(self) -> ContextPatternMatcher:
+        """Get the combined matcher, rebuilding it if the pattern table changed.
+
+        Returns:
+        The matcher for the current patterns.
+        """
+        if self._matcher is None or self._matcher.signature != ContextPatternMatcher.signature_of(self.patterns):
+            self._matcher = ContextPatternMatcher(self.patterns)
+        return self._matcher
+
+    def detect_context_from_content(self, content: str, session_name: str | None = None, incremental: bool = False) -> list[ContextInfo]:  # noqa: FBT001
         """Detect context from content (e.g., tmux pane output).
 
+        In incremental mode only lines that were not part of the previous
+        content seen for the session are scanned, so a context is reported once
+        when its output appears instead of on every capture of the pane.
+
         Returns:
         object: Description of return value.
         """
+        ranges = self._new_line_ranges(content, session_name) if incremental else None
+        if ranges == []:
+            return []
+
         detected_contexts = []
+        content_lower = content.lower()
+        timestamp = time.time()
 
-        for context_type, patterns in self.patterns.items():
-            for pattern in patterns:
-                matches = re.finditer(pattern, content, re.IGNORECASE | re.MULTILINE)
-                for match in matches:
-                    confidence = self._calculate_confidence(context_type, content, match)
-
-                    if confidence > 0.6:  # Minimum confidence threshold
-                        context_info = ContextInfo(
-                            context_type=context_type,
-                            confidence=confidence,
-                            details={
-                                "matched_pattern": pattern,
-                                "matched_text": match.group(),
-                                "content_snippet": content[max(0, match.start() - 50) : match.end() + 50],
-                            },
-                            timestamp=time.time(),
-                            project_path=str(self.project_path),
-                            session_name=session_name,
-                        )
-                        detected_contexts.append(context_info)
+        for context_type, pattern, match in self._get_matcher().find_matches(content, ranges, content_lower):
+            confidence = self._calculate_confidence(context_type, content, match, content_lower)
+
+            if confidence > 0.6:  # Minimum confidence threshold
+                context_info = ContextInfo(
+                    context_type=context_type,
+                    confidence=confidence,
+                    details={
+                        "matched_pattern": pattern,
+                        "matched_text": match.group(),
+                        "content_snippet": content[max(0, match.start() - 50) : match.end() + 50],
+                    },
+                    timestamp=timestamp,
+                    project_path=str(self.project_path),
+                    session_name=session_name,
+                )
+                detected_contexts.append(context_info)
 
         return detected_contexts
 
+    def _new_line_ranges(self, content: str, session_name: str | None) -> list[tuple[int, int]]:
+        """Find the spans of lines that were not in the previous content for a session.
+
+        Lines are compared as a multiset, so output that scrolls up or is
+        redrawn in place is not scanned again.
+
+        Returns:
+        List of (start, end) offsets of runs of new lines.
+        """
+        lines = content.split("\n")
+        previous = self._previous_lines.get(session_name, Counter())
+        self._previous_lines[session_name] = Counter(lines)
+
+        ranges: list[tuple[int, int]] = []
+        offset = 0
+        for line in lines:
+            end = offset + len(line)
+            if previous[line] > 0:
+                previous[line] -= 1
+            elif line:
+                if ranges and ranges[-1][1] == offset - 1:
+                    ranges[-1] = (ranges[-1][0], end)
+                else:
+                    ranges.append((offset, end))
+            offset = end + 1
+        return ranges
+
+    def reset_incremental_state(self, session_name: str | None = None) -> None:
+        """Forget the previous content of one session, or of all sessions."""
+        if session_name is None:
+            self._previous_lines.clear()
+        else:
+            self._previous_lines.pop(session_name, None)
+
     def detect_git_context(self) -> ContextInfo | None:
         """Detect git-related context changes.
 
@@ -300,24 +532,26 @@ class ContextDetector:
         return None
 
     @staticmethod
-    def _calculate_confidence(context_type: ContextType, content: str, match: re.Match) -> float:
+    def _calculate_confidence(context_type: ContextType, content: str, match: re.Match, content_lower: str | None = None) -> float:
         """Calculate confidence score for a detected context.
 
         Returns:
         float: Description of return value.
         """
         base_confidence = 0.7
+        if content_lower is None:
+            content_lower = content.lower()
 
         # Boost confidence based on context specificity
         if context_type == ContextType.TEST_FAILURE:
-            if "failed" in match.group().lower() and any(test_word in content.lower() for test_word in ["test", "spec", "jest", "pytest"]):
+            if "failed" in match.group().lower() and any(test_word in content_lower for test_word in ["test", "spec", "jest", "pytest"]):
                 base_confidence += 0.2
 
         elif context_type == ContextType.GIT_COMMIT:
-            if "commit" in match.group().lower() and "success" in content.lower():
+            if "commit" in match.group().lower() and "success" in content_lower:
                 base_confidence += 0.2
 
-        elif context_type == ContextType.BUILD_FAILURE and "error" in match.group().lower() and any(build_word in content.lower() for build_word in ["build", "compile", "webpack", "tsc"]):
+        elif context_type == ContextType.BUILD_FAILURE and "error" in match.group().lower() and any(build_word in content_lower for build_word in ["build", "compile", "webpack", "tsc"]):
             base_confidence += 0.2
 
         # Reduce confidence if match is very short or unclear
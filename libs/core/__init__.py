@@ -2,8 +2,10 @@
 
 from .claude_manager import ClaudeManager
 from .content_collector import ClaudeContentCollector
+from .interaction_store import InteractionStore
 from .models import DashboardStats, SessionInfo
-from .prompt_detector import ClaudePromptDetector
+from .monitor_hub import MonitorHub
+from .prompt_detector import ClaudePromptDetector, IncrementalPromptDetector
 from .session_manager import SessionManager
 
 # Copyright (c) 2024 Yesman Claude Project
@@ -20,6 +22,9 @@ __all__ = [
     "ClaudeManager",
     "ClaudePromptDetector",
     "DashboardStats",
+    "IncrementalPromptDetector",
+    "InteractionStore",
+    "MonitorHub",
     "SessionInfo",
     "SessionManager",
 ]
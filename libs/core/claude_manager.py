@@ -5,6 +5,7 @@ from .claude_monitor import ClaudeMonitor
 from .claude_process_controller import ClaudeProcessController
 from .claude_session_manager import ClaudeSessionManager
 from .claude_status_manager import ClaudeStatusManager
+from .monitor_hub import MonitorHub
 from .prompt_detector import PromptInfo
 
 # Copyright notice.
@@ -17,7 +18,7 @@ from .prompt_detector import PromptInfo
 class DashboardController:
     """Main controller that orchestrates Claude session management, process control, and monitoring."""
 
-    def __init__(self, session_name: str, pane_id: str | None = None) -> None:
+    def __init__(self, session_name: str, pane_id: str | None = None, monitor_backend: str = "control") -> None:
         """Initialize the dashboard controller."""
         self.session_name = session_name
         self.pane_id = pane_id
@@ -33,6 +34,7 @@ class DashboardController:
             self.session_manager,
             self.process_controller,
             self.status_manager,
+            monitor_backend=monitor_backend,
         )
 
         self.logger = logging.getLogger(f"yesman.dashboard.controller.{session_name}")
@@ -199,6 +201,14 @@ class DashboardController:
         """
         return self.monitor.cleanup_old_collections(days_to_keep)
 
+    def get_tick_stats(self) -> dict:
+        """Get monitor tick latency statistics.
+
+        Returns:
+        dict: Tick count and last/average/max latency in milliseconds.
+        """
+        return self.monitor.get_tick_stats()
+
     # Adaptive response system methods
     def get_adaptive_statistics(self) -> dict:
         """Get statistics from the adaptive response system.
@@ -360,6 +370,8 @@ class ClaudeManager:
     def __init__(self) -> None:
         """Initialize the Claude manager."""
         self.controllers: dict[str, DashboardController] = {}
+        # All controllers' monitors run on this hub's single event loop
+        self.hub = MonitorHub.get_instance()
         self.logger = logging.getLogger("yesman.dashboard.claude_manager")
 
     def get_controller(
@@ -385,6 +397,14 @@ class ClaudeManager:
             controller.stop()
             del self.controllers[session_name]
 
+    def get_tick_stats(self) -> dict[str, dict[str, object]]:
+        """Get monitor tick latency statistics for every session.
+
+        Returns:
+        Dict mapping session names to tick statistics.
+        """
+        return self.hub.get_tick_stats()
+
     def stop_all(self) -> None:
         """Stop all controllers."""
         for controller in self.controllers.values():
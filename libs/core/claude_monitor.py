@@ -1,17 +1,16 @@
 import asyncio
 import logging
-import threading
 import time
+from collections.abc import Callable
 from pathlib import Path
+from typing import TypeVar
 
-from libs.ai.adaptive_response import AdaptiveConfig, AdaptiveResponse
-from libs.automation.automation_manager import AutomationManager
 from libs.automation.context_detector import ContextType
-from libs.dashboard.health_calculator import HealthCalculator
 from libs.logging.async_logger import AsyncLogger, AsyncLoggerConfig, LogLevel
 
-from .content_collector import ClaudeContentCollector
-from .prompt_detector import ClaudePromptDetector, PromptInfo, PromptType
+from .monitor_hub import MonitorHub
+from .prompt_detector import IncrementalPromptDetector, PromptInfo, PromptType
+from .tmux_control import TmuxControlMonitor
 
 # Copyright notice.
 # Copyright (c) 2024 Yesman Claude Project
@@ -19,20 +18,41 @@ from .prompt_detector import ClaudePromptDetector, PromptInfo, PromptType
 
 """Claude monitoring and auto-response system."""
 
+T = TypeVar("T")
+
 
 class ClaudeMonitor:
     """Handles Claude monitoring and auto-response logic."""
 
-    def __init__(self, session_manager: object, process_controller: object, status_manager: object) -> None:
+    # Capture interval for the polling backend
+    POLL_INTERVAL = 1.0
+    # Control mode wakes up this often even without pane output to check liveness
+    CONTROL_HEARTBEAT_INTERVAL = 5.0
+    # Short settle delay so a burst of %output results in a single capture
+    OUTPUT_DEBOUNCE = 0.05
+
+    def __init__(
+        self,
+        session_manager: object,
+        process_controller: object,
+        status_manager: object,
+        monitor_backend: str = "control",
+        hub: MonitorHub | None = None,
+    ) -> None:
         self.session_manager = session_manager
         self.process_controller = process_controller
         self.status_manager = status_manager
         self.session_name = session_manager.session_name
 
-        # Monitoring state
+        # Monitoring state (the loop itself runs on the shared hub)
+        self.hub = hub or MonitorHub.get_instance()
         self.is_running = False
-        self._monitor_thread: threading.Thread | None = None
-        self._loop: asyncio.AbstractEventLoop | None = None
+
+        # Pane change notification ("control" uses tmux -C, "polling" captures every second)
+        self.monitor_backend = monitor_backend
+        self.active_backend = "polling"
+        self._pane_changed: asyncio.Event | None = None
+        self._watched_pane: tuple[str, object] | None = None
 
         # Auto-response settings
         self.is_auto_next_enabled = True
@@ -43,31 +63,17 @@ class ClaudeMonitor:
         self.mode123 = "Auto"
         self.mode123_response = "1"
 
-        # Prompt detection
-        self.prompt_detector = ClaudePromptDetector()
-        self.content_collector = ClaudeContentCollector(session_manager.session_name)
+        # Prompt detection (keeps per-pane state and only re-examines changed lines)
+        self.prompt_detector = IncrementalPromptDetector()
+        self.content_collector = self.hub.get_content_collector(session_manager.session_name)
         self.current_prompt: PromptInfo | None = None
         self.waiting_for_input = False
 
-        # AI-powered adaptive response system
-        self.adaptive_response = AdaptiveResponse(
-            config=AdaptiveConfig(
-                min_confidence_threshold=0.7,
-                learning_enabled=True,
-                auto_response_enabled=True,
-                response_delay_ms=1500,  # Slightly longer delay for more natural interaction
-            ),
-        )
-
-        # Context-aware automation system
-        self.automation_manager = AutomationManager(
-            project_path=None,  # Will use current working directory
-        )
-
-        # Project health monitoring system
-        self.health_calculator = HealthCalculator(
-            project_path=None,  # Will use current working directory
-        )
+        # AI-powered adaptive response, automation and health systems are
+        # shared between all sessions through the hub
+        self.adaptive_response = self.hub.adaptive_response
+        self.automation_manager = self.hub.automation_manager
+        self.health_calculator = self.hub.health_calculator
 
         # High-performance async logging system
         self.async_logger: AsyncLogger | None = None
@@ -109,9 +115,11 @@ class ClaudeMonitor:
             self.is_running = True
             self.status_manager.update_status(f"[green]Starting claude monitor for {self.session_name}[/]")
 
-            # Start monitoring in a separate thread with its own event loop
-            self._monitor_thread = threading.Thread(target=self._run_monitor_loop, daemon=True)
-            self._monitor_thread.start()
+            # Run as a coroutine on the hub's shared event loop
+            if not self.hub.start_session(self):
+                self.is_running = False
+                self.status_manager.update_status("[yellow]Monitor already running[/]")
+                return False
 
             return True
 
@@ -129,30 +137,12 @@ class ClaudeMonitor:
 
         self.is_running = False
 
-        # Stop the event loop if it's running
-        if self._loop and self._loop.is_running():
-            self._loop.call_soon_threadsafe(self._loop.stop)
-
-        # Wait for thread to finish
-        if self._monitor_thread and self._monitor_thread.is_alive():
-            self._monitor_thread.join(timeout=2.0)
+        # Cancel the monitor coroutine and wait for it to finish
+        self.hub.stop_session(self.session_name, timeout=2.0)
 
         self.status_manager.update_status(f"[red]Stopped claude monitor for {self.session_name}[/]")
         return True
 
-    def _run_monitor_loop(self) -> None:
-        """Run the monitor loop in its own thread with event loop."""
-        self._loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(self._loop)
-
-        try:
-            self._loop.run_until_complete(self._monitor_loop())
-        except Exception:
-            self.logger.error("Monitor loop error: {e}", exc_info=True)
-        finally:
-            self._loop.close()
-            self.is_running = False
-
     async def _monitor_loop(self) -> None:
         """Main monitoring loop that runs in background."""
         if not self.session_manager.get_claude_pane():
@@ -162,25 +152,36 @@ class ClaudeMonitor:
 
         self.logger.info("Starting monitoring loop for {self.session_name}")
         last_content = ""
+        self._collection_task: asyncio.Task | None = None
+        self._pending_collection: tuple[str, dict | None] | None = None
+        self.automation_manager.context_detector.reset_incremental_state(self.session_name)
+        self._start_pane_watch()
 
         try:
             while self.is_running:
-                await asyncio.sleep(1)  # Check every second
+                changed = await self._wait_for_pane_change()
+                tick_started = time.perf_counter()
+                error_backoff = False
 
                 try:
-                    content = self.session_manager.capture_pane_content()
-
                     # Check if Claude is still running
-                    if not self.process_controller.is_claude_running():
+                    if not await self._run_blocking("liveness", "tmux", self.process_controller.is_claude_running):
                         if self.is_auto_next_enabled:
                             self.status_manager.update_activity("🔄 Auto-restarting Claude...")
-                            self.process_controller.restart_claude_pane()
+                            await self._run_blocking("restart", "tmux", self.process_controller.restart_claude_pane)
                             continue
                         self.status_manager.update_status("[yellow]Claude not running. Auto-restart disabled.[/]")
                         continue
 
+                    if not changed:
+                        # Heartbeat without pane output: nothing new to detect
+                        self._check_idle_automation()
+                        continue
+
+                    content = await self._run_blocking("capture", "tmux", self.session_manager.capture_pane_content)
+
                     # Check for prompts and auto-respond if enabled
-                    prompt_info = self._check_for_prompt(content)
+                    prompt_info = await self._run_blocking("detect", "analysis", self._check_for_prompt, content)
 
                     if prompt_info:
                         # Try adaptive AI-powered response first if auto_next is enabled
@@ -207,10 +208,14 @@ class ClaudeMonitor:
                                 )
 
                                 if success:
-                                    self.process_controller.send_input(ai_response)
+                                    await self._run_blocking("respond", "tmux", self.process_controller.send_input, ai_response)
                                     self.status_manager.update_activity(f"🤖 AI auto-responded: '{ai_response}' (confidence: {confidence:.2f})")
                                     self.status_manager.record_response(prompt_info.type.value, ai_response, content)
-                                    self.adaptive_response.confirm_response_success(
+                                    self.hub.submit_blocking(
+                                        self.session_name,
+                                        "learn",
+                                        "learning",
+                                        self.adaptive_response.confirm_response_success,
                                         prompt_info.question,
                                         ai_response,
                                         context,
@@ -221,12 +226,16 @@ class ClaudeMonitor:
                                     continue
 
                             # Fall back to legacy pattern-based auto-response if AI didn't handle it
-                            if self._auto_respond_to_selection(prompt_info):
+                            if await self._run_blocking("respond", "tmux", self._auto_respond_to_selection, prompt_info):
                                 response = self._get_legacy_response(prompt_info)
                                 self.status_manager.update_activity(f"✅ Legacy auto-responded: '{response}' to {prompt_info.type.value}")
                                 self.status_manager.record_response(prompt_info.type.value, response, content)
                                 # Learn from legacy response for future AI improvements
-                                self.adaptive_response.learn_from_manual_response(
+                                self.hub.submit_blocking(
+                                    self.session_name,
+                                    "learn",
+                                    "learning",
+                                    self.adaptive_response.learn_from_manual_response,
                                     prompt_info.question,
                                     response,
                                     context,
@@ -244,39 +253,39 @@ class ClaudeMonitor:
                         # Clear prompt state if no longer waiting
                         self._clear_prompt_state()
 
-                    # Periodically update AI patterns
-                    await self.adaptive_response.update_patterns()
+                    # Periodically update AI patterns (in the background, it rewrites learning data).
+                    # The update stays due until a refresh finishes, so later ticks join the pending one.
+                    if self.adaptive_response.is_pattern_update_due():
+                        self.hub.submit_blocking(self.session_name, "patterns", "learning", self.adaptive_response.refresh_patterns, key="refresh_patterns")
 
-                    # Analyze content for automation contexts
+                    # Analyze newly appended output for automation contexts
                     if content != last_content and len(content.strip()) > 0:
-                        automation_contexts = self.automation_manager.analyze_content_for_context(content, self.session_name)
+                        automation_contexts = await self._run_blocking(
+                            "context",
+                            "analysis",
+                            self.automation_manager.analyze_content_for_context,
+                            content,
+                            self.session_name,
+                            True,
+                        )
                         for auto_context in automation_contexts:
                             self.logger.info("Automation context detected: {auto_context.context_type.value} (confidence: {auto_context.confidence:.2f})")
 
                     # Check for Claude idle automation opportunities
-                    if hasattr(self.status_manager, "last_activity_time"):
-                        idle_context = self.automation_manager.analyze_claude_idle(
-                            self.status_manager.last_activity_time,
-                            idle_threshold=60,
-                        )
-                        if idle_context:
-                            self.logger.debug("Claude idle context: {idle_context.confidence:.2f}")
+                    self._check_idle_automation()
 
                     # Collect content for pattern analysis
                     if content != last_content and len(content.strip()) > 0:
-                        try:
-                            # Convert PromptInfo to dict for collection compatibility
-                            prompt_dict = None
-                            if prompt_info:
-                                prompt_dict = {
-                                    "type": prompt_info.type.value,
-                                    "question": prompt_info.question,
-                                    "options": prompt_info.options,
-                                    "confidence": prompt_info.confidence,
-                                }
-                            self.content_collector.collect_interaction(content, prompt_dict, None)
-                        except Exception:
-                            self.logger.exception("Failed to collect content: {e}")
+                        # Convert PromptInfo to dict for collection compatibility
+                        prompt_dict = None
+                        if prompt_info:
+                            prompt_dict = {
+                                "type": prompt_info.type.value,
+                                "question": prompt_info.question,
+                                "options": prompt_info.options,
+                                "confidence": prompt_info.confidence,
+                            }
+                        self._queue_collection(content, prompt_dict)
 
                     # Update activity if content changed
                     if content != last_content:
@@ -285,6 +294,11 @@ class ClaudeMonitor:
 
                 except Exception:
                     self.logger.exception("Error in monitoring loop: {e}")
+                    error_backoff = True
+                finally:
+                    self.hub.record_tick(self.session_name, time.perf_counter() - tick_started)
+
+                if error_backoff:
                     await asyncio.sleep(5)  # Wait longer on errors
 
         except asyncio.CancelledError:
@@ -292,9 +306,123 @@ class ClaudeMonitor:
         except Exception:
             self.logger.exception("Monitoring loop error: {e}")
         finally:
+            self._stop_pane_watch()
             self.is_running = False
             self.status_manager.update_status("[red]Claude monitor stopped[/]")
 
+    async def _run_blocking(self, stage: str, lane: str, func: Callable[..., T], *args: object) -> T:
+        """Run a blocking tick stage on one of the hub's executor lanes.
+
+        Returns:
+            The function's return value.
+        """
+        return await self.hub.run_blocking(self.session_name, stage, lane, func, *args)
+
+    def _queue_collection(self, content: str, prompt_dict: dict | None) -> None:
+        """Hand a capture to the disk lane without waiting for the write.
+
+        At most one write per session is in flight. Captures that arrive
+        meanwhile replace each other, so a slow disk drops intermediate
+        captures instead of queueing them or delaying the next tick.
+        """
+        self._pending_collection = (content, prompt_dict)
+        if self._collection_task is None or self._collection_task.done():
+            self._collection_task = asyncio.get_running_loop().create_task(self._drain_collection())
+
+    async def _drain_collection(self) -> None:
+        while self._pending_collection is not None:
+            content, prompt_dict = self._pending_collection
+            self._pending_collection = None
+            try:
+                await self._run_blocking("collect", "disk", self.content_collector.collect_interaction, content, prompt_dict, None)
+            except Exception:
+                self.logger.exception("Failed to collect content: {e}")
+
+    def _start_pane_watch(self) -> None:
+        """Subscribe to pane output through tmux control mode, if configured."""
+        self._pane_changed = asyncio.Event()
+        self._pane_changed.set()  # Always capture once on startup
+        self.active_backend = "polling"
+
+        if self.monitor_backend != "control":
+            return
+
+        pane_id = getattr(self.session_manager.get_claude_pane(), "pane_id", None)
+        if not pane_id:
+            self.logger.warning("Claude pane has no pane id, falling back to polling")
+            return
+
+        loop = asyncio.get_running_loop()
+        pane_changed = self._pane_changed
+
+        def on_pane_output(_pane_id: str) -> None:
+            # Called from the control client's reader thread
+            try:
+                loop.call_soon_threadsafe(pane_changed.set)
+            except RuntimeError:
+                pass  # Loop already closed
+
+        if self._control_monitor().watch(self.session_name, pane_id, on_pane_output):
+            self._watched_pane = (pane_id, on_pane_output)
+            self.active_backend = "control"
+            self.logger.info("Watching pane %s through tmux control mode", pane_id)
+        else:
+            self.logger.warning("tmux control mode unavailable, falling back to polling")
+
+    def _stop_pane_watch(self) -> None:
+        """Release the control-mode subscription and revert to polling."""
+        if self._watched_pane:
+            pane_id, callback = self._watched_pane
+            self._control_monitor().unwatch(self.session_name, pane_id, callback)
+            self._watched_pane = None
+        self.active_backend = "polling"
+
+    def _control_monitor(self) -> TmuxControlMonitor:
+        server = getattr(self.session_manager, "server", None)
+        return TmuxControlMonitor.for_server(getattr(server, "socket_name", None))
+
+    async def _wait_for_pane_change(self) -> bool:
+        """Wait until the Claude pane may have changed.
+
+        Returns:
+            True if the pane produced output (or polling is in use), False on a
+            control-mode heartbeat without any output.
+        """
+        if self.active_backend != "control" or self._pane_changed is None:
+            await asyncio.sleep(self.POLL_INTERVAL)
+            return True
+
+        try:
+            await asyncio.wait_for(self._pane_changed.wait(), timeout=self.CONTROL_HEARTBEAT_INTERVAL)
+        except TimeoutError:
+            changed = False
+        else:
+            changed = True
+
+        # Checked on heartbeats too, in case the disconnect wake-up was missed
+        if not self._control_monitor().is_watching(self.session_name):
+            self.logger.warning("tmux control connection lost, falling back to polling")
+            self._stop_pane_watch()
+            return True
+
+        if not changed:
+            return False
+
+        # Let a burst of output settle so it results in a single capture
+        await asyncio.sleep(self.OUTPUT_DEBOUNCE)
+        self._pane_changed.clear()
+        return True
+
+    def _check_idle_automation(self) -> None:
+        """Check for Claude idle automation opportunities."""
+        if hasattr(self.status_manager, "last_activity_time"):
+            idle_context = self.automation_manager.analyze_claude_idle(
+                self.status_manager.last_activity_time,
+                idle_threshold=60,
+            )
+            if idle_context:
+                self.logger.debug("Claude idle context: {idle_context.confidence:.2f}")
+
     def _check_for_prompt(self, content: str) -> PromptInfo | None:
         """Check if content contains a prompt waiting for input."""
         prompt_info = self.prompt_detector.detect_prompt(content)
@@ -409,6 +537,10 @@ class ClaudeMonitor:
         """Get content collection statistics."""
         return self.content_collector.get_collection_stats()
 
+    def get_tick_stats(self) -> dict:
+        """Get monitor tick latency statistics for this session."""
+        return self.hub.get_tick_stats(self.session_name).get(self.session_name, {})
+
     def cleanup_old_collections(self, days_to_keep: int = 7) -> int:
         """Clean up old collection files."""
         return self.content_collector.cleanup_old_files(days_to_keep)
@@ -564,7 +696,7 @@ class ClaudeMonitor:
     def _async_log(self, level: LogLevel, message: str, **kwargs) -> None:
         """Log message to async logger (safe for sync contexts)."""
         if self.async_logger:
-            self.async_logger.log(level, message, **kwargs)
+            self.async_logger.log(level, message, stacklevel=2, **kwargs)
         else:
             # Fallback to standard logger
             self.logger.log(level.level_value, message)
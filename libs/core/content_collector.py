@@ -1,14 +1,16 @@
 # Copyright notice.
 
 import hashlib
-import json
 import logging
 import time
+from collections.abc import Iterator
 from datetime import UTC, datetime
 from pathlib import Path
 
 from libs.utils import ensure_log_directory, get_default_log_path
 
+from .interaction_store import InteractionStore, StoreLockedError, migrate_legacy_files
+
 # Copyright (c) 2024 Yesman Claude Project
 # Licensed under the MIT License
 
@@ -22,6 +24,7 @@ class ClaudeContentCollector:
         self.session_name = session_name
         self.logger = self._setup_logger()
         self.collection_path = self._setup_collection_directory()
+        self.store = self._open_store()
         self.last_content_hash = ""
         self.interaction_count = 0
 
@@ -57,6 +60,19 @@ class ClaudeContentCollector:
         session_dir.mkdir(exist_ok=True)
         return session_dir
 
+    def _open_store(self) -> InteractionStore | None:
+        """Open the session's interaction store.
+
+        Returns:
+        The store, or None if another monitor of this session already has it
+        open, in which case that monitor does the collecting.
+        """
+        try:
+            return InteractionStore(self.collection_path, delta_field="content")
+        except StoreLockedError:
+            self.logger.warning("Interaction store for %s is in use by another monitor; not collecting", self.session_name)
+            return None
+
     @staticmethod
     def _generate_content_hash(content: str) -> str:
         """Generate hash for content to detect changes.
@@ -82,7 +98,7 @@ class ClaudeContentCollector:
         Returns:
             True if content was collected (new/changed), False if duplicate
         """
-        if not content or len(content.strip()) < 10:
+        if self.store is None or not content or len(content.strip()) < 10:
             return False
 
         content_hash = self._generate_content_hash(content)
@@ -111,13 +127,9 @@ class ClaudeContentCollector:
             },
         }
 
-        # Save to file
+        # Append to the segment store
         try:
-            filename = f"interaction_{datetime.now(UTC).strftime('%Y%m%d_%H%M%S')}_{content_hash}.json"
-            filepath = self.collection_path / filename
-
-            with open(filepath, "w", encoding="utf-8") as f:
-                json.dump(interaction, f, indent=2, ensure_ascii=False)
+            self.store.append(interaction, "interaction")
 
             self.logger.info("Collected interaction %s - prompt: %s, response: %s", interaction["interaction_id"], prompt_info is not None, response)
 
@@ -137,7 +149,7 @@ class ClaudeContentCollector:
         Returns:
             True if collected, False if skipped
         """
-        if not content or len(content.strip()) < 10:
+        if self.store is None or not content or len(content.strip()) < 10:
             return False
 
         content_hash = self._generate_content_hash(content)
@@ -159,11 +171,7 @@ class ClaudeContentCollector:
         }
 
         try:
-            filename = f"raw_{datetime.now(UTC).strftime('%Y%m%d_%H%M%S')}_{content_hash}.json"
-            filepath = self.collection_path / filename
-
-            with open(filepath, "w", encoding="utf-8") as f:
-                json.dump(record, f, indent=2, ensure_ascii=False)
+            self.store.append(record, "raw_content")
 
             self.logger.debug("Collected raw content - hash: %s", content_hash)
             return True
@@ -172,25 +180,49 @@ class ClaudeContentCollector:
             self.logger.exception("Failed to save raw content")  # noqa: G004
             return False
 
+    def read_records(
+        self,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        record_type: str | None = None,
+    ) -> Iterator[dict]:
+        """Read collected records in a time range.
+
+        Args:
+            start: Only return records collected at or after this time
+            end: Only return records collected at or before this time
+            record_type: "interaction" or "raw_content" to filter by type
+
+        Returns:
+            Iterator over the records in collection order
+        """
+        if self.store is None:
+            return iter(())
+        return self.store.read(
+            start=start.timestamp() if start else None,
+            end=end.timestamp() if end else None,
+            record_type=record_type,
+        )
+
     def get_collection_stats(self) -> dict:
         """Get statistics about collected data.
 
         Returns:
         dict: Description of return value.
         """
+        if self.store is None:
+            return {"error": "interaction store is in use by another monitor"}
         try:
-            files = list(self.collection_path.glob("*.json"))
-
-            interaction_files = [f for f in files if f.name.startswith("interaction_")]
-            raw_files = [f for f in files if f.name.startswith("raw_")]
-
-            total_size = sum(f.stat().st_size for f in files)
+            store_stats = self.store.stats()
+            record_counts = store_stats["record_counts"]
 
             return {
-                "total_files": len(files),
-                "interaction_files": len(interaction_files),
-                "raw_files": len(raw_files),
-                "total_size_bytes": total_size,
+                "total_records": store_stats["total_records"],
+                "interaction_records": record_counts.get("interaction", 0),
+                "raw_records": record_counts.get("raw_content", 0),
+                "segment_count": store_stats["segment_count"],
+                "total_size_bytes": store_stats["total_size_bytes"],
+                "compression": store_stats["compression"],
                 "collection_path": str(self.collection_path),
                 "session_name": self.session_name,
                 "last_interaction_count": self.interaction_count,
@@ -201,32 +233,40 @@ class ClaudeContentCollector:
             return {"error": str(e)}
 
     def cleanup_old_files(self, days_to_keep: int = 7) -> int:
-        """Clean up old collection files.
+        """Clean up old collection segments.
+
+        Retention works on whole segments: a segment is removed once its newest
+        record is older than the cutoff.
 
         Args:
-            days_to_keep: Number of days to keep files
+            days_to_keep: Number of days to keep records
 
         Returns:
-            Number of files deleted
+            Number of records deleted
         """
+        if self.store is None:
+            return 0
         try:
             cutoff_time = time.time() - (days_to_keep * 24 * 60 * 60)
-            files_deleted = 0
-
-            for file_path in self.collection_path.glob("*.json"):
-                if file_path.stat().st_mtime < cutoff_time:
-                    file_path.unlink()
-                    files_deleted += 1
+            records_deleted = self.store.remove_before(cutoff_time)
 
-            if files_deleted > 0:
-                self.logger.info("Cleaned up %d old collection files", files_deleted)
+            if records_deleted > 0:
+                self.logger.info("Cleaned up %d old collection records", records_deleted)
 
-            return files_deleted
+            return records_deleted
 
         except Exception as e:
             self.logger.exception("Failed to cleanup old files")  # noqa: G004
             return 0
 
+    def migrate_legacy_files(self) -> dict[str, int]:
+        """Move records from the old one-file-per-capture layout into the store.
+
+        Returns:
+            Dict with the number of migrated and failed files
+        """
+        return migrate_legacy_files(self.collection_path, self.store)
+
 
 class ContentCollectionManager:
     """Manages content collectors for multiple sessions."""
@@ -0,0 +1,676 @@
+# Copyright notice.
+
+import bisect
+import difflib
+import gzip
+import heapq
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import BinaryIO, TextIO
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import fcntl
+except ImportError:  # Windows: stores are not locked
+    fcntl = None
+
+# Copyright (c) 2024 Yesman Claude Project
+# Licensed under the MIT License
+
+"""Append-only, segment-based storage for collected Claude interactions.
+
+Records are stored as newline-delimited JSON in rotating segment files. Each
+record is compressed as its own gzip member (or zstd frame), so a segment is a
+valid compressed stream as a whole while any single record can still be read
+with one seek. Every segment has a small sidecar index with one
+``timestamp offset length record_type`` line per record, and a manifest keeps
+per-segment totals so statistics and retention cleanup only touch segments,
+never individual records.
+
+Stores created with a ``delta_field`` write each record as a delta against the
+previous record in the same segment: top-level fields that did not change are
+omitted and ``delta_field`` itself is kept as line-level copy/insert
+operations. Each segment starts with a
+keyframe (a record holding the full value) and a new keyframe is written every
+``keyframe_interval`` records, so retention never orphans a delta and a range
+read only has to decode back to the nearest keyframe.
+
+A store holds an exclusive lock on ``store.lock`` in its directory for as long
+as it is open, so a second store (for example a migration running next to a
+live monitor) can never seal, truncate or rewrite files under the writer.
+"""
+
+COMPRESSION_SUFFIXES = {"gzip": ".jsonl.gz", "zstd": ".jsonl.zst"}
+MANIFEST_NAME = "manifest.json"
+LOCK_NAME = "store.lock"
+
+_SEGMENT_NAME = re.compile(r"^segment_(\d+)\.jsonl\.(gz|zst)$")
+_SUFFIX_COMPRESSION = {"gz": "gzip", "zst": "zstd"}
+
+LineDelta = list[list[int] | str]
+
+
+def encode_line_delta(previous: list[str], current: list[str]) -> LineDelta:
+    """Describe ``current`` as runs copied from ``previous`` plus new lines.
+
+    Copied runs are ``[start, count]`` pairs into ``previous``; every other
+    item is a literal line.
+
+    Returns:
+    The delta operations.
+    """
+    operations: LineDelta = []
+    matcher = difflib.SequenceMatcher(None, previous, current, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            operations.append([i1, i2 - i1])
+        elif tag != "delete":
+            operations.extend(current[j1:j2])
+    return operations
+
+
+def apply_line_delta(previous: list[str], operations: LineDelta) -> list[str]:
+    """Rebuild the lines described by :func:`encode_line_delta`.
+
+    Returns:
+    The reconstructed lines.
+    """
+    lines: list[str] = []
+    for operation in operations:
+        if isinstance(operation, str):
+            lines.append(operation)
+        else:
+            start, count = operation
+            lines.extend(previous[start : start + count])
+    return lines
+
+
+class DeltaChain:
+    """Encoder/decoder state for one chain of records that starts at a keyframe."""
+
+    REMOVED_KEY = "_removed"
+
+    def __init__(self, delta_field: str) -> None:
+        self.delta_field = delta_field
+        self.delta_key = f"{delta_field}_delta"
+        self.record: dict | None = None
+        self.lines: list[str] = []
+        self.length = 0
+
+    def _advance(self, record: dict) -> None:
+        value = record.get(self.delta_field)
+        self.record = record
+        self.lines = value.split("\n") if isinstance(value, str) else []
+
+    def encode(self, record: dict, max_length: int) -> tuple[dict, bool]:
+        """Encode ``record`` against the chain and advance it.
+
+        Falls back to a keyframe when there is no chain yet, the chain is
+        ``max_length`` records long, or the delta would not be smaller.
+
+        Returns:
+        The record to write and whether it is a keyframe.
+        """
+        previous = self.record
+        if previous is not None and self.length < max_length:
+            encoded = {key: value for key, value in record.items() if key != self.delta_field and (key not in previous or previous[key] != value)}
+            removed = [key for key in previous if key not in record]
+            if removed:
+                encoded[self.REMOVED_KEY] = removed
+            value = record.get(self.delta_field)
+            if isinstance(value, str):
+                encoded[self.delta_key] = encode_line_delta(self.lines, value.split("\n"))
+            elif self.delta_field in record:
+                encoded[self.delta_field] = value
+
+            if len(json.dumps(encoded, ensure_ascii=False)) < len(json.dumps(record, ensure_ascii=False)):
+                self._advance(record)
+                self.length += 1
+                return encoded, False
+
+        self._advance(record)
+        self.length = 0
+        return record, True
+
+    def decode(self, encoded: dict, keyframe: bool) -> dict:  # noqa: FBT001
+        """Rebuild a stored record and advance the chain.
+
+        Returns:
+        The original record.
+        """
+        if keyframe or self.record is None:
+            self._advance(encoded)
+            return encoded
+
+        record = dict(self.record)
+        for key in encoded.pop(self.REMOVED_KEY, ()):
+            record.pop(key, None)
+        delta = encoded.pop(self.delta_key, None)
+        record.update(encoded)
+        if delta is not None:
+            record[self.delta_field] = "\n".join(apply_line_delta(self.lines, delta))
+        self._advance(record)
+        return record
+
+
+@dataclass
+class IndexEntry:
+    """Location of a single record inside a segment file."""
+
+    timestamp: float
+    offset: int
+    length: int
+    record_type: str
+    keyframe: bool = True
+
+    def to_line(self) -> str:
+        """Serialize the entry as one index line.
+
+        Returns:
+        Index line terminated by a newline.
+        """
+        line = f"{self.timestamp:.6f} {self.offset} {self.length} {self.record_type}"
+        return f"{line}\n" if self.keyframe else f"{line} d\n"
+
+    @classmethod
+    def from_line(cls, line: str) -> "IndexEntry":
+        """Parse an index line written by :meth:`to_line`.
+
+        Returns:
+        The parsed IndexEntry.
+        """
+        timestamp, offset, length, record_type, *flags = line.split()
+        return cls(float(timestamp), int(offset), int(length), record_type, keyframe="d" not in flags)
+
+
+@dataclass
+class SegmentInfo:
+    """Summary of one segment, kept in the manifest."""
+
+    sequence: int
+    compression: str
+    first_timestamp: float = 0.0
+    last_timestamp: float = 0.0
+    record_count: int = 0
+    size_bytes: int = 0
+    type_counts: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def name(self) -> str:
+        """File name of the segment's data file."""
+        return f"segment_{self.sequence:06d}{COMPRESSION_SUFFIXES[self.compression]}"
+
+    def add(self, entry: IndexEntry) -> None:
+        """Account for a record appended to the segment."""
+        if not self.record_count:
+            self.first_timestamp = entry.timestamp
+        self.last_timestamp = entry.timestamp
+        self.record_count += 1
+        self.size_bytes = entry.offset + entry.length
+        self.type_counts[entry.record_type] = self.type_counts.get(entry.record_type, 0) + 1
+
+    def overlaps(self, start: float | None, end: float | None) -> bool:
+        """Check whether the segment may hold records in ``[start, end]``.
+
+        Returns:
+        True if the segment's time span intersects the range.
+        """
+        if not self.record_count:
+            return False
+        return (start is None or self.last_timestamp >= start) and (end is None or self.first_timestamp <= end)
+
+    def to_dict(self) -> dict[str, object]:
+        """Convert to dictionary for serialization.
+
+        Returns:
+        Dict containing the segment summary.
+        """
+        return {
+            "sequence": self.sequence,
+            "compression": self.compression,
+            "first_timestamp": self.first_timestamp,
+            "last_timestamp": self.last_timestamp,
+            "record_count": self.record_count,
+            "size_bytes": self.size_bytes,
+            "type_counts": dict(self.type_counts),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "SegmentInfo":
+        """Create a SegmentInfo from its serialized form.
+
+        Returns:
+        The restored SegmentInfo.
+        """
+        return cls(
+            sequence=data["sequence"],
+            compression=data["compression"],
+            first_timestamp=data.get("first_timestamp", 0.0),
+            last_timestamp=data.get("last_timestamp", 0.0),
+            record_count=data.get("record_count", 0),
+            size_bytes=data.get("size_bytes", 0),
+            type_counts=dict(data.get("type_counts", {})),
+        )
+
+
+def _compress(data: bytes, compression: str) -> bytes:
+    if compression == "zstd":
+        return zstandard.ZstdCompressor(level=3).compress(data)
+    return gzip.compress(data, compresslevel=6, mtime=0)
+
+
+def _decompress(data: bytes, compression: str) -> bytes:
+    if compression == "zstd":
+        if zstandard is None:
+            msg = "zstandard is required to read zstd-compressed segments"
+            raise RuntimeError(msg)
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+class InteractionStore:
+    """Rotating, compressed, append-only record store for one directory.
+
+    Appends go to a single active segment, which is sealed and replaced once it
+    grows past ``max_segment_bytes`` or spans more than ``max_segment_seconds``.
+    Within a segment records are kept in timestamp order, so range reads can
+    bisect the index; retention cleanup drops whole segments.
+    """
+
+    DEFAULT_MAX_SEGMENT_BYTES = 4 * 1024 * 1024
+    DEFAULT_MAX_SEGMENT_SECONDS = 3600.0
+    DEFAULT_KEYFRAME_INTERVAL = 128
+
+    def __init__(
+        self,
+        directory: Path,
+        compression: str | None = None,
+        max_segment_bytes: int = DEFAULT_MAX_SEGMENT_BYTES,
+        max_segment_seconds: float = DEFAULT_MAX_SEGMENT_SECONDS,
+        delta_field: str | None = None,
+        keyframe_interval: int = DEFAULT_KEYFRAME_INTERVAL,
+    ) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.compression = self._resolve_compression(compression)
+        self.max_segment_bytes = max_segment_bytes
+        self.max_segment_seconds = max_segment_seconds
+        self.delta_field = delta_field
+        self.keyframe_interval = keyframe_interval
+        self.logger = logging.getLogger("yesman.interaction_store")
+
+        self._lock = threading.RLock()
+        self._segments: list[SegmentInfo] = []
+        self._active: SegmentInfo | None = None
+        self._data_file: BinaryIO | None = None
+        self._index_file = None
+        self._index_cache: dict[int, list[IndexEntry]] = {}
+        self._chain: DeltaChain | None = None
+
+        self._lock_file = self._acquire_directory_lock()
+        self._load()
+
+    def _acquire_directory_lock(self) -> TextIO | None:
+        """Take the directory's exclusive lock, held until ``release``.
+
+        Returns:
+        The open lock file, or None where file locking is unavailable.
+        """
+        if fcntl is None:
+            return None
+        lock_file = open(self.directory / LOCK_NAME, "a", encoding="utf-8")  # noqa: SIM115
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            msg = f"Interaction store in {self.directory} is in use by another writer"
+            raise StoreLockedError(msg) from None
+        return lock_file
+
+    @staticmethod
+    def _resolve_compression(compression: str | None) -> str:
+        if compression is None:
+            return "zstd" if zstandard is not None else "gzip"
+        if compression not in COMPRESSION_SUFFIXES:
+            msg = f"Unsupported compression: {compression}"
+            raise ValueError(msg)
+        if compression == "zstd" and zstandard is None:
+            msg = "zstd compression requires the 'zstandard' package"
+            raise ValueError(msg)
+        return compression
+
+    # Paths
+    def _data_path(self, segment: SegmentInfo) -> Path:
+        return self.directory / segment.name
+
+    def _index_path(self, segment: SegmentInfo) -> Path:
+        return self.directory / f"segment_{segment.sequence:06d}.idx"
+
+    @property
+    def _manifest_path(self) -> Path:
+        return self.directory / MANIFEST_NAME
+
+    # Loading and recovery
+    def _load(self) -> None:
+        sealed: dict[int, SegmentInfo] = {}
+        if self._manifest_path.exists():
+            try:
+                manifest = json.loads(self._manifest_path.read_text(encoding="utf-8"))
+                for data in manifest.get("segments", []):
+                    segment = SegmentInfo.from_dict(data)
+                    if self._data_path(segment).exists():
+                        sealed[segment.sequence] = segment
+            except (OSError, ValueError, KeyError):
+                self.logger.warning("Interaction store manifest in %s is unreadable; rebuilding from indexes", self.directory)
+                sealed = {}
+
+        # Segments without a manifest entry were still active (or the manifest was lost)
+        unsealed = []
+        for path in self.directory.iterdir():
+            match = _SEGMENT_NAME.match(path.name)
+            if not match or int(match.group(1)) in sealed:
+                continue
+            segment = SegmentInfo(int(match.group(1)), _SUFFIX_COMPRESSION[match.group(2)])
+            for entry in self._read_index(segment):
+                segment.add(entry)
+            unsealed.append(segment)
+
+        self._segments = sorted([*sealed.values(), *unsealed], key=lambda segment: segment.sequence)
+        unsealed.sort(key=lambda segment: segment.sequence)
+        if unsealed and unsealed[-1] is self._segments[-1] and unsealed[-1].compression == self.compression:
+            self._active = unsealed.pop()
+        if unsealed:
+            self._write_manifest()
+
+    def _read_index(self, segment: SegmentInfo) -> list[IndexEntry]:
+        entries = []
+        index_path = self._index_path(segment)
+        if not index_path.exists():
+            return entries
+
+        data_size = self._data_path(segment).stat().st_size
+        with open(index_path, encoding="utf-8") as index_file:
+            for line in index_file:
+                try:
+                    entry = IndexEntry.from_line(line)
+                except ValueError:
+                    # Torn write at the end of the index
+                    break
+                if entry.offset + entry.length > data_size:
+                    break
+                entries.append(entry)
+        return entries
+
+    def _write_manifest(self) -> None:
+        sealed = [segment.to_dict() for segment in self._segments if segment is not self._active]
+        temp_path = self._manifest_path.with_suffix(".tmp")
+        with open(temp_path, "w", encoding="utf-8") as manifest_file:
+            json.dump({"version": 1, "segments": sealed}, manifest_file)
+        os.replace(temp_path, self._manifest_path)
+
+    # Writing
+    def append(self, record: dict, record_type: str, timestamp: float | None = None) -> None:
+        """Append one record to the active segment.
+
+        Records older than the last record of the active segment start a new
+        segment, keeping every segment sorted by timestamp.
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+
+        with self._lock:
+            active = self._active
+            if (
+                active is not None
+                and active.record_count
+                and (active.size_bytes >= self.max_segment_bytes or timestamp - active.first_timestamp >= self.max_segment_seconds or timestamp < active.last_timestamp)
+            ):
+                self._seal_active()
+            if self._active is None:
+                self._open_segment()
+            elif self._data_file is None:
+                self._open_active_files()
+
+            keyframe = True
+            if self._chain is not None:
+                record, keyframe = self._chain.encode(record, self.keyframe_interval)
+            payload = _compress((json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8"), self.compression)
+
+            active = self._active
+            entry = IndexEntry(timestamp, active.size_bytes, len(payload), record_type, keyframe)
+            self._data_file.write(payload)
+            self._data_file.flush()
+            self._index_file.write(entry.to_line())
+            self._index_file.flush()
+
+            active.add(entry)
+            if active.sequence in self._index_cache:
+                self._index_cache[active.sequence].append(entry)
+
+    def _open_segment(self) -> None:
+        sequence = self._segments[-1].sequence + 1 if self._segments else 1
+        segment = SegmentInfo(sequence, self.compression)
+        self._segments.append(segment)
+        self._active = segment
+        self._open_active_files()
+
+    def _open_active_files(self) -> None:
+        segment = self._active
+        # The delta chain is not persisted: the next record after (re)opening is a keyframe
+        self._chain = DeltaChain(self.delta_field) if self.delta_field else None
+        entries = self._read_index(segment) if segment.record_count else []
+        self._data_file = open(self._data_path(segment), "ab")  # noqa: SIM115
+        # Drop any torn tail left behind by a crash before appending after it
+        self._data_file.truncate(segment.size_bytes)
+        self._index_file = open(self._index_path(segment), "w", encoding="utf-8")  # noqa: SIM115
+        self._index_file.writelines(entry.to_line() for entry in entries)
+        self._index_file.flush()
+
+    def _close_files(self) -> None:
+        for handle in (self._data_file, self._index_file):
+            if handle is not None:
+                handle.close()
+        self._data_file = None
+        self._index_file = None
+
+    def _seal_active(self) -> None:
+        self._close_files()
+        self._active = None
+        self._write_manifest()
+
+    def close(self) -> None:
+        """Seal the active segment and release its file handles."""
+        with self._lock:
+            if self._active is None:
+                return
+            if self._active.record_count:
+                self._seal_active()
+            else:
+                self._close_files()
+                self._drop_segment(self._active)
+                self._active = None
+
+    def release(self) -> None:
+        """Close the store and give up the directory lock; the store must not be used afterwards."""
+        with self._lock:
+            self.close()
+            if self._lock_file is not None:
+                self._lock_file.close()
+                self._lock_file = None
+
+    # Reading
+    def _entries(self, segment: SegmentInfo) -> list[IndexEntry]:
+        entries = self._index_cache.get(segment.sequence)
+        if entries is None:
+            entries = self._read_index(segment)
+            self._index_cache[segment.sequence] = entries
+        return entries
+
+    def _iter_segment(self, segment: SegmentInfo, start: float | None, end: float | None, record_type: str | None) -> Iterator[tuple[float, dict]]:
+        entries = self._entries(segment)
+        position = bisect.bisect_left(entries, start, key=lambda entry: entry.timestamp) if start is not None else 0
+        # Deltas need every record back to the nearest keyframe
+        first = position
+        while first > 0 and first < len(entries) and not entries[first].keyframe:
+            first -= 1
+
+        chain = DeltaChain(self.delta_field) if self.delta_field else None
+        with open(self._data_path(segment), "rb") as data_file:
+            for index in range(first, len(entries)):
+                entry = entries[index]
+                if end is not None and entry.timestamp > end:
+                    break
+                wanted = index >= position and (record_type is None or entry.record_type == record_type)
+                if not wanted and (not self.delta_field or (index + 1 < len(entries) and entries[index + 1].keyframe)):
+                    continue
+                data_file.seek(entry.offset)
+                record = json.loads(_decompress(data_file.read(entry.length), segment.compression))
+                if chain is not None:
+                    # Hand out a copy so callers cannot alter the chain's base record
+                    record = dict(chain.decode(record, entry.keyframe))
+                if wanted:
+                    yield entry.timestamp, record
+
+    def read(self, start: float | None = None, end: float | None = None, record_type: str | None = None) -> Iterator[dict]:
+        """Read records with timestamps in ``[start, end]`` in timestamp order.
+
+        Only segments whose time span intersects the range are opened, and each
+        one is entered at the first matching record via its index.
+
+        Returns:
+        Iterator over the stored records.
+        """
+        with self._lock:
+            segments = [segment for segment in self._segments if segment.overlaps(start, end) and (record_type is None or segment.type_counts.get(record_type))]
+            # Make sure pending writes are visible to the readers below
+            if self._data_file is not None:
+                self._data_file.flush()
+
+        streams = [self._iter_segment(segment, start, end, record_type) for segment in segments]
+        for _timestamp, record in heapq.merge(*streams, key=lambda item: item[0]):
+            yield record
+
+    # Maintenance
+    def _drop_segment(self, segment: SegmentInfo) -> None:
+        for path in (self._data_path(segment), self._index_path(segment)):
+            path.unlink(missing_ok=True)
+        self._index_cache.pop(segment.sequence, None)
+        self._segments.remove(segment)
+
+    def remove_before(self, cutoff: float) -> int:
+        """Delete every segment whose newest record is older than ``cutoff``.
+
+        Cleanup works on whole segments, so a segment that still holds one
+        record newer than the cutoff is kept until it ages out entirely.
+
+        Returns:
+        Number of records removed.
+        """
+        removed = 0
+        with self._lock:
+            expired = [segment for segment in self._segments if segment.record_count and segment.last_timestamp < cutoff]
+            for segment in expired:
+                if segment is self._active:
+                    self._close_files()
+                    self._active = None
+                removed += segment.record_count
+                self._drop_segment(segment)
+            if expired:
+                self._write_manifest()
+        return removed
+
+    def stats(self) -> dict[str, object]:
+        """Summarize the store from segment metadata alone.
+
+        Returns:
+        Dict with record, segment and size totals.
+        """
+        with self._lock:
+            segments = list(self._segments)
+        type_counts: dict[str, int] = {}
+        for segment in segments:
+            for record_type, count in segment.type_counts.items():
+                type_counts[record_type] = type_counts.get(record_type, 0) + count
+
+        populated = [segment for segment in segments if segment.record_count]
+        return {
+            "segment_count": len(populated),
+            "total_records": sum(segment.record_count for segment in segments),
+            "record_counts": type_counts,
+            "total_size_bytes": sum(segment.size_bytes for segment in segments),
+            "first_timestamp": min((segment.first_timestamp for segment in populated), default=None),
+            "last_timestamp": max((segment.last_timestamp for segment in populated), default=None),
+            "compression": self.compression,
+        }
+
+
+class StoreLockedError(RuntimeError):
+    """Raised when another open store owns the directory."""
+
+
+def _legacy_timestamp(record: dict, path: Path) -> float:
+    try:
+        return datetime.fromisoformat(record["timestamp"]).timestamp()
+    except (KeyError, TypeError, ValueError):
+        return path.stat().st_mtime
+
+
+def migrate_legacy_files(directory: Path, store: InteractionStore | None = None, delete: bool = True) -> dict[str, int]:  # noqa: FBT001
+    """Import per-file ``interaction_*.json`` / ``raw_*.json`` records into a store.
+
+    Files are imported in timestamp order into fresh segments and removed once
+    the import has been written. Unreadable files are left in place.
+
+    Without ``store`` a store is opened for the directory, which raises
+    ``StoreLockedError`` while another store (such as a running monitor's)
+    has it open.
+
+    Returns:
+    Dict with the number of migrated and failed files.
+    """
+    directory = Path(directory)
+    if store is None:
+        own_store = InteractionStore(directory, delta_field="content")
+        try:
+            return migrate_legacy_files(directory, own_store, delete)
+        finally:
+            own_store.release()
+
+    logger = logging.getLogger("yesman.interaction_store")
+
+    legacy = []
+    failed = 0
+    for path in [*directory.glob("interaction_*.json"), *directory.glob("raw_*.json")]:
+        try:
+            record = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            logger.warning("Skipping unreadable legacy record %s", path)
+            failed += 1
+            continue
+        record_type = record.get("record_type", "raw_content" if path.name.startswith("raw_") else "interaction")
+        legacy.append((_legacy_timestamp(record, path), path.name, path, record, record_type))
+
+    legacy.sort(key=lambda item: (item[0], item[1]))
+    for timestamp, _name, _path, record, record_type in legacy:
+        store.append(record, record_type, timestamp=timestamp)
+
+    # Seal so the imported segment is in the manifest before the originals go away
+    store.close()
+    if delete:
+        for _timestamp, _name, path, _record, _record_type in legacy:
+            path.unlink(missing_ok=True)
+
+    if legacy:
+        logger.info("Migrated %d legacy records in %s", len(legacy), directory)
+    return {"migrated": len(legacy), "failed": failed}
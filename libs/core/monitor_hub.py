@@ -0,0 +1,418 @@
+# Copyright notice.
+
+import asyncio
+import concurrent.futures
+import contextlib
+import functools
+import logging
+import threading
+import time
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, ClassVar, Optional, TypeVar
+
+from libs.ai.adaptive_response import AdaptiveConfig, AdaptiveResponse
+from libs.automation.automation_manager import AutomationManager
+from libs.dashboard.health_calculator import HealthCalculator
+
+from .content_collector import ClaudeContentCollector, ContentCollectionManager
+
+if TYPE_CHECKING:
+    from .claude_monitor import ClaudeMonitor
+
+# Copyright (c) 2024 Yesman Claude Project
+# Licensed under the MIT License
+
+"""Shared scheduler that runs every Claude monitor on a single event loop."""
+
+T = TypeVar("T")
+
+
+@dataclass
+class TickStats:
+    """Latency statistics for one session's monitor ticks."""
+
+    ticks: int = 0
+    last_seconds: float = 0.0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+    last_tick_at: float = 0.0
+
+    def record(self, seconds: float) -> None:
+        """Record the duration of a single tick."""
+        self.ticks += 1
+        self.last_seconds = seconds
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        self.last_tick_at = time.time()
+
+    @property
+    def average_seconds(self) -> float:
+        """Average tick duration in seconds."""
+        return self.total_seconds / self.ticks if self.ticks else 0.0
+
+    def to_dict(self) -> dict[str, object]:
+        """Convert to dictionary for serialization.
+
+        Returns:
+        Dict containing the tick statistics.
+        """
+        return {
+            "ticks": self.ticks,
+            "last_ms": round(self.last_seconds * 1000, 3),
+            "average_ms": round(self.average_seconds * 1000, 3),
+            "max_ms": round(self.max_seconds * 1000, 3),
+            "last_tick_at": self.last_tick_at,
+        }
+
+
+class BlockingLane:
+    """Bounded thread pool for one kind of blocking monitor work.
+
+    At most ``max_pending`` jobs may be queued or running at once. Callers
+    beyond that wait for a free slot (backpressure) instead of growing the
+    executor queue, and lanes are separate so slow disk writes never hold up
+    the tmux calls that prompt responses depend on.
+    """
+
+    def __init__(self, name: str, max_workers: int, max_pending: int) -> None:
+        self.name = name
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"yesman-{name}")
+        self._slots = asyncio.Semaphore(max_pending)
+
+        self.pending = 0
+        self.completed = 0
+        self.backpressure_waits = 0
+
+    async def run(self, func: Callable[..., T], *args: object) -> T:
+        """Run ``func(*args)`` on the lane's executor once a slot is free.
+
+        Returns:
+        The function's return value.
+        """
+        if self._slots.locked():
+            self.backpressure_waits += 1
+        async with self._slots:
+            self.pending += 1
+            try:
+                return await asyncio.get_running_loop().run_in_executor(self.executor, functools.partial(func, *args))
+            finally:
+                self.pending -= 1
+                self.completed += 1
+
+    def shutdown(self) -> None:
+        """Stop accepting work and drop queued jobs."""
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def to_dict(self) -> dict[str, object]:
+        """Convert to dictionary for serialization.
+
+        Returns:
+        Dict containing the lane's load counters.
+        """
+        return {
+            "max_workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "pending": self.pending,
+            "completed": self.completed,
+            "backpressure_waits": self.backpressure_waits,
+        }
+
+
+class MonitorHub:
+    """Runs all session monitors as coroutines on one shared event loop.
+
+    The hub owns a single background thread and event loop, plus one instance
+    of each heavy analyzer (adaptive response, automation, health) that every
+    monitor shares instead of building its own copy.
+    """
+
+    _instance: Optional["MonitorHub"] = None
+    _instance_lock = threading.Lock()
+
+    # Executor lanes for blocking work: name -> (worker threads, max queued or running jobs).
+    # "learning" has a single worker so learned responses are recorded in order.
+    LANES: ClassVar[dict[str, tuple[int, int]]] = {
+        "tmux": (8, 32),
+        "analysis": (4, 16),
+        "disk": (2, 8),
+        "learning": (1, 16),
+    }
+
+    def __init__(self) -> None:
+        self.logger = logging.getLogger("yesman.monitor_hub")
+
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._loop_lock = threading.Lock()
+
+        self._sessions: dict[str, concurrent.futures.Future] = {}
+        self._tasks: dict[str, asyncio.Task] = {}
+        self.tick_stats: dict[str, TickStats] = {}
+        self.stage_stats: dict[str, dict[str, TickStats]] = {}
+        self._lanes: dict[str, BlockingLane] = {}
+        self._background: set[asyncio.Task] = set()
+        self._keyed_background: dict[Hashable, asyncio.Task] = {}
+
+        self._analyzer_lock = threading.Lock()
+        self._adaptive_response: AdaptiveResponse | None = None
+        self._automation_manager: AutomationManager | None = None
+        self._health_calculator: HealthCalculator | None = None
+        self.content_collection = ContentCollectionManager()
+
+    @classmethod
+    def get_instance(cls) -> "MonitorHub":
+        """Get the process-wide hub, creating it on first use.
+
+        Returns:
+        The shared MonitorHub instance.
+        """
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    @classmethod
+    def reset_instance(cls) -> None:
+        """Shut down and discard the shared hub (mainly for tests)."""
+        with cls._instance_lock:
+            if cls._instance is not None:
+                cls._instance.shutdown()
+                cls._instance = None
+
+    # Shared analyzers
+    @property
+    def adaptive_response(self) -> AdaptiveResponse:
+        """Adaptive response system shared by every monitored session."""
+        with self._analyzer_lock:
+            if self._adaptive_response is None:
+                self._adaptive_response = AdaptiveResponse(
+                    config=AdaptiveConfig(
+                        min_confidence_threshold=0.7,
+                        learning_enabled=True,
+                        auto_response_enabled=True,
+                        response_delay_ms=1500,  # Slightly longer delay for more natural interaction
+                    ),
+                )
+            return self._adaptive_response
+
+    @property
+    def automation_manager(self) -> AutomationManager:
+        """Context-aware automation manager shared by every monitored session."""
+        with self._analyzer_lock:
+            if self._automation_manager is None:
+                self._automation_manager = AutomationManager(project_path=None)
+            return self._automation_manager
+
+    @property
+    def health_calculator(self) -> HealthCalculator:
+        """Project health calculator shared by every monitored session."""
+        with self._analyzer_lock:
+            if self._health_calculator is None:
+                self._health_calculator = HealthCalculator(project_path=None)
+            return self._health_calculator
+
+    def get_content_collector(self, session_name: str) -> ClaudeContentCollector:
+        """Get the content collector for a session.
+
+        Returns:
+        ClaudeContentCollector for the session.
+        """
+        return self.content_collection.get_collector(session_name)
+
+    # Event loop management
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """The shared event loop, started on first access."""
+        with self._loop_lock:
+            if self._loop is None or self._loop.is_closed():
+                self._loop = asyncio.new_event_loop()
+                self._lanes = {name: BlockingLane(name, workers, pending) for name, (workers, pending) in self.LANES.items()}
+                self._thread = threading.Thread(target=self._run_loop, name="yesman-monitor-hub", daemon=True)
+                self._thread.start()
+            return self._loop
+
+    def _run_loop(self) -> None:
+        loop = self._loop
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_forever()
+        finally:
+            loop.close()
+
+    def start_session(self, monitor: "ClaudeMonitor") -> bool:
+        """Schedule a monitor's loop on the shared event loop.
+
+        Returns:
+        True if the session was scheduled, False if it is already running.
+        """
+        session_name = monitor.session_name
+        existing = self._sessions.get(session_name)
+        if existing and not existing.done():
+            return False
+
+        self.tick_stats[session_name] = TickStats()
+        future = asyncio.run_coroutine_threadsafe(self._run_session(monitor), self.loop)
+        future.add_done_callback(lambda _future: self._on_session_done(session_name, _future))
+        self._sessions[session_name] = future
+        self.logger.info("Scheduled monitor for session '%s' (%d active)", session_name, self.active_session_count)
+        return True
+
+    async def _run_session(self, monitor: "ClaudeMonitor") -> None:
+        self._tasks[monitor.session_name] = asyncio.current_task()
+        try:
+            await monitor._monitor_loop()
+        finally:
+            self._tasks.pop(monitor.session_name, None)
+
+    async def _cancel_task(self, session_name: str) -> None:
+        task = self._tasks.get(session_name)
+        if task is None or task.done():
+            return
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+
+    def stop_session(self, session_name: str, timeout: float = 2.0) -> bool:
+        """Cancel a session's monitor coroutine and wait for it to finish.
+
+        Returns:
+        True if a running session was stopped.
+        """
+        future = self._sessions.pop(session_name, None)
+        if future is None:
+            return False
+
+        if threading.current_thread() is self._thread:
+            # Called from a monitor on the hub loop: cannot block waiting for ourselves
+            task = self._tasks.get(session_name)
+            if task:
+                task.cancel()
+            return True
+
+        try:
+            asyncio.run_coroutine_threadsafe(self._cancel_task(session_name), self.loop).result(timeout=timeout)
+        except concurrent.futures.TimeoutError:
+            self.logger.warning("Monitor for session '%s' did not stop within %.1fs", session_name, timeout)
+        except Exception:
+            self.logger.exception("Monitor for session '%s' failed while stopping", session_name)
+        return True
+
+    def _on_session_done(self, session_name: str, future: concurrent.futures.Future) -> None:
+        if self._sessions.get(session_name) is future:
+            del self._sessions[session_name]
+        if not future.cancelled() and future.exception():
+            self.logger.error("Monitor for session '%s' crashed", session_name, exc_info=future.exception())
+
+    def is_session_running(self, session_name: str) -> bool:
+        """Check whether a session's monitor is scheduled.
+
+        Returns:
+        True if the monitor coroutine has not finished.
+        """
+        future = self._sessions.get(session_name)
+        return future is not None and not future.done()
+
+    @property
+    def active_session_count(self) -> int:
+        """Number of monitors currently scheduled."""
+        return sum(1 for future in self._sessions.values() if not future.done())
+
+    # Off-loop execution
+    async def run_blocking(self, session_name: str, stage: str, lane: str, func: Callable[..., T], *args: object) -> T:
+        """Run a blocking call on an executor lane and time it as a tick stage.
+
+        Must be awaited from the hub's event loop. The recorded time includes
+        any wait for a free slot in the lane.
+
+        Returns:
+        The function's return value.
+        """
+        started = time.perf_counter()
+        try:
+            return await self._lanes[lane].run(func, *args)
+        finally:
+            self.record_stage(session_name, stage, time.perf_counter() - started)
+
+    def submit_blocking(self, session_name: str, stage: str, lane: str, func: Callable[..., object], *args: object, key: Hashable | None = None) -> asyncio.Task:
+        """Run a blocking call in the background without waiting for it.
+
+        Calls submitted with a ``key`` are coalesced: while an earlier call with
+        the same key is still queued or running, no new call is made and the
+        earlier call's task is returned instead.
+
+        Returns:
+        The task running the call; failures are logged.
+        """
+        if key is not None:
+            pending = self._keyed_background.get(key)
+            if pending is not None and not pending.done():
+                return pending
+
+        task = asyncio.get_running_loop().create_task(self.run_blocking(session_name, stage, lane, func, *args))
+        self._background.add(task)
+        if key is not None:
+            self._keyed_background[key] = task
+        task.add_done_callback(functools.partial(self._on_background_done, session_name, stage, key))
+        return task
+
+    def _on_background_done(self, session_name: str, stage: str, key: Hashable | None, task: asyncio.Task) -> None:
+        self._background.discard(task)
+        if key is not None and self._keyed_background.get(key) is task:
+            del self._keyed_background[key]
+        if not task.cancelled() and task.exception():
+            self.logger.error("Background stage '%s' failed for session '%s'", stage, session_name, exc_info=task.exception())
+
+    # Statistics
+    def record_tick(self, session_name: str, seconds: float) -> None:
+        """Record how long one monitor tick took for a session."""
+        self.tick_stats.setdefault(session_name, TickStats()).record(seconds)
+
+    def record_stage(self, session_name: str, stage: str, seconds: float) -> None:
+        """Record how long one stage of a monitor tick took for a session."""
+        self.stage_stats.setdefault(session_name, {}).setdefault(stage, TickStats()).record(seconds)
+
+    def _session_stats(self, session_name: str) -> dict[str, object]:
+        stats = self.tick_stats.get(session_name)
+        result = stats.to_dict() if stats else {}
+        stages = self.stage_stats.get(session_name)
+        if stages:
+            result["stages"] = {stage: stage_stats.to_dict() for stage, stage_stats in stages.items()}
+        return result
+
+    def get_tick_stats(self, session_name: str | None = None) -> dict[str, dict[str, object]]:
+        """Get per-session tick latency statistics, including per-stage timings.
+
+        Returns:
+        Dict mapping session names to their tick statistics.
+        """
+        if session_name is not None:
+            stats = self._session_stats(session_name)
+            return {session_name: stats} if stats else {}
+        return {name: self._session_stats(name) for name in self.tick_stats.keys() | self.stage_stats.keys()}
+
+    def get_lane_stats(self) -> dict[str, dict[str, object]]:
+        """Get load counters for every executor lane.
+
+        Returns:
+        Dict mapping lane names to their counters.
+        """
+        return {name: lane.to_dict() for name, lane in self._lanes.items()}
+
+    def shutdown(self, timeout: float = 2.0) -> None:
+        """Stop every session and the shared event loop."""
+        for session_name in list(self._sessions):
+            self.stop_session(session_name, timeout)
+
+        with self._loop_lock:
+            if self._loop and not self._loop.is_closed():
+                self._loop.call_soon_threadsafe(self._loop.stop)
+            if self._thread and self._thread.is_alive():
+                self._thread.join(timeout=timeout)
+            for lane in self._lanes.values():
+                lane.shutdown()
+            self._lanes = {}
+            self._loop = None
+            self._thread = None
@@ -4,12 +4,35 @@ import logging
 import re
 from dataclasses import dataclass
 from enum import Enum
+from typing import NamedTuple
 
 # Copyright (c) 2024 Yesman Claude Project
 # Licensed under the MIT License
 
 """Advanced prompt detection system for Claude Code interactions."""
 
+_ANSI_ESCAPE = re.compile(r"\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])")
+_WHITESPACE = re.compile(r"\s+")
+_EXCESS_BLANK_LINES = re.compile(r"\n\s*\n\s*\n+")
+
+# One alternation covering every prompt family, matched against lower-cased
+# lines. It is a cheap superset of the detector patterns: a single finditer over
+# the changed lines tells which families can possibly match, so only those lines
+# and families are examined with the full patterns. The leading lookahead lets
+# the scan skip positions that cannot start any family, and no group consumes a
+# newline.
+_PROMPT_SCANNER = re.compile(
+    r"(?=[\d\[(?taslie])(?:"
+    r"(?P<numbered>\d[.)][^\S\n]|\[\d+\][^\S\n])"
+    r"|(?P<binary>\((?:y/n|yes/no)\)|\[(?:y/n|1/2)\])"
+    r"|(?P<true_false>true)"
+    r"|(?P<terminal>terminal)"
+    r"|(?P<login>login|authenticate|sign(?=[^\S\n]+in))"
+    r"|(?P<text_input>(?:enter|type|input)(?=[^\S\n]+[^\n]+?:))"
+    r"|(?P<question>\?)"
+    r")",
+)
+
 
 class PromptType(Enum):
     """Types of prompts that can be detected."""
@@ -150,21 +173,20 @@ class ClaudePromptDetector:
         str: Description of return value.
         """
         # Remove ANSI escape sequences
-        ansi_escape = re.compile(r"\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])")
-        cleaned = ansi_escape.sub("", content)
+        cleaned = _ANSI_ESCAPE.sub("", content)
 
         # Keep line structure but normalize spacing within lines
         lines = []
         for line in cleaned.split("\n"):
             # Normalize whitespace within each line but preserve line breaks
-            normalized_line = re.sub(r"\s+", " ", line).strip()
+            normalized_line = _WHITESPACE.sub(" ", line).strip()
             lines.append(normalized_line)
 
         # Rejoin with preserved line structure
         cleaned = "\n".join(lines)
 
         # Remove excessive empty lines
-        cleaned = re.sub(r"\n\s*\n\s*\n+", "\n\n", cleaned)
+        cleaned = _EXCESS_BLANK_LINES.sub("\n\n", cleaned)
 
         return cleaned.strip()
 
@@ -181,13 +203,22 @@ class ClaudePromptDetector:
             if matches:
                 all_options.extend([(num, desc.strip()) for num, desc in matches])
 
+        return self._build_numbered_selection(all_options, content, content.split("\n"))
+
+    @staticmethod
+    def _build_numbered_selection(all_options: list[tuple[str, str]], content: str, lines: list[str]) -> PromptInfo | None:
+        """Build a numbered selection prompt from the options found in content.
+
+        Returns:
+        object: Description of return value.
+        """
         if len(all_options) >= 2:
             # Extract question text (usually appears before options)
-            lines = content.split("\n")
             question = ""
+            markers = tuple({marker for num, _ in all_options for marker in (f"{num}.", f"[{num}]")})
 
             for line in lines:
-                if any(f"{opt[0]}." in line or f"[{opt[0]}]" in line for opt in all_options):
+                if any(map(line.__contains__, markers)):
                     break
                 if "?" in line:
                     question = line.strip()
@@ -372,11 +403,13 @@ class ClaudePromptDetector:
             if line.endswith("?"):
                 return line
 
-        # Look for question patterns
+        # Look for question patterns (they never span lines and all need a '?')
+        question_lines = [line for line in lines if "?" in line]
         for pattern in self.question_patterns:
-            match = pattern.search(content)
-            if match:
-                return match.group(0).strip()
+            for line in question_lines:
+                match = pattern.search(line)
+                if match:
+                    return match.group(0).strip()
 
         # Fallback: return the last non-empty line
         for raw_line in reversed(lines):
@@ -408,3 +441,239 @@ class ClaudePromptDetector:
 
         # Check for selection menus
         return bool(self.detect_prompt(content))
+
+
+# Bit flags for the prompt families, in the order detect_prompt tries them
+_FAMILY_BITS = {family: 1 << index for index, family in enumerate(("numbered", "binary", "true_false", "terminal", "login", "text_input", "question"))}
+
+
+class _LineFeatures(NamedTuple):
+    """Cleaned text and prompt families found on a single line."""
+
+    cleaned: str
+    families: int  # OR of _FAMILY_BITS
+    # Numbered options matched by each of the numbered patterns
+    options: tuple[tuple[tuple[str, str], ...], ...]
+
+
+@dataclass
+class _PaneState:
+    """What the incremental detector remembers about one pane."""
+
+    content: str | None = None
+    result: PromptInfo | None = None
+    raw_lines: list[str] | None = None
+    features: list[_LineFeatures] | None = None
+    # Lines with prompt families in the last capture and what they add up to
+    flagged: list[_LineFeatures] | None = None
+    present: int = 0
+    options: list[tuple[str, str]] | None = None
+
+
+class IncrementalPromptDetector(ClaudePromptDetector):
+    """Prompt detector that keeps per-pane state between captures.
+
+    A capture identical to the pane's previous one returns the previous result.
+    Otherwise the lines carried over from the previous capture (the unchanged
+    part of the pane, possibly scrolled up) keep their features, and only the
+    changed tail is looked up in a line cache or cleaned and classified with a
+    single pass of ``_PROMPT_SCANNER``. The full detectors then run only for
+    the prompt families that are actually present.
+
+    Prompts are matched line by line; a pattern split across two lines of the
+    capture is not detected.
+    """
+
+    # (family, detector) in the same order of specificity as detect_prompt
+    _FAMILY_ORDER = (
+        (_FAMILY_BITS["numbered"], "_detect_numbered_selection"),
+        (_FAMILY_BITS["binary"], "_detect_binary_choice"),
+        (_FAMILY_BITS["true_false"], "_detect_true_false"),
+        (_FAMILY_BITS["terminal"], "_detect_terminal_settings"),
+        (_FAMILY_BITS["login"], "_detect_login_redirect"),
+        (_FAMILY_BITS["text_input"], "_detect_text_input"),
+        (_FAMILY_BITS["question"], "_detect_confirmation"),
+    )
+
+    DEFAULT_PANE = "default"
+    MAX_CACHED_LINES = 4096
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._family_patterns = {
+            "binary": self.binary_patterns,
+            "true_false": self.true_false_patterns,
+            "terminal": self.terminal_patterns,
+            "login": self.login_patterns,
+            "text_input": self.text_input_patterns,
+        }
+        self._panes: dict[str, _PaneState] = {}
+        self._line_cache: dict[str, _LineFeatures] = {}
+
+    def reset(self, pane_id: str | None = None) -> None:
+        """Forget the state of one pane, or of every pane when ``pane_id`` is None."""
+        if pane_id is None:
+            self._panes.clear()
+            self._line_cache.clear()
+        else:
+            self._panes.pop(pane_id, None)
+
+    def detect_prompt(self, content: str, pane_id: str | None = None) -> PromptInfo | None:
+        """Detect a prompt, re-examining only lines changed since earlier captures.
+
+        Args:
+            content: The terminal content to analyze
+            pane_id: Pane the content was captured from
+
+        Returns:
+            PromptInfo for the detected prompt, or None.
+        """
+        state = self._panes.setdefault(pane_id or self.DEFAULT_PANE, _PaneState())
+        if content == state.content:
+            return state.result
+
+        if not content or len(content.strip()) < 3:
+            result = None
+        else:
+            raw_lines = content.split("\n")
+            features = self._line_features(state, raw_lines)
+            result = self._classify(state, features)
+            state.raw_lines = raw_lines
+            state.features = features
+
+        state.content = content
+        state.result = result
+        return result
+
+    def is_waiting_for_input(self, content: str, pane_id: str | None = None) -> bool:
+        """Check if Claude Code is waiting for input.
+
+        Args:
+            content: Terminal content to check
+            pane_id: Pane the content was captured from
+
+        Returns:
+            True if waiting for input, False otherwise
+        """
+        if not content:
+            return False
+
+        cursor_indicators = ["❯", ">", ":", "?", "[", "("]
+        last_line = content.strip().split("\n")[-1]
+        if any(last_line.strip().endswith(indicator) for indicator in cursor_indicators):
+            return True
+
+        return bool(self.detect_prompt(content, pane_id))
+
+    def _line_features(self, state: _PaneState, raw_lines: list[str]) -> list[_LineFeatures]:
+        """Reuse features for the part of the pane that only scrolled and classify the changed tail.
+
+        Returns:
+        Features for every line of the capture.
+        """
+        head = 0
+        reused: list[_LineFeatures] = []
+        previous = state.raw_lines
+        if previous and state.features:
+            try:
+                shift = previous.index(raw_lines[0])
+            except ValueError:
+                shift = -1
+            if shift >= 0:
+                # Lines carried over (possibly scrolled up) from the previous capture
+                limit = min(len(previous) - shift, len(raw_lines))
+                while head < limit and previous[shift + head] == raw_lines[head]:
+                    head += 1
+                reused = state.features[shift : shift + head]
+
+        # Drop the cache before it grows unbounded; captures repopulate it quickly
+        if len(self._line_cache) > self.MAX_CACHED_LINES:
+            self._line_cache.clear()
+
+        tail = raw_lines[head:]
+        # Each distinct line that is not cached yet, in order
+        new_lines = [line for line in dict.fromkeys(tail) if line not in self._line_cache]
+        if new_lines:
+            self._classify_lines(new_lines)
+        return reused + [self._line_cache[line] for line in tail]
+
+    def _classify_lines(self, raw_lines: list[str]) -> None:
+        """Clean and classify new lines in one scanner pass and cache the results."""
+        # str.split() and \s agree on what whitespace is, so this matches _clean_content
+        cleaned_lines = [" ".join(line.split()) for line in _ANSI_ESCAPE.sub("", "\n".join(raw_lines)).split("\n")]
+
+        # Map every scanner hit back to the line it occurred on
+        line_families: list[set[str]] = [set() for _ in cleaned_lines]
+        lowered_lines = [line.lower() for line in cleaned_lines]
+        line_index = 0
+        line_end = len(lowered_lines[0])
+        for match in _PROMPT_SCANNER.finditer("\n".join(lowered_lines)):
+            while match.start() > line_end:
+                line_index += 1
+                line_end += len(lowered_lines[line_index]) + 1
+            line_families[line_index].add(match.lastgroup)
+
+        for raw_line, cleaned, candidates in zip(raw_lines, cleaned_lines, line_families, strict=True):
+            families = 0
+            options: tuple[tuple[tuple[str, str], ...], ...] = ()
+            for family in candidates:
+                if family == "numbered":
+                    options = tuple(tuple((num, desc.strip()) for num, desc in pattern.findall(cleaned)) for pattern in self.numbered_patterns)
+                    if not any(options):
+                        options = ()
+                        continue
+                elif family != "question" and not any(pattern.search(cleaned) for pattern in self._family_patterns[family]):
+                    continue
+                families |= _FAMILY_BITS[family]
+            self._line_cache[raw_line] = _LineFeatures(cleaned, families, options)
+
+    def _classify(self, state: _PaneState, features: list[_LineFeatures]) -> PromptInfo | None:
+        """Run the full detectors for the prompt families present in the capture.
+
+        Returns:
+        PromptInfo for the first matching detector, or None.
+        """
+        # Only lines that can take part in a prompt matter; while they stay the
+        # same (e.g. plain output scrolling by) the aggregates are reused
+        flagged = [feature for feature in features if feature.families]
+        if flagged != state.flagged:
+            state.flagged = flagged
+            state.present = 0
+            for feature in flagged:
+                state.present |= feature.families
+
+            # Ordered by pattern first, then by position, like findall over the whole capture
+            state.options = []
+            for index in range(len(self.numbered_patterns)):
+                for feature in flagged:
+                    if feature.options:
+                        state.options.extend(feature.options[index])
+            if len(state.options) < 2:
+                state.present &= ~_FAMILY_BITS["numbered"]
+
+        present = state.present
+        if not present:
+            return None
+
+        all_options = list(state.options)
+        lines = [feature.cleaned for feature in features]
+        content = "\n".join(lines)
+        if "\n\n\n" in content:
+            content = _EXCESS_BLANK_LINES.sub("\n\n", content)
+        content = content.strip()
+        for family, detector_name in self._FAMILY_ORDER:
+            if not present & family:
+                continue
+            try:
+                if family == _FAMILY_BITS["numbered"]:
+                    prompt_info = self._build_numbered_selection(all_options, content, lines)
+                else:
+                    prompt_info = getattr(self, detector_name)(content)
+            except Exception:
+                self.logger.exception("Error in detector %s", detector_name)
+                continue
+            if prompt_info:
+                self.logger.debug("Detected prompt: %s", prompt_info.type.value)
+                return prompt_info
+
+        return None
@@ -2,6 +2,7 @@
 
 from libs.core.container import container
 from libs.core.session_manager import SessionManager
+from libs.core.session_snapshot import SessionSnapshotService
 from libs.tmux_manager import TmuxManager
 from libs.yesman_config import YesmanConfig
 
@@ -24,6 +25,9 @@ def register_core_services() -> None:
     # Register SessionManager as a singleton factory
     container.register_factory(SessionManager, SessionManager)
 
+    # Shared session snapshot for every in-process consumer
+    container.register_factory(SessionSnapshotService, lambda: SessionSnapshotService(container.resolve(SessionManager)))
+
 
 def register_test_services(config: YesmanConfig | None = None, tmux_manager: TmuxManager | None = None) -> None:
     """Register mock services for testing.
@@ -48,6 +52,7 @@ def register_test_services(config: YesmanConfig | None = None, tmux_manager: Tmu
 
     # Always register SessionManager for tests
     container.register_factory(SessionManager, SessionManager)
+    container.register_factory(SessionSnapshotService, lambda: SessionSnapshotService(container.resolve(SessionManager)))
 
 
 def get_config() -> YesmanConfig:
@@ -77,13 +82,22 @@ def get_session_manager() -> SessionManager:
     return container.resolve(SessionManager)
 
 
+def get_session_snapshot_service() -> SessionSnapshotService:
+    """Convenience function to get the shared SessionSnapshotService from container.
+
+    Returns:
+        SessionSnapshotService: Description of return value.
+    """
+    return container.resolve(SessionSnapshotService)
+
+
 def is_container_initialized() -> bool:
     """Check if the container has been initialized with core services.
 
     Returns:
         bool: Description of return value.
     """
-    return container.is_registered(YesmanConfig) and container.is_registered(TmuxManager) and container.is_registered(SessionManager)
+    return container.is_registered(YesmanConfig) and container.is_registered(TmuxManager) and container.is_registered(SessionManager) and container.is_registered(SessionSnapshotService)
 
 
 def initialize_services() -> None:
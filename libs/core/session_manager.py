@@ -13,6 +13,7 @@ import psutil
 
 # Lazy import to avoid circular dependency
 from libs.tmux_manager import TmuxManager
+from libs.tmux_snapshot import PaneSnapshot, TmuxSnapshot
 from libs.utils import ensure_log_directory
 
 # Import here to avoid circular import
@@ -71,9 +72,12 @@ class SessionManager:
 
         return logger
 
-    def get_all_sessions(self) -> list[SessionInfo]:
+    def get_all_sessions(self, projects: dict[str, object] | None = None) -> list[SessionInfo]:
         """Get information about all yesman sessions.
 
+        Args:
+            projects: Already loaded projects configuration; loaded from disk when omitted
+
         Returns:
         List of the requested data.
         """
@@ -81,11 +85,17 @@ class SessionManager:
 
         try:
             # Load project configurations
-            projects = self.tmux_manager.load_projects().get("sessions", {})
+            if projects is None:
+                projects = self.tmux_manager.load_projects().get("sessions", {})
             self.logger.info("Loaded %d projects", len(projects))
 
+            # One list-panes call and one batched capture for every session
+            snapshot = TmuxSnapshot.take(self.server)
+            session_names = {project_conf.get("override", {}).get("session_name", project_name) for project_name, project_conf in projects.items()}
+            snapshot.capture(pane.pane_id for pane in snapshot.panes if pane.session_name in session_names)
+
             for project_name, project_conf in projects.items():
-                session_info = self._get_session_info(project_name, project_conf)
+                session_info = self._get_session_info(project_name, project_conf, snapshot)
                 sessions_info.append(session_info)
 
             return sessions_info
@@ -94,9 +104,14 @@ class SessionManager:
             self.logger.error("Error getting sessions", exc_info=True)
             return []
 
-    def _get_session_info(self, project_name: str, project_conf: dict[str]) -> SessionInfo:
+    def _get_session_info(self, project_name: str, project_conf: dict[str], snapshot: TmuxSnapshot | None = None) -> SessionInfo:
         """Get information for a single session with mode-aware caching.
 
+        Args:
+            project_name: Project name from the sessions configuration
+            project_conf: Project configuration
+            snapshot: Shared tmux snapshot; a new one is taken when omitted
+
         Returns:
         Dict containing service information.
         """
@@ -105,16 +120,20 @@ class SessionManager:
             override = project_conf.get("override", {})
             session_name = override.get("session_name", project_name)
 
-            # Check if session exists
-            session = self.server.find_where({"session_name": session_name})
+            tmux_snapshot = snapshot if snapshot is not None else TmuxSnapshot.take(self.server)
+            session_windows = tmux_snapshot.windows_for_session(session_name)
+            session_exists = bool(session_windows)
+            if session_exists:
+                # No-op when the caller already captured these panes in bulk
+                tmux_snapshot.capture(pane.pane_id for panes in session_windows.values() for pane in panes)
 
             windows: list[WindowInfo] = []
             controller_status = "unknown"
 
-            if session:
+            if session_exists:
                 # Get window information
-                for window in session.list_windows():
-                    window_info = self._get_window_info(window)
+                for window_panes in session_windows.values():
+                    window_info = self._get_window_info(window_panes, tmux_snapshot)
                     windows.append(window_info)
 
                     # Update controller status based on panes
@@ -140,20 +159,13 @@ class SessionManager:
 
             # Analyze progress if session is running
             progress = None
-            if session:
-                # Collect output from all Claude panes
+            if session_exists:
+                # Collect output from all Claude panes (already captured in the snapshot)
                 claude_output = []
                 for window_info in windows:
                     for pane_info in window_info.panes:
                         if pane_info.is_claude and pane_info.last_output:
-                            # Get full pane content for better analysis
-                            try:
-                                tmux_pane = session.find_where({"pane_id": pane_info.id})
-                                if tmux_pane:
-                                    pane_content = tmux_pane.cmd("capture-pane", "-p").stdout
-                                    claude_output.extend(pane_content)
-                            except Exception as e:
-                                self.logger.warning("Could not get pane content for %s: %s", pane_info.id, e)
+                            claude_output.extend(tmux_snapshot.contents.get(pane_info.id, []))
 
                 # Analyze progress
                 if claude_output:
@@ -163,8 +175,8 @@ class SessionManager:
                 project_name=project_name,
                 session_name=session_name,
                 template=template_display,
-                exists=session is not None,
-                status="running" if session else "stopped",
+                exists=session_exists,
+                status="running" if session_exists else "stopped",
                 windows=windows,
                 controller_status=controller_status,
                 progress=progress,
@@ -172,7 +184,7 @@ class SessionManager:
 
         return compute_session_info()
 
-    def _get_window_info(self, window: object) -> WindowInfo:
+    def _get_window_info(self, window_panes: list[PaneSnapshot], snapshot: TmuxSnapshot) -> WindowInfo:
         """Get information for a single window with detailed pane metrics.
 
         Returns:
@@ -180,45 +192,47 @@ class SessionManager:
         """
         panes: list[PaneInfo] = []
 
-        for pane in window.list_panes():
+        for pane in window_panes:
             try:
-                pane_info = self._get_detailed_pane_info(pane)
+                pane_info = self._get_detailed_pane_info(pane, snapshot.contents.get(pane.pane_id))
                 panes.append(pane_info)
             except Exception:
                 self.logger.exception("Error getting pane info")
                 # Fallback to basic pane info
-                try:
-                    cmd = pane.cmd("display-message", "-p", "#{pane_current_command}").stdout[0]
-                    basic_pane = PaneInfo(
-                        id=pane.get("pane_id"),
+                cmd = pane.pane_current_command
+                panes.append(
+                    PaneInfo(
+                        id=pane.pane_id,
                         command=cmd,
                         is_claude="claude" in cmd.lower(),
                         is_controller="controller" in cmd.lower() or "yesman" in cmd.lower(),
                     )
-                    panes.append(basic_pane)
-                except Exception as e:
-                    self.logger.debug("Could not get basic pane info: %s", e)
+                )
 
+        first_pane = window_panes[0]
         return WindowInfo(
-            name=window.get("window_name"),
-            index=window.get("window_index"),
+            name=first_pane.window_name,
+            index=first_pane.window_index,
             panes=panes,
         )
 
-    def _get_detailed_pane_info(self, pane: object) -> PaneInfo:
+    def _get_detailed_pane_info(self, pane: PaneSnapshot, pane_content: list[str] | None = None) -> PaneInfo:
         """Get detailed information for a single pane including metrics.
 
+        Args:
+            pane: Pane format variables from a tmux snapshot
+            pane_content: Captured pane lines, if already captured in bulk
+
         Returns:
         Dict containing service information.
         """
         try:
             # Get basic pane information
-            cmd = pane.cmd("display-message", "-p", "#{pane_current_command}").stdout[0]
-            pane_id = pane.get("pane_id")
+            cmd = pane.pane_current_command
+            pane_id = pane.pane_id
 
             # Get pane PID and process info
-            pid_info = pane.cmd("display-message", "-p", "#{pane_pid}").stdout[0]
-            pid = int(pid_info) if pid_info.isdigit() else None
+            pid = pane.pane_pid
 
             # Initialize detailed metrics
             cpu_usage = 0.0
@@ -263,8 +277,7 @@ class SessionManager:
             # Get pane activity information
             try:
                 # Get last pane activity time (approximation)
-                pane_activity = pane.cmd("display-message", "-p", "#{pane_activity}").stdout[0]
-                activity_timestamp = int(pane_activity) if pane_activity.isdigit() else 0
+                activity_timestamp = pane.pane_activity or 0
 
                 # Calculate idle time and activity score
                 current_time = datetime.now(UTC).timestamp()
@@ -282,7 +295,8 @@ class SessionManager:
             output_lines = 0
             try:
                 # Capture last few lines of pane content
-                pane_content = pane.cmd("capture-pane", "-p").stdout
+                if pane_content is None:
+                    pane_content = TmuxSnapshot(self.server).capture([pane_id])[pane_id]
                 if pane_content:
                     lines = [line for line in pane_content if line.strip()]
                     output_lines = len(lines)
@@ -314,8 +328,8 @@ class SessionManager:
             self.logger.exception("Error getting detailed pane info")
             # Return basic pane info as fallback
             return PaneInfo(
-                id=pane.get("pane_id", "unknown"),
-                command=cmd if "cmd" in locals() else "unknown",
+                id=pane.pane_id or "unknown",
+                command=pane.pane_current_command or "unknown",
                 is_claude=False,
                 is_controller=False,
             )
@@ -0,0 +1,187 @@
+# Copyright notice.
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+
+from .models import SessionInfo
+from .session_manager import SessionManager
+
+# Copyright (c) 2024 Yesman Claude Project
+# Licensed under the MIT License
+
+"""Shared, periodically refreshed snapshot of all yesman sessions.
+
+Every consumer of session state inside one process (the dashboard and sessions
+REST endpoints, the WebSocket background monitor) reads the same immutable
+``SessionSnapshot`` from a ``SessionSnapshotService`` instead of querying tmux
+itself. The service refreshes at most once per ``max_age`` seconds no matter
+how many callers (or browser tabs) ask; concurrent callers that find the
+snapshot stale wait for a single refresh and share its result. The projects
+configuration is only re-read when a file in the sessions directory changes.
+
+Each snapshot carries an ``etag`` derived from its content, so unchanged
+refreshes keep their ETag and HTTP clients can revalidate with
+``If-None-Match``.
+"""
+
+
+@dataclass(frozen=True)
+class SessionSnapshot:
+    """Immutable view of every configured session at one point in time.
+
+    The ``SessionInfo`` objects are shared between all readers and must not be
+    mutated.
+    """
+
+    sessions: tuple[SessionInfo, ...]
+    version: int
+    etag: str
+    taken_at: float
+    created_at: datetime = field(default_factory=lambda: datetime.now(UTC))
+
+    @property
+    def age(self) -> float:
+        """Seconds since the snapshot was taken."""
+        return time.monotonic() - self.taken_at
+
+    def get(self, session_name: str) -> SessionInfo | None:
+        """Find a session by name.
+
+        Returns:
+            SessionInfo | None: The session, or None if it is not configured.
+        """
+        return next((session for session in self.sessions if session.session_name == session_name), None)
+
+    def matches(self, if_none_match: str | None) -> bool:
+        """Check an ``If-None-Match`` header against this snapshot's ETag.
+
+        Returns:
+            bool: True if the client's copy is current.
+        """
+        return etag_matches(self.etag, if_none_match)
+
+
+def etag_matches(etag: str, if_none_match: str | None) -> bool:
+    """Check an ``If-None-Match`` header value against an ETag.
+
+    Returns:
+        bool: True if any listed tag (weak or strong) equals ``etag``.
+    """
+    if not if_none_match:
+        return False
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in tags or etag.removeprefix("W/") in tags
+
+
+def make_etag(payload: object) -> str:
+    """Derive a strong ETag from JSON-serializable content.
+
+    Returns:
+        str: Quoted ETag value.
+    """
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode()
+    return f'"{hashlib.blake2b(encoded, digest_size=12).hexdigest()}"'
+
+
+class SessionSnapshotService:
+    """Refresh session state once per interval and share it with every caller."""
+
+    def __init__(self, session_manager: SessionManager, max_age: float = 1.0) -> None:
+        self.session_manager = session_manager
+        self.max_age = max_age
+
+        self._snapshot: SessionSnapshot | None = None
+        self._stale = False
+        self._lock = threading.Lock()
+        self._projects: dict[str, object] | None = None
+        self._projects_signature: tuple | None = None
+
+        self.stats = {"refreshes": 0, "hits": 0, "project_loads": 0, "changes": 0}
+        self.logger = logging.getLogger("yesman.session_snapshot")
+
+    def get(self, max_age: float | None = None) -> SessionSnapshot:
+        """Return the current snapshot, refreshing it if it is older than ``max_age``.
+
+        Returns:
+            SessionSnapshot: A snapshot no older than ``max_age`` seconds
+            (``self.max_age`` by default; 0 forces a refresh unless one
+            finishes while this caller waits for the lock).
+        """
+        max_age = self.max_age if max_age is None else max_age
+        requested_at = time.monotonic()
+        if self._is_fresh(max_age, requested_at):
+            self.stats["hits"] += 1
+            return self._snapshot
+
+        with self._lock:
+            # Another caller may have refreshed while this one waited
+            if self._is_fresh(max_age, requested_at):
+                self.stats["hits"] += 1
+                return self._snapshot
+            return self._refresh()
+
+    async def get_async(self, max_age: float | None = None) -> SessionSnapshot:
+        """Like ``get``, but refresh in a worker thread.
+
+        Returns:
+            SessionSnapshot: The shared snapshot.
+        """
+        if self._is_fresh(self.max_age if max_age is None else max_age, time.monotonic()):
+            self.stats["hits"] += 1
+            return self._snapshot
+        return await asyncio.to_thread(self.get, max_age)
+
+    def invalidate(self) -> None:
+        """Force the next ``get`` to refresh, e.g. after creating or killing a session."""
+        self._stale = True
+
+    def _is_fresh(self, max_age: float, requested_at: float) -> bool:
+        return self._snapshot is not None and not self._stale and self._snapshot.taken_at >= requested_at - max_age
+
+    def _refresh(self) -> SessionSnapshot:
+        # Cleared first so an invalidate() during the refresh is not lost
+        self._stale = False
+        taken_at = time.monotonic()
+        sessions = tuple(self.session_manager.get_all_sessions(projects=self._load_projects()))
+        etag = make_etag([session.to_dict() for session in sessions])
+        self.stats["refreshes"] += 1
+
+        previous = self._snapshot
+        if previous is not None and previous.etag == etag:
+            version, created_at = previous.version, previous.created_at
+        else:
+            version, created_at = (previous.version if previous else 0) + 1, datetime.now(UTC)
+            self.stats["changes"] += 1
+            self.logger.debug("Session snapshot v%d: %d sessions", version, len(sessions))
+
+        self._snapshot = SessionSnapshot(sessions=sessions, version=version, etag=etag, taken_at=taken_at, created_at=created_at)
+        return self._snapshot
+
+    def _load_projects(self) -> dict[str, object]:
+        """Load the projects configuration, re-reading it only when its files change.
+
+        Returns:
+            dict[str, object]: Projects keyed by name.
+        """
+        signature = self._sessions_dir_signature(Path(self.session_manager.tmux_manager.sessions_path))
+        if self._projects is None or signature != self._projects_signature:
+            self._projects = self.session_manager.tmux_manager.load_projects().get("sessions", {})
+            self._projects_signature = signature
+            self.stats["project_loads"] += 1
+        return self._projects
+
+    @staticmethod
+    def _sessions_dir_signature(sessions_path: Path) -> tuple:
+        try:
+            entries = sorted((entry.name, entry.stat().st_mtime_ns, entry.stat().st_size) for entry in os.scandir(sessions_path) if entry.name.endswith((".yaml", ".yml")))
+        except (FileNotFoundError, NotADirectoryError):
+            return ()
+        return (os.stat(sessions_path).st_mtime_ns, *entries)
@@ -0,0 +1,297 @@
+# Copyright notice.
+
+import logging
+import re
+import shutil
+import subprocess
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import ClassVar
+
+# Copyright (c) 2024 Yesman Claude Project
+# Licensed under the MIT License
+
+"""Event-driven pane monitoring through tmux control mode (``tmux -C``).
+
+A control-mode client receives a ``%output %<pane> <data>`` notification every
+time a pane writes to its terminal. Subscribing to these notifications lets the
+monitor react to pane changes as they happen instead of polling
+``capture-pane`` on a fixed interval.
+
+tmux only delivers ``%output`` for panes that belong to the session the control
+client is attached to, so :class:`TmuxControlMonitor` keeps one long-lived
+connection per watched session and shares it between every subscriber on the
+same server.
+"""
+
+_OCTAL_ESCAPE = re.compile(rb"\\([0-7]{3})")
+
+PaneCallback = Callable[[str], None]
+
+
+@dataclass
+class ControlNotification:
+    """A single ``%``-prefixed notification emitted by a control-mode client."""
+
+    name: str
+    args: list[str] = field(default_factory=list)
+    data: bytes = b""
+
+
+def unescape_output(data: bytes) -> bytes:
+    """Decode the octal escapes tmux applies to ``%output`` payloads.
+
+    Returns:
+        Raw bytes written by the pane.
+    """
+    return _OCTAL_ESCAPE.sub(lambda match: bytes([int(match.group(1), 8)]), data)
+
+
+def parse_notification(line: bytes) -> ControlNotification | None:
+    """Parse one line of control-mode output.
+
+    Returns:
+        The parsed notification, or None for command replies and blank lines.
+    """
+    line = line.rstrip(b"\r\n")
+    if not line.startswith(b"%"):
+        return None
+
+    name, _, rest = line[1:].partition(b" ")
+    notification_name = name.decode("ascii", errors="replace")
+
+    if notification_name == "output":
+        pane_id, _, payload = rest.partition(b" ")
+        return ControlNotification(
+            name=notification_name,
+            args=[pane_id.decode("ascii", errors="replace")],
+            data=unescape_output(payload),
+        )
+
+    args = rest.decode("utf-8", errors="replace").split() if rest else []
+    return ControlNotification(name=notification_name, args=args)
+
+
+class TmuxControlClient:
+    """Long-lived ``tmux -C`` connection attached to a single session."""
+
+    def __init__(self, session_name: str, socket_name: str | None = None) -> None:
+        self.session_name = session_name
+        self.socket_name = socket_name
+        self.logger = logging.getLogger(f"yesman.tmux_control.{session_name}")
+
+        self._process: subprocess.Popen | None = None
+        self._reader_thread: threading.Thread | None = None
+        self._subscribers: dict[str, list[PaneCallback]] = {}
+        self._lock = threading.Lock()
+        # Set once the reader stops; the process may take a moment longer to exit
+        self.disconnected = False
+
+    @property
+    def is_alive(self) -> bool:
+        """Check whether the control-mode process is still running and being read.
+
+        Returns:
+            True if the connection is usable.
+        """
+        return self._process is not None and not self.disconnected and self._process.poll() is None
+
+    def _build_command(self) -> list[str]:
+        command = ["tmux"]
+        if self.socket_name:
+            command.extend(["-L", self.socket_name])
+        # Read-only so the control client can never send keys by accident
+        command.extend(["-C", "attach-session", "-r", "-t", self.session_name])
+        return command
+
+    def start(self) -> bool:
+        """Spawn the control-mode client and its reader thread.
+
+        Returns:
+            True if the connection was established.
+        """
+        if self.is_alive:
+            return True
+
+        if not shutil.which("tmux"):
+            self.logger.warning("tmux executable not found; control mode unavailable")
+            return False
+
+        try:
+            # stdin must stay open: control mode exits as soon as it reads EOF
+            self._process = subprocess.Popen(
+                self._build_command(),
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+        except OSError:
+            self.logger.exception("Failed to start tmux control client")
+            self._process = None
+            return False
+
+        self.disconnected = False
+        self._reader_thread = threading.Thread(
+            target=self._read_loop,
+            name=f"tmux-control-{self.session_name}",
+            daemon=True,
+        )
+        self._reader_thread.start()
+        self.logger.info("Control client attached to session '%s'", self.session_name)
+        return True
+
+    def stop(self) -> None:
+        """Detach the control client and wait for the reader thread."""
+        process = self._process
+        if process is None:
+            return
+
+        if process.poll() is None:
+            try:
+                if process.stdin:
+                    process.stdin.close()
+                process.wait(timeout=2.0)
+            except (OSError, subprocess.TimeoutExpired):
+                process.kill()
+
+        if self._reader_thread and self._reader_thread.is_alive():
+            self._reader_thread.join(timeout=2.0)
+
+        self._process = None
+        self._reader_thread = None
+
+    def subscribe(self, pane_id: str, callback: PaneCallback) -> None:
+        """Register a callback invoked with the pane id whenever the pane outputs."""
+        with self._lock:
+            self._subscribers.setdefault(pane_id, []).append(callback)
+
+    def unsubscribe(self, pane_id: str, callback: PaneCallback) -> None:
+        """Remove a previously registered callback."""
+        with self._lock:
+            callbacks = self._subscribers.get(pane_id, [])
+            if callback in callbacks:
+                callbacks.remove(callback)
+            if not callbacks:
+                self._subscribers.pop(pane_id, None)
+
+    def has_subscribers(self) -> bool:
+        """Check whether any pane is still being watched.
+
+        Returns:
+            True if at least one callback is registered.
+        """
+        with self._lock:
+            return bool(self._subscribers)
+
+    def _dispatch(self, pane_id: str) -> None:
+        with self._lock:
+            callbacks = list(self._subscribers.get(pane_id, ()))
+
+        for callback in callbacks:
+            try:
+                callback(pane_id)
+            except Exception:
+                self.logger.exception("Pane output callback failed for %s", pane_id)
+
+    def _read_loop(self) -> None:
+        process = self._process
+        if process is None or process.stdout is None:
+            return
+
+        try:
+            for line in process.stdout:
+                notification = parse_notification(line)
+                if notification is None:
+                    continue
+
+                if notification.name == "output" and notification.args:
+                    self._dispatch(notification.args[0])
+                elif notification.name == "exit":
+                    self.logger.info("Control client for '%s' exited", self.session_name)
+                    break
+        except (OSError, ValueError):
+            self.logger.debug("Control client stream closed for '%s'", self.session_name)
+        finally:
+            self.disconnected = True
+            self._notify_disconnect()
+
+    def _notify_disconnect(self) -> None:
+        # Wake every subscriber so waiting monitors notice the lost connection
+        with self._lock:
+            pane_ids = list(self._subscribers)
+        for pane_id in pane_ids:
+            self._dispatch(pane_id)
+
+
+class TmuxControlMonitor:
+    """Shares control-mode connections between all monitors on one tmux server."""
+
+    _instances: ClassVar[dict[str | None, "TmuxControlMonitor"]] = {}
+    _instances_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    def __init__(self, socket_name: str | None = None) -> None:
+        self.socket_name = socket_name
+        self.clients: dict[str, TmuxControlClient] = {}
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger("yesman.tmux_control")
+
+    @classmethod
+    def for_server(cls, socket_name: str | None = None) -> "TmuxControlMonitor":
+        """Get the shared monitor for a tmux server.
+
+        Returns:
+            The process-wide monitor for ``socket_name``.
+        """
+        with cls._instances_lock:
+            if socket_name not in cls._instances:
+                cls._instances[socket_name] = cls(socket_name)
+            return cls._instances[socket_name]
+
+    def watch(self, session_name: str, pane_id: str, callback: PaneCallback) -> bool:
+        """Start receiving output notifications for a pane.
+
+        Returns:
+            True if the pane is watched through control mode, False if the
+            caller should fall back to polling.
+        """
+        with self._lock:
+            client = self.clients.get(session_name)
+            if client is None or not client.is_alive:
+                if client is not None:
+                    client.stop()
+                client = TmuxControlClient(session_name, self.socket_name)
+                if not client.start():
+                    return False
+                self.clients[session_name] = client
+
+            client.subscribe(pane_id, callback)
+            return True
+
+    def unwatch(self, session_name: str, pane_id: str, callback: PaneCallback) -> None:
+        """Stop receiving notifications and close idle connections."""
+        with self._lock:
+            client = self.clients.get(session_name)
+            if client is None:
+                return
+
+            client.unsubscribe(pane_id, callback)
+            if not client.has_subscribers():
+                client.stop()
+                del self.clients[session_name]
+
+    def is_watching(self, session_name: str) -> bool:
+        """Check whether a live control connection exists for a session.
+
+        Returns:
+            True if the session's control client is running.
+        """
+        client = self.clients.get(session_name)
+        return client is not None and client.is_alive
+
+    def shutdown(self) -> None:
+        """Close every control connection held by this monitor."""
+        with self._lock:
+            for client in self.clients.values():
+                client.stop()
+            self.clients.clear()
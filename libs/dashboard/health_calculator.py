@@ -1,12 +1,19 @@
 # Copyright notice.
 
+import asyncio
+import contextlib
 import json
 import logging
+import os
 import subprocess
 import time
+from collections.abc import AsyncIterator, Awaitable, Callable
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
+from typing import ClassVar
+
+from libs.source_index import IGNORED_DIRS, SOURCE_SUFFIXES, SourceFileIndex
 
 try:
     import tomllib
@@ -116,6 +123,53 @@ class HealthMetric:
         }
 
 
+@dataclass
+class CategorySchedule:
+    """Refresh policy for one health category.
+
+    A category is reassessed once ``refresh_interval`` seconds have passed. If
+    it watches files, it is also reassessed as soon as any of them changes.
+    """
+
+    refresh_interval: float
+    timeout: float
+    watch_files: tuple[str, ...] = ()
+    watch_suffixes: tuple[str, ...] = ()
+
+    @property
+    def watches_files(self) -> bool:
+        """Whether changes to project files trigger a reassessment."""
+        return bool(self.watch_files or self.watch_suffixes)
+
+
+@dataclass
+class CategoryResult:
+    """Cached assessment of one health category."""
+
+    metrics: list[HealthMetric]
+    last_updated: float
+    duration: float
+    fingerprint: tuple | None = None
+    timed_out: bool = False
+
+    def to_dict(self) -> dict[str, object]:
+        """Convert to dictionary.
+
+        Returns:
+        Dict containing.
+        """
+        return {
+            "last_updated": self.last_updated,
+            "duration_ms": round(self.duration * 1000, 3),
+            "timed_out": self.timed_out,
+            "metric_count": len(self.metrics),
+        }
+
+
+BUILD_CONFIG_FILES = ("package.json", "Cargo.toml", "setup.py", "pyproject.toml", "Makefile", "build.gradle", "pom.xml")
+DEPENDENCY_FILES = ("package.json", "requirements.txt", "Cargo.toml", "go.mod")
+
+
 @dataclass
 class ProjectHealth:
     """Overall project health assessment."""
@@ -171,80 +225,215 @@ class ProjectHealth:
 class HealthCalculator:
     """Calculates project health scores based on various metrics."""
 
+    # Build and tests only rerun when sources or build files change (or every 6 hours)
+    SCHEDULES: ClassVar[dict[HealthCategory, CategorySchedule]] = {
+        HealthCategory.BUILD: CategorySchedule(6 * 3600, 180, BUILD_CONFIG_FILES, SOURCE_SUFFIXES),
+        HealthCategory.TESTS: CategorySchedule(6 * 3600, 420, BUILD_CONFIG_FILES, SOURCE_SUFFIXES),
+        HealthCategory.DEPENDENCIES: CategorySchedule(3600, 30, DEPENDENCY_FILES),
+        HealthCategory.PERFORMANCE: CategorySchedule(600, 60),
+        HealthCategory.SECURITY: CategorySchedule(300, 10),
+        HealthCategory.CODE_QUALITY: CategorySchedule(3600, 60, (), SOURCE_SUFFIXES),
+        HealthCategory.GIT: CategorySchedule(30, 15),
+        HealthCategory.DOCUMENTATION: CategorySchedule(300, 10),
+    }
+    # Watched files are stat'ed on every call, the source tree is walked at most this often
+    TREE_SCAN_INTERVAL: ClassVar[float] = 15.0
+
     def __init__(self, project_path: Path | None = None) -> None:
         self.project_path = project_path or Path.cwd()
         self.logger = logging.getLogger("yesman.health_calculator")
 
-        # Cache for expensive operations
-        self._cache: dict[str, object] = {}
-        self._cache_ttl = 300  # 5 minutes
+        # Latest assessment per category; categories refresh on their own schedule
+        self._results: dict[HealthCategory, CategoryResult] = {}
+        self._inflight: dict[HealthCategory, asyncio.Task] = {}
+        # Last source tree summary per suffix set, with the monotonic time it was taken
+        self._tree_states: dict[tuple[str, ...], tuple[float, tuple[int, int, int]]] = {}
+        self._assessors: dict[HealthCategory, Callable[[], Awaitable[list[HealthMetric]]]] = {
+            HealthCategory.BUILD: self._assess_build_health,
+            HealthCategory.TESTS: self._assess_test_health,
+            HealthCategory.DEPENDENCIES: self._assess_dependency_health,
+            HealthCategory.PERFORMANCE: self._assess_performance_health,
+            HealthCategory.SECURITY: self._assess_security_health,
+            HealthCategory.CODE_QUALITY: self._assess_code_quality_health,
+            HealthCategory.GIT: self._assess_git_health,
+            HealthCategory.DOCUMENTATION: self._assess_documentation_health,
+        }
 
     async def calculate_health(self, force_refresh: bool = False) -> ProjectHealth:  # noqa: FBT001
         """Calculate comprehensive project health."""
-        cache_key = f"health_{self.project_path}"
+        health = None
+        async for health in self.stream_health(force_refresh):
+            pass
+        return health
 
-        if not force_refresh and cache_key in self._cache:
-            cached_data = self._cache[cache_key]
-            if time.time() - cached_data["timestamp"] < self._cache_ttl:
-                return ProjectHealth(**cached_data["health"])
+    async def stream_health(self, force_refresh: bool = False) -> AsyncIterator[ProjectHealth]:  # noqa: FBT001
+        """Reassess stale categories concurrently, yielding the health after each one finishes.
 
-        self.logger.info("Calculating health for project: %s", self.project_path)
+        Categories that are still fresh keep their cached metrics, so every
+        yielded ProjectHealth covers all categories assessed so far. If nothing
+        is stale a single snapshot is yielded.
 
-        metrics = []
+        Yields:
+        ProjectHealth snapshots.
+        """
+        stale = await self._stale_categories(force_refresh)
+        if not stale:
+            yield self._snapshot()
+            return
 
-        # Build health
-        build_metrics = await self._assess_build_health()
-        metrics.extend(build_metrics)
+        self.logger.info("Calculating health for project: %s (%s)", self.project_path, ", ".join(category.value for category, _ in stale))
+        for finished in asyncio.as_completed([self._refresh(category, fingerprint) for category, fingerprint in stale]):
+            await finished
+            yield self._snapshot()
 
-        # Test health
-        test_metrics = await self._assess_test_health()
-        metrics.extend(test_metrics)
+    def get_category_status(self) -> dict[str, dict[str, object]]:
+        """Get when each category was last assessed and how long it took.
+
+        Returns:
+        Dict mapping category names to their status.
+        """
+        return {category.value: result.to_dict() for category, result in self._results.items()}
+
+    def _snapshot(self) -> ProjectHealth:
+        metrics = [metric for category in HealthCategory if category in self._results for metric in self._results[category].metrics]
+        return ProjectHealth(
+            project_path=str(self.project_path),
+            overall_score=self._calculate_overall_score(metrics),
+            metrics=metrics,
+        )
+
+    async def _stale_categories(self, force_refresh: bool) -> list[tuple[HealthCategory, tuple | None]]:  # noqa: FBT001
+        """Find the categories due for reassessment.
+
+        Returns:
+        List of (category, current fingerprint of its watched files) pairs.
+        """
+        now = time.time()
+        if force_refresh:
+            self._tree_states.clear()
+        fingerprints: dict[tuple, tuple] = {}
+        stale = []
+        for category, schedule in self.SCHEDULES.items():
+            fingerprint = None
+            if schedule.watches_files:
+                key = (schedule.watch_files, schedule.watch_suffixes)
+                if key not in fingerprints:
+                    fingerprints[key] = await asyncio.to_thread(self._fingerprint, *key)
+                fingerprint = fingerprints[key]
+
+            result = self._results.get(category)
+            if force_refresh or result is None or now - result.last_updated >= schedule.refresh_interval or (schedule.watches_files and fingerprint != result.fingerprint):
+                stale.append((category, fingerprint))
+        return stale
+
+    async def _refresh(self, category: HealthCategory, fingerprint: tuple | None) -> CategoryResult:
+        """Reassess one category, sharing the run with concurrent callers.
 
-        # Dependencies health
-        dependency_metrics = await self._assess_dependency_health()
-        metrics.extend(dependency_metrics)
+        Returns:
+        The new result for the category.
+        """
+        task = self._inflight.get(category)
+        if task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.create_task(self._assess_category(category, fingerprint))
+            self._inflight[category] = task
+        return await asyncio.shield(task)
+
+    async def _assess_category(self, category: HealthCategory, fingerprint: tuple | None) -> CategoryResult:
+        schedule = self.SCHEDULES[category]
+        previous = self._results.get(category)
+        started = time.perf_counter()
+        try:
+            metrics = await asyncio.wait_for(self._assessors[category](), timeout=schedule.timeout)
+            timed_out = False
+        except TimeoutError:
+            self.logger.warning("Health assessment for %s timed out after %ss", category.value, schedule.timeout)
+            metrics = previous.metrics if previous else []
+            timed_out = True
 
-        # Performance health
-        performance_metrics = await self._assess_performance_health()
-        metrics.extend(performance_metrics)
+        result = CategoryResult(metrics, time.time(), time.perf_counter() - started, fingerprint, timed_out)
+        self._results[category] = result
+        return result
 
-        # Security health
-        security_metrics = await self._assess_security_health()
-        metrics.extend(security_metrics)
+    def _fingerprint(self, watch_files: tuple[str, ...], watch_suffixes: tuple[str, ...]) -> tuple:
+        """Summarize the state of watched files cheaply enough to poll.
 
-        # Code quality health
-        quality_metrics = await self._assess_code_quality_health()
-        metrics.extend(quality_metrics)
+        Changes to files matching ``watch_suffixes`` show up within
+        ``TREE_SCAN_INTERVAL`` seconds.
 
-        # Git health
-        git_metrics = await self._assess_git_health()
-        metrics.extend(git_metrics)
+        Returns:
+        Tuple that changes whenever a watched file is added, removed or modified.
+        """
+        file_states = []
+        for name in watch_files:
+            try:
+                stat = (self.project_path / name).stat()
+                file_states.append((name, stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                file_states.append((name, None, None))
 
-        # Documentation health
-        doc_metrics = await self._assess_documentation_health()
-        metrics.extend(doc_metrics)
+        return tuple(file_states), *self._tree_state(watch_suffixes)
 
-        # Calculate overall score
-        overall_score = self._calculate_overall_score(metrics)
+    def _tree_state(self, suffixes: tuple[str, ...]) -> tuple[int, int, int]:
+        """Count, latest mtime and total size of the source files with some suffixes.
 
-        health = ProjectHealth(
-            project_path=str(self.project_path),
-            overall_score=overall_score,
-            metrics=metrics,
-        )
+        Returns:
+        The summary, rescanned only if the last scan is older than ``TREE_SCAN_INTERVAL``.
+        """
+        if not suffixes:
+            return 0, 0, 0
+        cached = self._tree_states.get(suffixes)
+        if cached is not None and time.monotonic() - cached[0] < self.TREE_SCAN_INTERVAL:
+            return cached[1]
+
+        scanned_at = time.monotonic()
+        count = 0
+        latest_mtime = 0
+        total_size = 0
+        for root, dirs, files in os.walk(self.project_path):
+            dirs[:] = [name for name in dirs if name not in IGNORED_DIRS]
+            for name in files:
+                if name.endswith(suffixes):
+                    try:
+                        stat = os.stat(os.path.join(root, name))
+                    except OSError:
+                        continue
+                    count += 1
+                    latest_mtime = max(latest_mtime, stat.st_mtime_ns)
+                    total_size += stat.st_size
+        state = (count, latest_mtime, total_size)
+        self._tree_states[suffixes] = (scanned_at, state)
+        return state
+
+    async def _run_command(self, cmd: list[str], timeout: float) -> tuple[int, str] | None:
+        """Run a command asynchronously in the project directory.
+
+        The process is killed if it outlives the timeout or the caller is
+        cancelled (for example by the category timeout).
 
-        # Cache result
-        self._cache[cache_key] = {
-            "health": {
-                "project_path": health.project_path,
-                "overall_score": health.overall_score,
-                "metrics": health.metrics,
-                "last_assessment": health.last_assessment,
-            },
-            "timestamp": time.time(),
-        }
+        Returns:
+        Tuple of (return code, stdout), or None if the command is missing or timed out.
+        """
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                cwd=self.project_path,
+                stdin=asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL,
+            )
+        except (FileNotFoundError, PermissionError):
+            return None
 
-        return health
+        try:
+            stdout, _ = await asyncio.wait_for(process.communicate(), timeout=timeout)
+        except TimeoutError:
+            return None
+        finally:
+            if process.returncode is None:
+                with contextlib.suppress(ProcessLookupError):
+                    process.kill()
+                await process.wait()
+        return process.returncode, stdout.decode("utf-8", errors="replace")
 
     async def _assess_build_health(self) -> list[HealthMetric]:
         """Assess build system health."""
@@ -315,9 +504,13 @@ class HealthCalculator:
                 "**/src/**/__tests__/**/*",
             ]
 
-            test_files = []
-            for pattern in test_patterns:
-                test_files.extend(list(self.project_path.glob(pattern)))
+            def find_test_files() -> list[Path]:
+                test_files = []
+                for pattern in test_patterns:
+                    test_files.extend(list(self.project_path.glob(pattern)))
+                return test_files
+
+            test_files = await asyncio.to_thread(find_test_files)
 
             test_coverage_score = min(100, len(test_files) * 10)  # 10 points per test file, max 100
 
@@ -402,7 +595,7 @@ class HealthCalculator:
 
         try:
             # Check project size and structure
-            file_count = len(list(self.project_path.rglob("*")))
+            file_count = await asyncio.to_thread(lambda: sum(1 for _ in self.project_path.rglob("*")))
             size_score = max(0, 100 - max(0, (file_count - 1000) // 100))  # Penalty for large projects
 
             metrics.append(
@@ -572,18 +765,15 @@ class HealthCalculator:
                 )
                 return metrics
 
-            # Check git status
-            result = subprocess.run(
-                ["git", "status", "--porcelain"],
-                check=False,
-                cwd=self.project_path,
-                capture_output=True,
-                text=True,
-                timeout=10,
+            # Check git status and recent commit activity
+            status_result, log_result = await asyncio.gather(
+                self._run_command(["git", "status", "--porcelain"], timeout=10),
+                self._run_command(["git", "log", "--oneline", "-10"], timeout=10),
             )
 
-            if result.returncode == 0:
-                uncommitted_files = len(result.stdout.strip().split("\n")) if result.stdout.strip() else 0
+            if status_result is not None and status_result[0] == 0:
+                stdout = status_result[1]
+                uncommitted_files = len(stdout.strip().split("\n")) if stdout.strip() else 0
                 git_status_score = max(0, 100 - (uncommitted_files * 10))  # Penalty for uncommitted files
 
                 metrics.append(
@@ -596,18 +786,9 @@ class HealthCalculator:
                     )
                 )
 
-            # Check recent commit activity
-            result = subprocess.run(
-                ["git", "log", "--oneline", "-10"],
-                check=False,
-                cwd=self.project_path,
-                capture_output=True,
-                text=True,
-                timeout=10,
-            )
-
-            if result.returncode == 0:
-                recent_commits = len(result.stdout.strip().split("\n")) if result.stdout.strip() else 0
+            if log_result is not None and log_result[0] == 0:
+                stdout = log_result[1]
+                recent_commits = len(stdout.strip().split("\n")) if stdout.strip() else 0
                 commit_activity_score = min(100, recent_commits * 10)
 
                 metrics.append(
@@ -620,7 +801,7 @@ class HealthCalculator:
                     )
                 )
 
-        except (OSError, subprocess.SubprocessError, subprocess.TimeoutExpired) as e:
+        except (OSError, subprocess.SubprocessError) as e:
             self.logger.debug("Git health assessment error: %s", e)
 
         return metrics
@@ -722,18 +903,9 @@ class HealthCalculator:
         ]
 
         for cmd in build_commands:
-            try:
-                result = subprocess.run(
-                    cmd,
-                    check=False,
-                    cwd=self.project_path,
-                    capture_output=True,
-                    timeout=30,
-                )
-                if result.returncode == 0:
-                    return 100
-            except (subprocess.TimeoutExpired, FileNotFoundError):
-                continue
+            result = await self._run_command(cmd, timeout=30)
+            if result is not None and result[0] == 0:
+                return 100
 
         return 30  # Default score if no build command works
 
@@ -749,18 +921,9 @@ class HealthCalculator:
         ]
 
         for cmd in test_commands:
-            try:
-                result = subprocess.run(
-                    cmd,
-                    check=False,
-                    cwd=self.project_path,
-                    capture_output=True,
-                    timeout=60,
-                )
-                if result.returncode == 0:
-                    return 100
-            except (subprocess.TimeoutExpired, FileNotFoundError):
-                continue
+            result = await self._run_command(cmd, timeout=60)
+            if result is not None and result[0] == 0:
+                return 100
 
         return 40  # Default score if no test command works
 
@@ -865,31 +1028,24 @@ class HealthCalculator:
 
     async def _assess_code_documentation(self) -> int:
         """Assess code documentation coverage."""
+        return await asyncio.to_thread(self._scan_code_documentation)
+
+    def _scan_code_documentation(self) -> int:
+        """Assess code documentation coverage from the shared source file index.
+
+        Only files added or changed since the last refresh are read.
+
+        Returns:
+        Integer representing.
+        """
         try:
-            # Look for common source files
-            source_patterns = ["**/*.py", "**/*.js", "**/*.ts", "**/*.rs", "**/*.go"]
-
-            total_files = 0
-            documented_files = 0
-
-            for pattern in source_patterns:
-                for file_path in self.project_path.glob(pattern):
-                    if file_path.is_file() and "node_modules" not in str(file_path):
-                        total_files += 1
-                        try:
-                            content = file_path.read_text()
-                            # Simple heuristic: look for docstrings/comments
-                            if (
-                                '"""' in content
-                                or "'''" in content  # Python docstrings
-                                or "/**" in content  # JS/TS JSDoc
-                                or "///" in content  # Rust doc comments
-                                or "// " in content
-                            ):  # General comments
-                                documented_files += 1
-                        except (OSError, UnicodeDecodeError) as e:
-                            self.logger.warning("Could not parse file %s: %s", file_path, e)
-                            continue
+            index = SourceFileIndex.for_root(self.project_path)
+            index.refresh()
+            source_files = index.files(SOURCE_SUFFIXES, analyzers=("doc",))
+
+            total_files = len(source_files)
+            # Simple heuristic: look for docstrings/comments
+            documented_files = sum(1 for entry in source_files if entry.readable and (entry.stats.get("doc") or {}).get("documented"))
 
             if total_files > 0:
                 doc_ratio = documented_files / total_files
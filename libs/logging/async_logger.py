@@ -1,7 +1,6 @@
 # Copyright notice.
 
 import asyncio
-import inspect
 import logging
 import os
 import sys
@@ -12,6 +11,7 @@ from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
+from types import CodeType, TracebackType
 from typing import Optional
 
 from .batch_processor import BatchProcessor
@@ -19,7 +19,27 @@ from .batch_processor import BatchProcessor
 # Copyright (c) 2024 Yesman Claude Project
 # Licensed under the MIT License
 
-"""Asynchronous logger with queue-based processing for high performance."""
+"""Asynchronous logger with queue-based processing for high performance.
+
+``AsyncLogger.log`` only does what cannot be deferred: a level check, a cached
+call-site lookup and, for errors, grabbing ``sys.exc_info()``. Message
+``%``-formatting, traceback formatting and serialization all happen when the
+processing loop consumes the entry, so filtered or dropped entries cost almost
+nothing.
+"""
+
+ExcInfo = tuple[type[BaseException], BaseException, TracebackType | None]
+
+_process_id = os.getpid()
+
+
+def _refresh_process_id() -> None:
+    global _process_id  # noqa: PLW0603
+    _process_id = os.getpid()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_refresh_process_id)
 
 
 class LogLevel(Enum):
@@ -38,21 +58,95 @@ class LogLevel(Enum):
         self.level_name = name
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
+class CallSite:
+    """Where a log call was made."""
+
+    module: str
+    function: str
+    line_number: int
+
+
+_call_sites: dict[tuple[CodeType, int], CallSite] = {}
+
+
+def _call_site(depth: int) -> CallSite | None:
+    """Return the call site ``depth`` frames above the caller.
+
+    Call sites are cached per code object and line, so repeated calls from the
+    same line only cost a frame lookup and a dictionary hit.
+
+    Returns:
+        The cached call site, or None if the stack is not that deep.
+    """
+    try:
+        frame = sys._getframe(depth + 1)  # noqa: SLF001
+    except ValueError:
+        return None
+    key = (frame.f_code, frame.f_lineno)
+    site = _call_sites.get(key)
+    if site is None:
+        site = _call_sites[key] = CallSite(frame.f_globals.get("__name__", ""), frame.f_code.co_name, frame.f_lineno)
+    return site
+
+
+@dataclass(slots=True)
 class LogEntry:
-    """Structured log entry."""
+    """Structured log entry.
+
+    ``message`` is kept as passed together with its ``%``-style ``args``;
+    ``get_message()`` formats it on demand.
+    """
 
     level: LogLevel
-    message: str
+    message: object
+    args: tuple = ()
     timestamp: float = field(default_factory=time.time)
     logger_name: str = ""
-    module: str = ""
-    function: str = ""
-    line_number: int = 0
+    call_site: CallSite | None = None
     thread_id: int = field(default_factory=threading.get_ident)
-    process_id: int = field(default_factory=os.getpid)
+    process_id: int = field(default_factory=lambda: _process_id)
     extra_data: dict[str, object] = field(default_factory=dict)
-    exception_info: str | None = None
+    exc_info: ExcInfo | None = None
+    _formatted_exception: str | None = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def module(self) -> str:
+        """Module the entry was logged from."""
+        return self.call_site.module if self.call_site else ""
+
+    @property
+    def function(self) -> str:
+        """Function the entry was logged from."""
+        return self.call_site.function if self.call_site else ""
+
+    @property
+    def line_number(self) -> int:
+        """Line the entry was logged from."""
+        return self.call_site.line_number if self.call_site else 0
+
+    @property
+    def exception_info(self) -> str | None:
+        """Formatted traceback of the exception being handled when the entry was logged."""
+        if self._formatted_exception is None and self.exc_info is not None:
+            self._formatted_exception = "".join(traceback.format_exception(*self.exc_info))
+            # Drop the traceback so its frames can be freed
+            self.exc_info = None
+        return self._formatted_exception
+
+    def get_message(self) -> str:
+        """Format the message with its arguments.
+
+        Returns:
+            The formatted message.
+        """
+        message = str(self.message)
+        if self.args:
+            try:
+                message %= self.args
+            except (TypeError, ValueError):
+                message = f"{message} {self.args!r}"
+        return message
 
     def to_dict(self) -> dict[str, object]:
         """Convert to dictionary for serialization."""
@@ -60,7 +154,7 @@ class LogEntry:
             "timestamp": self.timestamp,
             "level": self.level.level_name,
             "level_value": self.level.level_value,
-            "message": self.message,
+            "message": self.get_message(),
             "logger_name": self.logger_name,
             "module": self.module,
             "function": self.function,
@@ -72,6 +166,11 @@ class LogEntry:
         }
 
 
+def _current_exception() -> ExcInfo | None:
+    exc_info = sys.exc_info()
+    return exc_info if exc_info[0] is not None else None
+
+
 class AsyncLoggerConfig:
     """Configuration for AsyncLogger."""
 
@@ -87,6 +186,7 @@ class AsyncLoggerConfig:
         enable_batch_processor: bool = True,  # noqa: FBT001
         log_format: str = "{timestamp} [{level}] {logger_name}: {message}",
         output_dir: Path | None = None,
+        capture_call_site: bool = True,  # noqa: FBT001
     ) -> None:
         """Initialize the async logger configuration."""
         self.name = name
@@ -99,6 +199,7 @@ class AsyncLoggerConfig:
         self.enable_batch_processor = enable_batch_processor
         self.log_format = log_format
         self.output_dir = output_dir or Path.home() / ".scripton" / "yesman" / "logs"
+        self.capture_call_site = capture_call_site
 
 
 class AsyncLogger:
@@ -131,6 +232,7 @@ class AsyncLogger:
             raise RuntimeError(msg)
 
         self.config = config or AsyncLoggerConfig()
+        self._level_value = self.config.level.level_value
 
         # Queue for log entries
         self.log_queue: asyncio.Queue = asyncio.Queue(maxsize=self.config.max_queue_size)
@@ -261,103 +363,99 @@ class AsyncLogger:
 
     async def _log_to_standard(self, entry: LogEntry) -> None:
         """Log entry to standard Python logging."""
-        # Format message
-        message = entry.message
+        standard_level = entry.level.level_value
+        if not self.standard_logger.isEnabledFor(standard_level):
+            return
+
+        message = entry.get_message()
         if entry.extra_data:
-            extra_str = " | ".join([f"{k}={v}" for k, v in entry.extra_data.items()])
-            message = f"{message} | {extra_str}"
+            message = " | ".join([message, *(f"{k}={v}" for k, v in entry.extra_data.items())])
 
         # Add exception info if present
         if entry.exception_info:
             message = f"{message}\n{entry.exception_info}"
 
-        # Log to standard logger
-        standard_level = entry.level.level_value
         self.standard_logger.log(standard_level, message)
 
     def _queue_entry(self, entry: LogEntry) -> None:
-        """Queue a log entry (thread-safe)."""
+        """Queue a log entry, dropping the oldest one when the queue is full."""
         try:
-            # Try to put entry in queue
-            if self.log_queue.full():
-                self.stats["queue_full_events"] += 1
-                # Drop oldest entry to make room
-                try:
-                    self.log_queue.get_nowait()
-                    self.stats["entries_dropped"] += 1
-                except asyncio.QueueEmpty:
-                    pass
-
             self.log_queue.put_nowait(entry)
-            self.stats["entries_queued"] += 1
-
-        except Exception as e:
-            # Fallback to standard logging
-            self.standard_logger.exception("Failed to queue log entry")
-
-    def log(self, level: LogLevel, message: str, **kwargs) -> None:
-        """Log a message at specified level."""
-        # Extract caller information
-        frame = None
-        try:
-            frame = inspect.currentframe().f_back
-            module = frame.f_globals.get("__name__", "")
-            function = frame.f_code.co_name
-            line_number = frame.f_lineno
-        except (AttributeError, KeyError, IndexError):
-            # Handle frame inspection errors gracefully
-            module = function = ""
-            line_number = 0
-        finally:
-            del frame  # Prevent reference cycles
-
-        # Create log entry
-        entry = LogEntry(
-            level=level,
-            message=str(message),
-            logger_name=self.config.name,
-            module=module,
-            function=function,
-            line_number=line_number,
-            extra_data=kwargs,
-        )
-
-        # Add exception info if logging an exception
-        if level in {LogLevel.ERROR, LogLevel.CRITICAL}:
+        except asyncio.QueueFull:
+            self.stats["queue_full_events"] += 1
             try:
-                if sys.exc_info()[0] is not None:
-                    entry.exception_info = traceback.format_exc()
-            except Exception as e:
-                # Ignore errors in exception info collection
-                self.standard_logger.debug("Failed to capture exception info: %s", e, exc_info=False)
+                self.log_queue.get_nowait()
+                self.stats["entries_dropped"] += 1
+            except asyncio.QueueEmpty:
+                pass
+            try:
+                self.log_queue.put_nowait(entry)
+            except asyncio.QueueFull:
+                self.stats["entries_dropped"] += 1
+                return
+        self.stats["entries_queued"] += 1
+
+    def is_enabled_for(self, level: LogLevel) -> bool:
+        """Check whether entries at ``level`` would be logged.
+
+        Returns:
+            True if ``level`` passes the configured threshold.
+        """
+        return level.level_value >= self._level_value
+
+    def log(self, level: LogLevel, message: object, *args: object, stacklevel: int = 1, **kwargs) -> None:
+        """Log a message at specified level.
+
+        ``args`` are merged into ``message`` with ``%``-formatting when the
+        entry is processed, not here. ``stacklevel`` works as in
+        :mod:`logging`, for wrappers that want their caller recorded.
+        """
+        if level.level_value < self._level_value:
+            return
 
-        # Queue the entry
-        self._queue_entry(entry)
+        self._queue_entry(
+            LogEntry(
+                level,
+                message,
+                args,
+                time.time(),
+                self.config.name,
+                _call_site(stacklevel) if self.config.capture_call_site else None,
+                extra_data=kwargs,
+                exc_info=_current_exception() if level.level_value >= LogLevel.ERROR.level_value else None,
+            ),
+        )
 
     # Convenience methods for different log levels
-    def trace(self, message: str, **kwargs) -> None:
+    def trace(self, message: object, *args: object, **kwargs) -> None:
         """Log a trace message."""
-        self.log(LogLevel.TRACE, message, **kwargs)
+        if LogLevel.TRACE.level_value >= self._level_value:
+            self.log(LogLevel.TRACE, message, *args, stacklevel=2, **kwargs)
 
-    def debug(self, message: str, **kwargs) -> None:
+    def debug(self, message: object, *args: object, **kwargs) -> None:
         """Log a debug message."""
-        self.log(LogLevel.DEBUG, message, **kwargs)
+        if LogLevel.DEBUG.level_value >= self._level_value:
+            self.log(LogLevel.DEBUG, message, *args, stacklevel=2, **kwargs)
 
-    def info(self, message: str, **kwargs) -> None:
+    def info(self, message: object, *args: object, **kwargs) -> None:
         """Log an info message."""
-        self.log(LogLevel.INFO, message, **kwargs)
+        if LogLevel.INFO.level_value >= self._level_value:
+            self.log(LogLevel.INFO, message, *args, stacklevel=2, **kwargs)
 
-    def warning(self, message: str, **kwargs) -> None:
+    def warning(self, message: object, *args: object, **kwargs) -> None:
         """Log a warning message."""
-        self.log(LogLevel.WARNING, message, **kwargs)
+        if LogLevel.WARNING.level_value >= self._level_value:
+            self.log(LogLevel.WARNING, message, *args, stacklevel=2, **kwargs)
 
-    def error(self, message: str, **kwargs) -> None:
+    def error(self, message: object, *args: object, **kwargs) -> None:
         """Log an error message."""
-        self.log(LogLevel.ERROR, message, **kwargs)
+        if LogLevel.ERROR.level_value >= self._level_value:
+            self.log(LogLevel.ERROR, message, *args, stacklevel=2, **kwargs)
 
-    def critical(self, message: str, **kwargs) -> None:
+    def critical(self, message: object, *args: object, **kwargs) -> None:
         """Log a critical message."""
-        self.log(LogLevel.CRITICAL, message, **kwargs)
+        if LogLevel.CRITICAL.level_value >= self._level_value:
+            self.log(LogLevel.CRITICAL, message, *args, stacklevel=2, **kwargs)
 
     # Context manager support
     async def __aenter__(self):
@@ -389,6 +487,7 @@ class AsyncLogger:
     def set_level(self, level: LogLevel) -> None:
         """Change the logging level."""
         self.config.level = level
+        self._level_value = level.level_value
         self.standard_logger.setLevel(level.level_value)
 
     async def flush(self) -> None:
@@ -1,18 +1,25 @@
 # Copyright notice.
 
 import asyncio
-import gzip
 import json
 import logging
 import time
 from collections import deque
+from collections.abc import Iterator
 from dataclasses import dataclass
 from pathlib import Path
 
+from .log_sink import StreamingLogSink, iter_json_lines
+
 # Copyright (c) 2024 Yesman Claude Project
 # Licensed under the MIT License
 
-"""Batch log processor for optimized I/O operations."""
+"""Batch log processor for optimized I/O operations.
+
+Batches are appended as one JSON line each to rotating log files through a
+``StreamingLogSink``, which does the file I/O and compression on its own
+writer thread so flushing a batch never blocks the event loop.
+"""
 
 
 @dataclass
@@ -44,11 +51,17 @@ class BatchProcessor:
         max_file_size: int = 10 * 1024 * 1024,  # 10MB
         compression_enabled: bool = True,  # noqa: FBT001
         output_dir: Path | None = None,
+        compression: str = "gzip",
+        max_file_age: float = 3600.0,
+        flush_interval: float = 1.0,
     ) -> None:
         self.max_batch_size = max_batch_size
         self.max_batch_time = max_batch_time
         self.max_file_size = max_file_size
+        self.max_file_age = max_file_age
+        self.flush_interval = flush_interval
         self.compression_enabled = compression_enabled
+        self.compression = compression if compression_enabled else None
         self.output_dir = output_dir or Path.home() / ".scripton" / "yesman" / "logs"
 
         # Ensure output directory exists
@@ -60,6 +73,7 @@ class BatchProcessor:
         self.batch_counter = 0
         self.current_file_size = 0
         self.current_log_file: Path | None = None
+        self._sink: StreamingLogSink | None = None
 
         # Statistics
         self.stats = {
@@ -101,7 +115,13 @@ class BatchProcessor:
             self._processing_task.cancel()
 
         # Flush any remaining entries
-        await self._flush_pending_entries()
+        while self.pending_entries:
+            pending = len(self.pending_entries)
+            await self._flush_pending_entries()
+            if len(self.pending_entries) >= pending:
+                break
+
+        await self._close_sink()
 
         self.logger.info("Batch processor stopped")
 
@@ -167,54 +187,56 @@ class BatchProcessor:
             # Re-queue entries for retry
             self.pending_entries.extendleft(reversed(entries))
 
+    def _get_sink(self) -> StreamingLogSink:
+        if self._sink is None:
+            self._sink = StreamingLogSink(
+                self.output_dir,
+                compression=self.compression,
+                max_file_size=self.max_file_size,
+                max_file_age=self.max_file_age,
+                flush_interval=self.flush_interval,
+            )
+        return self._sink
+
+    async def _close_sink(self) -> None:
+        if self._sink is None:
+            return
+        sink, self._sink = self._sink, None
+        await asyncio.to_thread(sink.close)
+        self._update_file_stats(sink)
+
+    def _update_file_stats(self, sink: StreamingLogSink) -> None:
+        self.current_log_file = sink.current_file
+        self.current_file_size = sink.current_file_size
+        self.stats["bytes_written"] = sink.bytes_written
+        self.stats["compression_ratio"] = sink.compression_ratio
+        self.stats["files_created"] = sink.stats["files_created"]
+
     async def _write_batch(self, batch: LogBatch) -> None:
-        """Write a batch to storage."""
-        # Check if we need a new log file
-        if not self.current_log_file or self.current_file_size >= self.max_file_size:
-            await self._rotate_log_file()
+        """Write a batch to storage.
 
-        # Prepare batch data
+        Serialization happens here; the append itself runs on the sink's
+        writer thread, which also handles compression and rotation.
+        """
         batch_data = {
             "batch_id": batch.batch_id,
             "timestamp": batch.timestamp,
             "entry_count": len(batch.entries),
             "entries": batch.entries,
         }
+        payload = (json.dumps(batch_data, default=str, separators=(",", ":")) + "\n").encode("utf-8")
 
-        # Serialize to JSON
-        json_data = json.dumps(batch_data, default=str, separators=(",", ":"))
-        raw_size = len(json_data.encode("utf-8"))
-
-        # Write to file (with optional compression)
-        if self.compression_enabled and self.current_log_file.suffix == ".gz":
-            compressed_data = gzip.compress(json_data.encode("utf-8"))
-            self.current_log_file.write_bytes(compressed_data)
-            written_size = len(compressed_data)
-
-            # Update compression ratio
-            compression_ratio = written_size / raw_size if raw_size > 0 else 1.0
-            self.stats["compression_ratio"] = (self.stats["compression_ratio"] * (self.stats["batches_processed"] - 1) + compression_ratio) / self.stats["batches_processed"]
-        else:
-            # Write uncompressed
-            json_data += "\n"  # Add newline for easier reading
-            self.current_log_file.write_text(json_data, encoding="utf-8")
-            written_size = len(json_data.encode("utf-8"))
+        sink = self._get_sink()
+        await asyncio.wrap_future(sink.write(payload))
+        self._update_file_stats(sink)
 
-        self.current_file_size += written_size
-        self.stats["bytes_written"] += written_size
-
-        self.logger.debug("Wrote batch %s: %d entries, %d bytes", batch.batch_id, len(batch.entries), written_size)
+        self.logger.debug("Wrote batch %s: %d entries, %d bytes", batch.batch_id, len(batch.entries), len(payload))
 
     async def _rotate_log_file(self) -> None:
         """Rotate to a new log file."""
-        timestamp = int(time.time())
-        file_extension = ".jsonl.gz" if self.compression_enabled else ".jsonl"
-
-        self.current_log_file = self.output_dir / f"yesman_logs_{timestamp}{file_extension}"
-        self.current_file_size = 0
-        self.stats["files_created"] += 1
-
-        self.logger.info("Rotated to new log file: %s", self.current_log_file)
+        sink = self._get_sink()
+        await asyncio.wrap_future(sink.rotate())
+        self._update_file_stats(sink)
 
     def get_statistics(self) -> dict[str, object]:
         """Get processing statistics.
@@ -231,6 +253,7 @@ class BatchProcessor:
             "max_batch_size": self.max_batch_size,
             "max_batch_time": self.max_batch_time,
             "compression_enabled": self.compression_enabled,
+            "compression": self.compression,
             "uptime_seconds": uptime,
             "entries_per_second": self.stats["entries_processed"] / max(uptime, 1),
             "output_directory": str(self.output_dir),
@@ -255,34 +278,29 @@ class BatchProcessor:
 
         return removed_count
 
-    async def read_batch_file(self, file_path: Path) -> list[LogBatch]:
-        """Read and parse a batch log file."""
-        batches = []
+    def iter_batch_file(self, file_path: Path) -> Iterator[LogBatch]:
+        """Stream the batches of a log file without loading it into memory.
 
-        try:
-            if file_path.suffix == ".gz":
-                # Read compressed file
-                compressed_data = file_path.read_bytes()
-                json_data = gzip.decompress(compressed_data).decode("utf-8")
-            else:
-                # Read uncompressed file
-                json_data = file_path.read_text(encoding="utf-8")
-
-            # Parse JSON lines
-            for line in json_data.strip().split("\n"):
-                if line.strip():
-                    batch_data = json.loads(line)
-                    batch = LogBatch(
-                        entries=batch_data["entries"],
-                        timestamp=batch_data["timestamp"],
-                        batch_id=batch_data["batch_id"],
-                    )
-                    batches.append(batch)
+        Files that are still being written are read up to their last flush
+        point.
 
-        except Exception as e:
-            self.logger.exception("Error reading batch file {file_path}")  # noqa: G004
+        Yields:
+            Each batch in file order.
+        """
+        for batch_data in iter_json_lines(file_path):
+            yield LogBatch(
+                entries=batch_data["entries"],
+                timestamp=batch_data["timestamp"],
+                batch_id=batch_data["batch_id"],
+            )
 
-        return batches
+    async def read_batch_file(self, file_path: Path) -> list[LogBatch]:
+        """Read and parse a batch log file."""
+        try:
+            return await asyncio.to_thread(lambda: list(self.iter_batch_file(file_path)))
+        except Exception:
+            self.logger.exception("Error reading batch file %s", file_path)
+            return []
 
     def get_recent_entries(self, limit: int = 100) -> list[dict[str, object]]:
         """Get recent log entries from memory (pending entries).
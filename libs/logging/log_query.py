@@ -0,0 +1,513 @@
+# Copyright notice.
+
+import base64
+import heapq
+import json
+import logging
+import os
+import re
+import threading
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import BinaryIO, ClassVar
+
+# Copyright (c) 2024 Yesman Claude Project
+# Licensed under the MIT License
+
+"""Query plain-text log files from the end without reading them whole.
+
+``LogQueryService`` reads log files backwards in fixed-size blocks, so the
+newest entries are found first and a query stops as soon as it has enough
+results. Every block it reads completely is summarised in a sparse per-file
+index: the levels and sources that occur in it and its time range. Later
+queries with a ``level`` or ``source`` filter skip blocks that cannot match
+and ``since`` queries stop at the first block that is entirely older. Log files
+are append-only, so a summary stays valid until the file is rotated or
+truncated, which resets its index.
+
+Results from several files are merged newest first. A query returns an opaque
+cursor holding, per file, the offset of the oldest entry returned so far;
+passing it back continues exactly where the previous page stopped, however
+many lines were appended in between.
+"""
+
+BLOCK_SIZE = 64 * 1024
+MAX_INDEXED_SOURCES = 32
+
+_BRACKETED_PATTERN = re.compile(r"^\[([^\]]+)\]\s*\[([^\]]+)\]\s*\[([^\]]+)\]\s*(.+)$")
+_SIMPLE_PATTERN = re.compile(r"^\[([^\]]+)\]\s*\[([^\]]+)\]\s*(.+)$")
+_STANDARD_PATTERN = re.compile(r"^(\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2}(?:[,.]\d+)?) - (\S+) - ([A-Za-z]+) - (.*)$")
+
+_LEVEL_BITS = {name: 1 << bit for bit, name in enumerate(("trace", "debug", "info", "warning", "error", "critical"))}
+_OTHER_LEVEL_BIT = 1 << len(_LEVEL_BITS)
+
+
+def _level_bit(level: str) -> int:
+    return _LEVEL_BITS.get(level, _OTHER_LEVEL_BIT)
+
+
+def _parse_time(timestamp: str) -> float | None:
+    try:
+        return datetime.fromisoformat(timestamp.replace(",", ".")).timestamp()
+    except ValueError:
+        return None
+
+
+@dataclass(slots=True)
+class LogLine:
+    """A parsed log line."""
+
+    level: str
+    timestamp: str
+    source: str
+    message: str
+    raw: str
+    time: float | None = None
+    offset: int = 0
+
+    def to_dict(self) -> dict[str, object]:
+        """Convert to the dictionary served by the logs API.
+
+        Returns:
+            Dictionary with level, timestamp, source, message and raw line.
+        """
+        return {
+            "level": self.level,
+            "timestamp": self.timestamp,
+            "source": self.source,
+            "message": self.message,
+            "raw": self.raw,
+        }
+
+
+def _parse_json_line(line: str) -> LogLine | None:
+    try:
+        data = json.loads(line)
+    except json.JSONDecodeError:
+        return None
+    if not isinstance(data, dict) or "message" not in data:
+        return None
+
+    raw_timestamp = data.get("timestamp")
+    if isinstance(raw_timestamp, int | float):
+        time_value = float(raw_timestamp)
+        timestamp = datetime.fromtimestamp(time_value, UTC).isoformat()
+    else:
+        timestamp = str(raw_timestamp or "")
+        time_value = _parse_time(timestamp) if timestamp else None
+    return LogLine(
+        level=str(data.get("level", "info")).lower(),
+        timestamp=timestamp,
+        source=str(data.get("source") or data.get("logger_name") or "yesman"),
+        message=str(data["message"]),
+        raw=line,
+        time=time_value,
+    )
+
+
+def parse_log_line(line: str) -> LogLine | None:
+    """Parse one log line.
+
+    Understands ``[timestamp] [level] [source] message``,
+    ``[timestamp] [level] message``, the standard ``logging`` format used for
+    ``yesman.log`` and JSON entries. Anything else is returned as an
+    unstructured ``info`` line.
+
+    Returns:
+        The parsed line, or None for blank lines.
+    """
+    line = line.strip()
+    if not line:
+        return None
+
+    if line.startswith("{"):
+        parsed = _parse_json_line(line)
+        if parsed is not None:
+            return parsed
+
+    match = _BRACKETED_PATTERN.match(line)
+    if match:
+        timestamp, level, source, message = match.groups()
+        return LogLine(level.lower(), timestamp, source, message, line, _parse_time(timestamp))
+
+    match = _STANDARD_PATTERN.match(line)
+    if match:
+        timestamp, source, level, message = match.groups()
+        return LogLine(level.lower(), timestamp, source, message, line, _parse_time(timestamp))
+
+    match = _SIMPLE_PATTERN.match(line)
+    if match:
+        timestamp, level, message = match.groups()
+        return LogLine(level.lower(), timestamp, "yesman", message, line, _parse_time(timestamp))
+
+    return LogLine("info", datetime.now(UTC).isoformat(), "unknown", line, line)
+
+
+@dataclass(slots=True)
+class LogFilter:
+    """Filters applied to a log query."""
+
+    level: str | None = None
+    source: str | None = None
+    search: str | None = None
+    since: float | None = None
+
+    def __post_init__(self) -> None:
+        self.level = self.level.lower() if self.level else None
+        self.search = self.search.lower() if self.search else None
+
+    def matches(self, line: LogLine) -> bool:
+        """Check a parsed line against the filters.
+
+        Returns:
+            True if the line passes every filter.
+        """
+        if self.level and line.level != self.level:
+            return False
+        if self.source and line.source != self.source:
+            return False
+        if self.since is not None and line.time is not None and line.time < self.since:
+            return False
+        return not (self.search and self.search not in line.message.lower())
+
+
+@dataclass(slots=True)
+class BlockSummary:
+    """What the lines starting in one block of a log file contain.
+
+    ``head`` is the number of bytes from the block start to its first line
+    start, which belong to a line from the previous block.
+    """
+
+    head: int
+    line_count: int = 0
+    level_mask: int = 0
+    sources: set[str] | None = field(default_factory=set)
+    min_time: float | None = None
+    max_time: float | None = None
+
+    @classmethod
+    def from_lines(cls, head: int, lines: list[LogLine]) -> "BlockSummary":
+        """Summarise the parsed lines of a block.
+
+        Returns:
+            The block summary.
+        """
+        summary = cls(head=head, line_count=len(lines))
+        for line in lines:
+            summary.level_mask |= _level_bit(line.level)
+            if summary.sources is not None:
+                summary.sources.add(line.source)
+                if len(summary.sources) > MAX_INDEXED_SOURCES:
+                    summary.sources = None
+            if line.time is not None:
+                summary.min_time = line.time if summary.min_time is None else min(summary.min_time, line.time)
+                summary.max_time = line.time if summary.max_time is None else max(summary.max_time, line.time)
+        return summary
+
+    def may_match(self, log_filter: LogFilter) -> bool:
+        """Check whether any line in the block could pass ``log_filter``.
+
+        Returns:
+            False only if the block can be skipped.
+        """
+        if log_filter.level and not self.level_mask & _level_bit(log_filter.level):
+            return False
+        return not (log_filter.source and self.sources is not None and log_filter.source not in self.sources)
+
+
+@dataclass
+class LogFileIndex:
+    """Sparse block index of one log file."""
+
+    device: int
+    inode: int
+    size: int = 0
+    blocks: dict[int, BlockSummary] = field(default_factory=dict)
+
+
+@dataclass
+class LogPage:
+    """One page of query results."""
+
+    entries: list[LogLine]
+    next_cursor: str | None
+
+    def to_dict(self) -> dict[str, object]:
+        """Convert to dictionary.
+
+        Returns:
+            Dictionary with the entries and the cursor of the next page.
+        """
+        return {"entries": [entry.to_dict() for entry in self.entries], "next_cursor": self.next_cursor}
+
+
+def _read_at(handle: BinaryIO, offset: int, length: int) -> bytes:
+    handle.seek(offset)
+    return handle.read(length)
+
+
+def _encode_cursor(positions: dict[str, tuple[int, int]]) -> str:
+    data = json.dumps({name: list(position) for name, position in positions.items()}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(data.encode("utf-8")).decode("ascii")
+
+
+def _decode_cursor(cursor: str) -> dict[str, tuple[int, int]]:
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return {str(name): (int(inode), int(offset)) for name, (inode, offset) in data.items()}
+    except (ValueError, TypeError, AttributeError) as e:
+        msg = "Invalid log cursor"
+        raise ValueError(msg) from e
+
+
+class LogQueryService:
+    """Answer log queries with reverse block reads and a sparse block index."""
+
+    _instances: ClassVar[dict[Path, "LogQueryService"]] = {}
+    _instances_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    def __init__(self, log_dir: Path, block_size: int = BLOCK_SIZE) -> None:
+        self.log_dir = log_dir
+        self.block_size = block_size
+        self._indexes: dict[str, LogFileIndex] = {}
+        self._lock = threading.Lock()
+        self.stats = {
+            "queries": 0,
+            "bytes_read": 0,
+            "blocks_read": 0,
+            "blocks_skipped": 0,
+        }
+        self.logger = logging.getLogger("yesman.log_query")
+
+    @classmethod
+    def for_directory(cls, log_dir: Path) -> "LogQueryService":
+        """Get the shared service for a log directory.
+
+        Returns:
+            The service, created on first use.
+        """
+        log_dir = log_dir.expanduser().resolve()
+        with cls._instances_lock:
+            service = cls._instances.get(log_dir)
+            if service is None:
+                service = cls._instances[log_dir] = cls(log_dir)
+            return service
+
+    def query(
+        self,
+        files: list[Path],
+        limit: int = 100,
+        level: str | None = None,
+        source: str | None = None,
+        search: str | None = None,
+        since: float | None = None,
+        cursor: str | None = None,
+    ) -> LogPage:
+        """Return the newest matching entries across ``files``.
+
+        Returns:
+            Up to ``limit`` entries, newest first, and the cursor of the next
+            page (None when there are no older entries).
+
+        Raises:
+            ValueError: If ``cursor`` is malformed.
+        """
+        self.stats["queries"] += 1
+        log_filter = LogFilter(level=level, source=source, search=search, since=since)
+        previous = _decode_cursor(cursor) if cursor else None
+
+        positions: dict[str, tuple[int, int]] = {}
+        streams = []
+        for path in files:
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            if previous is None:
+                end = stat.st_size
+            else:
+                inode, end = previous.get(path.name, (stat.st_ino, 0))
+                if inode != stat.st_ino:
+                    # Rotated since the first page; its entries are newer than the cursor
+                    end = 0
+            positions[path.name] = (stat.st_ino, end)
+            if end > 0:
+                streams.append(self._keyed(path.name, self.iter_entries(path, end=end, log_filter=log_filter)))
+
+        entries: list[LogLine] = []
+        exhausted = True
+        for _, name, entry in heapq.merge(*streams, key=lambda item: item[0], reverse=True):
+            if len(entries) == limit:
+                exhausted = False
+                break
+            entries.append(entry)
+            positions[name] = (positions[name][0], entry.offset)
+
+        return LogPage(entries=entries, next_cursor=None if exhausted else _encode_cursor(positions))
+
+    def iter_entries(self, path: Path, end: int | None = None, log_filter: LogFilter | None = None) -> Iterator[LogLine]:
+        """Iterate the entries of one file from the newest to the oldest.
+
+        ``end`` limits the scan to the bytes before that offset, which must be
+        a line start (as in ``LogLine.offset``) or the file size.
+
+        Yields:
+            Each matching entry.
+        """
+        log_filter = log_filter or LogFilter()
+        with open(path, "rb") as handle:
+            stat = os.fstat(handle.fileno())
+            index = self._index_for(path, stat)
+            size = stat.st_size if end is None else min(end, stat.st_size)
+            if size <= 0:
+                return
+
+            block = (size - 1) // self.block_size
+            region_end = size
+            carry = b""
+            while block >= 0:
+                start = block * self.block_size
+                full = region_end == start + self.block_size
+                summary = index.blocks.get(block) if full else None
+
+                if summary is not None:
+                    if log_filter.since is not None and summary.max_time is not None and summary.max_time < log_filter.since:
+                        return
+                    if not summary.may_match(log_filter):
+                        self.stats["blocks_skipped"] += 1
+                        head = _read_at(handle, start, summary.head)
+                        carry = head + carry if summary.line_count == 0 else head
+                        region_end = start
+                        block -= 1
+                        continue
+
+                lines, head, next_carry, terminated = self._read_block(handle, start, region_end, carry)
+                if full and terminated and summary is None:
+                    summary = index.blocks[block] = BlockSummary.from_lines(head, lines)
+
+                for line in reversed(lines):
+                    if log_filter.matches(line):
+                        yield line
+
+                if log_filter.since is not None and summary is not None and summary.min_time is not None and summary.min_time < log_filter.since:
+                    return
+                carry = next_carry
+                region_end = start
+                block -= 1
+
+    def tail(self, path: Path, limit: int) -> list[str]:
+        """Return the last ``limit`` raw lines of a file, oldest first.
+
+        Returns:
+            The lines without their trailing newlines.
+        """
+        if limit <= 0:
+            return []
+        with open(path, "rb") as handle:
+            position = os.fstat(handle.fileno()).st_size
+            buffer = b""
+            newlines = 0
+            while position > 0 and newlines <= limit:
+                start = max(position - self.block_size, 0)
+                chunk = _read_at(handle, start, position - start)
+                self.stats["bytes_read"] += len(chunk)
+                newlines += chunk.count(b"\n")
+                buffer = chunk + buffer
+                position = start
+
+        lines = buffer.split(b"\n")
+        if lines[-1] == b"":
+            lines.pop()
+        if position > 0:
+            # The first piece may start in the middle of a line
+            lines = lines[1:]
+        return [line.decode("utf-8", errors="replace").rstrip("\r") for line in lines[-limit:]]
+
+    def sources(self, files: list[Path], sample: int = 50) -> list[str]:
+        """Collect the sources of the newest ``sample`` entries of each file.
+
+        Returns:
+            Sorted source names.
+        """
+        found = set()
+        for path in files:
+            if not path.exists():
+                continue
+            for count, entry in enumerate(self.iter_entries(path)):
+                if count >= sample:
+                    break
+                found.add(entry.source)
+        return sorted(found)
+
+    def get_statistics(self) -> dict[str, object]:
+        """Get query statistics.
+
+        Returns:
+            Counters and the number of indexed blocks per file.
+        """
+        with self._lock:
+            indexed = {name: len(index.blocks) for name, index in self._indexes.items()}
+        return {**self.stats, "indexed_blocks": indexed}
+
+    @staticmethod
+    def _keyed(name: str, entries: Iterator[LogLine]) -> Iterator[tuple[float, str, LogLine]]:
+        """Attach a merge key that never increases along the file.
+
+        Lines without a timestamp (continuations, tracebacks) sort with the
+        entry after them.
+
+        Yields:
+            ``(key, file name, entry)`` tuples.
+        """
+        key = float("inf")
+        for entry in entries:
+            if entry.time is not None and entry.time < key:
+                key = entry.time
+            yield key, name, entry
+
+    def _index_for(self, path: Path, stat: os.stat_result) -> LogFileIndex:
+        key = str(path)
+        with self._lock:
+            index = self._indexes.get(key)
+            if index is None or (index.device, index.inode) != (stat.st_dev, stat.st_ino) or stat.st_size < index.size:
+                index = self._indexes[key] = LogFileIndex(device=stat.st_dev, inode=stat.st_ino)
+            index.size = stat.st_size
+            return index
+
+    def _read_block(self, handle: BinaryIO, start: int, region_end: int, carry: bytes) -> tuple[list[LogLine], int, bytes, bool]:
+        """Read and parse the lines that start in ``[start, region_end)``.
+
+        ``carry`` holds the bytes after ``region_end`` that belong to the last
+        line starting in this block.
+
+        Returns:
+            The parsed lines (oldest first), the block's head length, the carry
+            for the previous block and whether the last line is terminated.
+        """
+        read_start = start - 1 if start else 0
+        data = _read_at(handle, read_start, region_end - read_start)
+        self.stats["bytes_read"] += len(data)
+        self.stats["blocks_read"] += 1
+        previous_byte, body = (data[:1], data[1:]) if start else (b"\n", data)
+        terminated = (body + carry).endswith(b"\n")
+
+        if previous_byte == b"\n":
+            first = 0
+        else:
+            newline = body.find(b"\n")
+            first = newline + 1 if newline != -1 and newline + 1 < len(body) else None
+        if first is None:
+            return [], len(body), body + carry, terminated
+
+        lines = []
+        offset = start + first
+        for piece in (body[first:] + carry).split(b"\n"):
+            parsed = parse_log_line(piece.decode("utf-8", errors="replace")) if piece else None
+            if parsed is not None:
+                parsed.offset = offset
+                lines.append(parsed)
+            offset += len(piece) + 1
+        return lines, first, body[:first], terminated
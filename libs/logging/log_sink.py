@@ -0,0 +1,346 @@
+# Copyright notice.
+
+import gzip
+import io
+import json
+import logging
+import queue
+import threading
+import time
+import zlib
+from collections.abc import Iterator
+from concurrent.futures import Future
+from pathlib import Path
+from typing import BinaryIO
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Copyright (c) 2024 Yesman Claude Project
+# Licensed under the MIT License
+
+"""Streaming, append-only sink for newline-delimited JSON log files.
+
+A ``StreamingLogSink`` owns a dedicated writer thread that keeps the current
+log file open in append mode behind one long-lived gzip or zstd stream. Writers
+only enqueue encoded lines and get a future back, so no file I/O or compression
+happens on the caller's thread. The stream is flushed to a decodable boundary
+(``Z_SYNC_FLUSH`` / ``FLUSH_BLOCK``) at most every ``flush_interval`` seconds
+and whenever the queue goes idle, so a crash loses at most the unflushed tail.
+Files rotate once they reach ``max_file_size`` bytes on disk or
+``max_file_age`` seconds.
+"""
+
+COMPRESSION_SUFFIXES = {"gzip": ".jsonl.gz", "zstd": ".jsonl.zst", None: ".jsonl"}
+
+_CLOSE = object()
+
+
+def _resolve_compression(compression: str | None) -> str | None:
+    if compression not in COMPRESSION_SUFFIXES:
+        msg = f"Unsupported compression: {compression}"
+        raise ValueError(msg)
+    if compression == "zstd" and zstandard is None:
+        msg = "zstd compression requires the 'zstandard' package"
+        raise ValueError(msg)
+    return compression
+
+
+def _open_text_stream(path: Path) -> io.TextIOBase:
+    if path.suffix == ".gz":
+        return gzip.open(path, "rt", encoding="utf-8")
+    if path.suffix == ".zst":
+        if zstandard is None:
+            msg = "zstandard is required to read zstd-compressed log files"
+            raise ValueError(msg)
+        raw = open(path, "rb")  # noqa: SIM115
+        reader = zstandard.ZstdDecompressor().stream_reader(raw, read_across_frames=True, closefd=True)
+        return io.TextIOWrapper(reader, encoding="utf-8")
+    return open(path, encoding="utf-8")  # noqa: SIM115
+
+
+def iter_json_lines(path: Path) -> Iterator[dict[str, object]]:
+    """Stream the JSON records of a (possibly compressed) log file.
+
+    The file is decoded incrementally, so memory use does not grow with the
+    file size. A file that is still being written, or whose writer crashed,
+    ends in an unterminated compressed stream or a partial line; everything
+    up to the last flush point is yielded and the torn tail is ignored.
+
+    Yields:
+        One decoded record per line.
+    """
+    truncated_errors: tuple[type[Exception], ...] = (EOFError, zlib.error)
+    if zstandard is not None:
+        truncated_errors = (*truncated_errors, zstandard.ZstdError)
+
+    with _open_text_stream(path) as stream:
+        try:
+            for line in stream:
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    logging.getLogger("yesman.log_sink").debug("Skipping unreadable line in %s", path)
+        except truncated_errors:
+            return
+
+
+class StreamingLogSink:
+    """Append encoded lines to rotating, optionally compressed log files."""
+
+    def __init__(
+        self,
+        output_dir: Path,
+        compression: str | None = "gzip",
+        max_file_size: int = 10 * 1024 * 1024,
+        max_file_age: float = 3600.0,
+        flush_interval: float = 1.0,
+        prefix: str = "yesman_logs_",
+    ) -> None:
+        self.output_dir = output_dir
+        self.compression = _resolve_compression(compression)
+        self.max_file_size = max_file_size
+        self.max_file_age = max_file_age
+        self.flush_interval = flush_interval
+        self.prefix = prefix
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+
+        # Only touched by the writer thread (and read for statistics)
+        self.current_file: Path | None = None
+        self._file: BinaryIO | None = None
+        self._stream: BinaryIO | None = None
+        self._opened_at = 0.0
+        self._last_flush = 0.0
+        self._dirty = False
+        self._closed_bytes = 0
+
+        self.stats = {
+            "lines_written": 0,
+            "raw_bytes": 0,
+            "flushes": 0,
+            "files_created": 0,
+        }
+
+        self._queue: queue.Queue = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._thread_lock = threading.Lock()
+        self._closed = False
+
+        self.logger = logging.getLogger("yesman.log_sink")
+
+    @property
+    def current_file_size(self) -> int:
+        """Bytes of the current file that have reached the OS.
+
+        Returns:
+            Size in bytes, 0 when no file is open.
+        """
+        file = self._file
+        if file is None or file.closed:
+            return 0
+        try:
+            return file.tell()
+        except ValueError:
+            return 0
+
+    @property
+    def bytes_written(self) -> int:
+        """Total bytes written to disk across all files.
+
+        Returns:
+            Size in bytes.
+        """
+        return self._closed_bytes + self.current_file_size
+
+    @property
+    def compression_ratio(self) -> float:
+        """Ratio of bytes on disk to bytes accepted.
+
+        Returns:
+            The ratio, 1.0 before anything was written.
+        """
+        raw_bytes = self.stats["raw_bytes"]
+        return self.bytes_written / raw_bytes if raw_bytes else 1.0
+
+    # Public API (any thread)
+    def write(self, payload: bytes) -> Future:
+        """Queue ``payload`` for appending to the current file.
+
+        Returns:
+            Future resolving to the number of bytes accepted.
+        """
+        return self._submit("write", payload)
+
+    def flush(self) -> Future:
+        """Queue a flush point so everything written so far becomes readable.
+
+        Returns:
+            Future resolving once the stream is flushed.
+        """
+        return self._submit("flush")
+
+    def rotate(self) -> Future:
+        """Finish the current file; the next write starts a new one.
+
+        Returns:
+            Future resolving once the file is closed.
+        """
+        return self._submit("rotate")
+
+    def close(self, timeout: float | None = 10.0) -> None:
+        """Drain queued writes, finish the current file and stop the thread."""
+        with self._thread_lock:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread
+        if thread is None:
+            return
+        self._queue.put((_CLOSE, None, None))
+        thread.join(timeout)
+        if thread.is_alive():
+            self.logger.warning("Log writer thread did not stop within %.1fs", timeout)
+
+    def get_statistics(self) -> dict[str, object]:
+        """Get sink statistics.
+
+        Returns:
+            Dictionary of counters and the current file.
+        """
+        return {
+            **self.stats,
+            "bytes_written": self.bytes_written,
+            "compression": self.compression,
+            "compression_ratio": self.compression_ratio,
+            "current_file": str(self.current_file) if self.current_file else None,
+            "current_file_size": self.current_file_size,
+            "queued": self._queue.qsize(),
+        }
+
+    def _submit(self, command: str, payload: bytes | None = None) -> Future:
+        future: Future = Future()
+        with self._thread_lock:
+            if self._closed:
+                future.set_exception(RuntimeError("Log sink is closed"))
+                return future
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="yesman-log-writer", daemon=True)
+                self._thread.start()
+            self._queue.put((command, payload, future))
+        return future
+
+    # Writer thread
+    def _run(self) -> None:
+        while True:
+            try:
+                command, payload, future = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                self._flush_if_dirty()
+                continue
+
+            if command is _CLOSE:
+                self._finish_file()
+                return
+            if not future.set_running_or_notify_cancel():
+                continue
+
+            try:
+                if command == "write":
+                    result = self._write(payload)
+                elif command == "flush":
+                    result = self._flush_if_dirty()
+                else:
+                    result = self._finish_file()
+            except Exception as e:
+                self.logger.exception("Log writer %s failed", command)
+                self._abandon_file()
+                future.set_exception(e)
+                continue
+            future.set_result(result)
+
+            if self._queue.empty():
+                self._flush_if_dirty()
+
+    def _write(self, payload: bytes) -> int:
+        if self._stream is None:
+            self._open_file()
+        elif self.current_file_size >= self.max_file_size or time.monotonic() - self._opened_at >= self.max_file_age:
+            self._finish_file()
+            self._open_file()
+
+        self._stream.write(payload)
+        self._dirty = True
+        self.stats["lines_written"] += 1
+        self.stats["raw_bytes"] += len(payload)
+
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            self._flush_if_dirty()
+        return len(payload)
+
+    def _next_path(self) -> Path:
+        suffix = COMPRESSION_SUFFIXES[self.compression]
+        stem = f"{self.prefix}{int(time.time())}"
+        path = self.output_dir / f"{stem}{suffix}"
+        counter = 1
+        while path.exists():
+            path = self.output_dir / f"{stem}_{counter}{suffix}"
+            counter += 1
+        return path
+
+    def _open_file(self) -> None:
+        path = self._next_path()
+        self._file = open(path, "ab")  # noqa: SIM115
+        if self.compression == "gzip":
+            self._stream = gzip.GzipFile(fileobj=self._file, mode="wb", compresslevel=6)
+        elif self.compression == "zstd":
+            self._stream = zstandard.ZstdCompressor(level=3).stream_writer(self._file, closefd=False)
+        else:
+            self._stream = self._file
+
+        self.current_file = path
+        self._opened_at = self._last_flush = time.monotonic()
+        self.stats["files_created"] += 1
+        self.logger.info("Rotated to new log file: %s", path)
+
+    def _flush_if_dirty(self) -> None:
+        if self._stream is None or not self._dirty:
+            return
+        if self.compression == "gzip":
+            self._stream.flush(zlib.Z_SYNC_FLUSH)
+        elif self.compression == "zstd":
+            self._stream.flush(zstandard.FLUSH_BLOCK)
+        self._file.flush()
+        self._dirty = False
+        self._last_flush = time.monotonic()
+        self.stats["flushes"] += 1
+
+    def _finish_file(self) -> None:
+        if self._stream is None:
+            return
+        try:
+            if self._stream is not self._file:
+                # Writes the gzip trailer / ends the zstd frame
+                self._stream.close()
+            self._file.flush()
+            self._closed_bytes += self._file.tell()
+        finally:
+            self._file.close()
+            self._file = self._stream = None
+            self._dirty = False
+
+    def _abandon_file(self) -> None:
+        """Drop a stream left in an unknown state so the next write starts a fresh file."""
+        if self._file is None:
+            return
+        try:
+            self._closed_bytes += self._file.tell()
+            self._file.close()
+        except (OSError, ValueError):
+            pass
+        self._file = self._stream = None
+        self._dirty = False
@@ -0,0 +1,303 @@
+# Copyright notice.
+
+import asyncio
+import ctypes
+import ctypes.util
+import fnmatch
+import logging
+import os
+import select
+import struct
+import sys
+import time
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+# Copyright (c) 2024 Yesman Claude Project
+# Licensed under the MIT License
+
+"""Follow the log files of a directory as they grow, rotate and appear.
+
+``LogWatcher`` follows every file in a directory whose name matches one of its
+patterns and reports complete new lines. On Linux it waits on an inotify
+descriptor for the directory, so following costs nothing while the logs are
+idle and new lines are seen within milliseconds; elsewhere (or if inotify is
+unavailable) it falls back to polling file sizes.
+
+Each followed file keeps its descriptor open. When a file is renamed away or
+replaced, the rest of the old file is read through that descriptor before the
+new file is followed from its start; a truncated file is followed from its
+start again. Files that appear after the watcher was opened are read from the
+beginning.
+
+The same watcher drives ``yesman logs tail --follow`` (``follow()``) and the
+``logs`` WebSocket channel (``watch()``).
+"""
+
+READ_SIZE = 64 * 1024
+
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_Q_OVERFLOW = 0x00004000
+_WATCH_MASK = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+_EVENT_HEADER = struct.Struct("iIII")
+
+LineCallback = Callable[[Path, list[str]], None]
+
+
+class _Inotify:
+    """Minimal non-blocking inotify watch on one directory."""
+
+    def __init__(self, directory: Path) -> None:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        if libc.inotify_add_watch(self.fd, os.fsencode(directory), _WATCH_MASK) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f"inotify_add_watch failed for {directory}")
+
+    def read_names(self) -> set[str] | None:
+        """Drain pending events.
+
+        Returns:
+            Names of the changed directory entries, or None if the kernel
+            queue overflowed and everything must be rechecked.
+        """
+        names: set[str] = set()
+        while True:
+            try:
+                data = os.read(self.fd, READ_SIZE)
+            except BlockingIOError:
+                return names
+            position = 0
+            while position + _EVENT_HEADER.size <= len(data):
+                _, mask, _, length = _EVENT_HEADER.unpack_from(data, position)
+                position += _EVENT_HEADER.size
+                if mask & _IN_Q_OVERFLOW:
+                    return None
+                if length:
+                    names.add(os.fsdecode(data[position : position + length].rstrip(b"\0")))
+                position += length
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+@dataclass
+class _FollowedFile:
+    fd: int
+    inode: int
+    offset: int
+    partial: bytes = b""
+
+
+class LogWatcher:
+    """Report new lines appended to matching log files in a directory."""
+
+    def __init__(
+        self,
+        directory: Path,
+        patterns: tuple[str, ...] = ("*.log",),
+        poll_interval: float = 1.0,
+        backend: str = "auto",
+        from_start: bool = False,  # noqa: FBT001
+    ) -> None:
+        if backend not in {"auto", "inotify", "poll"}:
+            msg = f"Unsupported watch backend: {backend}"
+            raise ValueError(msg)
+        self.directory = directory
+        self.patterns = patterns
+        self.poll_interval = poll_interval
+        self.backend = backend
+        self.from_start = from_start
+
+        self._inotify: _Inotify | None = None
+        self._files: dict[str, _FollowedFile] = {}
+        self._opened = False
+        self.stats = {"wakeups": 0, "lines": 0, "rotations": 0}
+        self.logger = logging.getLogger("yesman.log_watcher")
+
+    @property
+    def uses_inotify(self) -> bool:
+        """Whether changes are reported by inotify rather than polling."""
+        return self._inotify is not None
+
+    @property
+    def followed_files(self) -> list[Path]:
+        """Files currently followed."""
+        return [self.directory / name for name in sorted(self._files)]
+
+    def open(self) -> None:
+        """Start following the matching files from their current end."""
+        if self._opened:
+            return
+        if self.backend != "poll" and sys.platform.startswith("linux"):
+            try:
+                self._inotify = _Inotify(self.directory)
+            except (OSError, AttributeError) as e:
+                if self.backend == "inotify":
+                    raise
+                self.logger.info("inotify unavailable (%s), polling %s", e, self.directory)
+        elif self.backend == "inotify":
+            msg = "inotify is only available on Linux"
+            raise OSError(msg)
+
+        self._opened = True
+        for name in self._matching_names():
+            self._open_file(name, at_end=not self.from_start)
+
+    def close(self) -> None:
+        """Stop following and release all descriptors."""
+        for followed in self._files.values():
+            os.close(followed.fd)
+        self._files.clear()
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+        self._opened = False
+
+    def __enter__(self) -> "LogWatcher":
+        self.open()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def poll(self, names: set[str] | None = None) -> list[tuple[Path, list[str]]]:
+        """Read whatever was appended since the last call.
+
+        Returns:
+            ``(path, lines)`` for every file with new complete lines.
+        """
+        if names is None:
+            names = set(self._files) | set(self._matching_names())
+        results = []
+        for name in sorted(names):
+            if not self._matches(name):
+                continue
+            lines = self._check(name)
+            if lines:
+                self.stats["lines"] += len(lines)
+                results.append((self.directory / name, lines))
+        return results
+
+    def follow(self, stop: Callable[[], bool] | None = None) -> Iterator[tuple[Path, str]]:
+        """Block until lines are appended and yield them, until ``stop()`` is true.
+
+        Yields:
+            ``(path, line)`` for each new line.
+        """
+        self.open()
+        while stop is None or not stop():
+            for path, lines in self._wait(self.poll_interval):
+                for line in lines:
+                    yield path, line
+
+    async def watch(self, callback: LineCallback) -> None:
+        """Call ``callback(path, lines)`` for new lines until cancelled."""
+        self.open()
+        loop = asyncio.get_running_loop()
+        if self._inotify is None:
+            while True:
+                await asyncio.sleep(self.poll_interval)
+                self._dispatch(self.poll(), callback)
+
+        changed = asyncio.Event()
+        fd = self._inotify.fd
+        loop.add_reader(fd, changed.set)
+        try:
+            while True:
+                await changed.wait()
+                changed.clear()
+                self.stats["wakeups"] += 1
+                names = self._inotify.read_names()
+                self._dispatch(self.poll(names), callback)
+        finally:
+            loop.remove_reader(fd)
+
+    def _dispatch(self, results: list[tuple[Path, list[str]]], callback: LineCallback) -> None:
+        for path, lines in results:
+            try:
+                callback(path, lines)
+            except Exception:
+                self.logger.exception("Log line callback failed for %s", path)
+
+    def _wait(self, timeout: float) -> list[tuple[Path, list[str]]]:
+        if self._inotify is None:
+            time.sleep(timeout)
+            return self.poll()
+        readable, _, _ = select.select([self._inotify.fd], [], [], timeout)
+        if not readable:
+            return []
+        self.stats["wakeups"] += 1
+        return self.poll(self._inotify.read_names())
+
+    def _matches(self, name: str) -> bool:
+        return any(fnmatch.fnmatchcase(name, pattern) for pattern in self.patterns)
+
+    def _matching_names(self) -> list[str]:
+        try:
+            return [entry.name for entry in os.scandir(self.directory) if entry.is_file() and self._matches(entry.name)]
+        except FileNotFoundError:
+            return []
+
+    def _open_file(self, name: str, at_end: bool) -> _FollowedFile | None:  # noqa: FBT001
+        try:
+            fd = os.open(self.directory / name, os.O_RDONLY | getattr(os, "O_CLOEXEC", 0))
+        except (FileNotFoundError, IsADirectoryError, PermissionError):
+            return None
+        stat = os.fstat(fd)
+        followed = self._files[name] = _FollowedFile(fd=fd, inode=stat.st_ino, offset=stat.st_size if at_end else 0)
+        return followed
+
+    def _check(self, name: str) -> list[str]:
+        try:
+            current_inode = os.stat(self.directory / name).st_ino
+        except FileNotFoundError:
+            current_inode = None
+
+        lines: list[str] = []
+        followed = self._files.get(name)
+        if followed is not None and followed.inode != current_inode:
+            # Rotated or removed: finish the old file through its descriptor
+            lines = self._read_new(followed, final=True)
+            os.close(followed.fd)
+            del self._files[name]
+            followed = None
+            self.stats["rotations"] += 1
+
+        if followed is None:
+            if current_inode is None:
+                return lines
+            followed = self._open_file(name, at_end=False)
+            if followed is None:
+                return lines
+        elif os.fstat(followed.fd).st_size < followed.offset:
+            # Truncated in place
+            followed.offset = 0
+            followed.partial = b""
+            self.stats["rotations"] += 1
+
+        return lines + self._read_new(followed)
+
+    @staticmethod
+    def _read_new(followed: _FollowedFile, final: bool = False) -> list[str]:  # noqa: FBT001, FBT002
+        chunks = [followed.partial]
+        while True:
+            chunk = os.pread(followed.fd, READ_SIZE, followed.offset)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            followed.offset += len(chunk)
+
+        data = b"".join(chunks)
+        pieces = data.split(b"\n")
+        followed.partial = b"" if final else pieces.pop()
+        return [piece.decode("utf-8", errors="replace").rstrip("\r") for piece in pieces if piece]
@@ -0,0 +1,218 @@
+# Copyright notice.
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Mapping
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pickle import PicklingError  # noqa: S403
+from typing import ClassVar
+
+from .semantic_cache import SemanticSummaryCache, blob_sha
+
+# Copyright (c) 2024 Yesman Claude Project
+# Licensed under the MIT License
+
+"""Off-loop, multi-process execution of CPU-bound source analysis.
+
+Parsing and walking ASTs is CPU-bound; done inline it blocks the event loop
+that also runs the agent pool dispatcher and the collaboration message loop.
+``AnalysisService.map`` takes a batch of sources and a picklable, module-level
+function of one source, and returns the function's results:
+
+* identical contents are analyzed once (they are deduplicated by blob SHA) and
+  results are memoized in memory, or in a ``SemanticSummaryCache`` when one is
+  passed, so repeated calls for the same content are free;
+* the remaining sources are split into chunks of at most ``chunk_files`` files
+  and ``max_chunk_bytes`` bytes (a larger single file is a chunk of its own)
+  and run in a process pool, so one huge file cannot hold up a whole batch;
+* batches smaller than ``inline_bytes`` run in a worker thread instead, where
+  pickling and process hops would cost more than they save;
+* cancelling the awaiting task cancels every chunk that has not started yet,
+  and ``shutdown`` drops queued work altogether.
+
+If the pool cannot be used (a worker crashed, or the function or a result is
+not picklable) the affected chunks are run in a thread instead.
+"""
+
+CHUNK_FILES = 32
+MAX_CHUNK_BYTES = 1024 * 1024
+INLINE_BYTES = 64 * 1024
+MAX_MEMO_ENTRIES = 8192
+
+
+def _run_chunk(func: Callable[[str], object], contents: list[str]) -> list[object]:
+    """Apply ``func`` to every source in a chunk (runs in a worker).
+
+    Returns:
+        list[object]: Results in the order of ``contents``.
+    """
+    return [func(content) for content in contents]
+
+
+class AnalysisService:
+    """Batch analysis of source files in a process pool, with result caching."""
+
+    _shared: ClassVar["AnalysisService | None"] = None
+    _shared_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    def __init__(
+        self,
+        max_workers: int | None = None,
+        chunk_files: int = CHUNK_FILES,
+        max_chunk_bytes: int = MAX_CHUNK_BYTES,
+        inline_bytes: int = INLINE_BYTES,
+    ) -> None:
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self.chunk_files = chunk_files
+        self.max_chunk_bytes = max_chunk_bytes
+        self.inline_bytes = inline_bytes
+        self.logger = logging.getLogger("yesman.analysis_service")
+
+        self._executor: ProcessPoolExecutor | None = None
+        self._executor_lock = threading.Lock()
+        # The memo is read and written from to_thread workers of concurrent map calls
+        self._memo: OrderedDict[tuple[str, str], object] = OrderedDict()
+        self._memo_lock = threading.Lock()
+
+        self.stats = {"cached": 0, "analyzed": 0, "chunks": 0, "pool_chunks": 0, "fallbacks": 0}
+
+    @classmethod
+    def shared(cls) -> "AnalysisService":
+        """Get the process-wide service, so all analyzers share one worker pool.
+
+        Returns:
+            AnalysisService: The shared service.
+        """
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    async def map(
+        self,
+        func: Callable[[str], object],
+        sources: Mapping[Hashable, str],
+        cache: SemanticSummaryCache | None = None,
+    ) -> dict[Hashable, object]:
+        """Apply a module-level function to a batch of sources off the event loop.
+
+        ``func`` must be deterministic in the source text, since results are
+        shared by every source with the same content. With ``cache``, results
+        are looked up in and stored to that summary cache, which must only
+        ever be used with this one ``func``.
+
+        Returns:
+            dict[Hashable, object]: ``func(source)`` for each key of ``sources``.
+        """
+        keys = {key: blob_sha(content) for key, content in sources.items()}
+        contents = {keys[key]: content for key, content in sources.items()}
+        results = await asyncio.to_thread(self._cached_results, func, list(contents), cache)
+
+        missing = [sha for sha in contents if sha not in results]
+        self.stats["cached"] += len(contents) - len(missing)
+        if missing:
+            for chunk, values in await self._run(func, [[(sha, contents[sha]) for sha in chunk] for chunk in self._chunks(missing, contents)]):
+                computed = dict(zip(chunk, values, strict=True))
+                results.update(computed)
+                await asyncio.to_thread(self._store_results, func, computed, cache)
+            self.stats["analyzed"] += len(missing)
+
+        return {key: results[sha] for key, sha in keys.items()}
+
+    def shutdown(self, cancel_futures: bool = True) -> None:  # noqa: FBT001, FBT002
+        """Stop the worker processes, dropping queued chunks unless told otherwise."""
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=cancel_futures)
+
+    def _cached_results(self, func: Callable[[str], object], shas: list[str], cache: SemanticSummaryCache | None) -> dict[str, object]:
+        results = {}
+        for sha in shas:
+            if cache is not None:
+                summary = cache.lookup(sha)
+                if summary is not None:
+                    results[sha] = summary
+            else:
+                memo_key = (self._func_key(func), sha)
+                with self._memo_lock:
+                    if memo_key in self._memo:
+                        self._memo.move_to_end(memo_key)
+                        results[sha] = self._memo[memo_key]
+        return results
+
+    def _store_results(self, func: Callable[[str], object], results: dict[str, object], cache: SemanticSummaryCache | None) -> None:
+        if cache is not None:
+            for sha, value in results.items():
+                cache.put(sha, value)
+            return
+        func_key = self._func_key(func)
+        with self._memo_lock:
+            for sha, value in results.items():
+                self._memo[func_key, sha] = value
+            while len(self._memo) > MAX_MEMO_ENTRIES:
+                self._memo.popitem(last=False)
+
+    @staticmethod
+    def _func_key(func: Callable[[str], object]) -> str:
+        return f"{func.__module__}.{func.__qualname__}"
+
+    def _chunks(self, shas: list[str], contents: dict[str, str]) -> list[list[str]]:
+        """Split work into chunks capped by file count and total size.
+
+        Returns:
+            list[list[str]]: Blob SHAs per chunk.
+        """
+        chunks: list[list[str]] = []
+        current: list[str] = []
+        current_bytes = 0
+        for sha in shas:
+            size = len(contents[sha])
+            if current and (len(current) >= self.chunk_files or current_bytes + size > self.max_chunk_bytes):
+                chunks.append(current)
+                current, current_bytes = [], 0
+            current.append(sha)
+            current_bytes += size
+        if current:
+            chunks.append(current)
+        return chunks
+
+    async def _run(self, func: Callable[[str], object], chunks: list[list[tuple[str, str]]]) -> list[tuple[list[str], list[object]]]:
+        """Run chunks in the process pool, or in a thread when the batch is small.
+
+        Returns:
+            list[tuple[list[str], list[object]]]: Blob SHAs and results per chunk.
+        """
+        self.stats["chunks"] += len(chunks)
+        total_bytes = sum(len(content) for chunk in chunks for _, content in chunk)
+        use_pool = total_bytes >= self.inline_bytes and self.max_workers > 1
+
+        async def run_chunk(chunk: list[tuple[str, str]]) -> tuple[list[str], list[object]]:
+            shas, contents = [sha for sha, _ in chunk], [content for _, content in chunk]
+            if use_pool:
+                try:
+                    values = await asyncio.get_running_loop().run_in_executor(self._pool(), _run_chunk, func, contents)
+                except (BrokenProcessPool, PicklingError, AttributeError, TypeError) as e:
+                    self.logger.warning("Process pool analysis failed (%s), running chunk in a thread", e)
+                    self.stats["fallbacks"] += 1
+                    if isinstance(e, BrokenProcessPool):
+                        self.shutdown()
+                else:
+                    self.stats["pool_chunks"] += 1
+                    return shas, values
+            return shas, await asyncio.to_thread(_run_chunk, func, contents)
+
+        # gather cancels the chunks that have not started if the caller is cancelled
+        return list(await asyncio.gather(*(run_chunk(chunk) for chunk in chunks)))
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                # spawn: forking a process that runs threads and an event loop is unsafe
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn"))
+            return self._executor
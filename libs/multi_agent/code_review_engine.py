@@ -11,6 +11,9 @@ from datetime import UTC, datetime, timedelta
 from enum import Enum
 from pathlib import Path
 
+from libs.source_index import SourceFileIndex
+
+from .analysis_service import AnalysisService
 from .branch_manager import BranchManager
 from .collaboration_engine import CollaborationEngine, MessagePriority, MessageType
 from .semantic_analyzer import SemanticAnalyzer
@@ -169,6 +172,7 @@ class CodeReviewEngine:
         self.branch_manager = branch_manager
         self.repo_path = Path(repo_path) if repo_path else Path.cwd()
         self.enable_auto_review = enable_auto_review
+        self.analysis = AnalysisService.shared()
 
         # Review storage and tracking
         self.active_reviews: dict[str, CodeReview] = {}
@@ -742,67 +746,74 @@ class CodeReviewEngine:
 
         return findings
 
-    async def _check_performance(self, file_paths: list[str]) -> list[ReviewFinding]:
-        """Check for performance issues."""
-        findings = []
+    def _read_python_sources(self, file_paths: list[str]) -> dict[str, str]:
+        """Read the existing Python files among ``file_paths``.
 
+        Returns:
+            dict[str, str]: Content keyed by file path.
+        """
+        sources = {}
         for file_path in file_paths:
             if not file_path.endswith(".py"):
                 continue
-
             full_path = self.repo_path / file_path
-            if not full_path.exists():
+            try:
+                sources[file_path] = full_path.read_text(encoding="utf-8")
+            except FileNotFoundError:
                 continue
+            except (OSError, UnicodeDecodeError):
+                logger.exception("Error reading %s:", file_path)
+        return sources
 
-            try:
-                with full_path.open(encoding="utf-8") as f:
-                    content = f.read()
+    async def _get_review_facts(self, file_paths: list[str]) -> dict[str, dict[str, object]]:
+        """Collect ``review_facts`` for the Python files in the analysis worker pool.
 
-                # Parse AST for performance analysis
-                tree = ast.parse(content)
-
-                for node in ast.walk(tree):
-                    # Check for inefficient loops
-                    if isinstance(node, ast.For):
-                        if isinstance(node.iter, ast.Call) and isinstance(node.iter.func, ast.Name) and node.iter.func.id == "range":
-                            # Check for range(len(list)) pattern
-                            if len(node.iter.args) == 1 and isinstance(node.iter.args[0], ast.Call) and isinstance(node.iter.args[0].func, ast.Name) and node.iter.args[0].func.id == "len":
-                                finding = ReviewFinding(
-                                    finding_id=f"perf_range_len_{file_path}_{node.lineno}",
-                                    review_type=ReviewType.PERFORMANCE,
-                                    severity=ReviewSeverity.MEDIUM,
-                                    file_path=file_path,
-                                    line_number=node.lineno,
-                                    message="Consider using enumerate() instead of range(len())",
-                                    description="Using enumerate() is more Pythonic and potentially faster",
-                                    suggestion="Replace 'for i in range(len(items)):' with 'for i, item in enumerate(items):'",
-                                )
-                                findings.append(finding)
-
-                    # Check for string concatenation in loops
-                    elif (
-                        isinstance(node, ast.AugAssign)
-                        and isinstance(
-                            node.op,
-                            ast.Add,
-                        )
-                        and isinstance(node.target, ast.Name)
-                    ):
-                        # This is a simplified check - could be more sophisticated
-                        finding = ReviewFinding(
-                            finding_id=f"perf_string_concat_{file_path}_{node.lineno}",
-                            review_type=ReviewType.PERFORMANCE,
-                            severity=ReviewSeverity.LOW,
-                            file_path=file_path,
-                            line_number=node.lineno,
-                            message="Consider using join() for string concatenation",
-                            description="String concatenation in loops can be inefficient",
-                            suggestion="Use ''.join(list) for better performance when concatenating many strings",
-                        )
-                        findings.append(finding)
+        Results are memoized by content, so the checks and metrics of one
+        review parse each file once.
 
-            except Exception:
-                logger.exception("Error checking performance for %s:", file_path)
+        Returns:
+            dict[str, dict[str, object]]: Facts keyed by file path.
+        """
+        sources = await asyncio.to_thread(self._read_python_sources, file_paths)
+        return await self.analysis.map(review_facts, sources)
+
+    async def _check_performance(self, file_paths: list[str]) -> list[ReviewFinding]:
+        """Check for performance issues."""
+        findings = []
+
+        for file_path, facts in (await self._get_review_facts(file_paths)).items():
+            if "error" in facts:
+                logger.warning("Error checking performance for %s: %s", file_path, facts["error"])
+                continue
+
+            # Check for range(len(list)) loops
+            for line_number in facts["range_len_loops"]:
+                finding = ReviewFinding(
+                    finding_id=f"perf_range_len_{file_path}_{line_number}",
+                    review_type=ReviewType.PERFORMANCE,
+                    severity=ReviewSeverity.MEDIUM,
+                    file_path=file_path,
+                    line_number=line_number,
+                    message="Consider using enumerate() instead of range(len())",
+                    description="Using enumerate() is more Pythonic and potentially faster",
+                    suggestion="Replace 'for i in range(len(items)):' with 'for i, item in enumerate(items):'",
+                )
+                findings.append(finding)
+
+            # Check for string concatenation in loops
+            for line_number in facts["augmented_adds"]:
+                # This is a simplified check - could be more sophisticated
+                finding = ReviewFinding(
+                    finding_id=f"perf_string_concat_{file_path}_{line_number}",
+                    review_type=ReviewType.PERFORMANCE,
+                    severity=ReviewSeverity.LOW,
+                    file_path=file_path,
+                    line_number=line_number,
+                    message="Consider using join() for string concatenation",
+                    description="String concatenation in loops can be inefficient",
+                    suggestion="Use ''.join(list) for better performance when concatenating many strings",
+                )
+                findings.append(finding)
 
         return findings
 
@@ -813,72 +824,52 @@ class CodeReviewEngine:
         """Check code maintainability."""
         findings = []
 
-        for file_path in file_paths:
-            if not file_path.endswith(".py"):
+        for file_path, facts in (await self._get_review_facts(file_paths)).items():
+            if "error" in facts:
+                logger.warning("Error checking maintainability for %s: %s", file_path, facts["error"])
                 continue
 
-            full_path = self.repo_path / file_path
-            if not full_path.exists():
-                continue
-
-            try:
-                with full_path.open(encoding="utf-8") as f:
-                    content = f.read()
-
-                # Basic maintainability checks
-                lines = content.split("\n")
-
+            for function in facts["functions"]:
                 # Check for long functions
-                tree = ast.parse(content)
-                for node in ast.walk(tree):
-                    if isinstance(node, ast.FunctionDef | ast.AsyncFunctionDef):
-                        # Calculate function length
-                        func_lines = 0
-                        if hasattr(node, "end_lineno") and node.end_lineno:
-                            func_lines = node.end_lineno - node.lineno + 1
-
-                        if func_lines > 50:  # Arbitrary threshold
-                            finding = ReviewFinding(
-                                finding_id=f"maint_long_func_{file_path}_{node.lineno}",
-                                review_type=ReviewType.MAINTAINABILITY,
-                                severity=ReviewSeverity.MEDIUM,
-                                file_path=file_path,
-                                line_number=node.lineno,
-                                message=f"Function '{node.name}' is too long ({func_lines} lines)",
-                                description="Long functions are harder to understand and maintain",
-                                suggestion="Consider breaking this function into smaller, more focused functions",
-                            )
-                            findings.append(finding)
-
-                        # Check for too many parameters
-                        if len(node.args.args) > 7:
-                            finding = ReviewFinding(
-                                finding_id=f"maint_many_params_{file_path}_{node.lineno}",
-                                review_type=ReviewType.MAINTAINABILITY,
-                                severity=ReviewSeverity.MEDIUM,
-                                file_path=file_path,
-                                line_number=node.lineno,
-                                message=f"Function '{node.name}' has too many parameters ({len(node.args.args)})",
-                                description="Functions with many parameters are hard to use and maintain",
-                                suggestion="Consider using a configuration object or breaking the function down",
-                            )
-                            findings.append(finding)
+                if function["length"] > 50:  # Arbitrary threshold
+                    finding = ReviewFinding(
+                        finding_id=f"maint_long_func_{file_path}_{function['line_number']}",
+                        review_type=ReviewType.MAINTAINABILITY,
+                        severity=ReviewSeverity.MEDIUM,
+                        file_path=file_path,
+                        line_number=function["line_number"],
+                        message=f"Function '{function['name']}' is too long ({function['length']} lines)",
+                        description="Long functions are harder to understand and maintain",
+                        suggestion="Consider breaking this function into smaller, more focused functions",
+                    )
+                    findings.append(finding)
 
-                # Check for large files
-                if len(lines) > 500:
+                # Check for too many parameters
+                if function["args"] > 7:
                     finding = ReviewFinding(
-                        finding_id=f"maint_large_file_{file_path}",
+                        finding_id=f"maint_many_params_{file_path}_{function['line_number']}",
                         review_type=ReviewType.MAINTAINABILITY,
-                        severity=ReviewSeverity.LOW,
+                        severity=ReviewSeverity.MEDIUM,
                         file_path=file_path,
-                        message=f"File is very large ({len(lines)} lines)",
-                        description="Large files can be difficult to navigate and maintain",
-                        suggestion="Consider splitting this file into smaller, more focused modules",
+                        line_number=function["line_number"],
+                        message=f"Function '{function['name']}' has too many parameters ({function['args']})",
+                        description="Functions with many parameters are hard to use and maintain",
+                        suggestion="Consider using a configuration object or breaking the function down",
                     )
                     findings.append(finding)
 
-            except Exception:
-                logger.exception("Error checking maintainability for %s:", file_path)
+            # Check for large files
+            if facts["lines"] > 500:
+                finding = ReviewFinding(
+                    finding_id=f"maint_large_file_{file_path}",
+                    review_type=ReviewType.MAINTAINABILITY,
+                    severity=ReviewSeverity.LOW,
+                    file_path=file_path,
+                    message=f"File is very large ({facts['lines']} lines)",
+                    description="Large files can be difficult to navigate and maintain",
+                    suggestion="Consider splitting this file into smaller, more focused modules",
+                )
+                findings.append(finding)
 
         return findings
 
@@ -922,57 +913,40 @@ class CodeReviewEngine:
     async def _check_documentation(self, file_paths: list[str]) -> list[ReviewFinding]:
         """Check documentation quality."""
         findings = []
+        # Docstring coverage comes from the shared source index, so unchanged files are not re-parsed
+        index = SourceFileIndex.for_root(self.repo_path)
 
         for file_path in file_paths:
             if not file_path.endswith(".py"):
                 continue
 
-            full_path = self.repo_path / file_path
-            if not full_path.exists():
-                continue
-
             try:
-                with full_path.open(encoding="utf-8") as f:
-                    content = f.read()
-
-                tree = ast.parse(content)
+                entry = index.get(file_path, analyzers=("doc",))
+                if entry is None or not entry.readable:
+                    continue
 
                 # Check for missing docstrings
-                for node in ast.walk(tree):
-                    if isinstance(
-                        node,
-                        ast.FunctionDef | ast.AsyncFunctionDef | ast.ClassDef,
-                    ):
-                        # Check if function/class has docstring
-                        has_docstring = len(node.body) > 0 and isinstance(node.body[0], ast.Expr) and isinstance(node.body[0].value, ast.Constant) and isinstance(node.body[0].value.value, str)
-
-                        if not has_docstring:
-                            # Skip private methods (start with _) unless they're special methods
-                            if node.name.startswith("_") and not (node.name.startswith("__") and node.name.endswith("__")):
-                                continue
-
-                            severity = ReviewSeverity.LOW
-                            if isinstance(
-                                node,
-                                ast.ClassDef,
-                            ) or not node.name.startswith("_"):
-                                severity = ReviewSeverity.MEDIUM
+                for node_type, name, line_number in (entry.stats.get("doc") or {}).get("missing_docstrings") or []:
+                    severity = ReviewSeverity.LOW
+                    if node_type == "ClassDef" or not name.startswith("_"):
+                        severity = ReviewSeverity.MEDIUM
 
-                            finding = ReviewFinding(
-                                finding_id=f"doc_missing_{file_path}_{node.lineno}",
-                                review_type=ReviewType.DOCUMENTATION,
-                                severity=severity,
-                                file_path=file_path,
-                                line_number=node.lineno,
-                                message=f"Missing docstring for {type(node).__name__.lower()} '{node.name}'",
-                                description="Public functions and classes should have docstrings",
-                                suggestion="Add a docstring describing the purpose, parameters, and return value",
-                            )
-                            findings.append(finding)
+                    finding = ReviewFinding(
+                        finding_id=f"doc_missing_{file_path}_{line_number}",
+                        review_type=ReviewType.DOCUMENTATION,
+                        severity=severity,
+                        file_path=file_path,
+                        line_number=line_number,
+                        message=f"Missing docstring for {node_type.lower()} '{name}'",
+                        description="Public functions and classes should have docstrings",
+                        suggestion="Add a docstring describing the purpose, parameters, and return value",
+                    )
+                    findings.append(finding)
 
             except Exception:
                 logger.exception("Error checking documentation for %s:", file_path)
 
+        index.save()
         return findings
 
     async def _check_testing(self, file_paths: list[str]) -> list[ReviewFinding]:
@@ -1074,9 +1048,10 @@ class CodeReviewEngine:
             if QualityMetric.LINES_OF_CODE in metric_types:
                 metrics.metrics[QualityMetric.LINES_OF_CODE] = len(non_empty_lines)
 
-            # Simple cyclomatic complexity estimation
+            # Simple cyclomatic complexity estimation, shared with the review checks
             if QualityMetric.CYCLOMATIC_COMPLEXITY in metric_types:
-                complexity = self._estimate_cyclomatic_complexity(content)
+                facts = await self.analysis.map(review_facts, {file_path: content})
+                complexity = facts[file_path]["complexity"]
                 metrics.metrics[QualityMetric.CYCLOMATIC_COMPLEXITY] = complexity
 
                 if complexity > metrics.thresholds[QualityMetric.CYCLOMATIC_COMPLEXITY]:
@@ -1098,30 +1073,6 @@ class CodeReviewEngine:
 
         return metrics
 
-    @staticmethod
-    def _estimate_cyclomatic_complexity(content: str) -> float:
-        """Estimate cyclomatic complexity by counting decision points.
-
-        Returns:
-        float: Description of return value.
-        """
-        try:
-            tree = ast.parse(content)
-            complexity = 1  # Base complexity
-
-            for node in ast.walk(tree):
-                if isinstance(
-                    node,
-                    ast.If | ast.While | ast.For | ast.AsyncFor | ast.ExceptHandler,
-                ):
-                    complexity += 1
-                elif isinstance(node, ast.BoolOp):
-                    complexity += len(node.values) - 1
-
-            return float(complexity)
-        except:
-            return 1.0
-
     @staticmethod
     def _calculate_maintainability_index(content: str, loc: int) -> float:
         """Calculate a simplified maintainability index.
@@ -1379,3 +1330,87 @@ class CodeReviewEngine:
                 for review in (list(self.active_reviews.values()) + self.review_history)[-10:]
             ],
         }
+
+
+def _cyclomatic_complexity(tree: ast.AST) -> float:
+    """Estimate cyclomatic complexity by counting decision points.
+
+    Returns:
+        float: 1 plus the number of branches and boolean operands.
+    """
+    complexity = 1  # Base complexity
+
+    for node in ast.walk(tree):
+        if isinstance(
+            node,
+            ast.If | ast.While | ast.For | ast.AsyncFor | ast.ExceptHandler,
+        ):
+            complexity += 1
+        elif isinstance(node, ast.BoolOp):
+            complexity += len(node.values) - 1
+
+    return float(complexity)
+
+
+def _is_range_len_loop(node: ast.For) -> bool:
+    iterator = node.iter
+    return (
+        isinstance(iterator, ast.Call)
+        and isinstance(iterator.func, ast.Name)
+        and iterator.func.id == "range"
+        and len(iterator.args) == 1
+        and isinstance(iterator.args[0], ast.Call)
+        and isinstance(iterator.args[0].func, ast.Name)
+        and iterator.args[0].func.id == "len"
+    )
+
+
+def review_facts(content: str) -> dict[str, object]:
+    """Parse Python source once and collect what the review checks look at.
+
+    Runs in the analysis worker processes, so the result is plain data:
+    ``range_len_loops`` and ``augmented_adds`` (line numbers), ``functions``
+    (name, line_number, length and args count), ``lines`` and ``complexity``,
+    or ``error`` (plus ``lines`` and ``complexity``) if the file does not parse
+    or cannot be analyzed, so one bad file never fails a whole batch.
+
+    Returns:
+        dict[str, object]: The facts.
+    """
+    lines = len(content.split("\n"))
+    try:
+        return _collect_review_facts(ast.parse(content), lines)
+    except (SyntaxError, ValueError) as e:
+        return {"error": str(e), "lines": lines, "complexity": 1.0}
+    except Exception as e:
+        # Deeply nested code raises RecursionError, for example
+        logger.exception("Error collecting review facts")
+        return {"error": f"{type(e).__name__}: {e}", "lines": lines, "complexity": 1.0}
+
+
+def _collect_review_facts(tree: ast.AST, lines: int) -> dict[str, object]:
+    range_len_loops = []
+    augmented_adds = []
+    functions = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.For) and _is_range_len_loop(node):
+            range_len_loops.append(node.lineno)
+        elif isinstance(node, ast.AugAssign) and isinstance(node.op, ast.Add) and isinstance(node.target, ast.Name):
+            augmented_adds.append(node.lineno)
+        elif isinstance(node, ast.FunctionDef | ast.AsyncFunctionDef):
+            functions.append(
+                {
+                    "name": node.name,
+                    "line_number": node.lineno,
+                    "length": node.end_lineno - node.lineno + 1 if node.end_lineno else 0,
+                    "args": len(node.args.args),
+                },
+            )
+
+    return {
+        "range_len_loops": range_len_loops,
+        "augmented_adds": augmented_adds,
+        "functions": functions,
+        "lines": lines,
+        "complexity": _cyclomatic_complexity(tree),
+    }
@@ -5,11 +5,13 @@
 
 """Advanced conflict prediction system for multi-agent branch development."""
 
-import ast
+import asyncio
 import difflib
 import logging
 import re
+import time
 from collections import Counter, defaultdict
+from collections.abc import Awaitable, Callable
 from dataclasses import dataclass, field
 from datetime import UTC, datetime, timedelta
 from enum import Enum
@@ -23,7 +25,8 @@ from .conflict_resolution import (
     ConflictSeverity,
     ConflictType,
 )
-from .semantic_analyzer import SemanticAnalyzer
+from .semantic_analyzer import SemanticAnalyzer, summarize_source
+from .semantic_cache import Summary
 
 logger = logging.getLogger(__name__)
 
@@ -38,6 +41,7 @@ HIGH_OVERLAP_THRESHOLD = 5
 SIGNIFICANT_DIFFERENCES_THRESHOLD = 3
 HIGH_SCORE_THRESHOLD = 5
 MEDIUM_SCORE_THRESHOLD = 2
+DEPENDENCY_FILES = ("requirements.txt", "pyproject.toml")
 
 
 class PredictionConfidence(Enum):
@@ -143,6 +147,12 @@ class ConflictPredictor:
         self.prediction_window = timedelta(days=7)  # Look ahead window
         self.min_confidence_threshold = 0.3
         self.max_predictions_per_run = 50
+        self.max_concurrent_pairs = 8
+        self.prune_unrelated_pairs = True
+
+        # Per-branch features shared by all pairs during one prediction run
+        self._run_features: dict[tuple[str, str], asyncio.Future] | None = None
+        self.last_run_stats: dict[str, object] = {}
 
         # Performance tracking
         self.prediction_stats = {
@@ -157,12 +167,22 @@ class ConflictPredictor:
         self,
         branches: list[str],
         time_horizon: timedelta | None = None,
+        progress_callback: Callable[[str, int, int], None] | None = None,
     ) -> list[PredictionResult]:
         """Predict potential conflicts between branches.
 
+        The run is pipelined in stages: per-branch features (changed files,
+        imports, signatures, ...) are computed at most once per branch and
+        shared by every pair, pairs whose changes cannot reach each other are
+        skipped, and the remaining pairs are analyzed concurrently, at most
+        ``max_concurrent_pairs`` at a time. Timings and counts for each stage
+        are kept in ``last_run_stats``.
+
         Args:
             branches: List of branch names to analyze
             time_horizon: How far ahead to predict (defaults to prediction_window)
+            progress_callback: Called with (stage, completed, total) as each
+                branch or pair finishes
 
         Returns:
             List of conflict predictions sorted by likelihood
@@ -171,21 +191,50 @@ class ConflictPredictor:
 
         time_horizon = time_horizon or self.prediction_window
         predictions = []
+        self._run_features = {}
+        stats: dict[str, object] = {"branches": len(branches), "pairs": 0, "pairs_skipped": 0, "pairs_analyzed": 0, "stage_seconds": {}}
+        self.last_run_stats = stats
+
+        def report(stage: str, completed: int, total: int) -> None:
+            logger.debug("Conflict prediction %s: %d/%d", stage, completed, total)
+            if progress_callback is not None:
+                progress_callback(stage, completed, total)
 
         try:
-            # Generate conflict vectors for all branch pairs
-            for i, branch1 in enumerate(branches):
-                for branch2 in branches[i + 1 :]:
-                    vector = await self._calculate_conflict_vector(branch1, branch2)
-                    self.conflict_vectors[f"{branch1}:{branch2}"] = vector
-
-                    # Run pattern detection
-                    for detector in self.pattern_detectors.values():
-                        prediction = await detector(branch1, branch2, vector)
-                        if prediction and prediction.likelihood_score >= self.min_confidence_threshold:
-                            predictions.append(prediction)
+            # Stage 1: features every pair needs, computed once per branch
+            started = time.perf_counter()
+            footprints = await self._run_stage(
+                "features",
+                [self._branch_footprint(branch) for branch in branches],
+                report,
+            )
+            stats["stage_seconds"]["features"] = time.perf_counter() - started
+
+            # Stage 2: keep only pairs whose changes can interact
+            pairs = [(i, j) for i in range(len(branches)) for j in range(i + 1, len(branches))]
+            related = [(branches[i], branches[j]) for i, j in pairs if not self.prune_unrelated_pairs or self._footprints_intersect(footprints[i], footprints[j])]
+            stats["pairs"] = len(pairs)
+            stats["pairs_skipped"] = len(pairs) - len(related)
+            stats["pairs_analyzed"] = len(related)
+
+            # Stage 3: vector and detectors for each remaining pair, concurrently
+            started = time.perf_counter()
+            semaphore = asyncio.Semaphore(self.max_concurrent_pairs)
+
+            async def predict_pair(branch1: str, branch2: str) -> list[PredictionResult]:
+                async with semaphore:
+                    return await self._predict_pair(branch1, branch2)
+
+            pair_predictions = await self._run_stage(
+                "pairs",
+                [predict_pair(branch1, branch2) for branch1, branch2 in related],
+                report,
+            )
+            predictions = [prediction for results in pair_predictions for prediction in results]
+            stats["stage_seconds"]["pairs"] = time.perf_counter() - started
 
             # Apply machine learning scoring
+            started = time.perf_counter()
             predictions = await self._apply_ml_scoring(predictions)
 
             # Sort by likelihood and confidence
@@ -196,6 +245,7 @@ class ConflictPredictor:
 
             # Limit results
             predictions = predictions[: self.max_predictions_per_run]
+            stats["stage_seconds"]["scoring"] = time.perf_counter() - started
 
             # Store predictions
             for prediction in predictions:
@@ -203,13 +253,150 @@ class ConflictPredictor:
                 self.prediction_history.append(prediction)
 
             self.prediction_stats["total_predictions"] += len(predictions)
-            logger.info("Generated %d conflict predictions", len(predictions))
+            logger.info(
+                "Generated %d conflict predictions from %d of %d branch pairs (%s)",
+                len(predictions),
+                stats["pairs_analyzed"],
+                stats["pairs"],
+                ", ".join(f"{stage} {seconds:.2f}s" for stage, seconds in stats["stage_seconds"].items()),
+            )
 
         except Exception:
             logger.exception("Error predicting conflicts:")
+        finally:
+            self._run_features = None
 
         return predictions
 
+    @staticmethod
+    async def _run_stage(
+        stage: str,
+        jobs: list[Awaitable[object]],
+        report: Callable[[str, int, int], None],
+    ) -> list[object]:
+        """Run a stage's jobs concurrently, reporting progress as each finishes.
+
+        Returns:
+            list[object]: Job results in the order of ``jobs``.
+        """
+        total = len(jobs)
+        completed = 0
+        report(stage, completed, total)
+
+        async def run(job: Awaitable[object]) -> object:
+            nonlocal completed
+            result = await job
+            completed += 1
+            report(stage, completed, total)
+            return result
+
+        return list(await asyncio.gather(*(run(job) for job in jobs)))
+
+    async def _predict_pair(self, branch1: str, branch2: str) -> list[PredictionResult]:
+        """Run every pattern detector for one branch pair.
+
+        Returns:
+            list[PredictionResult]: Predictions above the confidence threshold.
+        """
+        try:
+            vector = await self._calculate_conflict_vector(branch1, branch2)
+            self.conflict_vectors[f"{branch1}:{branch2}"] = vector
+
+            results = await asyncio.gather(*(detector(branch1, branch2, vector) for detector in self.pattern_detectors.values()))
+        except Exception:
+            logger.exception("Error predicting conflicts between %s and %s:", branch1, branch2)
+            return []
+        return [prediction for prediction in results if prediction and prediction.likelihood_score >= self.min_confidence_threshold]
+
+    async def _branch_feature(
+        self,
+        kind: str,
+        branch: str,
+        compute: Callable[[str], Awaitable[object]],
+    ) -> object:
+        """Compute a per-branch feature once per prediction run.
+
+        Concurrent pairs asking for the same feature share one computation;
+        outside ``predict_conflicts`` the feature is computed on every call.
+
+        Returns:
+            object: The feature value.
+        """
+        if self._run_features is None:
+            return await compute(branch)
+        key = (kind, branch)
+        if key not in self._run_features:
+            self._run_features[key] = asyncio.ensure_future(compute(branch))
+        return await self._run_features[key]
+
+    async def _branch_footprint(self, branch: str) -> tuple[set[str], set[str], set[str]]:
+        """Summarize what a branch touches and what its changes can reach.
+
+        Returns:
+            tuple[set[str], set[str], set[str]]: Changed paths, modules of the
+            changed Python files, and modules imported by those files.
+        """
+        files = await self._branch_feature("changed_files", branch, self.conflict_engine._get_changed_files)  # noqa: SLF001
+        imports = await self._branch_feature("imports", branch, self._get_python_files_with_imports)
+
+        modules = {self._module_name(path) for path in files if path.endswith(".py")}
+        imported = set()
+        for statements in imports.values():
+            for statement in statements:
+                parts = statement.replace(",", " ").split()
+                if parts[0] == "import":
+                    imported.add(parts[1])
+                elif parts[1] == "import":  # from . import <name>
+                    imported.update(parts[2:])
+                else:  # from <module> import <names>
+                    imported.update(f"{parts[1]}.{name}" for name in parts[3:])
+        return set(files), modules, imported
+
+    @staticmethod
+    def _module_name(path: str) -> str:
+        module = path.removesuffix(".py").replace("/", ".")
+        return module.removesuffix(".__init__")
+
+    @classmethod
+    def _footprints_intersect(
+        cls,
+        footprint1: tuple[set[str], set[str], set[str]],
+        footprint2: tuple[set[str], set[str], set[str]],
+    ) -> bool:
+        """Check whether two branches' changes can possibly conflict.
+
+        Returns:
+            bool: True if they change a common file, either changes a
+            dependency manifest, or one imports a module the other changes.
+        """
+        files1, modules1, imported1 = footprint1
+        files2, modules2, imported2 = footprint2
+        if files1 & files2 or any(path.endswith(DEPENDENCY_FILES) for path in files1 | files2):
+            return True
+        return cls._imports_reach(imported1, modules2) or cls._imports_reach(imported2, modules1)
+
+    @staticmethod
+    def _imports_reach(imported: set[str], modules: set[str]) -> bool:
+        """Check whether any import refers to one of ``modules``.
+
+        Relative imports lose their leading dots when extracted, so an import
+        matches any module whose dotted name ends with the imported name or
+        one of its parent packages.
+
+        Returns:
+            bool: True if some import names, or is inside, a changed module.
+        """
+        suffixes = set()
+        for module in modules:
+            parts = module.split(".")
+            suffixes.update(".".join(parts[i:]) for i in range(len(parts)))
+
+        for name in imported:
+            parts = name.split(".")
+            if any(".".join(parts[: i + 1]) in suffixes for i in range(len(parts))):
+                return True
+        return False
+
     async def _calculate_conflict_vector(
         self,
         branch1: str,
@@ -218,8 +405,8 @@ class ConflictPredictor:
         """Calculate multi-dimensional conflict probability vector."""
         try:
             # File overlap analysis
-            files1 = await self.conflict_engine._get_changed_files(branch1)  # noqa: SLF001
-            files2 = await self.conflict_engine._get_changed_files(branch2)  # noqa: SLF001
+            files1 = await self._branch_feature("changed_files", branch1, self.conflict_engine._get_changed_files)  # noqa: SLF001
+            files2 = await self._branch_feature("changed_files", branch2, self.conflict_engine._get_changed_files)  # noqa: SLF001
 
             common_files = set(files1.keys()) & set(files2.keys())
             file_overlap_score = len(common_files) / max(
@@ -228,13 +415,13 @@ class ConflictPredictor:
             )
 
             # Change frequency analysis
-            freq1 = await self._get_change_frequency(branch1)
-            freq2 = await self._get_change_frequency(branch2)
+            freq1 = await self._branch_feature("change_frequency", branch1, self._get_change_frequency)
+            freq2 = await self._branch_feature("change_frequency", branch2, self._get_change_frequency)
             change_frequency_score = min(freq1 * freq2 / 100, 1.0)  # Normalize
 
             # Code complexity analysis
-            complexity1 = await self._calculate_branch_complexity(branch1)
-            complexity2 = await self._calculate_branch_complexity(branch2)
+            complexity1 = await self._branch_feature("complexity", branch1, self._calculate_branch_complexity)
+            complexity2 = await self._branch_feature("complexity", branch2, self._calculate_branch_complexity)
             complexity_score = (complexity1 + complexity2) / 200  # Normalize
 
             # Dependency coupling analysis
@@ -268,8 +455,8 @@ class ConflictPredictor:
         """Detect potential import statement conflicts."""
         try:
             # Get Python files changed in both branches
-            files1 = await self._get_python_files_with_imports(branch1)
-            files2 = await self._get_python_files_with_imports(branch2)
+            files1 = await self._branch_feature("imports", branch1, self._get_python_files_with_imports)
+            files2 = await self._branch_feature("imports", branch2, self._get_python_files_with_imports)
 
             common_files = set(files1.keys()) & set(files2.keys())
             if not common_files:
@@ -331,8 +518,8 @@ class ConflictPredictor:
         """Detect potential function signature conflicts."""
         try:
             # Get function signatures from both branches
-            functions1 = await self._get_all_function_signatures(branch1)
-            functions2 = await self._get_all_function_signatures(branch2)
+            functions1 = await self._branch_feature("signatures", branch1, self._get_all_function_signatures)
+            functions2 = await self._branch_feature("signatures", branch2, self._get_all_function_signatures)
 
             common_functions = set(functions1.keys()) & set(functions2.keys())
             if not common_functions:
@@ -399,8 +586,8 @@ class ConflictPredictor:
         """Detect potential variable/class naming collisions."""
         try:
             # Get symbol definitions from both branches
-            symbols1 = await self._extract_symbol_definitions(branch1)
-            symbols2 = await self._extract_symbol_definitions(branch2)
+            symbols1 = await self._branch_feature("symbols", branch1, self._extract_symbol_definitions)
+            symbols2 = await self._branch_feature("symbols", branch2, self._extract_symbol_definitions)
 
             # Find potential naming collisions
             collision_likelihood = 0.0
@@ -453,8 +640,8 @@ class ConflictPredictor:
         """Detect potential class hierarchy conflicts."""
         try:
             # Get class hierarchies from both branches
-            hierarchies1 = await self._extract_class_hierarchies(branch1)
-            hierarchies2 = await self._extract_class_hierarchies(branch2)
+            hierarchies1 = await self._branch_feature("hierarchies", branch1, self._extract_class_hierarchies)
+            hierarchies2 = await self._branch_feature("hierarchies", branch2, self._extract_class_hierarchies)
 
             common_classes = set(hierarchies1.keys()) & set(hierarchies2.keys())
             if not common_classes:
@@ -511,8 +698,8 @@ class ConflictPredictor:
         """Detect potential dependency version conflicts."""
         try:
             # Get dependency versions from both branches
-            deps1 = await self._get_dependency_versions(branch1)
-            deps2 = await self._get_dependency_versions(branch2)
+            deps1 = await self._branch_feature("dependencies", branch1, self._get_dependency_versions)
+            deps2 = await self._branch_feature("dependencies", branch2, self._get_dependency_versions)
 
             common_deps = set(deps1.keys()) & set(deps2.keys())
             if not common_deps:
@@ -560,7 +747,6 @@ class ConflictPredictor:
             logger.exception("Error detecting version conflicts:")
             return None
 
-    @staticmethod
     async def _detect_api_changes(
         self,
         branch1: str,  # noqa: ARG002
@@ -572,7 +758,6 @@ class ConflictPredictor:
         # This is a simplified version
         return None
 
-    @staticmethod
     async def _detect_resource_conflicts(
         self,
         branch1: str,  # noqa: ARG002
@@ -583,7 +768,6 @@ class ConflictPredictor:
         # Implementation would analyze file locks, database access, etc.
         return None
 
-    @staticmethod
     async def _detect_context_loss(
         self,
         branch1: str,  # noqa: ARG002
@@ -683,9 +867,13 @@ class ConflictPredictor:
         # Simplified implementation
         return 0.5
 
-    async def _get_python_files_with_imports(self, branch: str) -> dict[str, list[str]]:
-        """Get Python files and their import statements."""
-        files = {}
+    async def _get_branch_sources(self, branch: str) -> dict[str, str]:
+        """Read the changed Python files of a branch.
+
+        Returns:
+            dict[str, str]: Content keyed by file path (deleted files are left out).
+        """
+        sources = {}
         try:
             python_files = await self.conflict_engine._get_python_files_changed(branch)  # noqa: SLF001
             for file_path in python_files:
@@ -694,27 +882,52 @@ class ConflictPredictor:
                     branch,
                 )
                 if content:
-                    imports = self._extract_imports(content)
-                    files[file_path] = imports
+                    sources[file_path] = content
+        except Exception:
+            logger.exception("Error reading changed Python files of %s:", branch)
+        return sources
+
+    async def _get_branch_summaries(self, branch: str) -> dict[str, Summary]:
+        """Parse the changed Python files of a branch in the analysis worker pool.
+
+        Returns:
+            dict[str, Summary]: Summary keyed by file path.
+        """
+        sources = await self._branch_feature("sources", branch, self._get_branch_sources)
+        return await self.semantic_analyzer.summarize_sources(sources)
+
+    async def _get_python_files_with_imports(self, branch: str) -> dict[str, list[str]]:
+        """Get Python files and their import statements."""
+        files = {}
+        try:
+            sources = await self._branch_feature("sources", branch, self._get_branch_sources)
+            # Parsed in the pool; _extract_imports then reads the cached summaries
+            await self._branch_feature("summaries", branch, self._get_branch_summaries)
+            for file_path, content in sources.items():
+                files[file_path] = self._extract_imports(content)
         except Exception:
             logger.exception("Error getting Python files with imports:")
         return files
 
-    @staticmethod
-    def _extract_imports(content: str) -> list[str]:
+    def _summarize(self, content: str) -> Summary:
+        """Get the parsed summary of Python source from the shared content cache.
+
+        Returns:
+            Summary: Output of ``summarize_source`` for ``content``.
+        """
+        return self.semantic_analyzer.summary_cache.get(content, summarize_source)
+
+    def _extract_imports(self, content: str) -> list[str]:
         """Extract import statements from Python code."""
         imports = []
-        try:
-            tree = ast.parse(content)
-            for node in ast.walk(tree):
-                if isinstance(node, ast.Import):
-                    for alias in node.names:
-                        imports.append(f"import {alias.name}")
-                elif isinstance(node, ast.ImportFrom):
-                    module = node.module or ""
-                    for alias in node.names:
-                        imports.append(f"from {module} import {alias.name}")
-        except SyntaxError:
+        summary = self._summarize(content)
+        if "syntax_error" not in summary:
+            for import_info in summary["imports"]:
+                if "name" in import_info:
+                    imports.append(f"from {import_info['module']} import {import_info['name']}")
+                else:
+                    imports.append(f"import {import_info['module']}")
+        else:
             # Fallback to regex for invalid syntax
             import_patterns = [
                 r"^import\s+[\w\.]+",
@@ -730,7 +943,6 @@ class ConflictPredictor:
 
     @staticmethod
     def _imports_likely_to_conflict(
-        self,
         imports1: list[str],
         imports2: list[str],
     ) -> bool:
@@ -756,18 +968,11 @@ class ConflictPredictor:
         """Get all function signatures from a branch."""
         signatures = {}
         try:
-            python_files = await self.conflict_engine._get_python_files_changed(branch)  # noqa: SLF001
-            for file_path in python_files:
-                content = await self.conflict_engine._get_file_content(  # noqa: SLF001
-                    file_path,
-                    branch,
-                )
-                if content:
-                    file_sigs = self.conflict_engine._extract_function_signatures(  # noqa: SLF001
-                        content,
-                    )
-                    for func_name, signature in file_sigs.items():
-                        signatures[f"{file_path}:{func_name}"] = signature
+            sources = await self._branch_feature("sources", branch, self._get_branch_sources)
+            file_sigs = await self.semantic_analyzer.analysis.map(self.conflict_engine._extract_function_signatures, sources)  # noqa: SLF001
+            for file_path, sigs in file_sigs.items():
+                for func_name, signature in sigs.items():
+                    signatures[f"{file_path}:{func_name}"] = signature
         except Exception:
             logger.exception("Error getting function signatures:")
         return signatures
@@ -776,23 +981,14 @@ class ConflictPredictor:
         """Extract symbol definitions from a branch."""
         symbols = {}
         try:
-            python_files = await self.conflict_engine._get_python_files_changed(branch)  # noqa: SLF001
-            for file_path in python_files:
-                content = await self.conflict_engine._get_file_content(  # noqa: SLF001
-                    file_path,
-                    branch,
-                )
-                if content:
-                    try:
-                        tree = ast.parse(content)
-                        for node in ast.walk(tree):
-                            if isinstance(
-                                node,
-                                ast.ClassDef | ast.FunctionDef | ast.AsyncFunctionDef,
-                            ):
-                                symbols[node.name] = f"{file_path}:{node.lineno}"
-                    except SyntaxError:
-                        pass
+            summaries = await self._branch_feature("summaries", branch, self._get_branch_summaries)
+            for file_path, summary in summaries.items():
+                for name, function in summary.get("functions", {}).items():
+                    symbols[name] = f"{file_path}:{function['line_number']}"
+                for name, definition in summary.get("classes", {}).items():
+                    symbols[name] = f"{file_path}:{definition['line_number']}"
+                    for method, function in definition.get("methods", {}).items():
+                        symbols[method] = f"{file_path}:{function['line_number']}"
         except Exception:
             logger.exception("Error extracting symbol definitions:")
         return symbols
@@ -801,26 +997,10 @@ class ConflictPredictor:
         """Extract class inheritance hierarchies."""
         hierarchies = {}
         try:
-            python_files = await self.conflict_engine._get_python_files_changed(branch)  # noqa: SLF001
-            for file_path in python_files:
-                content = await self.conflict_engine._get_file_content(  # noqa: SLF001
-                    file_path,
-                    branch,
-                )
-                if content:
-                    try:
-                        tree = ast.parse(content)
-                        for node in ast.walk(tree):
-                            if isinstance(node, ast.ClassDef):
-                                bases = []
-                                for base in node.bases:
-                                    if isinstance(base, ast.Name):
-                                        bases.append(base.id)
-                                    elif isinstance(base, ast.Attribute):
-                                        bases.append(ast.unparse(base))
-                                hierarchies[node.name] = bases
-                    except SyntaxError:
-                        pass
+            summaries = await self._branch_feature("summaries", branch, self._get_branch_summaries)
+            for summary in summaries.values():
+                for name, definition in summary.get("classes", {}).items():
+                    hierarchies[name] = list(definition.get("bases", []))
         except Exception:
             logger.exception("Error extracting class hierarchies:")
         return hierarchies
@@ -10,6 +10,7 @@ from enum import Enum
 from pathlib import Path
 
 from .branch_manager import BranchManager
+from .git_cache import GitObjectCache
 
 # Example: Handle import conflicts
 # Simple approach: merge unique imports
@@ -100,6 +101,7 @@ class ConflictResolutionEngine:
         """
         self.branch_manager = branch_manager
         self.repo_path = Path(repo_path) if repo_path else Path.cwd()
+        self.git = GitObjectCache.for_repo(self.repo_path)
 
         # Conflict tracking
         self.detected_conflicts: dict[str, ConflictInfo] = {}
@@ -826,36 +828,23 @@ class ConflictResolutionEngine:
 
     async def _get_merge_base(self, branch1: str, branch2: str) -> str:
         """Get the merge base of two branches."""
-        result = await self._run_git_command(["merge-base", branch1, branch2])
-        return str(result.stdout).strip()
+        return await asyncio.to_thread(self.git.merge_base, branch1, branch2)
 
     async def _get_changed_files(self, branch: str) -> dict[str, str]:
         """Get files changed in a branch with their change types."""
-        result = await self._run_git_command(
-            ["diff", "--name-status", f"HEAD..{branch}"],
-        )
-
-        files = {}
-        for line in result.stdout.strip().split("\n"):
-            if line:
-                parts = line.split("\t")
-                if len(parts) >= 2:
-                    change_type = parts[0]
-                    file_path = parts[1]
-                    files[file_path] = change_type
-
-        return files
+        return await asyncio.to_thread(self.git.changed_files, "HEAD", branch)
 
     async def _get_python_files_changed(self, branch: str) -> list[str]:
-        """Get Python files changed in a branch."""
+        """Get Python files changed in a branch, prefetching their contents."""
         files = await self._get_changed_files(branch)
-        return [f for f in files if f.endswith(".py")]
+        python_files = [f for f in files if f.endswith(".py")]
+        await asyncio.to_thread(self.git.prefetch, branch, [f for f in python_files if files[f] != "D"])
+        return python_files
 
     async def _get_file_content(self, file_path: str, branch: str) -> str | None:
         """Get file content from a specific branch."""
         try:
-            result = await self._run_git_command(["show", f"{branch}:{file_path}"])
-            return str(result.stdout) if result.returncode == 0 else None
+            return await asyncio.to_thread(self.git.read_text, branch, file_path)
         except (subprocess.CalledProcessError, OSError, RuntimeError) as e:
             return None
 
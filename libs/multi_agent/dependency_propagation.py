@@ -1,6 +1,5 @@
 # Copyright notice.
 
-import ast
 import asyncio
 import hashlib
 import logging
@@ -10,9 +9,12 @@ from datetime import UTC, datetime
 from enum import Enum
 from pathlib import Path
 
+from .analysis_service import AnalysisService
 from .branch_info_protocol import BranchInfoProtocol, BranchInfoType
 from .branch_manager import BranchManager
 from .collaboration_engine import CollaborationEngine, MessagePriority, MessageType
+from .semantic_analyzer import summarize_source
+from .semantic_cache import SemanticSummaryCache
 
 # Copyright (c) 2024 Yesman Claude Project
 # Licensed under the MIT License
@@ -134,6 +136,8 @@ class DependencyPropagationSystem:
         self.branch_info_protocol = branch_info_protocol
         self.branch_manager = branch_manager
         self.repo_path = Path(repo_path) if repo_path else Path.cwd()
+        self.summary_cache = SemanticSummaryCache.for_repo(self.repo_path)
+        self.analysis = AnalysisService.shared()
         self.auto_propagate = auto_propagate
 
         # Dependency graph and tracking
@@ -275,9 +279,11 @@ class DependencyPropagationSystem:
             py_files = list(self.repo_path.rglob("*.py"))
             file_paths = [str(p.relative_to(self.repo_path)) for p in py_files]
 
-        # Analyze each file
-        for file_path in file_paths:
-            await self._analyze_file_dependencies(file_path)
+        # Parse all files in the analysis worker pool, then link them up
+        sources = await asyncio.to_thread(self._read_sources, file_paths)
+        await self.analysis.map(summarize_source, sources, cache=self.summary_cache)
+        for file_path, content in sources.items():
+            await self._analyze_file_dependencies(file_path, content)
 
         logger.info("Built dependency graph with %d nodes", len(self.dependency_graph))
         return self.dependency_graph
@@ -391,72 +397,87 @@ class DependencyPropagationSystem:
 
     # Private methods
 
-    async def _analyze_file_dependencies(self, file_path: str) -> None:
-        """Analyze dependencies for a single file."""
+    def _read_sources(self, file_paths: list[str]) -> dict[str, str]:
+        """Read the existing Python files among ``file_paths``.
+
+        Returns:
+            dict[str, str]: Content keyed by file path.
+        """
+        sources = {}
+        for file_path in file_paths:
+            full_path = self.repo_path / file_path
+            if full_path.suffix != ".py":
+                continue
+            try:
+                sources[file_path] = full_path.read_text(encoding="utf-8")
+            except (OSError, UnicodeDecodeError):
+                logger.debug("Skipping unreadable file %s", file_path)
+        return sources
+
+    async def _analyze_file_dependencies(self, file_path: str, content: str | None = None) -> None:
+        """Analyze dependencies for a single file, reading it unless ``content`` is given."""
         full_path = self.repo_path / file_path
 
-        if not full_path.exists() or full_path.suffix != ".py":
+        if content is None and (not full_path.exists() or full_path.suffix != ".py"):
             return
 
         try:
-            with open(full_path, encoding="utf-8") as f:
-                content = f.read()
+            if content is None:
+                with open(full_path, encoding="utf-8") as f:
+                    content = f.read()
 
-            # Parse AST
-            tree = ast.parse(content)
+            # Parsed summary from the shared content-addressed cache
+            summary = self.summary_cache.get(content, summarize_source)
+            if "syntax_error" in summary:
+                logger.warning("Syntax error in %s: %s", file_path, summary["syntax_error"])
+                return
 
             # Extract dependencies
             dependencies = set()
             imports = {}
             exports = {}
 
-            for ast_node in ast.walk(tree):
-                if isinstance(ast_node, ast.Import | ast.ImportFrom):
+            for import_info in summary["imports"]:
+                module_name = import_info["module"]
+                if "name" not in import_info:
                     # Import statements
-                    if isinstance(ast_node, ast.Import):
-                        for alias in ast_node.names:
-                            module_name = alias.name
-                            dependencies.add(module_name)
-                            imports[alias.asname or alias.name] = {
-                                "type": "import",
-                                "module": module_name,
-                                "line": ast_node.lineno,
-                            }
-
-                    elif isinstance(ast_node, ast.ImportFrom) and ast_node.module:
-                        module_name = ast_node.module
-                        dependencies.add(module_name)
-                        for alias in ast_node.names:
-                            imports[alias.asname or alias.name] = {
-                                "type": "from_import",
-                                "module": module_name,
-                                "name": alias.name,
-                                "line": ast_node.lineno,
-                            }
-
-                elif isinstance(ast_node, ast.FunctionDef | ast.AsyncFunctionDef):
-                    # Function definitions (exports)
-                    exports[ast_node.name] = {
-                        "type": "function",
-                        "line": ast_node.lineno,
-                        "args": [arg.arg for arg in ast_node.args.args],
-                        "is_async": isinstance(ast_node, ast.AsyncFunctionDef),
+                    dependencies.add(module_name)
+                    imports[import_info.get("alias") or module_name] = {
+                        "type": "import",
+                        "module": module_name,
+                        "line": import_info["line_number"],
                     }
-
-                elif isinstance(ast_node, ast.ClassDef):
-                    # Class definitions (exports)
-                    base_classes = []
-                    for base in ast_node.bases:
-                        if isinstance(base, ast.Name):
-                            base_classes.append(base.id)
-                            dependencies.add(base.id)  # Inheritance dependency
-
-                    exports[ast_node.name] = {
-                        "type": "class",
-                        "line": ast_node.lineno,
-                        "bases": base_classes,
+                elif module_name:
+                    dependencies.add(module_name)
+                    imports[import_info.get("alias") or import_info["name"]] = {
+                        "type": "from_import",
+                        "module": module_name,
+                        "name": import_info["name"],
+                        "line": import_info["line_number"],
                     }
 
+            # Function and method definitions (exports)
+            functions = list(summary["functions"].items())
+            for definition in summary["classes"].values():
+                functions.extend(definition.get("methods", {}).items())
+            for function_name, function in functions:
+                exports[function_name] = {
+                    "type": "function",
+                    "line": function["line_number"],
+                    "args": [arg.split(":", 1)[0] for arg in function.get("args", [])],
+                    "is_async": function["name"].startswith("async "),
+                }
+
+            for class_name, definition in summary["classes"].items():
+                # Class definitions (exports); only plain names are inheritance dependencies
+                base_classes = [base for base in definition.get("bases", []) if "." not in base]
+                dependencies.update(base_classes)
+                exports[class_name] = {
+                    "type": "class",
+                    "line": definition["line_number"],
+                    "bases": base_classes,
+                }
+
             # Create or update dependency node
             module_name = file_path.replace("/", ".").replace(".py", "")
             node = DependencyNode(
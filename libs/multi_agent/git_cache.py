@@ -0,0 +1,280 @@
+# Copyright notice.
+
+import logging
+import subprocess
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable
+from pathlib import Path
+from typing import ClassVar
+
+# Copyright (c) 2024 Yesman Claude Project
+# Licensed under the MIT License
+
+"""Shared, SHA-keyed access to git objects for the multi-agent analyzers.
+
+Conflict detection and prediction read the same blobs, diffs and merge-bases
+over and over for every pair of branches. ``GitObjectCache`` serves all of
+them from one process-wide instance per repository:
+
+* blobs are read through a single long-lived ``git cat-file --batch`` process
+  instead of one ``git show`` per file per branch, and many of them can be
+  requested in one pipelined round trip with ``prefetch``;
+* branch names are resolved to commit SHAs on every call (cheap, through the
+  same batch process) and everything else is memoized by SHA, so a cached
+  diff, merge-base or blob can never go stale when a branch moves.
+
+The methods are synchronous and thread-safe; async callers run them with
+``asyncio.to_thread``.
+"""
+
+MAX_BLOB_CACHE_BYTES = 64 * 1024 * 1024
+PREFETCH_CHUNK_SIZE = 128
+
+
+class GitObjectCache:
+    """Long-lived ``cat-file`` reader plus SHA-keyed memo of diffs and merge-bases."""
+
+    _instances: ClassVar[dict[Path, "GitObjectCache"]] = {}
+    _instances_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    def __init__(self, repo_path: Path | str, max_blob_bytes: int = MAX_BLOB_CACHE_BYTES) -> None:
+        self.repo_path = Path(repo_path)
+        self.max_blob_bytes = max_blob_bytes
+        self.logger = logging.getLogger("yesman.git_cache")
+
+        self._process: subprocess.Popen | None = None
+        self._process_lock = threading.Lock()
+        self._cache_lock = threading.Lock()
+
+        self._blobs: OrderedDict[tuple[str, str], str | None] = OrderedDict()
+        self._blob_bytes = 0
+        self._diffs: dict[tuple[str, str], dict[str, str]] = {}
+        self._merge_bases: dict[tuple[str, str], str] = {}
+
+        self.stats = {
+            "blob_hits": 0,
+            "blob_reads": 0,
+            "diff_hits": 0,
+            "diff_runs": 0,
+            "merge_base_hits": 0,
+            "merge_base_runs": 0,
+            "processes_started": 0,
+        }
+
+    @classmethod
+    def for_repo(cls, repo_path: Path | str) -> "GitObjectCache":
+        """Get the shared cache for a repository.
+
+        Returns:
+            GitObjectCache: The process-wide cache for ``repo_path``.
+        """
+        resolved = Path(repo_path).resolve()
+        with cls._instances_lock:
+            if resolved not in cls._instances:
+                cls._instances[resolved] = cls(resolved)
+            return cls._instances[resolved]
+
+    def run(self, args: list[str]) -> subprocess.CompletedProcess:
+        """Run a one-off git command in the repository.
+
+        Returns:
+            subprocess.CompletedProcess: Result with decoded stdout and stderr.
+        """
+        return subprocess.run(["git", *args], cwd=self.repo_path, capture_output=True, text=True, errors="replace", check=False)
+
+    def resolve(self, rev: str) -> str | None:
+        """Resolve a branch, tag or SHA to a commit SHA.
+
+        Returns:
+            str | None: The full commit SHA, or None if ``rev`` does not exist.
+        """
+        header, _ = self._batch([f"{rev}^{{commit}}"])[0]
+        return header
+
+    def merge_base(self, rev1: str, rev2: str) -> str:
+        """Find the merge base of two revisions.
+
+        Returns:
+            str: The merge-base SHA, or an empty string if there is none.
+        """
+        sha1, sha2 = self.resolve(rev1), self.resolve(rev2)
+        if sha1 is None or sha2 is None:
+            return ""
+
+        key = (sha1, sha2) if sha1 <= sha2 else (sha2, sha1)
+        with self._cache_lock:
+            if key in self._merge_bases:
+                self.stats["merge_base_hits"] += 1
+                return self._merge_bases[key]
+
+        result = self.run(["merge-base", sha1, sha2])
+        base = result.stdout.strip() if result.returncode == 0 else ""
+        with self._cache_lock:
+            self._merge_bases[key] = base
+            self.stats["merge_base_runs"] += 1
+        return base
+
+    def changed_files(self, base: str, rev: str) -> dict[str, str]:
+        """List files that differ between two revisions.
+
+        Returns:
+            dict[str, str]: ``git diff --name-status`` change type keyed by path.
+        """
+        base_sha, sha = self.resolve(base), self.resolve(rev)
+        if base_sha is None or sha is None:
+            return {}
+
+        key = (base_sha, sha)
+        with self._cache_lock:
+            if key in self._diffs:
+                self.stats["diff_hits"] += 1
+                return dict(self._diffs[key])
+
+        result = self.run(["diff", "--name-status", base_sha, sha])
+        files = {}
+        if result.returncode == 0:
+            for line in result.stdout.splitlines():
+                parts = line.split("\t")
+                if len(parts) >= 2:
+                    files[parts[1]] = parts[0]
+
+        with self._cache_lock:
+            self._diffs[key] = files
+            self.stats["diff_runs"] += 1
+        return dict(files)
+
+    def read_text(self, rev: str, path: str) -> str | None:
+        """Read a file as it is in ``rev``.
+
+        Returns:
+            str | None: The decoded content, or None if the file does not exist there.
+        """
+        sha = self.resolve(rev)
+        if sha is None:
+            return None
+        return self._read_blobs(sha, [path])[path]
+
+    def prefetch(self, rev: str, paths: Iterable[str]) -> int:
+        """Load many files of one revision in a single pipelined round trip.
+
+        Returns:
+            int: Number of files that had to be read from git.
+        """
+        sha = self.resolve(rev)
+        if sha is None:
+            return 0
+        with self._cache_lock:
+            missing = [path for path in dict.fromkeys(paths) if (sha, path) not in self._blobs]
+        self._read_blobs(sha, missing)
+        return len(missing)
+
+    def clear(self) -> None:
+        """Drop every cached object (they are never stale, this only frees memory)."""
+        with self._cache_lock:
+            self._blobs.clear()
+            self._blob_bytes = 0
+            self._diffs.clear()
+            self._merge_bases.clear()
+
+    def close(self) -> None:
+        """Stop the ``cat-file`` process; it is restarted on the next read."""
+        with self._process_lock:
+            self._stop_process()
+
+    def _read_blobs(self, sha: str, paths: list[str]) -> dict[str, str | None]:
+        contents: dict[str, str | None] = {}
+        to_read = []
+        with self._cache_lock:
+            for path in paths:
+                key = (sha, path)
+                if key in self._blobs:
+                    self._blobs.move_to_end(key)
+                    contents[path] = self._blobs[key]
+                    self.stats["blob_hits"] += 1
+                else:
+                    to_read.append(path)
+
+        if to_read:
+            responses = self._batch([f"{sha}:{path}" for path in to_read])
+            with self._cache_lock:
+                for path, (object_sha, data) in zip(to_read, responses, strict=True):
+                    text = data.decode("utf-8", errors="replace") if object_sha is not None else None
+                    contents[path] = text
+                    self._store_blob((sha, path), text)
+                    self.stats["blob_reads"] += 1
+        return contents
+
+    def _store_blob(self, key: tuple[str, str], text: str | None) -> None:
+        if key in self._blobs:
+            return
+        self._blobs[key] = text
+        self._blob_bytes += len(text) if text else 0
+        while self._blob_bytes > self.max_blob_bytes and len(self._blobs) > 1:
+            _, evicted = self._blobs.popitem(last=False)
+            self._blob_bytes -= len(evicted) if evicted else 0
+
+    def _batch(self, specs: list[str]) -> list[tuple[str | None, bytes]]:
+        """Send object specs to ``cat-file --batch`` and read one response per spec.
+
+        Requests are pipelined in chunks small enough that writing a chunk can
+        never block on git waiting for its output to be read.
+
+        Returns:
+            list[tuple[str | None, bytes]]: Object SHA (None if missing) and
+            content for each spec, in order.
+        """
+        with self._process_lock:
+            for attempt in range(2):
+                try:
+                    process = self._ensure_process()
+                    responses = []
+                    for start in range(0, len(specs), PREFETCH_CHUNK_SIZE):
+                        chunk = specs[start : start + PREFETCH_CHUNK_SIZE]
+                        process.stdin.write("".join(f"{spec}\n" for spec in chunk).encode())
+                        process.stdin.flush()
+                        responses.extend(self._read_response(process) for _ in chunk)
+                except (BrokenPipeError, OSError, ValueError):
+                    self._stop_process()
+                    if attempt:
+                        raise
+                    self.logger.warning("git cat-file process for %s died, restarting", self.repo_path)
+                else:
+                    return responses
+        return []
+
+    @staticmethod
+    def _read_response(process: subprocess.Popen) -> tuple[str | None, bytes]:
+        header = process.stdout.readline()
+        if not header:
+            msg = "git cat-file closed its output"
+            raise OSError(msg)
+        fields = header.split()
+        if fields[-1] in {b"missing", b"ambiguous"}:
+            # "<spec> missing" or "<spec> ambiguous", where the spec may contain spaces
+            return None, b""
+        data = process.stdout.read(int(fields[2]))
+        process.stdout.read(1)
+        return fields[0].decode(), data
+
+    def _ensure_process(self) -> subprocess.Popen:
+        if self._process is None or self._process.poll() is not None:
+            self._process = subprocess.Popen(
+                ["git", "cat-file", "--batch"],
+                cwd=self.repo_path,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+            self.stats["processes_started"] += 1
+        return self._process
+
+    def _stop_process(self) -> None:
+        if self._process is None:
+            return
+        process, self._process = self._process, None
+        try:
+            process.stdin.close()
+            process.wait(timeout=1)
+        except (OSError, ValueError, subprocess.TimeoutExpired):
+            process.kill()
@@ -0,0 +1,203 @@
+# Copyright notice.
+
+import ast
+import logging
+import threading
+from collections import defaultdict
+from pathlib import Path
+from typing import ClassVar
+
+from libs.source_index import SourceFileIndex
+
+# Copyright (c) 2024 Yesman Claude Project
+# Licensed under the MIT License
+
+"""Forward and reverse import graph of a repository's Python modules.
+
+Finding the files related to a file used to mean parsing every Python file of
+the repository for every file on the search frontier. ``ModuleGraph`` keeps
+
+* the imports of every file, computed by an ``imports`` analyzer of the shared
+  ``SourceFileIndex`` (so they are persisted with the index and a file is only
+  re-parsed when its mtime or size changes), and
+* a reverse index from imported module name to importing files, updated
+  incrementally for the files that changed since the last ``refresh``,
+
+which turns related-file queries into graph traversals.
+"""
+
+
+def python_imports(path: str, content: str) -> list[list[object]] | None:
+    """List the imports of a Python file for the source index.
+
+    Relative imports are recorded by their module name without the leading
+    dots, and ``from . import x`` is skipped.
+
+    Returns:
+        list[list[object]] | None: ``[module, import type, line, symbols]`` per
+        import, an empty list for non-Python files, or None if the file does
+        not parse.
+    """
+    if not path.endswith(".py"):
+        return []
+    try:
+        tree = ast.parse(content)
+    except (SyntaxError, ValueError):
+        return None
+
+    imports: list[list[object]] = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            imports.extend([alias.name, "import", node.lineno, []] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            imports.append([node.module, "from_import", node.lineno, [alias.name for alias in node.names]])
+    return imports
+
+
+def module_name(file_path: str) -> str:
+    """Convert a file path to a dotted module name (``pkg/__init__.py`` is ``pkg``).
+
+    Returns:
+        str: The module name.
+    """
+    path = Path(file_path)
+    if path.suffix == ".py":
+        path = path.with_suffix("")
+    return str(path).replace("/", ".").replace("\\", ".").removesuffix(".__init__")
+
+
+class ModuleGraph:
+    """Imports per file plus a reverse index of importers per module name."""
+
+    _instances: ClassVar[dict[Path, "ModuleGraph"]] = {}
+    _instances_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    def __init__(self, root: Path | str, index: SourceFileIndex | None = None) -> None:
+        self.root = Path(root).resolve()
+        self.index = index or SourceFileIndex.for_root(self.root)
+        self.index.register_analyzer("imports", python_imports)
+        self.logger = logging.getLogger("yesman.module_graph")
+
+        self._lock = threading.RLock()
+        # path -> (mtime_ns, size) of the version whose imports are in the reverse index
+        self._versions: dict[str, tuple[int, int]] = {}
+        self._imported_modules: dict[str, set[str]] = {}
+        self._importers: defaultdict[str, set[str]] = defaultdict(set)
+        self._importers_by_last_part: defaultdict[str, set[str]] = defaultdict(set)
+        self._files_by_module: dict[str, str] = {}
+
+    @classmethod
+    def for_root(cls, root: Path | str) -> "ModuleGraph":
+        """Get the shared module graph for a project root.
+
+        Returns:
+            ModuleGraph: The process-wide graph for ``root``.
+        """
+        resolved = Path(root).resolve()
+        with cls._instances_lock:
+            if resolved not in cls._instances:
+                cls._instances[resolved] = cls(resolved)
+            return cls._instances[resolved]
+
+    def refresh(self) -> int:
+        """Bring the graph up to date with the file system.
+
+        Only files added, changed or removed since the last refresh are
+        re-indexed.
+
+        Returns:
+            int: Number of files whose imports were updated.
+        """
+        with self._lock:
+            self.index.refresh()
+            entries = {entry.path: entry for entry in self.index.files((".py",), analyzers=("imports",))}
+
+            updated = 0
+            for path in self._versions.keys() - entries.keys():
+                self._unlink(path)
+                del self._versions[path]
+                updated += 1
+            for path, entry in entries.items():
+                version = (entry.mtime_ns, entry.size)
+                if self._versions.get(path) != version:
+                    self._unlink(path)
+                    self._link(path, entry.stats.get("imports"))
+                    self._versions[path] = version
+                    updated += 1
+
+            if updated:
+                # pkg/mod.py wins over pkg/mod/__init__.py, as in module resolution
+                self._files_by_module = {}
+                for path in sorted(entries, key=lambda path: path.endswith("__init__.py")):
+                    self._files_by_module.setdefault(module_name(path), path)
+            return updated
+
+    def imports(self, file_path: str) -> list[list[object]] | None:
+        """Get the imports of one file, re-parsing it only if it changed.
+
+        Returns:
+            list[list[object]] | None: ``[module, import type, line, symbols]``
+            per import, or None if the file is missing, unreadable or does not
+            parse.
+        """
+        entry = self.index.get(file_path, analyzers=("imports",))
+        if entry is None or not entry.readable:
+            return None
+        return entry.stats.get("imports")
+
+    def file_for_module(self, module: str) -> str | None:
+        """Find the repository file defining a module.
+
+        Returns:
+            str | None: The file path, or None for third-party and missing modules.
+        """
+        with self._lock:
+            return self._files_by_module.get(module)
+
+    def imported_files(self, file_path: str) -> set[str]:
+        """Get the repository files a file imports.
+
+        Returns:
+            set[str]: Paths of the imported modules that live in the repository.
+        """
+        with self._lock:
+            files = (self._files_by_module.get(module) for module in self._imported_modules.get(file_path, ()))
+            return {path for path in files if path}
+
+    def importers(self, module: str) -> set[str]:
+        """Get the files importing a module.
+
+        A file counts as importing ``a.b.c`` if it imports ``a.b.c`` itself,
+        one of its parent packages, or any dotted module ending in ``.c``.
+
+        Returns:
+            set[str]: Paths of the importing files.
+        """
+        parts = module.split(".")
+        with self._lock:
+            files = set(self._importers_by_last_part.get(parts[-1], ()))
+            for end in range(1, len(parts) + 1):
+                files.update(self._importers.get(".".join(parts[:end]), ()))
+            return files
+
+    def _link(self, path: str, imports: list[list[object]] | None) -> None:
+        modules = {str(module) for module, *_ in imports or ()}
+        self._imported_modules[path] = modules
+        for module in modules:
+            self._importers[module].add(path)
+            if "." in module:
+                self._importers_by_last_part[module.rsplit(".", 1)[1]].add(path)
+
+    def _unlink(self, path: str) -> None:
+        for module in self._imported_modules.pop(path, ()):
+            self._discard(self._importers, module, path)
+            if "." in module:
+                self._discard(self._importers_by_last_part, module.rsplit(".", 1)[1], path)
+
+    @staticmethod
+    def _discard(index: defaultdict[str, set[str]], key: str, path: str) -> None:
+        files = index.get(key)
+        if files is not None:
+            files.discard(path)
+            if not files:
+                del index[key]
@@ -1,15 +1,20 @@
 # Copyright notice.
 
 import ast
+import asyncio
 import hashlib
 import logging
-from dataclasses import dataclass, field
+from collections.abc import Hashable, Mapping
+from dataclasses import MISSING, asdict, dataclass, field, fields
 from datetime import UTC, datetime
 from enum import Enum
 from pathlib import Path
 
+from .analysis_service import AnalysisService
 from .branch_manager import BranchManager
 from .conflict_resolution import ConflictSeverity, ResolutionStrategy
+from .git_cache import GitObjectCache
+from .semantic_cache import SemanticSummaryCache, Summary, blob_sha
 
 # Check import conflicts
 # Compare imports
@@ -104,6 +109,7 @@ class SemanticContext:
     constants: dict[str, str] = field(default_factory=dict)
     ast_hash: str = ""
     last_modified: datetime = field(default_factory=lambda: datetime.now(UTC))
+    syntax_error: str | None = None
 
 
 @dataclass
@@ -139,6 +145,9 @@ class SemanticAnalyzer:
         """
         self.branch_manager = branch_manager
         self.repo_path = Path(repo_path) if repo_path else Path.cwd()
+        self.git = GitObjectCache.for_repo(self.repo_path)
+        self.summary_cache = SemanticSummaryCache.for_repo(self.repo_path)
+        self.analysis = AnalysisService.shared()
 
         # Semantic context cache
         self.semantic_contexts: dict[str, SemanticContext] = {}
@@ -184,6 +193,9 @@ class SemanticAnalyzer:
             if file_paths is None:
                 file_paths = await self._get_changed_python_files(branch1, branch2)
 
+            # Parse every file of both branches in the worker pool up front
+            await self._summarize_files(file_paths, [branch1, branch2])
+
             # Analyze each file
             for file_path in file_paths:
                 file_conflicts = await self._analyze_file_semantic_conflicts(
@@ -271,20 +283,22 @@ class SemanticAnalyzer:
         file_path: str,
         branch: str,
     ) -> SemanticContext | None:
-        """Get or create semantic context for a file in a specific branch."""
-        cache_key = f"{branch}:{file_path}"
-
-        # Check cache
-        if cache_key in self.semantic_contexts:
-            self.analysis_stats["cache_hits"] += 1
-            return self.semantic_contexts[cache_key]
+        """Get or create semantic context for a file in a specific branch.
 
+        Contexts are cached by content, so a file that is identical on several
+        branches is analyzed once and a moved branch never hits a stale entry.
+        """
         try:
             # Get file content from branch
             content = await self._get_file_content(file_path, branch)
             if not content:
                 return None
 
+            cache_key = f"{blob_sha(content)}:{file_path}"
+            if cache_key in self.semantic_contexts:
+                self.analysis_stats["cache_hits"] += 1
+                return self.semantic_contexts[cache_key]
+
             # Parse AST and extract semantic information
             context = self._extract_semantic_context(file_path, content)
 
@@ -294,9 +308,30 @@ class SemanticAnalyzer:
             return context
 
         except Exception:
-            logger.exception("Error getting semantic context for %s in %s")
+            logger.exception("Error getting semantic context for %s in %s", file_path, branch)
             return None
 
+    async def summarize_sources(self, sources: Mapping[Hashable, str]) -> dict[Hashable, Summary]:
+        """Summarize a batch of sources off the event loop (see ``summarize_source``).
+
+        Summaries go through the shared summary cache, so later
+        ``_extract_semantic_context`` calls for the same contents are lookups.
+
+        Returns:
+            dict[Hashable, Summary]: Summary for each key of ``sources``.
+        """
+        return await self.analysis.map(summarize_source, sources, cache=self.summary_cache)
+
+    async def _summarize_files(self, file_paths: list[str], branches: list[str]) -> None:
+        """Summarize files as they are on each branch in one batch."""
+        sources = {}
+        for branch in branches:
+            for file_path in file_paths:
+                content = await self._get_file_content(file_path, branch)
+                if content:
+                    sources[branch, file_path] = content
+        await self.summarize_sources(sources)
+
     def _extract_semantic_context(
         self,
         file_path: str,
@@ -304,30 +339,22 @@ class SemanticAnalyzer:
     ) -> SemanticContext:
         """Extract semantic context from Python source code.
 
+        The parse result is looked up in, or added to, the repository's shared
+        content-addressed summary cache.
+
         Returns:
         SemanticContext: Description of return value.
         """
         context = SemanticContext(file_path=file_path)
 
         try:
-            # Parse AST
-            tree = ast.parse(content)
+            context = context_from_summary(file_path, self.summary_cache.get(content, summarize_source))
+            if context.syntax_error:
+                logger.warning("Syntax error in %s: %s", file_path, context.syntax_error)
 
             # Calculate AST hash for change detection
             context.ast_hash = hashlib.sha256(content.encode()).hexdigest()
 
-            # Extract semantic information
-            visitor = SemanticVisitor()
-            visitor.visit(tree)
-
-            context.functions = visitor.functions
-            context.classes = visitor.classes
-            context.imports = visitor.imports
-            context.global_variables = visitor.global_variables
-            context.constants = visitor.constants
-
-        except SyntaxError as e:
-            logger.warning("Syntax error in %s: %s", file_path, e)
         except Exception:
             logger.exception("Error extracting semantic context")
 
@@ -800,26 +827,24 @@ class SemanticAnalyzer:
 
     # Helper methods
 
-    async def _get_changed_python_files(self, branch1: str, branch2: str) -> list[str]:  # noqa: ARG002
-        """Get list of Python files changed between branches."""
+    async def _get_changed_python_files(self, branch1: str, branch2: str) -> list[str]:
+        """Get list of Python files changed between branches, prefetching both versions."""
         try:
-            # This would use git to find changed files
-            # For now, return a placeholder
-            return []
+            files = await asyncio.to_thread(self.git.changed_files, branch1, branch2)
+            python_files = [f for f in files if f.endswith(".py")]
+            await asyncio.to_thread(self.git.prefetch, branch1, python_files)
+            await asyncio.to_thread(self.git.prefetch, branch2, python_files)
         except Exception:
+            logger.exception("Error listing changed files between %s and %s", branch1, branch2)
             return []
+        return python_files
 
-    async def _get_file_content(self, file_path: str, branch: str) -> str | None:  # noqa: ARG002
+    async def _get_file_content(self, file_path: str, branch: str) -> str | None:
         """Get file content from specific branch."""
         try:
-            # This would use git to get file content from branch
-            # For now, read from current working directory
-            full_path = self.repo_path / file_path
-            if full_path.exists() and full_path.suffix == ".py":
-                with open(full_path, encoding="utf-8") as f:
-                    return f.read()
+            return await asyncio.to_thread(self.git.read_text, branch, file_path)
         except Exception:
-            logger.exception("Error reading file %s")
+            logger.exception("Error reading %s from %s", file_path, branch)
         return None
 
     def get_analysis_summary(self) -> dict[str]:
@@ -1086,3 +1111,70 @@ class SemanticVisitor(ast.NodeVisitor):
             return node.func.id
 
         return "unknown"
+
+
+def _compact(item: object) -> dict[str, object]:
+    """Convert a symbol dataclass to a dict without empty optional fields.
+
+    Fields without a default are always kept, so the dict rebuilds the dataclass.
+
+    Returns:
+        dict[str, object]: JSON-serializable fields.
+    """
+    required = {f.name for f in fields(item) if f.default is MISSING and f.default_factory is MISSING}
+    data = {key: value for key, value in asdict(item).items() if key in required or (value is not None and value not in ([], {}))}
+    if "visibility" in data:
+        data["visibility"] = data["visibility"].value
+    return data
+
+
+def _function_from_dict(data: dict[str, object]) -> FunctionSignature:
+    return FunctionSignature(**{**data, "visibility": SymbolVisibility(data["visibility"])})
+
+
+def summarize_source(content: str) -> Summary:
+    """Parse Python source into a JSON-serializable semantic summary.
+
+    This is the function whose results ``SemanticSummaryCache`` stores; bump
+    ``SUMMARY_VERSION`` there when its output changes.
+
+    Returns:
+        Summary: Functions, classes, imports, globals and constants, or just
+        ``syntax_error`` if the source does not parse.
+    """
+    try:
+        tree = ast.parse(content)
+    except (SyntaxError, ValueError) as e:
+        return {"syntax_error": str(e)}
+
+    visitor = SemanticVisitor()
+    visitor.visit(tree)
+    return {
+        "functions": {name: _compact(signature) for name, signature in visitor.functions.items()},
+        "classes": {name: {**_compact(definition), "methods": {method: _compact(signature) for method, signature in definition.methods.items()}} for name, definition in visitor.classes.items()},
+        "imports": [_compact(import_info) for import_info in visitor.imports],
+        "global_variables": visitor.global_variables,
+        "constants": visitor.constants,
+    }
+
+
+def context_from_summary(file_path: str, summary: Summary) -> SemanticContext:
+    """Build a ``SemanticContext`` from a summary made by ``summarize_source``.
+
+    Returns:
+        SemanticContext: Fresh objects that the caller may modify.
+    """
+    classes = {}
+    for name, data in summary.get("classes", {}).items():
+        methods = {method: _function_from_dict(signature) for method, signature in data.get("methods", {}).items()}
+        classes[name] = ClassDefinition(**{**data, "visibility": SymbolVisibility(data["visibility"]), "methods": methods})
+
+    return SemanticContext(
+        file_path=file_path,
+        functions={name: _function_from_dict(signature) for name, signature in summary.get("functions", {}).items()},
+        classes=classes,
+        imports=[ImportInfo(**data) for data in summary.get("imports", [])],
+        global_variables=dict(summary.get("global_variables", {})),
+        constants=dict(summary.get("constants", {})),
+        syntax_error=summary.get("syntax_error"),
+    )
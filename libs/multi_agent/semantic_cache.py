@@ -0,0 +1,156 @@
+# Copyright notice.
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import zlib
+from collections import OrderedDict
+from collections.abc import Callable
+from pathlib import Path
+from typing import ClassVar
+
+# Copyright (c) 2024 Yesman Claude Project
+# Licensed under the MIT License
+
+"""Content-addressed cache of parsed Python source summaries.
+
+Parsing the same file again in every analyzer, on every branch and in every
+agent process is wasted work: a given file content always yields the same
+summary. ``SemanticSummaryCache`` keys summaries by the git blob SHA of the
+content (so a file shared by many branches, or unchanged since the last run, is
+found no matter which branch or path it is read from) and keeps them
+
+* in memory, in a bounded LRU, and
+* on disk under ``.scripton/yesman/semantic_cache``, one zlib-compressed
+  compact JSON file per blob, written atomically so any number of agent
+  processes working on the same repository can share the directory.
+
+Summaries are plain JSON data; their shape is up to the ``compute`` function
+passed to ``get`` and is versioned by ``SUMMARY_VERSION``, which must be bumped
+whenever that shape or the extraction logic changes.
+"""
+
+SUMMARY_VERSION = 2
+MAX_MEMORY_ENTRIES = 4096
+
+Summary = dict[str, object]
+
+
+def blob_sha(content: str) -> str:
+    """Compute the git blob SHA of UTF-8 text.
+
+    Returns:
+        str: The SHA git would store the content under.
+    """
+    data = content.encode("utf-8")
+    return hashlib.sha1(b"blob %d\0" % len(data) + data, usedforsecurity=False).hexdigest()
+
+
+class SemanticSummaryCache:
+    """Blob-SHA keyed summaries in a memory LRU backed by a shared disk directory."""
+
+    _instances: ClassVar[dict[Path, "SemanticSummaryCache"]] = {}
+    _instances_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    def __init__(self, cache_dir: Path | None, max_memory_entries: int = MAX_MEMORY_ENTRIES) -> None:
+        self.cache_dir = cache_dir / f"v{SUMMARY_VERSION}" if cache_dir is not None else None
+        self.max_memory_entries = max_memory_entries
+        self.logger = logging.getLogger("yesman.semantic_cache")
+
+        self._memory: OrderedDict[str, Summary] = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "computed": 0, "write_errors": 0}
+
+    @classmethod
+    def for_repo(cls, repo_path: Path | str) -> "SemanticSummaryCache":
+        """Get the shared cache for a repository.
+
+        Returns:
+            SemanticSummaryCache: The process-wide cache storing its files in
+            the repository's ``.scripton/yesman`` directory.
+        """
+        resolved = Path(repo_path).resolve()
+        with cls._instances_lock:
+            if resolved not in cls._instances:
+                cls._instances[resolved] = cls(resolved / ".scripton" / "yesman" / "semantic_cache")
+            return cls._instances[resolved]
+
+    def get(self, content: str, compute: Callable[[str], Summary]) -> Summary:
+        """Return the summary of ``content``, computing and storing it on a miss.
+
+        The returned dict is shared with other callers and must not be mutated.
+
+        Returns:
+            Summary: The cached or freshly computed summary.
+        """
+        key = blob_sha(content)
+        summary = self.lookup(key)
+        if summary is None:
+            summary = compute(content)
+            self.stats["computed"] += 1
+            self.put(key, summary)
+        return summary
+
+    def lookup(self, key: str) -> Summary | None:
+        """Find the summary stored for a blob SHA, in memory or on disk.
+
+        Returns:
+            Summary | None: The summary, or None if it was never computed.
+        """
+        with self._lock:
+            summary = self._memory.get(key)
+            if summary is not None:
+                self._memory.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                return summary
+
+        summary = self._read(key)
+        if summary is not None:
+            self.stats["disk_hits"] += 1
+            self._remember(key, summary)
+        return summary
+
+    def put(self, key: str, summary: Summary) -> None:
+        """Store a summary computed elsewhere (e.g. in a worker process) for a blob SHA."""
+        self._write(key, summary)
+        self._remember(key, summary)
+
+    def _remember(self, key: str, summary: Summary) -> None:
+        with self._lock:
+            self._memory[key] = summary
+            while len(self._memory) > self.max_memory_entries:
+                self._memory.popitem(last=False)
+
+    def clear_memory(self) -> None:
+        """Drop the in-memory entries; the disk cache is kept."""
+        with self._lock:
+            self._memory.clear()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / key[2:]
+
+    def _read(self, key: str) -> Summary | None:
+        if self.cache_dir is None:
+            return None
+        try:
+            return json.loads(zlib.decompress(self._path(key).read_bytes()))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, zlib.error) as e:
+            self.logger.warning("Ignoring unreadable semantic cache entry %s: %s", key, e)
+            return None
+
+    def _write(self, key: str, summary: Summary) -> None:
+        if self.cache_dir is None:
+            return
+        path = self._path(key)
+        temp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path.write_bytes(zlib.compress(json.dumps(summary, separators=(",", ":")).encode()))
+            os.replace(temp_path, path)
+        except OSError as e:
+            self.stats["write_errors"] += 1
+            self.logger.warning("Could not write semantic cache entry %s: %s", key, e)
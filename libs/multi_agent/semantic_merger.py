@@ -395,11 +395,7 @@ class SemanticMerger:
     ) -> MergeResult:
         """Perform intelligent merge using multiple heuristics."""
         try:
-            # Parse ASTs for both versions
-            ast.parse(content1)
-            ast.parse(content2)
-
-            # Extract semantic contexts
+            # Extract semantic contexts (each unique content is parsed only once)
             context1 = self.semantic_analyzer._extract_semantic_context(  # noqa: SLF001
                 file_path,
                 content1,
@@ -408,6 +404,9 @@ class SemanticMerger:
                 file_path,
                 content2,
             )
+            syntax_error = context1.syntax_error or context2.syntax_error
+            if syntax_error:
+                raise SyntaxError(syntax_error)
 
             # Start with base content
             merged_content = content1
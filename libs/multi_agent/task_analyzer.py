@@ -1,12 +1,13 @@
 # Copyright notice.
 
-import ast
 import json
 import logging
+from collections import defaultdict
 from dataclasses import asdict, dataclass, field
 from pathlib import Path
 
 from .graph import DirectedGraph
+from .module_graph import ModuleGraph, module_name
 
 # Find imports
 # Find local files that import this module
@@ -73,7 +74,8 @@ class TaskAnalyzer:
         self.repo_path = Path(repo_path).resolve()
         self.file_dependencies: dict[str, list[CodeDependency]] = {}
         self.task_graph = DirectedGraph()
-        self._python_files_cache: list[Path] | None = None
+        # Persistent forward and reverse import index, shared with other analyzers of this repository
+        self.module_graph = ModuleGraph.for_root(self.repo_path)
 
     def analyze_file_dependencies(self, file_path: str) -> list[CodeDependency]:
         """Analyze dependencies of a Python file.
@@ -89,43 +91,25 @@ class TaskAnalyzer:
             logger.warning("File not found: %s", file_path)
             return []
 
-        dependencies = []
-
-        try:
-            with open(full_path, encoding="utf-8") as f:
-                content = f.read()
-
-            # Parse AST
-            tree = ast.parse(content, filename=str(full_path))
-
-            for node in ast.walk(tree):
-                if isinstance(node, ast.Import):
-                    for alias in node.names:
-                        dep = CodeDependency(
-                            source_file=file_path,
-                            imported_module=alias.name,
-                            import_type="import",
-                            line_number=node.lineno,
-                            symbols=[],
-                        )
-                        dependencies.append(dep)
-
-                elif isinstance(node, ast.ImportFrom) and node.module:
-                    symbols = [alias.name for alias in node.names]
-                    dep = CodeDependency(
-                        source_file=file_path,
-                        imported_module=node.module,
-                        import_type="from_import",
-                        line_number=node.lineno,
-                        symbols=symbols,
-                    )
-                    dependencies.append(dep)
-
-            # Cache results
-            self.file_dependencies[file_path] = dependencies
-
-        except Exception as e:
-            logger.exception("Failed to analyze %s")
+        # Parsed by the source index, only when the file changed since it was last indexed
+        imports = self.module_graph.imports(file_path)
+        if imports is None:
+            logger.warning("Failed to analyze %s", file_path)
+            return []
+
+        dependencies = [
+            CodeDependency(
+                source_file=file_path,
+                imported_module=module,
+                import_type=import_type,
+                line_number=line_number,
+                symbols=list(symbols),
+            )
+            for module, import_type, line_number, symbols in imports
+        ]
+
+        # Cache results
+        self.file_dependencies[file_path] = dependencies
 
         return dependencies
 
@@ -139,6 +123,11 @@ class TaskAnalyzer:
         Returns:
             Set of related file paths
         """
+        self.module_graph.refresh()
+        return self._related_files(file_path, depth)
+
+    def _related_files(self, file_path: str, depth: int) -> set[str]:
+        """Walk the module graph from a file: files it imports and files importing it."""
         related = {file_path}
         to_check = {file_path}
 
@@ -146,27 +135,13 @@ class TaskAnalyzer:
             new_files = set()
 
             for current_file in to_check:
-                # Get dependencies of current file
-                deps = self.analyze_file_dependencies(current_file)
+                # Files that import the current file
+                new_files.update(self.module_graph.importers(self._file_to_module(current_file)))
 
-                module_name = self._file_to_module(current_file)
-
-                for py_file in self._get_python_files():
-                    if str(py_file) in related:
-                        continue
-
-                    file_deps = self.analyze_file_dependencies(str(py_file))
-
-                    for dep in file_deps:
-                        if self._matches_module(dep.imported_module, module_name):
-                            new_files.add(str(py_file))
-                            break
-
-                for dep in deps:
-                    imported_file = self._module_to_file(dep.imported_module)
-                    if imported_file and imported_file not in related:
-                        new_files.add(imported_file)
+                # Files that the current file imports
+                new_files.update(self.module_graph.imported_files(current_file))
 
+            new_files -= related
             related.update(new_files)
             to_check = new_files
 
@@ -175,46 +150,10 @@ class TaskAnalyzer:
 
         return related
 
-    def _get_python_files(self) -> list[Path]:
-        """Get all Python files in repository."""
-        if self._python_files_cache is None:
-            self._python_files_cache = []
-
-            for py_file in self.repo_path.rglob("*.py"):
-                # Skip virtual environments and build directories
-                if any(
-                    part in py_file.parts
-                    for part in [
-                        "venv",
-                        "env",
-                        ".venv",
-                        "__pycache__",
-                        "build",
-                        "dist",
-                        ".eggs",
-                        "node_modules",
-                    ]
-                ):
-                    continue
-
-                rel_path = py_file.relative_to(self.repo_path)
-                self._python_files_cache.append(rel_path)
-
-        return self._python_files_cache
-
     @staticmethod
     def _file_to_module(file_path: str) -> str:
         """Convert file path to module name."""
-        # Remove .py extension and convert path to module
-        path = Path(file_path)
-        if path.suffix == ".py":
-            path = path.with_suffix("")
-
-        # Convert path separators to dots
-        module = str(path).replace("/", ".").replace("\\", ".")
-
-        # Handle __init__.py files
-        return module.removesuffix(".__init__")  # Remove .__init__
+        return module_name(file_path)
 
     def _module_to_file(self, module_name: str) -> str | None:
         """Convert module name to file path."""
@@ -231,19 +170,6 @@ class TaskAnalyzer:
 
         return None
 
-    @staticmethod
-    def _matches_module(imported: str, module: str) -> bool:
-        """Check if imported module matches target module."""
-        # Exact match
-        if imported == module:
-            return True
-
-        # Parent module match (e.g., 'libs.core' matches 'libs.core.module')
-        if module.startswith(imported + "."):
-            return True
-
-        return bool("." in imported and imported.split(".")[-1] == module.split(".")[-1])
-
     def create_task_from_files(
         self,
         task_id: str,
@@ -265,9 +191,10 @@ class TaskAnalyzer:
             TaskDefinition object
         """
         # Find all related files
+        self.module_graph.refresh()
         all_files = set()
         for file_path in file_paths:
-            related = self.find_related_files(file_path, depth=1)
+            related = self._related_files(file_path, depth=1)
             all_files.update(related)
 
         task = TaskDefinition(
@@ -284,7 +211,11 @@ class TaskAnalyzer:
         return task
 
     def analyze_task_dependencies(self, tasks: list[TaskDefinition]) -> DirectedGraph:
-        """Analyze dependencies between tasks based on file overlaps.
+        """Analyze dependencies between tasks based on file overlaps and imports.
+
+        Tasks touching the same files are ordered by complexity. A task whose
+        files import files of another task runs after it, unless the two
+        tasks import each other.
 
         Args:
             tasks: List of task definitions
@@ -299,39 +230,44 @@ class TaskAnalyzer:
         for task in tasks:
             self.task_graph.add_node(task.task_id, task=task)
 
+        # Index tasks by file, so only tasks sharing a file are compared
+        file_tasks: defaultdict[str, list[int]] = defaultdict(list)
+        for i, task in enumerate(tasks):
+            for file_path in dict.fromkeys(task.file_paths):
+                file_tasks[file_path].append(i)
+
+        overlaps: defaultdict[tuple[int, int], list[str]] = defaultdict(list)
+        for file_path, owners in file_tasks.items():
+            for position, i in enumerate(owners):
+                for j in owners[position + 1 :]:
+                    overlaps[i, j].append(file_path)
+
         # Analyze dependencies based on file overlaps
-        for i, task1 in enumerate(tasks):
-            for j, task2 in enumerate(tasks):
-                if i >= j:  # Skip self and already checked pairs
-                    continue
-
-                # Check for file overlaps
-                files1 = set(task1.file_paths)
-                files2 = set(task2.file_paths)
-                overlap = files1.intersection(files2)
-
-                if overlap:
-                    # Determine dependency direction based on complexity
-                    # More complex tasks should depend on simpler ones
-                    complexity_order = {"low": 1, "medium": 2, "high": 3}
-
-                    if complexity_order.get(task1.complexity, 2) > complexity_order.get(
-                        task2.complexity,
-                        2,
-                    ):
-                        # task1 depends on task2
-                        self.task_graph.add_edge(
-                            task2.task_id,
-                            task1.task_id,
-                            overlap=list(overlap),
-                        )
-                    else:
-                        # task2 depends on task1
-                        self.task_graph.add_edge(
-                            task1.task_id,
-                            task2.task_id,
-                            overlap=list(overlap),
-                        )
+        complexity_order = {"low": 1, "medium": 2, "high": 3}
+        for (i, j), overlap in overlaps.items():
+            task1, task2 = tasks[i], tasks[j]
+            # Determine dependency direction based on complexity
+            # More complex tasks should depend on simpler ones
+            if complexity_order.get(task1.complexity, 2) > complexity_order.get(task2.complexity, 2):
+                # task1 depends on task2
+                self.task_graph.add_edge(task2.task_id, task1.task_id, overlap=overlap)
+            else:
+                # task2 depends on task1
+                self.task_graph.add_edge(task1.task_id, task2.task_id, overlap=overlap)
+
+        # Analyze dependencies based on imports between the tasks' files
+        self.module_graph.refresh()
+        imported: defaultdict[tuple[int, int], list[str]] = defaultdict(list)
+        for j, task in enumerate(tasks):
+            for file_path in dict.fromkeys(task.file_paths):
+                for imported_file in self.module_graph.imported_files(file_path):
+                    for i in file_tasks.get(imported_file, ()):
+                        if i != j and (min(i, j), max(i, j)) not in overlaps:
+                            imported[i, j].append(imported_file)
+
+        for (i, j), imported_files in imported.items():
+            if (j, i) not in imported:
+                self.task_graph.add_edge(tasks[i].task_id, tasks[j].task_id, imports=sorted(set(imported_files)))
 
         # Add explicit dependencies
         for task in tasks:
@@ -0,0 +1,361 @@
+# Copyright notice.
+
+import ast
+import json
+import logging
+import os
+import threading
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import ClassVar
+
+# Copyright (c) 2024 Yesman Claude Project
+# Licensed under the MIT License
+
+"""Persistent, incrementally refreshed index of a project's source files.
+
+The index remembers the mtime and size of every source file together with
+per-file statistics computed by analyzers. A refresh only walks the tree
+(pruning ignored directories before descending) and stats each file; a file is
+read when a caller asks for analyzer results that are not yet stored for its
+current mtime and size, and only the requested analyzers run. The index is stored in
+``<root>/.scripton/yesman/source_index.json`` so it survives restarts, and one
+instance per project root is shared by every scanner in the process.
+"""
+
+INDEX_VERSION = 1
+SOURCE_SUFFIXES = (".py", ".js", ".ts", ".rs", ".go")
+IGNORED_DIRS = frozenset(
+    {
+        ".git",
+        ".hg",
+        ".svn",
+        ".scripton",
+        ".venv",
+        "venv",
+        "env",
+        ".eggs",
+        ".tox",
+        ".nox",
+        "node_modules",
+        "__pycache__",
+        ".mypy_cache",
+        ".pytest_cache",
+        ".ruff_cache",
+        "build",
+        "dist",
+        "target",
+    }
+)
+
+Analyzer = Callable[[str, str], object]
+
+_DOC_MARKERS = ('"""', "'''", "/**", "///", "// ")
+_COMMENT_PREFIXES = {".py": ("#",), ".js": ("//", "/*", "*"), ".ts": ("//", "/*", "*"), ".rs": ("//",), ".go": ("//",)}
+
+
+def doc_stats(path: str, content: str) -> dict[str, object]:
+    """Compute documentation and comment statistics for a source file.
+
+    For Python files ``missing_docstrings`` lists the public classes and
+    functions without a docstring as ``[node type, name, line]``, or is None if
+    the file does not parse.
+
+    Returns:
+    Dict of per-file statistics.
+    """
+    lines = content.split("\n")
+    comment_prefixes = _COMMENT_PREFIXES.get(os.path.splitext(path)[1], ())
+    stats: dict[str, object] = {
+        "lines": len(lines),
+        "code_lines": sum(1 for line in lines if line.strip()),
+        "comment_lines": sum(1 for line in lines if comment_prefixes and line.lstrip().startswith(comment_prefixes)),
+        "documented": any(marker in content for marker in _DOC_MARKERS),
+    }
+    if path.endswith(".py"):
+        stats["missing_docstrings"] = _missing_docstrings(content)
+    return stats
+
+
+def _missing_docstrings(content: str) -> list[list[object]] | None:
+    try:
+        tree = ast.parse(content)
+    except (SyntaxError, ValueError):
+        return None
+
+    missing: list[list[object]] = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.FunctionDef | ast.AsyncFunctionDef | ast.ClassDef) and ast.get_docstring(node, clean=False) is None:
+            # Private names are exempt, special methods are not
+            if node.name.startswith("_") and not (node.name.startswith("__") and node.name.endswith("__")):
+                continue
+            missing.append([type(node).__name__, node.name, node.lineno])
+    return missing
+
+
+@dataclass
+class FileEntry:
+    """Indexed state and statistics of one source file."""
+
+    path: str
+    mtime_ns: int
+    size: int
+    stats: dict[str, object] = field(default_factory=dict)
+    readable: bool = True
+
+    def to_list(self) -> list[object]:
+        """Convert to the compact form stored in the index file.
+
+        Returns:
+        List of the entry's fields without the path.
+        """
+        return [self.mtime_ns, self.size, self.stats, self.readable]
+
+    @classmethod
+    def from_list(cls, path: str, data: list[object]) -> "FileEntry":
+        """Create from the compact form stored in the index file.
+
+        Returns:
+        The file entry.
+        """
+        mtime_ns, size, stats, readable = data
+        return cls(path=path, mtime_ns=mtime_ns, size=size, stats=stats, readable=readable)
+
+
+@dataclass
+class IndexRefresh:
+    """Summary of one index refresh."""
+
+    added: int = 0
+    changed: int = 0
+    removed: int = 0
+    unchanged: int = 0
+
+    @property
+    def files_changed(self) -> int:
+        """Number of files added or changed, whose statistics are recomputed on next use."""
+        return self.added + self.changed
+
+    def to_dict(self) -> dict[str, int]:
+        """Convert to dictionary for serialization.
+
+        Returns:
+        Dict containing the refresh counters.
+        """
+        return {"added": self.added, "changed": self.changed, "removed": self.removed, "unchanged": self.unchanged}
+
+
+class SourceFileIndex:
+    """Incremental index of source files keyed by path, mtime and size."""
+
+    _instances: ClassVar[dict[Path, "SourceFileIndex"]] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(
+        self,
+        root: Path | str,
+        index_path: Path | None = None,
+        suffixes: tuple[str, ...] = SOURCE_SUFFIXES,
+        ignored_dirs: frozenset[str] = IGNORED_DIRS,
+    ) -> None:
+        self.root = Path(root).resolve()
+        self.index_path = index_path or self.root / ".scripton" / "yesman" / "source_index.json"
+        self.suffixes = suffixes
+        self.ignored_dirs = ignored_dirs
+        self.logger = logging.getLogger("yesman.source_index")
+
+        self.analyzers: dict[str, Analyzer] = {"doc": doc_stats}
+        self.entries: dict[str, FileEntry] = {}
+        self._lock = threading.RLock()
+        self._dirty = False
+        self._load()
+
+    @classmethod
+    def for_root(cls, root: Path | str) -> "SourceFileIndex":
+        """Get the shared index for a project root.
+
+        Returns:
+        The process-wide index for ``root``.
+        """
+        resolved = Path(root).resolve()
+        with cls._instances_lock:
+            if resolved not in cls._instances:
+                cls._instances[resolved] = cls(resolved)
+            return cls._instances[resolved]
+
+    def register_analyzer(self, name: str, analyzer: Analyzer) -> None:
+        """Add a per-file analyzer; its results are computed when a lookup first asks for them."""
+        with self._lock:
+            self.analyzers[name] = analyzer
+
+    def refresh(self) -> IndexRefresh:
+        """Bring the list of files and their mtimes and sizes up to date.
+
+        No file is read; statistics of added and changed files are dropped and
+        recomputed when they are next asked for.
+
+        Returns:
+        Counts of added, changed, removed and unchanged files.
+        """
+        with self._lock:
+            summary = IndexRefresh()
+            seen = set()
+            for relative_path, stat in self._walk():
+                seen.add(relative_path)
+                entry = self.entries.get(relative_path)
+                if entry is not None and entry.mtime_ns == stat.st_mtime_ns and entry.size == stat.st_size:
+                    summary.unchanged += 1
+                    continue
+                self.entries[relative_path] = FileEntry(path=relative_path, mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+                if entry is None:
+                    summary.added += 1
+                else:
+                    summary.changed += 1
+
+            for relative_path in self.entries.keys() - seen:
+                del self.entries[relative_path]
+                summary.removed += 1
+
+            if summary.files_changed or summary.removed:
+                self._dirty = True
+            self.save()
+            return summary
+
+    def files(self, suffixes: tuple[str, ...] | None = None, analyzers: Iterable[str] = ()) -> list[FileEntry]:
+        """Get the indexed files, optionally limited to some suffixes, sorted by path.
+
+        Files are only read to compute the requested ``analyzers`` where their
+        results are not stored yet, so listing paths reads nothing.
+
+        Returns:
+        List of file entries.
+        """
+        with self._lock:
+            entries = [entry for path, entry in sorted(self.entries.items()) if suffixes is None or path.endswith(suffixes)]
+            names = tuple(analyzers)
+            if names:
+                entries = [self._analyze(entry, names) if self._missing_analyzers(entry, names) else entry for entry in entries]
+                self.save()
+            return entries
+
+    def get(self, path: str, analyzers: Iterable[str] | None = None) -> FileEntry | None:
+        """Get an up-to-date entry for one file without walking the tree.
+
+        The file is read only if its mtime or size changed or some of the
+        requested ``analyzers`` (all registered ones by default) have no stored
+        results.
+
+        Returns:
+        The file entry, or None if it does not exist or is not indexed.
+        """
+        relative_path = Path(path).as_posix()
+        if not relative_path.endswith(self.suffixes) or any(part in self.ignored_dirs for part in Path(relative_path).parts[:-1]):
+            return None
+
+        with self._lock:
+            try:
+                stat = (self.root / relative_path).stat()
+            except OSError:
+                if self.entries.pop(relative_path, None) is not None:
+                    self._dirty = True
+                return None
+
+            entry = self.entries.get(relative_path)
+            if entry is None or entry.mtime_ns != stat.st_mtime_ns or entry.size != stat.st_size:
+                entry = self.entries[relative_path] = FileEntry(path=relative_path, mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+                self._dirty = True
+            names = tuple(self.analyzers if analyzers is None else analyzers)
+            if self._missing_analyzers(entry, names):
+                entry = self._analyze(entry, names)
+            return entry
+
+    def save(self) -> None:
+        """Write the index to disk if it changed since it was loaded or last saved."""
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {
+                "version": INDEX_VERSION,
+                "root": str(self.root),
+                "files": {path: entry.to_list() for path, entry in self.entries.items()},
+            }
+            try:
+                self.index_path.parent.mkdir(parents=True, exist_ok=True)
+                temp_path = self.index_path.with_suffix(".tmp")
+                temp_path.write_text(json.dumps(data, separators=(",", ":")), encoding="utf-8")
+                os.replace(temp_path, self.index_path)
+                self._dirty = False
+            except OSError as e:
+                self.logger.warning("Could not save source index %s: %s", self.index_path, e)
+
+    def _load(self) -> None:
+        try:
+            data = json.loads(self.index_path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            self.logger.warning("Ignoring unreadable source index %s: %s", self.index_path, e)
+            return
+
+        if data.get("version") != INDEX_VERSION or data.get("root") != str(self.root):
+            return
+        try:
+            self.entries = {path: FileEntry.from_list(path, entry) for path, entry in data.get("files", {}).items()}
+        except (TypeError, ValueError) as e:
+            self.logger.warning("Ignoring malformed source index %s: %s", self.index_path, e)
+            self.entries = {}
+
+    def _walk(self) -> list[tuple[str, os.stat_result]]:
+        """List the source files under the root, pruning ignored directories.
+
+        Returns:
+        List of (relative posix path, stat result) pairs.
+        """
+        found = []
+        pending = [""]
+        while pending:
+            relative_dir = pending.pop()
+            try:
+                with os.scandir(self.root / relative_dir) as iterator:
+                    for dir_entry in iterator:
+                        relative_path = f"{relative_dir}/{dir_entry.name}" if relative_dir else dir_entry.name
+                        try:
+                            if dir_entry.is_dir(follow_symlinks=False):
+                                if dir_entry.name not in self.ignored_dirs:
+                                    pending.append(relative_path)
+                            elif dir_entry.name.endswith(self.suffixes) and dir_entry.is_file():
+                                found.append((relative_path, dir_entry.stat()))
+                        except OSError:
+                            continue
+            except OSError as e:
+                self.logger.debug("Could not scan %s: %s", relative_dir or self.root, e)
+        return found
+
+    def _missing_analyzers(self, entry: FileEntry, names: tuple[str, ...]) -> bool:
+        return entry.readable and any(name in self.analyzers and name not in entry.stats for name in names)
+
+    def _analyze(self, entry: FileEntry, names: tuple[str, ...]) -> FileEntry:
+        """Read a file and run the requested analyzers that have no stored results.
+
+        Returns:
+        The updated entry.
+        """
+        self._dirty = True
+        try:
+            content = (self.root / entry.path).read_text(encoding="utf-8")
+        except (OSError, UnicodeDecodeError) as e:
+            self.logger.debug("Could not read %s: %s", entry.path, e)
+            entry.readable = False
+            return entry
+
+        for name in names:
+            analyzer = self.analyzers.get(name)
+            if analyzer is None or name in entry.stats:
+                continue
+            try:
+                entry.stats[name] = analyzer(entry.path, content)
+            except Exception:
+                self.logger.exception("Analyzer %s failed for %s", name, entry.path)
+                entry.stats[name] = None
+        return entry
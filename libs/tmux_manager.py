@@ -15,6 +15,7 @@ import yaml
 from tmuxp.workspace.builder import WorkspaceBuilder
 from tmuxp.workspace.loader import expand
 
+from libs.tmux_snapshot import TmuxSnapshot
 from libs.yesman_config import YesmanConfig
 
 # Copyright (c) 2024 Yesman Claude Project
@@ -256,61 +257,32 @@ class TmuxManager:
             name = sess.get("session_name")
             click.echo(f"  - {name}")
 
-    def get_session_info(self, session_name: str) -> dict[str, object]:
+    def get_session_info(self, session_name: str, snapshot: TmuxSnapshot | None = None) -> dict[str, object]:
         """Get session information directly from tmux.
 
+        Args:
+            session_name: Name of the tmux session
+            snapshot: Shared tmux snapshot; a new one is taken when omitted
+
         Returns:
         Dict containing service information.
         """
+        try:
+            tmux_snapshot = snapshot if snapshot is not None else TmuxSnapshot.take()
+            return tmux_snapshot.session_dict(session_name)
+        except Exception as e:
+            self.logger.exception("Failed to get session info for {session_name}:")
+            return {"exists": False, "session_name": session_name, "error": str(e)}
 
-        def fetch_session_info() -> dict[str, object]:
-            """Fetch session information from tmux.
+    def get_all_session_info(self) -> list[dict[str, object]]:
+        """Get information for every running session from a single tmux snapshot.
 
-            Returns:
-            Dict containing service information.
-            """
-            try:
-                server = libtmux.Server()
-                session = server.find_where({"session_name": session_name})
-                if not session:
-                    return {"exists": False, "session_name": session_name}
-
-                # Get session details
-                windows = []
-                for window in session.list_windows():
-                    panes = []
-                    for pane in window.list_panes():
-                        panes.append(
-                            {
-                                "pane_id": pane.get("pane_id"),
-                                "pane_current_command": pane.get("pane_current_command", ""),
-                                "pane_active": pane.get("pane_active") == "1",
-                                "pane_width": pane.get("pane_width"),
-                                "pane_height": pane.get("pane_height"),
-                            }
-                        )
-
-                    windows.append(
-                        {
-                            "window_id": window.get("window_id"),
-                            "window_name": window.get("window_name"),
-                            "window_active": window.get("window_active") == "1",
-                            "panes": panes,
-                        }
-                    )
-
-                return {
-                    "exists": True,
-                    "session_name": session_name,
-                    "session_id": session.get("session_id"),
-                    "session_created": session.get("session_created"),
-                    "windows": windows,
-                }
-            except Exception as e:
-                self.logger.exception("Failed to get session info for {session_name}:")
-                return {"exists": False, "session_name": session_name, "error": str(e)}
-
-        return fetch_session_info()
+        Returns:
+        List of session info dicts in the same shape as ``get_session_info``.
+        """
+        snapshot = TmuxSnapshot.take()
+        session_names = list(dict.fromkeys(pane.session_name for pane in snapshot.panes))
+        return [self.get_session_info(session_name, snapshot) for session_name in session_names]
 
     def get_cached_sessions_list(self) -> list[dict[str, object]]:
         """Get list of all sessions directly from tmux.
@@ -0,0 +1,286 @@
+# Copyright notice.
+
+import logging
+import uuid
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+import libtmux
+
+# Copyright (c) 2024 Yesman Claude Project
+# Licensed under the MIT License
+
+"""Bulk tmux snapshots: every pane's state in one round-trip.
+
+Walking ``session.list_windows()`` / ``window.list_panes()`` and calling
+``pane.cmd(...)`` for each attribute costs several tmux subprocesses per pane.
+:class:`TmuxSnapshot` instead reads all pane format variables with a single
+``list-panes -a -F`` call and captures many panes with one chained
+``capture-pane ; display-message ; capture-pane ...`` command sequence.
+"""
+
+logger = logging.getLogger("yesman.tmux_snapshot")
+
+# ASCII unit separator: never appears in session/window names or commands
+FIELD_SEPARATOR = "\x1f"
+
+PANE_FORMAT_FIELDS = (
+    "session_name",
+    "session_id",
+    "session_created",
+    "window_id",
+    "window_index",
+    "window_name",
+    "window_active",
+    "window_activity",
+    "pane_id",
+    "pane_index",
+    "pane_pid",
+    "pane_current_command",
+    "pane_activity",
+    "pane_active",
+    "pane_width",
+    "pane_height",
+)
+
+PANE_FORMAT = FIELD_SEPARATOR.join(f"#{{{name}}}" for name in PANE_FORMAT_FIELDS)
+
+# Panes captured per tmux invocation; keeps argv well below system limits
+CAPTURE_BATCH_SIZE = 100
+
+
+def _to_int(value: str) -> int | None:
+    return int(value) if value.isdigit() else None
+
+
+@dataclass
+class PaneSnapshot:
+    """Format variables of a single pane at snapshot time."""
+
+    session_name: str
+    session_id: str
+    session_created: str
+    window_id: str
+    window_index: str
+    window_name: str
+    window_active: bool
+    pane_id: str
+    pane_index: str
+    pane_pid: int | None
+    pane_current_command: str
+    pane_activity: int | None
+    pane_active: bool
+    pane_width: int | None
+    pane_height: int | None
+
+    @classmethod
+    def from_format_line(cls, line: str) -> "PaneSnapshot | None":
+        """Build a snapshot from one ``list-panes -F`` output line.
+
+        Returns:
+        PaneSnapshot, or None if the line is malformed.
+        """
+        values = line.split(FIELD_SEPARATOR)
+        if len(values) != len(PANE_FORMAT_FIELDS):
+            return None
+
+        data = dict(zip(PANE_FORMAT_FIELDS, values, strict=True))
+        # Older tmux versions leave pane_activity empty; window activity is the closest proxy
+        activity = _to_int(data["pane_activity"]) or _to_int(data["window_activity"])
+
+        return cls(
+            session_name=data["session_name"],
+            session_id=data["session_id"],
+            session_created=data["session_created"],
+            window_id=data["window_id"],
+            window_index=data["window_index"],
+            window_name=data["window_name"],
+            window_active=data["window_active"] == "1",
+            pane_id=data["pane_id"],
+            pane_index=data["pane_index"],
+            pane_pid=_to_int(data["pane_pid"]),
+            pane_current_command=data["pane_current_command"],
+            pane_activity=activity,
+            pane_active=data["pane_active"] == "1",
+            pane_width=_to_int(data["pane_width"]),
+            pane_height=_to_int(data["pane_height"]),
+        )
+
+    def to_dict(self) -> dict[str, object]:
+        """Convert to the dict shape used by ``TmuxManager.get_session_info``.
+
+        Returns:
+        Dict containing pane information.
+        """
+        return {
+            "pane_id": self.pane_id,
+            "pane_current_command": self.pane_current_command,
+            "pane_active": self.pane_active,
+            "pane_width": self.pane_width,
+            "pane_height": self.pane_height,
+        }
+
+
+@dataclass
+class TmuxSnapshot:
+    """All panes of a tmux server, plus any pane contents captured in bulk."""
+
+    server: libtmux.Server
+    panes: list[PaneSnapshot] = field(default_factory=list)
+    contents: dict[str, list[str]] = field(default_factory=dict)
+
+    @classmethod
+    def take(cls, server: libtmux.Server | None = None) -> "TmuxSnapshot":
+        """List every pane on the server with one ``list-panes -a`` call.
+
+        Returns:
+        TmuxSnapshot (empty if no server is running).
+        """
+        server = server or libtmux.Server()
+        snapshot = cls(server=server)
+
+        try:
+            result = server.cmd("list-panes", "-a", "-F", PANE_FORMAT)
+        except Exception:
+            logger.exception("Failed to list tmux panes")
+            return snapshot
+
+        if result.returncode not in {0, None}:
+            # "no server running" is a normal, empty state
+            logger.debug("list-panes failed: %s", result.stderr)
+            return snapshot
+
+        for line in result.stdout:
+            pane = PaneSnapshot.from_format_line(line)
+            if pane:
+                snapshot.panes.append(pane)
+
+        return snapshot
+
+    @property
+    def session_names(self) -> set[str]:
+        """Names of all sessions that have at least one pane."""
+        return {pane.session_name for pane in self.panes}
+
+    def has_session(self, session_name: str) -> bool:
+        """Check whether a session exists in the snapshot.
+
+        Returns:
+        True if the session has panes.
+        """
+        return any(pane.session_name == session_name for pane in self.panes)
+
+    def panes_for_session(self, session_name: str) -> list[PaneSnapshot]:
+        """Get the panes of one session in window/pane order.
+
+        Returns:
+        List of pane snapshots.
+        """
+        return [pane for pane in self.panes if pane.session_name == session_name]
+
+    def windows_for_session(self, session_name: str) -> dict[str, list[PaneSnapshot]]:
+        """Group a session's panes by window index, preserving order.
+
+        Returns:
+        Dict mapping window index to its panes.
+        """
+        windows: dict[str, list[PaneSnapshot]] = {}
+        for pane in self.panes_for_session(session_name):
+            windows.setdefault(pane.window_index, []).append(pane)
+        return windows
+
+    def session_dict(self, session_name: str) -> dict[str, object]:
+        """Build the session dict returned by ``TmuxManager.get_session_info``.
+
+        Returns:
+        Dict containing session, window and pane information.
+        """
+        panes = self.panes_for_session(session_name)
+        if not panes:
+            return {"exists": False, "session_name": session_name}
+
+        windows = [
+            {
+                "window_id": window_panes[0].window_id,
+                "window_name": window_panes[0].window_name,
+                "window_active": window_panes[0].window_active,
+                "panes": [pane.to_dict() for pane in window_panes],
+            }
+            for window_panes in self.windows_for_session(session_name).values()
+        ]
+
+        return {
+            "exists": True,
+            "session_name": session_name,
+            "session_id": panes[0].session_id,
+            "session_created": panes[0].session_created,
+            "windows": windows,
+        }
+
+    def capture(self, pane_ids: Iterable[str], start: int | None = None) -> dict[str, list[str]]:
+        """Capture many panes with one chained tmux command per batch.
+
+        Args:
+            pane_ids: Panes to capture
+            start: Optional ``capture-pane -S`` start line (e.g. -50)
+
+        Returns:
+            Dict mapping pane id to captured lines. Results are also kept in
+            ``self.contents`` so repeated lookups do not hit tmux again.
+        """
+        requested = list(dict.fromkeys(pane_ids))
+        pending = [pane_id for pane_id in requested if pane_id not in self.contents]
+
+        for offset in range(0, len(pending), CAPTURE_BATCH_SIZE):
+            batch = pending[offset : offset + CAPTURE_BATCH_SIZE]
+            try:
+                self.contents.update(self._capture_batch(batch, start))
+            except Exception:
+                logger.exception("Batched capture failed, capturing panes one by one")
+                for pane_id in batch:
+                    self.contents[pane_id] = self._capture_single(pane_id, start)
+
+        return {pane_id: self.contents.get(pane_id, []) for pane_id in requested}
+
+    def _capture_batch(self, pane_ids: list[str], start: int | None) -> dict[str, list[str]]:
+        # Each capture is followed by a unique marker line so the combined
+        # output can be split back into per-pane contents.
+        marker = f"__yesman_capture_{uuid.uuid4().hex}__"
+        args: list[str] = []
+        for pane_id in pane_ids:
+            if args:
+                args.append(";")
+            args.extend(["capture-pane", "-p", "-t", pane_id])
+            if start is not None:
+                args.extend(["-S", str(start)])
+            args.extend([";", "display-message", "-p", marker])
+
+        result = self.server.cmd(*args)
+        if result.returncode not in {0, None}:
+            msg = f"capture sequence failed: {result.stderr}"
+            raise RuntimeError(msg)
+
+        contents: dict[str, list[str]] = {}
+        current: list[str] = []
+        pane_iter = iter(pane_ids)
+        for line in result.stdout:
+            if line == marker:
+                contents[next(pane_iter)] = current
+                current = []
+            else:
+                current.append(line)
+
+        if len(contents) != len(pane_ids):
+            msg = f"expected {len(pane_ids)} captures, got {len(contents)}"
+            raise RuntimeError(msg)
+        return contents
+
+    def _capture_single(self, pane_id: str, start: int | None) -> list[str]:
+        args = ["capture-pane", "-p", "-t", pane_id]
+        if start is not None:
+            args.extend(["-S", str(start)])
+        try:
+            return self.server.cmd(*args).stdout
+        except Exception as e:
+            logger.debug("Could not capture pane %s: %s", pane_id, e)
+            return []
@@ -0,0 +1,118 @@
+/**
+ * 버전 관리되는 대시보드 상태 동기화 유틸리티
+ * WebSocket의 state_snapshot / state_patch 메시지를 받아 로컬 상태를 제자리에서 갱신
+ *
+ * 아직 어떤 스토어에도 연결되어 있지 않음: 대시보드에는 현재 WebSocket 클라이언트가 없으므로,
+ * 클라이언트가 추가되면 state_snapshot / state_patch 메시지를 VersionedStateClient로 넘겨야 함
+ */
+
+export interface PatchOperation {
+	op: 'add' | 'remove' | 'replace';
+	path: string;
+	value?: unknown;
+}
+
+export interface StateSnapshotMessage {
+	type: 'state_snapshot';
+	state: string;
+	version: number;
+	data: unknown;
+}
+
+export interface StatePatchMessage {
+	type: 'state_patch';
+	state: string;
+	base_version: number;
+	version: number;
+	ops: PatchOperation[];
+}
+
+export type StateMessage = StateSnapshotMessage | StatePatchMessage;
+
+export interface ResyncRequest {
+	type: 'resync';
+	state: string;
+	version: number | null;
+}
+
+function unescapeToken(token: string): string {
+	return token.replace(/~1/g, '/').replace(/~0/g, '~');
+}
+
+/**
+ * JSON Patch(RFC 6902)의 add / remove / replace 연산을 문서에 제자리 적용
+ * @param document 갱신할 문서
+ * @param ops 적용할 연산 목록
+ * @returns 갱신된 문서 (루트가 교체된 경우 새 객체)
+ */
+export function applyPatch(document: any, ops: PatchOperation[]): any {
+	for (const op of ops) {
+		if (op.path === '') {
+			document = op.op === 'remove' ? null : op.value;
+			continue;
+		}
+
+		const tokens = op.path.split('/').slice(1).map(unescapeToken);
+		const last = tokens.pop() as string;
+		let target = document;
+		for (const token of tokens) {
+			target = Array.isArray(target) ? target[Number(token)] : target[token];
+		}
+
+		if (Array.isArray(target)) {
+			const index = last === '-' ? target.length : Number(last);
+			if (op.op === 'add') {
+				target.splice(index, 0, op.value);
+			} else if (op.op === 'remove') {
+				target.splice(index, 1);
+			} else {
+				target[index] = op.value;
+			}
+		} else if (op.op === 'remove') {
+			delete target[last];
+		} else {
+			target[last] = op.value;
+		}
+	}
+	return document;
+}
+
+/**
+ * 서버 상태 하나의 로컬 사본
+ * 버전이 끊기면 resync 요청을 만들어 돌려주고, 그 전까지의 패치는 무시
+ */
+export class VersionedStateClient<T = unknown> {
+	data: T | null = null;
+	version: number | null = null;
+
+	constructor(public readonly name: string) {}
+
+	/**
+	 * 스냅샷 또는 패치 메시지를 적용
+	 * @returns 상태가 바뀌었으면 'applied', 이미 반영된 메시지면 'ignored',
+	 *          버전이 끊겼으면 서버로 보낼 resync 요청
+	 */
+	handle(message: StateMessage): 'applied' | 'ignored' | ResyncRequest {
+		if (message.state !== this.name) {
+			return 'ignored';
+		}
+
+		if (message.type === 'state_snapshot') {
+			this.data = message.data as T;
+			this.version = message.version;
+			return 'applied';
+		}
+
+		if (this.version !== null && message.version <= this.version) {
+			// 여러 채널로 중복 수신한 패치
+			return 'ignored';
+		}
+		if (message.base_version !== this.version) {
+			return { type: 'resync', state: this.name, version: this.version };
+		}
+
+		this.data = applyPatch(this.data, message.ops);
+		this.version = message.version;
+		return 'applied';
+	}
+}
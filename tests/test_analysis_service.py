@@ -0,0 +1,134 @@
+# Copyright notice.
+
+import asyncio
+import threading
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from libs.multi_agent import code_review_engine
+from libs.multi_agent.analysis_service import AnalysisService
+from libs.multi_agent.code_review_engine import review_facts
+from libs.multi_agent.semantic_analyzer import summarize_source
+from libs.multi_agent.semantic_cache import SemanticSummaryCache
+
+# Copyright (c) 2024 Yesman Claude Project
+# Licensed under the MIT License
+
+"""Tests for the process-pool source analysis service."""
+
+SOURCE = "import os\n\n\nclass Base:\n    pass\n\n\ndef run(items):\n    for i in range(len(items)):\n        total += i\n"
+
+
+@pytest.fixture
+def service() -> AnalysisService:
+    analysis_service = AnalysisService(max_workers=2, chunk_files=2, max_chunk_bytes=200, inline_bytes=10**9)
+    yield analysis_service
+    analysis_service.shutdown()
+
+
+def test_identical_contents_are_analyzed_once(service: AnalysisService) -> None:
+    """Test that duplicates within and across calls reuse one result."""
+    sources = {("main", "a.py"): SOURCE, ("feature", "a.py"): SOURCE, ("feature", "b.py"): "x = 1\n"}
+
+    facts = asyncio.run(service.map(review_facts, sources))
+    assert facts["main", "a.py"] is facts["feature", "a.py"]
+    assert facts["main", "a.py"]["range_len_loops"] == [9]
+    assert service.stats["analyzed"] == 2
+
+    asyncio.run(service.map(review_facts, {"c.py": SOURCE}))
+    assert service.stats["analyzed"] == 2
+    assert service.stats["cached"] == 1
+
+
+def test_failing_file_does_not_fail_the_batch(service: AnalysisService) -> None:
+    """Test that a file whose analysis raises is reported on its own."""
+    real_collect = code_review_engine._collect_review_facts  # noqa: SLF001
+
+    def collect(tree: object, lines: int) -> dict[str, object]:
+        if lines > 5:
+            msg = "maximum recursion depth exceeded"
+            raise RecursionError(msg)
+        return real_collect(tree, lines)
+
+    with patch("libs.multi_agent.code_review_engine._collect_review_facts", side_effect=collect):
+        facts = asyncio.run(service.map(review_facts, {"deep.py": SOURCE, "ok.py": "x = 1\n"}))
+
+    assert facts["deep.py"]["error"].startswith("RecursionError")
+    assert facts["ok.py"]["functions"] == []
+
+
+def test_chunks_are_capped_by_count_and_size(service: AnalysisService) -> None:
+    """Test that chunks hold at most chunk_files files and max_chunk_bytes bytes."""
+    contents = {"a": "x" * 50, "b": "x" * 50, "c": "x" * 50, "d": "x" * 180, "e": "x" * 500}
+
+    assert service._chunks(list(contents), contents) == [["a", "b"], ["c"], ["d"], ["e"]]  # noqa: SLF001
+
+
+def test_summaries_use_persistent_cache(tmp_path: Path, service: AnalysisService) -> None:
+    """Test that results stored with a summary cache are found by a fresh cache."""
+    asyncio.run(service.map(summarize_source, {"a.py": SOURCE}, cache=SemanticSummaryCache(tmp_path)))
+
+    fresh_cache = SemanticSummaryCache(tmp_path)
+    summaries = asyncio.run(AnalysisService(max_workers=1).map(summarize_source, {"b.py": SOURCE}, cache=fresh_cache))
+    assert set(summaries["b.py"]["classes"]) == {"Base"}
+    assert fresh_cache.stats["disk_hits"] == 1
+
+
+def test_large_batches_run_in_process_pool() -> None:
+    """Test that batches over inline_bytes are analyzed in worker processes."""
+    pool_service = AnalysisService(max_workers=2, chunk_files=1, inline_bytes=1)
+    try:
+        sources = {f"m{i}.py": f"{SOURCE}\nVALUE = {i}\n" for i in range(3)}
+        facts = asyncio.run(pool_service.map(review_facts, sources))
+    finally:
+        pool_service.shutdown()
+
+    assert all(fact["functions"][0]["name"] == "run" for fact in facts.values())
+    assert pool_service.stats["pool_chunks"] == 3
+    assert pool_service.stats["fallbacks"] == 0
+
+
+def test_unpicklable_function_falls_back_to_thread() -> None:
+    """Test that a function the pool cannot run is applied in a thread instead."""
+    pool_service = AnalysisService(max_workers=2, inline_bytes=1)
+
+    def local_length(content: str) -> int:
+        return len(content)
+
+    try:
+        lengths = asyncio.run(pool_service.map(local_length, {"a.py": SOURCE}))
+    finally:
+        pool_service.shutdown()
+
+    assert lengths == {"a.py": len(SOURCE)}
+    assert pool_service.stats["fallbacks"] == 1
+
+
+def test_cancellation_stops_pending_chunks(service: AnalysisService) -> None:
+    """Test that cancelling the caller leaves chunks that did not start unrun."""
+    started = []
+    release = threading.Event()
+
+    def slow(content: str) -> int:
+        started.append(content)
+        release.wait(5)
+        return len(content)
+
+    async def cancel_midway() -> None:
+        service.chunk_files = 1
+        task = asyncio.create_task(service.map(slow, {i: str(i) for i in range(50)}))
+        while not started:
+            await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        release.set()
+
+    asyncio.run(cancel_midway())
+    assert len(started) < 50
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
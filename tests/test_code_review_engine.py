@@ -29,6 +29,7 @@ import sys
     ReviewSeverity,
     ReviewStatus,
     ReviewType,
+    review_facts,
 )
 
 
@@ -610,13 +611,13 @@ class TestCodeReviewEngine:
             assert reviewer in available_agent_ids
 
     @staticmethod
-    def test_cyclomatic_complexity_estimation(code_review_engine: CodeReviewEngine) -> None:
+    def test_cyclomatic_complexity_estimation() -> None:
         """Test cyclomatic complexity estimation."""
         simple_code = """
 def simple_function() -> object:
     return True
 """
-        complexity = code_review_engine._estimate_cyclomatic_complexity(simple_code)  # noqa: SLF001
+        complexity = review_facts(simple_code)["complexity"]
         assert complexity == 1.0
 
         complex_code = """
@@ -634,7 +635,7 @@ def complex_function(x, y) -> object:
                 print(i)
         return 0
 """
-        complexity = code_review_engine._estimate_cyclomatic_complexity(complex_code)  # noqa: SLF001
+        complexity = review_facts(complex_code)["complexity"]
         assert complexity > 5.0
 
     @staticmethod
@@ -0,0 +1,106 @@
+# Copyright notice.
+
+import asyncio
+from pathlib import Path
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from libs.multi_agent.conflict_prediction import ConflictPattern, ConflictPredictor
+from libs.multi_agent.conflict_resolution import ConflictResolutionEngine
+
+# Copyright (c) 2024 Yesman Claude Project
+# Licensed under the MIT License
+
+"""Tests for the staged, concurrent branch-pair pipeline of ConflictPredictor."""
+
+CHANGES = {
+    "auth": {"libs/auth/login.py": "M"},
+    "api": {"api/routes.py": "M"},
+    "docs": {"docs/guide.md": "M"},
+    "auth-fix": {"libs/auth/login.py": "M", "tests/test_login.py": "A"},
+}
+
+CONTENT = {
+    ("auth", "libs/auth/login.py"): "import os\n\ndef login(user):\n    pass\n",
+    ("api", "api/routes.py"): "from libs.auth.login import login\n\ndef route():\n    pass\n",
+    ("auth-fix", "libs/auth/login.py"): "import os\n\ndef login(user, password):\n    pass\n",
+    ("auth-fix", "tests/test_login.py"): "from libs.auth import login\n",
+}
+
+
+@pytest.fixture
+def predictor(tmp_path: Path) -> ConflictPredictor:
+    engine = Mock()
+    engine._get_changed_files = AsyncMock(side_effect=lambda branch: dict(CHANGES[branch]))  # noqa: SLF001
+    engine._get_python_files_changed = AsyncMock(  # noqa: SLF001
+        side_effect=lambda branch: [path for path in CHANGES[branch] if path.endswith(".py")],
+    )
+    engine._get_file_content = AsyncMock(side_effect=lambda path, branch: CONTENT.get((branch, path)))  # noqa: SLF001
+    engine._extract_function_signatures = ConflictResolutionEngine._extract_function_signatures  # noqa: SLF001
+    engine._run_git_command = AsyncMock(return_value=Mock(stdout="7\n"))  # noqa: SLF001
+
+    conflict_predictor = ConflictPredictor(engine, Mock(), repo_path=str(tmp_path))
+    conflict_predictor._get_change_frequency = AsyncMock(return_value=1.0)  # noqa: SLF001
+    conflict_predictor._calculate_branch_complexity = AsyncMock(return_value=10.0)  # noqa: SLF001
+    return conflict_predictor
+
+
+@pytest.mark.asyncio
+async def test_unrelated_pairs_are_skipped(predictor: ConflictPredictor) -> None:
+    """Test that only pairs sharing files or imports reach the detectors."""
+    analyzed = []
+
+    async def predict_pair(branch1: str, branch2: str) -> list:
+        analyzed.append({branch1, branch2})
+        return []
+
+    predictor._predict_pair = predict_pair  # noqa: SLF001
+    await predictor.predict_conflicts(list(CHANGES))
+
+    # docs touches nothing the others do; api imports the module auth changes
+    assert sorted(map(sorted, analyzed)) == [["api", "auth"], ["api", "auth-fix"], ["auth", "auth-fix"]]
+    assert predictor.last_run_stats["pairs"] == 6
+    assert predictor.last_run_stats["pairs_skipped"] == 3
+    assert set(predictor.last_run_stats["stage_seconds"]) == {"features", "pairs", "scoring"}
+
+
+@pytest.mark.asyncio
+async def test_branch_features_computed_once(predictor: ConflictPredictor) -> None:
+    """Test that every branch's git reads happen once per run, however many pairs use them."""
+    predictor.prune_unrelated_pairs = False
+
+    predictions = await predictor.predict_conflicts(list(CHANGES))
+
+    assert predictor.conflict_engine._get_changed_files.await_count == len(CHANGES)  # noqa: SLF001
+    assert predictor._get_change_frequency.await_count == len(CHANGES)  # noqa: SLF001
+    assert len(predictor.conflict_vectors) == 6
+    assert any(prediction.pattern == ConflictPattern.FUNCTION_SIGNATURE_DRIFT for prediction in predictions)
+
+
+@pytest.mark.asyncio
+async def test_pairs_run_concurrently_within_limit(predictor: ConflictPredictor) -> None:
+    """Test that pairs overlap but never exceed max_concurrent_pairs."""
+    predictor.prune_unrelated_pairs = False
+    predictor.max_concurrent_pairs = 2
+    running = peak = 0
+
+    async def predict_pair(branch1: str, branch2: str) -> list:  # noqa: ARG001
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return []
+
+    progress = []
+    predictor._predict_pair = predict_pair  # noqa: SLF001
+    await predictor.predict_conflicts(list(CHANGES), progress_callback=lambda *update: progress.append(update))
+
+    assert peak == 2
+    assert progress[-1] == ("pairs", 6, 6)
+    assert ("features", 4, 4) in progress
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
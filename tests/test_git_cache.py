@@ -0,0 +1,110 @@
+# Copyright notice.
+
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from libs.multi_agent.git_cache import GitObjectCache
+
+# Copyright (c) 2024 Yesman Claude Project
+# Licensed under the MIT License
+
+"""Tests for the shared SHA-keyed git object cache."""
+
+
+def _git(repo: Path, *args: str) -> str:
+    return subprocess.run(["git", *args], cwd=repo, check=True, capture_output=True, text=True).stdout.strip()
+
+
+def _commit(repo: Path, files: dict[str, str], message: str) -> None:
+    for name, content in files.items():
+        (repo / name).write_text(content, encoding="utf-8")
+    _git(repo, "add", ".")
+    _git(repo, "commit", "-q", "-m", message)
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    _git(tmp_path, "init", "-q", "-b", "main")
+    _git(tmp_path, "config", "user.email", "test@example.com")
+    _git(tmp_path, "config", "user.name", "Test User")
+    _commit(tmp_path, {"app.py": "def run():\n    return 1\n", "README.md": "docs\n"}, "Initial commit")
+    _git(tmp_path, "checkout", "-q", "-b", "feature")
+    _commit(tmp_path, {"app.py": "def run(x):\n    return x\n", "new.py": "VALUE = 1\n"}, "Feature work")
+    _git(tmp_path, "checkout", "-q", "main")
+    return tmp_path
+
+
+@pytest.fixture
+def cache(repo: Path) -> GitObjectCache:
+    git_cache = GitObjectCache(repo)
+    yield git_cache
+    git_cache.close()
+
+
+def test_reads_blobs_through_one_process(cache: GitObjectCache) -> None:
+    """Test that blob reads share one cat-file process and are memoized."""
+    assert cache.read_text("feature", "app.py") == "def run(x):\n    return x\n"
+    assert cache.read_text("main", "app.py") == "def run():\n    return 1\n"
+    assert cache.read_text("main", "new.py") is None
+    assert cache.read_text("no-such-branch", "app.py") is None
+
+    assert cache.read_text("feature", "app.py") == "def run(x):\n    return x\n"
+    assert cache.stats["processes_started"] == 1
+    assert cache.stats["blob_reads"] == 3
+    assert cache.stats["blob_hits"] == 1
+
+
+def test_missing_path_with_spaces(cache: GitObjectCache) -> None:
+    """Test that a missing path containing spaces reads as None without a restart."""
+    assert cache.read_text("main", "a b") is None
+    assert cache.read_text("main", "app.py") == "def run():\n    return 1\n"
+    assert cache.stats["processes_started"] == 1
+
+
+def test_prefetch_loads_whole_diff(cache: GitObjectCache) -> None:
+    """Test that prefetching reads every file once and later reads hit the cache."""
+    files = cache.changed_files("main", "feature")
+    assert files == {"app.py": "M", "new.py": "A"}
+
+    assert cache.prefetch("feature", files) == 2
+    assert cache.prefetch("feature", files) == 0
+    assert cache.read_text("feature", "new.py") == "VALUE = 1\n"
+    assert cache.stats["blob_reads"] == 2
+
+
+def test_memo_is_keyed_by_commit_not_branch(repo: Path, cache: GitObjectCache) -> None:
+    """Test that moving a branch never serves a stale diff, merge-base or blob."""
+    base = cache.merge_base("main", "feature")
+    assert base == _git(repo, "rev-parse", "main")
+    assert cache.merge_base("feature", "main") == base
+    assert cache.changed_files("main", "feature") == {"app.py": "M", "new.py": "A"}
+    assert cache.stats["merge_base_hits"] == 1
+
+    _git(repo, "checkout", "-q", "feature")
+    _commit(repo, {"app.py": "def run(x, y):\n    return x + y\n"}, "More work")
+
+    assert cache.read_text("feature", "app.py") == "def run(x, y):\n    return x + y\n"
+    assert cache.changed_files("main", "feature") == {"app.py": "M", "new.py": "A"}
+    assert cache.stats["diff_runs"] == 2
+
+
+def test_restarts_dead_process(cache: GitObjectCache) -> None:
+    """Test that a killed cat-file process is replaced transparently."""
+    assert cache.resolve("main")
+    cache._process.kill()  # noqa: SLF001
+    cache._process.wait()  # noqa: SLF001
+
+    assert cache.read_text("main", "README.md") == "docs\n"
+    assert cache.stats["processes_started"] == 2
+
+
+def test_for_repo_shares_instance(repo: Path) -> None:
+    """Test that every caller for one repository gets the same cache."""
+    assert GitObjectCache.for_repo(repo) is GitObjectCache.for_repo(str(repo))
+    GitObjectCache.for_repo(repo).close()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,97 @@
+# Copyright notice.
+
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from libs.multi_agent.module_graph import ModuleGraph
+from libs.multi_agent.task_analyzer import TaskAnalyzer, TaskDefinition
+from libs.source_index import SourceFileIndex
+
+# Copyright (c) 2024 Yesman Claude Project
+# Licensed under the MIT License
+
+"""Tests for the persistent forward and reverse import graph."""
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    (tmp_path / "libs").mkdir()
+    (tmp_path / "libs" / "__init__.py").write_text("")
+    (tmp_path / "libs" / "module_a.py").write_text("import os\nfrom libs.module_b import helper\n")
+    (tmp_path / "libs" / "module_b.py").write_text("from libs.module_c import Base\n\ndef helper():\n    return Base()\n")
+    (tmp_path / "libs" / "module_c.py").write_text("class Base:\n    pass\n")
+    (tmp_path / "main.py").write_text("from libs.module_a import main\n")
+    (tmp_path / "broken.py").write_text("def (:\n")
+    return tmp_path
+
+
+def test_forward_and_reverse_edges(repo: Path) -> None:
+    """Test that imports resolve to repository files and importers are indexed."""
+    graph = ModuleGraph(repo, SourceFileIndex(repo))
+    graph.refresh()
+
+    assert graph.imported_files("libs/module_a.py") == {"libs/module_b.py"}
+    assert graph.importers("libs.module_b") == {"libs/module_a.py"}
+    assert graph.importers("libs.module_c.Base") == {"libs/module_b.py"}
+    assert graph.file_for_module("libs") == "libs/__init__.py"
+    assert graph.imports("broken.py") is None
+
+
+def test_refresh_updates_changed_files_only(repo: Path) -> None:
+    """Test that only files whose mtime or size changed are re-linked."""
+    graph = ModuleGraph(repo, SourceFileIndex(repo))
+    assert graph.refresh() == 6
+    assert graph.refresh() == 0
+
+    module_c = repo / "libs" / "module_c.py"
+    module_c.write_text("from libs.module_a import helper\n\nclass Base:\n    pass\n")
+    os.utime(module_c, ns=(1, 1))
+    (repo / "main.py").unlink()
+
+    assert graph.refresh() == 2
+    assert graph.importers("libs.module_a") == {"libs/module_c.py"}
+    assert graph.imported_files("libs/module_c.py") == {"libs/module_a.py"}
+
+
+def test_imports_persist_with_source_index(repo: Path) -> None:
+    """Test that a new process reuses the stored imports instead of re-parsing."""
+    ModuleGraph(repo, SourceFileIndex(repo)).refresh()
+
+    graph = ModuleGraph(repo, SourceFileIndex(repo))
+    with patch.object(SourceFileIndex, "_analyze") as mock_analyze:
+        graph.refresh()
+
+    mock_analyze.assert_not_called()
+    assert graph.importers("libs.module_b") == {"libs/module_a.py"}
+
+
+def test_task_analyzer_queries_use_graph(repo: Path) -> None:
+    """Test related files and task ordering from the shared module graph."""
+    analyzer = TaskAnalyzer(repo_path=str(repo))
+
+    assert analyzer.find_related_files("libs/module_b.py", depth=2) == {
+        "libs/module_a.py",
+        "libs/module_b.py",
+        "libs/module_c.py",
+        "main.py",
+    }
+    assert analyzer.find_related_files("libs/module_b.py", depth=1) == {"libs/module_a.py", "libs/module_b.py", "libs/module_c.py"}
+
+    deps = analyzer.analyze_file_dependencies("libs/module_a.py")
+    assert [(dep.imported_module, dep.import_type, dep.line_number) for dep in deps] == [("os", "import", 1), ("libs.module_b", "from_import", 2)]
+    assert deps[1].symbols == ["helper"]
+
+    tasks = [
+        TaskDefinition(task_id="ui", title="UI", description="", file_paths=["main.py"]),
+        TaskDefinition(task_id="core", title="Core", description="", file_paths=["libs/module_a.py"]),
+    ]
+    graph = analyzer.analyze_task_dependencies(tasks)
+    assert graph.has_edge("core", "ui")
+    assert analyzer.get_execution_order(tasks) == [["core"], ["ui"]]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
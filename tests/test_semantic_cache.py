@@ -0,0 +1,117 @@
+# Copyright notice.
+
+import asyncio
+import subprocess
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+from libs.multi_agent.dependency_propagation import DependencyPropagationSystem
+from libs.multi_agent.semantic_analyzer import SemanticAnalyzer, context_from_summary, summarize_source
+from libs.multi_agent.semantic_cache import SemanticSummaryCache, blob_sha
+
+# Copyright (c) 2024 Yesman Claude Project
+# Licensed under the MIT License
+
+"""Tests for the content-addressed semantic summary cache."""
+
+SOURCE = '''import os
+from .models import Session as S
+
+LIMIT: int = 3
+
+
+class Worker(Base, mixins.Logged):
+    """Does work."""
+
+    async def run(self, task: str, *, retries: int = 2) -> bool:
+        return True
+
+
+def helper(a, b=1):
+    pass
+'''
+
+
+def test_blob_sha_matches_git(tmp_path: Path) -> None:
+    """Test that cache keys are the SHA git stores the same content under."""
+    (tmp_path / "file.py").write_text(SOURCE, encoding="utf-8")
+    expected = subprocess.run(["git", "hash-object", "file.py"], cwd=tmp_path, check=True, capture_output=True, text=True).stdout.strip()
+
+    assert blob_sha(SOURCE) == expected
+
+
+def test_summary_round_trips_to_context() -> None:
+    """Test that a stored summary rebuilds the same context as a fresh parse."""
+    context = context_from_summary("worker.py", summarize_source(SOURCE))
+
+    assert context.syntax_error is None
+    assert context.constants == {"LIMIT": "int"}
+    assert context.classes["Worker"].bases == ["Base", "mixins.Logged"]
+    method = context.classes["Worker"].methods["run"]
+    assert method.name == "async run"
+    assert method.kwonlyargs == ["retries: int"]
+    assert method.kwdefaults == {"retries: int": "2"}
+    assert [(info.module, info.name, info.alias, info.level) for info in context.imports] == [("os", None, None, 0), ("models", "Session", "S", 1)]
+    assert context_from_summary("x.py", summarize_source("def (")).syntax_error
+
+
+def test_functions_without_positional_args_round_trip(tmp_path: Path) -> None:
+    """Test that empty required fields survive the cache, for zero-arg, varargs-only and static functions."""
+    source = "def main():\n    pass\n\n\ndef spread(*items):\n    pass\n\n\nclass Tool:\n    @staticmethod\n    def build():\n        pass\n"
+    SemanticSummaryCache(tmp_path).get(source, summarize_source)
+
+    context = context_from_summary("tool.py", SemanticSummaryCache(tmp_path).get(source, Mock(side_effect=AssertionError)))
+
+    assert context.functions["main"].args == []
+    assert context.functions["spread"].args == []
+    assert context.functions["spread"].varargs == "items"
+    assert context.classes["Tool"].methods["build"].args == []
+    assert context.classes["Tool"].methods["build"].decorators == ["staticmethod"]
+
+
+def test_each_blob_parsed_once_and_persisted(tmp_path: Path) -> None:
+    """Test memory hits, disk hits across instances, and recovery from corrupt entries."""
+    compute = Mock(side_effect=summarize_source)
+    cache = SemanticSummaryCache(tmp_path)
+
+    first = cache.get(SOURCE, compute)
+    assert cache.get(SOURCE, compute) is first
+    assert compute.call_count == 1
+
+    other_process = SemanticSummaryCache(tmp_path)
+    assert other_process.get(SOURCE, compute) == first
+    assert other_process.stats["disk_hits"] == 1
+    assert compute.call_count == 1
+
+    entry = other_process._path(blob_sha(SOURCE))  # noqa: SLF001
+    entry.write_bytes(b"not zlib")
+    assert SemanticSummaryCache(tmp_path).get(SOURCE, compute) == first
+    assert compute.call_count == 2
+
+
+def test_analyzers_share_the_repo_cache(tmp_path: Path) -> None:
+    """Test that different analyzers parse a given content only once between them."""
+    (tmp_path / "worker.py").write_text(SOURCE, encoding="utf-8")
+    cache = SemanticSummaryCache.for_repo(tmp_path)
+
+    analyzer = SemanticAnalyzer(Mock(), str(tmp_path))
+    context = analyzer._extract_semantic_context("worker.py", SOURCE)  # noqa: SLF001
+    assert "helper" in context.functions
+
+    propagation = DependencyPropagationSystem(Mock(), Mock(), Mock(), repo_path=str(tmp_path), auto_propagate=False)
+    assert propagation.summary_cache is cache
+    asyncio.run(propagation._analyze_file_dependencies("worker.py"))  # noqa: SLF001
+    node = propagation.dependency_graph["worker.py"]
+    assert node.dependencies == {"os", "models", "Base"}
+    assert node.exports["run"]["is_async"]
+    assert node.exports["run"]["args"] == ["self", "task"]
+    assert node.imports["S"] == {"type": "from_import", "module": "models", "name": "Session", "line": 2}
+
+    assert cache.stats["computed"] == 1
+    assert cache.stats["memory_hits"] == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,192 @@
+# Copyright notice.
+
+import asyncio
+import json
+import threading
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from libs.ai.adaptive_response import AdaptiveResponse
+from libs.ai.response_analyzer import ResponseAnalyzer
+
+# Copyright (c) 2024 Yesman Claude Project
+# Licensed under the MIT License
+
+"""Test indexed response prediction, running statistics and the response journal."""
+
+
+@pytest.fixture
+def analyzer(tmp_path: Path) -> ResponseAnalyzer:
+    return ResponseAnalyzer(data_dir=tmp_path)
+
+
+def _record_at(analyzer: ResponseAnalyzer, timestamp: float, prompt_text: str, response: str) -> None:
+    with patch("time.time", return_value=timestamp):
+        analyzer.record_response(prompt_text, response)
+
+
+class TestResponseAnalyzer:
+    def test_predicts_most_common_response(self, analyzer: ResponseAnalyzer) -> None:
+        for response in ["2", "1", "1", "2", "1", "1"]:
+            analyzer.record_response("Select an option: 1) keep 2) discard", response)
+
+        assert analyzer.predict_response("Select an option: 1) keep 2) discard") == ("1", 1.0)
+
+    def test_ties_keep_first_seen_response(self, analyzer: ResponseAnalyzer) -> None:
+        for response in ["no", "yes", "yes", "no"]:
+            analyzer.record_response("Do you want to continue? yes or no?", response)
+
+        assert analyzer.predict_response("Do you want to continue? yes or no?")[0] == "no"
+
+    def test_learned_regex_is_compiled_once(self, analyzer: ResponseAnalyzer) -> None:
+        analyzer.record_response("Overwrite config.py?", "yes")
+
+        with patch("libs.ai.response_analyzer.re.compile") as mock_compile, patch("libs.ai.response_analyzer.re.search") as mock_search:
+            for _ in range(5):
+                analyzer.predict_response("Overwrite settings.py?")
+
+        mock_compile.assert_not_called()
+        mock_search.assert_not_called()
+
+    def test_invalid_learned_regex_is_ignored(self, analyzer: ResponseAnalyzer) -> None:
+        analyzer.record_response("Overwrite config.py?", "yes")
+        pattern = analyzer.learned_patterns["overwrite_confirmation_global"]
+        pattern.regex_pattern = "("
+        analyzer._pattern_index.clear()
+
+        assert analyzer.predict_response("Overwrite config.py?") == ("yes", 0.4)
+
+    def test_statistics_track_history(self, analyzer: ResponseAnalyzer) -> None:
+        analyzer.record_response("Do you want to continue? yes or no?", "yes", project_name="web")
+        analyzer.record_response("Choose a theme", "1")
+
+        stats = analyzer.get_statistics()
+
+        assert stats["total_responses"] == 2
+        assert stats["response_types"] == {"yes_no": 1, "choice_selection": 1}
+        assert stats["project_distribution"] == {"web": 1, "global": 1}
+        assert stats["recent_activity"] == 2
+
+    def test_cleanup_updates_statistics(self, analyzer: ResponseAnalyzer) -> None:
+        _record_at(analyzer, time.time() - 40 * 24 * 3600, "Choose a theme", "1")
+        analyzer.record_response("Proceed with deployment", "yes")
+
+        assert analyzer.cleanup_old_data(days_to_keep=30) == 1
+
+        stats = analyzer.get_statistics()
+        assert stats["total_responses"] == 1
+        assert stats["response_types"] == {"proceed_confirmation": 1}
+        assert stats["project_distribution"] == {"global": 1}
+        assert [record.prompt_text for record in ResponseAnalyzer(data_dir=analyzer.data_dir).response_history] == ["Proceed with deployment"]
+
+    def test_index_is_rebuilt_on_load(self, analyzer: ResponseAnalyzer, tmp_path: Path) -> None:
+        for response in ["yes", "no", "no"]:
+            analyzer.record_response("Proceed with build?", response, project_name="api")
+        analyzer._save_data()
+
+        reloaded = ResponseAnalyzer(data_dir=tmp_path)
+
+        assert reloaded.predict_response("Proceed with build?", project_name="api") == analyzer.predict_response("Proceed with build?", project_name="api")
+        assert reloaded.get_statistics() == analyzer.get_statistics()
+
+    def test_prediction_does_not_wait_for_journal_io(self, tmp_path: Path) -> None:
+        adaptive = AdaptiveResponse(data_dir=tmp_path)
+        for _ in range(6):
+            adaptive.learn_from_manual_response("Do you want to continue? yes or no?", "yes")
+
+        flushing = threading.Event()
+        release = threading.Event()
+
+        def slow_flush() -> None:
+            flushing.set()
+            release.wait(5)
+
+        with patch.object(adaptive.analyzer, "_flush_journal", side_effect=slow_flush):
+            learner = threading.Thread(target=adaptive.learn_from_manual_response, args=("Do you want to continue? yes or no?", "yes"))
+            learner.start()
+            try:
+                assert flushing.wait(5)
+                decision = asyncio.run(adaptive.should_auto_respond("Do you want to continue? yes or no?"))
+                assert learner.is_alive()
+            finally:
+                release.set()
+                learner.join()
+
+        assert decision == (True, "yes", 1.0)
+
+
+class TestResponseJournal:
+    def test_each_response_is_appended_to_the_journal(self, analyzer: ResponseAnalyzer) -> None:
+        for index in range(5):
+            analyzer.record_response(f"Choose option {index}", "1")
+
+        lines = analyzer.journal_file.read_text(encoding="utf-8").splitlines()
+        assert [json.loads(line)["seq"] for line in lines] == [1, 2, 3, 4, 5]
+        # Snapshots are only written every SNAPSHOT_INTERVAL records
+        assert not analyzer.snapshot_file.exists()
+
+    def test_snapshot_is_written_periodically(self, tmp_path: Path) -> None:
+        analyzer = ResponseAnalyzer(data_dir=tmp_path)
+        analyzer.SNAPSHOT_INTERVAL = 3
+        for index in range(4):
+            analyzer.record_response(f"Choose option {index}", "1")
+
+        snapshot = json.loads(analyzer.snapshot_file.read_text(encoding="utf-8"))
+        assert snapshot["sequence"] == 3
+        assert snapshot["total_responses"] == 3
+
+    def test_startup_replays_only_the_journal_tail(self, tmp_path: Path) -> None:
+        analyzer = ResponseAnalyzer(data_dir=tmp_path)
+        for response in ["yes", "yes", "no"]:
+            analyzer.record_response("Proceed with build?", response)
+        analyzer._save_data()
+        analyzer.record_response("Proceed with build?", "yes")
+
+        with patch.object(ResponseAnalyzer, "_apply_record", autospec=True, side_effect=ResponseAnalyzer._apply_record) as mock_apply:
+            reloaded = ResponseAnalyzer(data_dir=tmp_path)
+
+        assert mock_apply.call_count == 1
+        assert reloaded._history is None
+        assert reloaded.get_statistics()["total_responses"] == 4
+        assert reloaded.learned_patterns["proceed_confirmation_global"].common_responses == {"yes": 3, "no": 1}
+        assert len(reloaded.response_history) == 4
+
+    def test_torn_journal_tail_is_discarded(self, analyzer: ResponseAnalyzer, tmp_path: Path) -> None:
+        analyzer.record_response("Choose a theme", "1")
+        with open(analyzer.journal_file, "ab") as f:
+            f.write(b'{"seq": 2, "timestamp"')
+
+        reloaded = ResponseAnalyzer(data_dir=tmp_path)
+        reloaded.record_response("Choose a layout", "2")
+
+        assert [record.prompt_text for record in ResponseAnalyzer(data_dir=tmp_path).response_history] == ["Choose a theme", "Choose a layout"]
+
+    def test_legacy_files_are_migrated(self, tmp_path: Path) -> None:
+        record = {
+            "timestamp": time.time(),
+            "prompt_text": "Overwrite config.py?",
+            "prompt_type": "overwrite_confirmation",
+            "user_response": "yes",
+            "context": "",
+        }
+        pattern = {
+            "pattern_id": "overwrite_confirmation_global",
+            "prompt_type": "overwrite_confirmation",
+            "regex_pattern": "overwrite\\ config\\.py\\?",
+            "confidence_threshold": 0.7,
+            "common_responses": {"yes": 1},
+            "context_factors": {},
+            "last_updated": time.time(),
+        }
+        (tmp_path / "response_history.json").write_text(json.dumps([record]), encoding="utf-8")
+        (tmp_path / "learned_patterns.json").write_text(json.dumps({pattern["pattern_id"]: pattern}), encoding="utf-8")
+
+        analyzer = ResponseAnalyzer(data_dir=tmp_path)
+
+        assert analyzer.get_statistics()["total_responses"] == 1
+        assert analyzer.learned_patterns["overwrite_confirmation_global"].common_responses == {"yes": 1}
+        assert not (tmp_path / "response_history.json").exists()
+        assert ResponseAnalyzer(data_dir=tmp_path).get_statistics() == analyzer.get_statistics()
@@ -0,0 +1,143 @@
+# Copyright notice.
+
+import re
+import time
+
+from libs.automation.context_detector import ContextDetector, ContextType, required_literals
+
+# Copyright (c) 2024 Yesman Claude Project
+# Licensed under the MIT License
+
+"""Test combined and incremental context detection."""
+
+
+OUTPUT_LINES = [
+    "● Bash(python -m pytest -q tests/unit)",
+    "  ⎿  3 failed, 120 passed in 4.2s",
+    "FAILED tests/unit/test_monitor.py::test_tick - AssertionError: expected 2",
+    "● Update(libs/core/claude_monitor.py)",
+    "  ⎿  Updated libs/core/claude_monitor.py with 3 additions",
+    "[main 1a2b3c4] Fix commit hook",
+    "npm ERR! code E404 npm error",
+    "Traceback (most recent call last):",
+    "pip install requests",
+    "  ⎿  Pull request created",
+    "* Cogitating… (12s · esc to interrupt)",
+] + [f"plain output line {index} describing the change" for index in range(20)]
+
+
+def record_captures(count: int = 200, height: int = 50) -> list[str]:
+    """Simulate pane captures of scrolling Claude output.
+
+    Returns:
+    List of pane captures.
+    """
+    history: list[str] = []
+    captures = []
+    for frame in range(count):
+        history.append(f"{OUTPUT_LINES[(frame * 7) % len(OUTPUT_LINES)]} [{frame}]")
+        captures.append("\n".join(history[-height:]))
+    return captures
+
+
+def reference_detection(detector: ContextDetector, content: str) -> list[tuple]:
+    """Scan with every pattern separately, like the original implementation.
+
+    Returns:
+    List of (type, pattern, matched text, start) tuples.
+    """
+    return [
+        (context_type, pattern, match.group(), match.start())
+        for context_type, patterns in detector.patterns.items()
+        for pattern in patterns
+        for match in re.finditer(pattern, content, re.IGNORECASE | re.MULTILINE)
+        if detector._calculate_confidence(context_type, content, match) > 0.6
+    ]
+
+
+def _summary(contexts: list) -> list[tuple]:
+    return [(context.context_type, context.details["matched_pattern"], context.details["matched_text"]) for context in contexts]
+
+
+class TestContextDetector:
+    def setup_method(self) -> None:
+        self.detector = ContextDetector()
+
+    def test_matches_separate_pattern_scans(self) -> None:
+        for capture in record_captures():
+            expected = [(context_type, pattern, text) for context_type, pattern, text, _ in reference_detection(self.detector, capture)]
+            assert _summary(self.detector.detect_context_from_content(capture, "s")) == expected
+
+    def test_detects_test_failure(self) -> None:
+        contexts = self.detector.detect_context_from_content("pytest run: 3 failed, 10 passed", "s")
+
+        assert ContextType.TEST_FAILURE in {context.context_type for context in contexts}
+        assert contexts[0].session_name == "s"
+
+    def test_pattern_changes_rebuild_the_matcher(self) -> None:
+        content = "deploy finished: rollout complete"
+        assert self.detector.detect_context_from_content(content) == []
+
+        self.detector.patterns[ContextType.DEPLOYMENT_READY] = [r"rollout\s+complete"]
+
+        assert _summary(self.detector.detect_context_from_content(content)) == [(ContextType.DEPLOYMENT_READY, r"rollout\s+complete", "rollout complete")]
+
+    def test_incremental_mode_scans_only_new_lines(self) -> None:
+        first = "● Bash(pytest)\n  ⎿  3 failed, 10 passed\nplain line"
+        second = f"{first}\nnpm ERR! build failed with npm error"
+
+        assert len(self.detector.detect_context_from_content(first, "s", incremental=True)) > 0
+        assert self.detector.detect_context_from_content(first, "s", incremental=True) == []
+
+        contexts = self.detector.detect_context_from_content(second, "s", incremental=True)
+        assert {context.context_type for context in contexts} == {ContextType.BUILD_FAILURE}
+        assert all(context.details["matched_text"] in "npm ERR! build failed with npm error" for context in contexts)
+        # The snippet still comes from the full content
+        assert "failed" in contexts[0].details["content_snippet"]
+
+    def test_incremental_state_is_per_session(self) -> None:
+        content = "pytest: 1 failed, 2 passed"
+        self.detector.detect_context_from_content(content, "a", incremental=True)
+
+        assert self.detector.detect_context_from_content(content, "b", incremental=True)
+
+        self.detector.reset_incremental_state("a")
+        assert self.detector.detect_context_from_content(content, "a", incremental=True)
+
+    def test_incremental_mode_reports_each_line_once(self) -> None:
+        for capture in record_captures():
+            new_line_start = capture.rfind("\n") + 1
+            expected = [(context_type, pattern, text) for context_type, pattern, text, start in reference_detection(self.detector, capture) if start >= new_line_start]
+
+            assert _summary(self.detector.detect_context_from_content(capture, "s", incremental=True)) == expected
+
+
+def test_required_literals() -> None:
+    assert required_literals("committed.*files? changed") == ["committed"]
+    assert required_literals(r"\d+ failed.*\d+ passed") == [" failed"]
+    assert required_literals("error:|ERROR:") == ["error:", "error:"]
+    assert required_literals("a(b|c)d") == ["a"]
+    assert required_literals(r"ab{2,3}cd") == ["cd"]
+    assert required_literals(r"\w+|error") is None
+
+
+def test_context_detection_benchmark() -> None:
+    """Combined detection should be faster than scanning with each pattern separately."""
+    captures = record_captures()
+    detector = ContextDetector()
+
+    def best_time(detect: object) -> float:
+        timings = []
+        for _ in range(3):
+            start_time = time.perf_counter()
+            for capture in captures:
+                detect(capture)
+            timings.append(time.perf_counter() - start_time)
+        return min(timings)
+
+    reference_time = best_time(lambda capture: reference_detection(detector, capture))
+    combined_time = best_time(lambda capture: detector.detect_context_from_content(capture, "s"))
+    incremental_time = best_time(lambda capture: detector.detect_context_from_content(capture, "s", incremental=True))
+
+    assert combined_time < reference_time
+    assert reference_time / incremental_time >= 5, f"Incremental detection only {reference_time / incremental_time:.1f}x faster"
@@ -0,0 +1,169 @@
+# Copyright notice.
+
+import time
+
+import pytest
+
+from libs.core.prompt_detector import ClaudePromptDetector, IncrementalPromptDetector, PromptType
+
+# Copyright (c) 2024 Yesman Claude Project
+# Licensed under the MIT License
+
+"""Test incremental prompt detection on pane deltas."""
+
+PANE_HEIGHT = 50
+PANE_WIDTH = 120
+
+OUTPUT_LINES = [
+    "\x1b[1m●\x1b[0m I'll start by reading the monitor implementation to understand how the polling loop is structured.",
+    "\x1b[1m● Read\x1b[0m(libs/core/claude_monitor.py)",
+    "  ⎿  Read 480 lines (ctrl+r to expand)",
+    "\x1b[1m●\x1b[0m The loop captures the pane every second and runs the full prompt detector on each capture, even when",
+    "  nothing changed. Here is the plan:",
+    "  1. Add a control-mode client that reports pane output as it happens",
+    "  2. Wait on an asyncio event instead of sleeping, with a heartbeat for idle checks",
+    "\x1b[1m● Update\x1b[0m(libs/core/claude_monitor.py)",
+    "  ⎿  Updated libs/core/claude_monitor.py with 24 additions and 3 removals",
+    "\x1b[2m     171\x1b[0m \x1b[32m+            self._pane_changed = asyncio.Event()                                                  \x1b[0m",
+    "\x1b[2m     172\x1b[0m \x1b[31m-            await asyncio.sleep(self.POLL_INTERVAL)                                             \x1b[0m",
+    "\x1b[2m     173\x1b[0m                  content = self.session_manager.capture_pane_content()",
+    "\x1b[1m● Bash\x1b[0m(python -m pytest -q tests/unit/core/session)",
+    "  ⎿  34 passed in 2.41s",
+    "",
+]
+
+PROMPTS = [
+    [
+        "╭" + "─" * (PANE_WIDTH - 2) + "╮",
+        "│ Do you want to make this edit to claude_monitor.py?".ljust(PANE_WIDTH - 1) + "│",
+        "│ ❯ 1. Yes".ljust(PANE_WIDTH - 1) + "│",
+        "│   2. Yes, and don't ask again this session (shift+tab)".ljust(PANE_WIDTH - 1) + "│",
+        "│   3. No, and tell Claude what to do differently (esc)".ljust(PANE_WIDTH - 1) + "│",
+        "╰" + "─" * (PANE_WIDTH - 2) + "╯",
+    ],
+    ["Do you want to continue? (y/n)"],
+    ["Enable verbose logging? (true/false)"],
+    ["Please enter your API key:"],
+    ["Are you sure you want to proceed?"],
+]
+
+
+def _footer(status: str | None) -> list[str]:
+    footer = ["", f"\x1b[33m{status}\x1b[0m"] if status else [""]
+    return [
+        *footer,
+        "╭" + "─" * (PANE_WIDTH - 2) + "╮",
+        "│ >".ljust(PANE_WIDTH - 1) + "│",
+        "╰" + "─" * (PANE_WIDTH - 2) + "╯",
+        "  ? for shortcuts",
+    ]
+
+
+def record_captures(cycles: int = 10) -> list[str]:
+    """Simulate the captures a 1s polling monitor takes during a Claude session.
+
+    Each cycle streams output for 20 polls (a new line and an updated status
+    line on every capture), then shows a prompt for 10 polls while the user
+    reads it, then sits idle at the input box for 10 polls.
+
+    Returns:
+    List of 50-line pane captures.
+    """
+    captures = []
+    history: list[str] = []
+    frame = 0
+    for cycle in range(cycles):
+        for _ in range(20):
+            history.append(OUTPUT_LINES[frame % len(OUTPUT_LINES)])
+            footer = _footer(f"✻ Cogitating… ({frame}s · ↑ {frame * 37} tokens · esc to interrupt)")
+            captures.append("\n".join(history[-(PANE_HEIGHT - len(footer)) :] + footer))
+            frame += 1
+
+        prompt = PROMPTS[cycle % len(PROMPTS)]
+        captures.extend(["\n".join(history[-(PANE_HEIGHT - len(prompt)) :] + prompt)] * 10)
+
+        footer = _footer(None)
+        captures.extend(["\n".join(history[-(PANE_HEIGHT - len(footer)) :] + footer)] * 10)
+    return captures
+
+
+def _summary(prompt_info: object) -> tuple | None:
+    if prompt_info is None:
+        return None
+    return prompt_info.type, prompt_info.question, prompt_info.options, prompt_info.context
+
+
+class TestIncrementalPromptDetector:
+    @pytest.fixture(autouse=True)
+    def setup(self) -> None:
+        self.detector = IncrementalPromptDetector()
+        self.reference = ClaudePromptDetector()
+
+    def test_matches_full_detector_on_recorded_captures(self) -> None:
+        for capture in record_captures():
+            assert _summary(self.detector.detect_prompt(capture, "%1")) == _summary(self.reference.detect_prompt(capture))
+
+    def test_detects_numbered_selection(self) -> None:
+        content = """
+Do you want to make this edit to VideoProcessingService.kt?
+❯ 1. Yes
+  2. Yes, and don't ask again this session (shift+tab)
+  3. No, and tell Claude what to do differently (esc)
+"""
+        prompt_info = self.detector.detect_prompt(content)
+
+        assert prompt_info is not None
+        assert prompt_info.type == PromptType.NUMBERED_SELECTION
+        assert len(prompt_info.options) == 3
+
+    def test_prompt_appearing_in_changed_tail_is_detected(self) -> None:
+        lines = [f"output line {index}" for index in range(PANE_HEIGHT)]
+        assert self.detector.detect_prompt("\n".join(lines), "%1") is None
+
+        lines[-1] = "Do you want to continue? (y/n)"
+        prompt_info = self.detector.detect_prompt("\n".join(lines), "%1")
+
+        assert prompt_info is not None
+        assert prompt_info.type == PromptType.BINARY_CHOICE
+
+    def test_state_is_kept_per_pane(self) -> None:
+        self.detector.detect_prompt("Do you want to continue? (y/n)", "%1")
+
+        assert self.detector.detect_prompt("plain output", "%2") is None
+        assert self.detector.detect_prompt("Do you want to continue? (y/n)", "%1") is not None
+
+    def test_short_content_returns_none(self) -> None:
+        assert self.detector.detect_prompt("", "%1") is None
+        assert self.detector.detect_prompt("ok", "%1") is None
+
+    def test_reset_forgets_pane_state(self) -> None:
+        self.detector.detect_prompt("Do you want to continue? (y/n)", "%1")
+        self.detector.reset("%1")
+
+        assert "%1" not in self.detector._panes
+
+    def test_is_waiting_for_input(self) -> None:
+        assert self.detector.is_waiting_for_input("Select an option ❯", "%1")
+        assert not self.detector.is_waiting_for_input("Compiling project", "%1")
+
+
+def _best_time(detector_factory: type, captures: list[str], *args: str, repeat: int = 5) -> float:
+    timings = []
+    for _ in range(repeat):
+        detector = detector_factory()
+        start_time = time.perf_counter()
+        for capture in captures:
+            detector.detect_prompt(capture, *args)
+        timings.append(time.perf_counter() - start_time)
+    return min(timings)
+
+
+def test_incremental_detector_benchmark() -> None:
+    """The incremental detector should be at least 10x faster on recorded captures."""
+    captures = record_captures()
+
+    reference_time = _best_time(ClaudePromptDetector, captures)
+    incremental_time = _best_time(IncrementalPromptDetector, captures, "%1")
+
+    speedup = reference_time / incremental_time
+    assert speedup >= 10, f"Incremental detector only {speedup:.1f}x faster ({incremental_time:.4f}s vs {reference_time:.4f}s)"
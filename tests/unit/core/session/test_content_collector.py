@@ -4,6 +4,7 @@ import json
 import shutil
 import tempfile
 import unittest
+from datetime import UTC, datetime
 from pathlib import Path
 from unittest.mock import patch
 
@@ -37,14 +38,12 @@ class TestClaudeContentCollector(unittest.TestCase):
         result = self.collector.collect_interaction(content, prompt_info, response)
         assert result
 
-        # Check file was created
-        files = list(self.collector.collection_path.glob("interaction_*.json"))
-        assert len(files) == 1
-
-        # Check file content
-        with open(files[0], encoding="utf-8") as f:
-            data = json.load(f)
+        # Check record was stored
+        records = list(self.collector.read_records(record_type="interaction"))
+        assert len(records) == 1
 
+        # Check record content
+        data = records[0]
         assert data["session_name"] == self.session_name
         assert data["content"] == content
         assert data["prompt_info"] == prompt_info
@@ -63,9 +62,9 @@ class TestClaudeContentCollector(unittest.TestCase):
         result2 = self.collector.collect_interaction(content)
         assert not result2
 
-        # Only one file should exist
-        files = list(self.collector.collection_path.glob("interaction_*.json"))
-        assert len(files) == 1
+        # Only one record should exist
+        records = list(self.collector.read_records())
+        assert len(records) == 1
 
     def test_collect_raw_content(self) -> None:
         """Test raw content collection."""
@@ -75,14 +74,12 @@ class TestClaudeContentCollector(unittest.TestCase):
         result = self.collector.collect_raw_content(content, metadata)
         assert result
 
-        # Check file was created
-        files = list(self.collector.collection_path.glob("raw_*.json"))
-        assert len(files) == 1
-
-        # Check file content
-        with open(files[0], encoding="utf-8") as f:
-            data = json.load(f)
+        # Check record was stored
+        records = list(self.collector.read_records(record_type="raw_content"))
+        assert len(records) == 1
 
+        # Check record content
+        data = records[0]
         assert data["content"] == content
         assert data["metadata"] == metadata
         assert data["record_type"] == "raw_content"
@@ -95,9 +92,8 @@ class TestClaudeContentCollector(unittest.TestCase):
             result = self.collector.collect_interaction(content)
             assert not result
 
-        # No files should be created
-        files = list(self.collector.collection_path.glob("*.json"))
-        assert len(files) == 0
+        # No records should be stored
+        assert self.collector.get_collection_stats()["total_records"] == 0
 
     def test_get_collection_stats(self) -> None:
         """Test collection statistics."""
@@ -108,9 +104,10 @@ class TestClaudeContentCollector(unittest.TestCase):
         stats = self.collector.get_collection_stats()
 
         assert stats["session_name"] == self.session_name
-        assert stats["interaction_files"] == 1
-        assert stats["raw_files"] == 1
-        assert stats["total_files"] == 2
+        assert stats["interaction_records"] == 1
+        assert stats["raw_records"] == 1
+        assert stats["total_records"] == 2
+        assert stats["segment_count"] == 1
         assert stats["total_size_bytes"] > 0
         assert stats["last_interaction_count"] == 1
 
@@ -120,17 +117,57 @@ class TestClaudeContentCollector(unittest.TestCase):
         self.collector.collect_interaction("Test interaction 1")
         self.collector.collect_raw_content("Test raw content 1")
 
-        # Initially should have 2 files
+        # Initially should have 2 records
         stats_before = self.collector.get_collection_stats()
-        assert stats_before["total_files"] == 2
+        assert stats_before["total_records"] == 2
 
         # Cleanup with 0 days (delete all)
         deleted_count = self.collector.cleanup_old_files(days_to_keep=0)
         assert deleted_count == 2
 
-        # Should have no files left
+        # Should have no records left
         stats_after = self.collector.get_collection_stats()
-        assert stats_after["total_files"] == 0
+        assert stats_after["total_records"] == 0
+        assert not list(self.collector.collection_path.glob("segment_*"))
+
+    def test_read_records_by_time_range(self) -> None:
+        """Test reading records collected within a time range."""
+        self.collector.collect_interaction("Interaction before the range")
+        middle = datetime.now(UTC)
+        self.collector.collect_interaction("Interaction inside the range")
+
+        records = list(self.collector.read_records(start=middle))
+        assert [record["content"] for record in records] == ["Interaction inside the range"]
+
+    def test_migrate_legacy_files(self) -> None:
+        """Test importing records written in the old one-file-per-capture layout."""
+        legacy = {
+            "interaction_20240101_000001_aaaaaaaa.json": {"timestamp": "2024-01-01T00:00:01+00:00", "content": "first"},
+            "raw_20240101_000002_bbbbbbbb.json": {"timestamp": "2024-01-01T00:00:02+00:00", "content": "second", "record_type": "raw_content"},
+        }
+        for name, record in legacy.items():
+            (self.collector.collection_path / name).write_text(json.dumps(record, indent=2), encoding="utf-8")
+
+        result = self.collector.migrate_legacy_files()
+
+        assert result == {"migrated": 2, "failed": 0}
+        assert not list(self.collector.collection_path.glob("*_2024*.json"))
+        assert [record["content"] for record in self.collector.read_records()] == ["first", "second"]
+        assert self.collector.get_collection_stats()["raw_records"] == 1
+
+    def test_second_collector_for_session_does_not_collect(self) -> None:
+        """Test that a second monitor of the same session starts without taking over the store."""
+        with patch("libs.core.content_collector.get_default_log_path") as mock_log_path:
+            mock_log_path.return_value = Path(self.temp_dir)
+            second = ClaudeContentCollector(self.session_name)
+
+        assert second.store is None
+        assert not second.collect_interaction("Do you want to make this edit? [1] Yes [2] No")
+        assert list(second.read_records()) == []
+        assert second.cleanup_old_files(days_to_keep=0) == 0
+        assert "error" in second.get_collection_stats()
+
+        assert self.collector.collect_interaction("Do you want to make this edit? [1] Yes [2] No")
 
 
 class TestContentCollectionManager(unittest.TestCase):
@@ -183,5 +220,5 @@ class TestContentCollectionManager(unittest.TestCase):
 
         # Each should have stats
         for session_stats in stats.values():
-            assert "total_files" in session_stats
+            assert "total_records" in session_stats
             assert "session_name" in session_stats
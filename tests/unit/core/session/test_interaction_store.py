@@ -0,0 +1,196 @@
+# Copyright notice.
+
+import gzip
+import json
+from pathlib import Path
+
+import pytest
+
+from libs.core.interaction_store import InteractionStore, StoreLockedError, apply_line_delta, encode_line_delta, migrate_legacy_files
+
+# Copyright (c) 2024 Yesman Claude Project
+# Licensed under the MIT License
+
+"""Test the segment-based interaction store."""
+
+
+PANE_LINES = [f"● step {index}: updated libs/core/module_{index % 17}.py with {index % 5} additions" for index in range(400)]
+
+
+def _capture(frame: int) -> str:
+    """Simulate a 50-line pane that scrolls by one line per capture.
+
+    Returns:
+    The pane content.
+    """
+    return "\n".join([*PANE_LINES[frame : frame + 45], "", f"✻ Cogitating… ({frame}s · esc to interrupt)", ">", ""])
+
+
+def _fill(store: InteractionStore, count: int, start: float = 1000.0) -> None:
+    for index in range(count):
+        record_type = "raw_content" if index % 3 == 0 else "interaction"
+        store.append({"index": index, "content": "x" * 200}, record_type, timestamp=start + index)
+
+
+class TestInteractionStore:
+    def test_append_and_read_back(self, tmp_path: Path) -> None:
+        store = InteractionStore(tmp_path, compression="gzip")
+        _fill(store, 10)
+
+        assert [record["index"] for record in store.read()] == list(range(10))
+        assert [record["index"] for record in store.read(record_type="raw_content")] == [0, 3, 6, 9]
+
+    def test_segment_is_a_valid_ndjson_stream(self, tmp_path: Path) -> None:
+        store = InteractionStore(tmp_path, compression="gzip")
+        _fill(store, 5)
+        store.close()
+
+        (segment,) = tmp_path.glob("segment_*.jsonl.gz")
+        lines = gzip.decompress(segment.read_bytes()).decode("utf-8").splitlines()
+        assert [json.loads(line)["index"] for line in lines] == list(range(5))
+
+    def test_segments_rotate_by_size_and_age(self, tmp_path: Path) -> None:
+        store = InteractionStore(tmp_path, compression="gzip", max_segment_bytes=200)
+        _fill(store, 6)
+        assert store.stats()["segment_count"] > 1
+
+        store = InteractionStore(tmp_path / "aged", compression="gzip", max_segment_seconds=10)
+        _fill(store, 25)
+        assert store.stats()["segment_count"] == 3
+
+    def test_range_read_across_segments(self, tmp_path: Path) -> None:
+        store = InteractionStore(tmp_path, compression="gzip", max_segment_seconds=10)
+        _fill(store, 50)
+
+        records = list(store.read(start=1012.0, end=1031.5))
+        assert [record["index"] for record in records] == list(range(12, 32))
+
+    def test_out_of_order_append_starts_new_segment(self, tmp_path: Path) -> None:
+        store = InteractionStore(tmp_path, compression="gzip")
+        store.append({"index": 2}, "interaction", timestamp=2000.0)
+        store.append({"index": 1}, "interaction", timestamp=1000.0)
+
+        assert store.stats()["segment_count"] == 2
+        assert [record["index"] for record in store.read()] == [1, 2]
+
+    def test_remove_before_drops_whole_segments(self, tmp_path: Path) -> None:
+        store = InteractionStore(tmp_path, compression="gzip", max_segment_seconds=10)
+        _fill(store, 30)
+
+        assert store.remove_before(1015.0) == 10
+        assert store.stats()["total_records"] == 20
+        assert len(list(tmp_path.glob("segment_*.jsonl.gz"))) == 2
+        assert next(store.read())["index"] == 10
+
+    def test_stats_survive_reopen(self, tmp_path: Path) -> None:
+        store = InteractionStore(tmp_path, compression="gzip", max_segment_seconds=10)
+        _fill(store, 25)
+        expected = store.stats()
+        store.release()
+
+        reopened = InteractionStore(tmp_path, compression="gzip", max_segment_seconds=10)
+        assert reopened.stats() == expected
+
+        reopened.append({"index": 25}, "interaction", timestamp=1025.0)
+        assert [record["index"] for record in reopened.read(start=1020.0)] == list(range(20, 26))
+
+    def test_recovers_from_torn_write(self, tmp_path: Path) -> None:
+        store = InteractionStore(tmp_path, compression="gzip")
+        _fill(store, 3)
+        (segment,) = tmp_path.glob("segment_*.jsonl.gz")
+        with open(segment, "ab") as data_file:
+            data_file.write(b"\x1f\x8b partial")
+        del store
+
+        reopened = InteractionStore(tmp_path, compression="gzip")
+        reopened.append({"index": 3}, "interaction", timestamp=1003.0)
+
+        assert [record["index"] for record in reopened.read()] == [0, 1, 2, 3]
+
+    def test_second_store_on_directory_is_refused(self, tmp_path: Path) -> None:
+        store = InteractionStore(tmp_path, compression="gzip")
+        with pytest.raises(StoreLockedError):
+            InteractionStore(tmp_path, compression="gzip")
+        with pytest.raises(StoreLockedError):
+            migrate_legacy_files(tmp_path)
+
+        store.release()
+        InteractionStore(tmp_path, compression="gzip").release()
+
+    def test_rejects_unknown_compression(self, tmp_path: Path) -> None:
+        with pytest.raises(ValueError, match="Unsupported compression"):
+            InteractionStore(tmp_path, compression="lz4")
+
+
+class TestDeltaEncoding:
+    def test_line_delta_round_trip(self) -> None:
+        previous = _capture(0).split("\n")
+        current = _capture(3).split("\n")
+
+        operations = encode_line_delta(previous, current)
+
+        assert apply_line_delta(previous, operations) == current
+        assert sum(isinstance(operation, str) for operation in operations) == 4
+
+    def test_records_are_reconstructed(self, tmp_path: Path) -> None:
+        store = InteractionStore(tmp_path, compression="gzip", delta_field="content", keyframe_interval=8)
+        records = [{"frame": frame, "session_name": "s", "content": _capture(frame)} for frame in range(30)]
+        for frame, record in enumerate(records):
+            store.append(dict(record), "interaction", timestamp=1000.0 + frame)
+
+        assert list(store.read()) == records
+        # Range reads starting between keyframes decode from the previous keyframe
+        assert list(store.read(start=1013.0, end=1017.0)) == records[13:18]
+
+    def test_removed_fields_and_mixed_record_types(self, tmp_path: Path) -> None:
+        store = InteractionStore(tmp_path, compression="gzip", delta_field="content")
+        records = [
+            {"content": _capture(0), "prompt_info": {"type": "yn"}},
+            {"content": _capture(1), "record_type": "raw_content"},
+            {"content": _capture(2), "prompt_info": None},
+        ]
+        for index, record in enumerate(records):
+            store.append(dict(record), "raw_content" if "record_type" in record else "interaction", timestamp=1000.0 + index)
+
+        assert list(store.read()) == records
+        assert list(store.read(record_type="interaction")) == [records[0], records[2]]
+
+    def test_every_segment_starts_with_keyframe(self, tmp_path: Path) -> None:
+        store = InteractionStore(tmp_path, compression="gzip", delta_field="content", max_segment_seconds=10)
+        for frame in range(35):
+            store.append({"content": _capture(frame)}, "interaction", timestamp=1000.0 + frame)
+
+        assert store.remove_before(1015.0) == 10
+        assert [record["content"] for record in store.read()] == [_capture(frame) for frame in range(10, 35)]
+
+    def test_delta_store_is_much_smaller(self, tmp_path: Path) -> None:
+        full = InteractionStore(tmp_path / "full", compression="gzip")
+        delta = InteractionStore(tmp_path / "delta", compression="gzip", delta_field="content")
+        legacy_bytes = 0
+        for frame in range(300):
+            record = {"session_name": "s", "interaction_id": f"s_{frame:04d}", "content": _capture(frame), "prompt_info": None}
+            legacy_bytes += len(json.dumps(record, indent=2, ensure_ascii=False).encode("utf-8"))
+            full.append(dict(record), "interaction", timestamp=1000.0 + frame)
+            delta.append(dict(record), "interaction", timestamp=1000.0 + frame)
+
+        delta_bytes = delta.stats()["total_size_bytes"]
+        assert legacy_bytes / delta_bytes >= 10, f"Delta store only {legacy_bytes / delta_bytes:.1f}x smaller than one file per capture"
+        assert full.stats()["total_size_bytes"] / delta_bytes >= 2
+
+
+def test_migrate_legacy_files(tmp_path: Path) -> None:
+    """Legacy per-file records should be imported in timestamp order and removed."""
+    for second in (3, 1, 2):
+        prefix = "raw" if second == 2 else "interaction"
+        record = {"timestamp": f"2024-01-01T00:00:0{second}+00:00", "content": f"capture {second}"}
+        (tmp_path / f"{prefix}_20240101_00000{second}_abcdef0{second}.json").write_text(json.dumps(record, indent=2), encoding="utf-8")
+    (tmp_path / "interaction_broken.json").write_text("{not json", encoding="utf-8")
+
+    result = migrate_legacy_files(tmp_path)
+
+    assert result == {"migrated": 3, "failed": 1}
+    assert [path.name for path in tmp_path.glob("*.json") if path.name != "manifest.json"] == ["interaction_broken.json"]
+
+    store = InteractionStore(tmp_path)
+    assert [record["content"] for record in store.read()] == ["capture 1", "capture 2", "capture 3"]
+    assert store.stats()["record_counts"] == {"interaction": 2, "raw_content": 1}
@@ -0,0 +1,241 @@
+# Copyright notice.
+
+import asyncio
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+from libs.core.claude_monitor import ClaudeMonitor
+from libs.core.monitor_hub import BlockingLane, MonitorHub, TickStats
+
+# Copyright (c) 2024 Yesman Claude Project
+# Licensed under the MIT License
+
+"""Test the shared monitor scheduler."""
+
+
+class FakeMonitor:
+    """Minimal monitor that records which thread its loop ran on."""
+
+    def __init__(self, hub: MonitorHub, session_name: str) -> None:
+        self.hub = hub
+        self.session_name = session_name
+        self.thread_ids: set[int] = set()
+        self.cancelled = threading.Event()
+
+    async def _monitor_loop(self) -> None:
+        try:
+            while True:
+                started = time.perf_counter()
+                self.thread_ids.add(threading.get_ident())
+                await asyncio.sleep(0.01)
+                self.hub.record_tick(self.session_name, time.perf_counter() - started)
+        except asyncio.CancelledError:
+            self.cancelled.set()
+
+
+class TestMonitorHub:
+    def setup_method(self) -> None:
+        self.hub = MonitorHub()
+
+    def teardown_method(self) -> None:
+        self.hub.shutdown()
+
+    def test_sessions_share_one_event_loop_thread(self) -> None:
+        monitors = [FakeMonitor(self.hub, f"session-{i}") for i in range(5)]
+        for monitor in monitors:
+            assert self.hub.start_session(monitor)
+
+        time.sleep(0.1)
+
+        thread_ids = set().union(*(monitor.thread_ids for monitor in monitors))
+        assert len(thread_ids) == 1
+        assert self.hub.active_session_count == 5
+
+    def test_start_session_rejects_duplicates(self) -> None:
+        monitor = FakeMonitor(self.hub, "dup")
+
+        assert self.hub.start_session(monitor)
+        assert not self.hub.start_session(monitor)
+
+    def test_stop_session_cancels_monitor(self) -> None:
+        monitor = FakeMonitor(self.hub, "stop-me")
+        self.hub.start_session(monitor)
+        time.sleep(0.05)
+
+        assert self.hub.stop_session("stop-me")
+        assert monitor.cancelled.wait(timeout=1)
+        assert not self.hub.is_session_running("stop-me")
+        assert not self.hub.stop_session("stop-me")
+
+    def test_tick_stats_are_reported_per_session(self) -> None:
+        monitor = FakeMonitor(self.hub, "stats")
+        self.hub.start_session(monitor)
+        time.sleep(0.1)
+
+        stats = self.hub.get_tick_stats("stats")["stats"]
+        assert stats["ticks"] > 0
+        assert stats["max_ms"] >= stats["average_ms"] > 0
+
+    def test_analyzers_are_shared(self) -> None:
+        with (
+            patch("libs.core.monitor_hub.AdaptiveResponse") as mock_adaptive,
+            patch("libs.core.monitor_hub.AutomationManager") as mock_automation,
+            patch("libs.core.monitor_hub.HealthCalculator") as mock_health,
+        ):
+            first = [self.hub.adaptive_response, self.hub.automation_manager, self.hub.health_calculator]
+            second = [self.hub.adaptive_response, self.hub.automation_manager, self.hub.health_calculator]
+
+        assert first == second
+        mock_adaptive.assert_called_once()
+        mock_automation.assert_called_once()
+        mock_health.assert_called_once()
+
+    def test_claude_monitors_use_hub_analyzers(self) -> None:
+        hub = MagicMock()
+        monitors = []
+        for name in ("a", "b"):
+            session_manager = MagicMock()
+            session_manager.session_name = name
+            monitors.append(ClaudeMonitor(session_manager, MagicMock(), MagicMock(), hub=hub))
+
+        assert monitors[0].adaptive_response is monitors[1].adaptive_response is hub.adaptive_response
+        assert monitors[0].automation_manager is monitors[1].automation_manager
+
+
+class TestBlockingWork:
+    def setup_method(self) -> None:
+        self.hub = MonitorHub()
+
+    def teardown_method(self) -> None:
+        self.hub.shutdown()
+
+    def _run(self, coro: object) -> object:
+        return asyncio.run_coroutine_threadsafe(coro, self.hub.loop).result(timeout=5)
+
+    def test_blocking_calls_run_off_the_event_loop(self) -> None:
+        loop_thread = self._run(self._thread_id())
+        worker_thread = self._run(self.hub.run_blocking("s", "capture", "tmux", threading.get_ident))
+
+        assert worker_thread != loop_thread
+
+    def test_stage_timings_are_reported(self) -> None:
+        self._run(self.hub.run_blocking("s", "capture", "tmux", time.sleep, 0.01))
+        self.hub.record_tick("s", 0.02)
+
+        stats = self.hub.get_tick_stats("s")["s"]
+        assert stats["ticks"] == 1
+        assert stats["stages"]["capture"]["ticks"] == 1
+        assert stats["stages"]["capture"]["max_ms"] >= 10
+        assert self.hub.get_lane_stats()["tmux"]["completed"] == 1
+
+    def test_slow_disk_does_not_delay_tmux_calls(self) -> None:
+        release = threading.Event()
+
+        async def scenario() -> float:
+            # Saturate the disk lane with writes that block until released
+            for _ in range(10):
+                self.hub.submit_blocking("s", "collect", "disk", release.wait)
+            await asyncio.sleep(0.01)
+            started = time.perf_counter()
+            await self.hub.run_blocking("s", "capture", "tmux", lambda: None)
+            return time.perf_counter() - started
+
+        try:
+            assert self._run(scenario()) < 0.5
+            assert self.hub.get_lane_stats()["disk"]["pending"] == 8
+        finally:
+            release.set()
+
+    def test_background_failures_are_logged(self) -> None:
+        async def scenario() -> None:
+            task = self.hub.submit_blocking("s", "learn", "learning", self._fail)
+            await asyncio.gather(task, return_exceptions=True)
+            await asyncio.sleep(0)
+
+        with patch.object(self.hub.logger, "error") as mock_error:
+            self._run(scenario())
+
+        mock_error.assert_called_once()
+        assert not self.hub._background
+
+    def test_keyed_background_calls_are_coalesced(self) -> None:
+        release = threading.Event()
+
+        async def scenario() -> list[asyncio.Task]:
+            tasks = [self.hub.submit_blocking(f"s{index}", "patterns", "learning", release.wait, key="refresh") for index in range(3)]
+            await asyncio.sleep(0.01)
+            release.set()
+            await asyncio.gather(*tasks)
+            tasks.append(self.hub.submit_blocking("s0", "patterns", "learning", release.wait, key="refresh"))
+            await tasks[-1]
+            return tasks
+
+        tasks = self._run(scenario())
+
+        assert tasks[0] is tasks[1] is tasks[2]
+        assert tasks[3] is not tasks[0]
+        assert self.hub.get_lane_stats()["learning"]["completed"] == 2
+        assert not self.hub._keyed_background
+
+    def test_collection_keeps_only_latest_pending_capture(self) -> None:
+        release = threading.Event()
+        collected = []
+
+        def collect(content: str, prompt_dict: dict | None, _response: str | None) -> None:
+            release.wait()
+            collected.append(content)
+
+        session_manager = MagicMock()
+        session_manager.session_name = "s"
+        monitor = ClaudeMonitor(session_manager, MagicMock(), MagicMock(), hub=self.hub)
+        monitor.content_collector = MagicMock(collect_interaction=collect)
+        monitor._collection_task = None
+
+        async def scenario() -> None:
+            for index in range(5):
+                monitor._queue_collection(f"capture {index}", None)
+                await asyncio.sleep(0.01)
+            release.set()
+            while not monitor._collection_task.done():
+                await asyncio.sleep(0.01)
+
+        self._run(scenario())
+
+        assert collected == ["capture 0", "capture 4"]
+
+    @staticmethod
+    async def _thread_id() -> int:
+        return threading.get_ident()
+
+    @staticmethod
+    def _fail() -> None:
+        msg = "disk full"
+        raise OSError(msg)
+
+
+def test_blocking_lane_applies_backpressure() -> None:
+    async def scenario() -> BlockingLane:
+        lane = BlockingLane("test", max_workers=1, max_pending=1)
+        try:
+            await asyncio.gather(*(lane.run(time.sleep, 0.01) for _ in range(3)))
+        finally:
+            lane.shutdown()
+        return lane
+
+    lane = asyncio.run(scenario())
+
+    assert lane.completed == 3
+    assert lane.backpressure_waits == 2
+    assert lane.pending == 0
+
+
+def test_tick_stats_record() -> None:
+    stats = TickStats()
+    stats.record(0.002)
+    stats.record(0.004)
+
+    assert stats.ticks == 2
+    assert stats.max_seconds == 0.004
+    assert abs(stats.average_seconds - 0.003) < 1e-9
+    assert stats.to_dict()["last_ms"] == 4.0
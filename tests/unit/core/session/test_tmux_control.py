@@ -0,0 +1,186 @@
+# Copyright notice.
+
+import asyncio
+import shutil
+import subprocess
+import threading
+import uuid
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from libs.core.claude_monitor import ClaudeMonitor
+from libs.core.tmux_control import TmuxControlClient, TmuxControlMonitor, parse_notification, unescape_output
+
+# Copyright (c) 2024 Yesman Claude Project
+# Licensed under the MIT License
+
+"""Test tmux control-mode pane monitoring."""
+
+
+class TestControlProtocol:
+    def test_unescape_output_decodes_octal_escapes(self) -> None:
+        assert unescape_output(b"hi\\015\\012") == b"hi\r\n"
+        assert unescape_output(b"back\\134slash") == b"back\\slash"
+
+    def test_parse_output_notification(self) -> None:
+        notification = parse_notification(b"%output %3 Do you want to continue?\\015\\012\n")
+
+        assert notification is not None
+        assert notification.name == "output"
+        assert notification.args == ["%3"]
+        assert notification.data == b"Do you want to continue?\r\n"
+
+    def test_parse_other_notifications(self) -> None:
+        notification = parse_notification(b"%session-changed $0 main\n")
+
+        assert notification is not None
+        assert notification.name == "session-changed"
+        assert notification.args == ["$0", "main"]
+
+    def test_parse_ignores_plain_lines(self) -> None:
+        assert parse_notification(b"plain command reply\n") is None
+
+
+class TestTmuxControlMonitor:
+    def test_watch_falls_back_when_client_cannot_start(self) -> None:
+        monitor = TmuxControlMonitor("yesman-test")
+
+        with patch.object(TmuxControlClient, "start", return_value=False):
+            assert not monitor.watch("session", "%1", lambda _pane: None)
+
+        assert not monitor.is_watching("session")
+
+    def test_unwatch_closes_idle_connection(self) -> None:
+        monitor = TmuxControlMonitor("yesman-test")
+        callback = MagicMock()
+
+        with (
+            patch.object(TmuxControlClient, "start", return_value=True),
+            patch.object(TmuxControlClient, "stop") as mock_stop,
+        ):
+            assert monitor.watch("session", "%1", callback)
+            client = monitor.clients["session"]
+            client._dispatch("%1")
+            callback.assert_called_once_with("%1")
+
+            monitor.unwatch("session", "%1", callback)
+            mock_stop.assert_called_once()
+
+        assert "session" not in monitor.clients
+
+    def test_disconnected_client_is_not_watching(self) -> None:
+        monitor = TmuxControlMonitor("yesman-test")
+
+        with patch.object(TmuxControlClient, "start", return_value=True):
+            assert monitor.watch("session", "%1", lambda _pane: None)
+        client = monitor.clients["session"]
+        client._process = MagicMock(poll=MagicMock(return_value=None))
+        assert monitor.is_watching("session")
+
+        # Reader hit EOF but the tmux process has not exited yet
+        client.disconnected = True
+        assert not monitor.is_watching("session")
+
+    def test_for_server_returns_shared_instance(self) -> None:
+        assert TmuxControlMonitor.for_server("yesman-shared") is TmuxControlMonitor.for_server("yesman-shared")
+
+
+@pytest.mark.skipif(shutil.which("tmux") is None, reason="tmux not installed")
+def test_control_client_receives_pane_output() -> None:
+    """A real control client should report output written to the pane."""
+    socket_name = f"yesman-test-{uuid.uuid4().hex[:8]}"
+    tmux = ["tmux", "-L", socket_name]
+    subprocess.run([*tmux, "new-session", "-d", "-s", "ctl", "-x", "80", "-y", "24", "cat"], check=True)
+
+    try:
+        pane_id = subprocess.run(
+            [*tmux, "display-message", "-p", "-t", "ctl", "#{pane_id}"],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout.strip()
+
+        received = threading.Event()
+        client = TmuxControlClient("ctl", socket_name)
+        client.subscribe(pane_id, lambda _pane: received.set())
+        assert client.start()
+
+        try:
+            subprocess.run([*tmux, "send-keys", "-t", "ctl", "hello", "Enter"], check=True)
+            assert received.wait(timeout=5)
+        finally:
+            client.stop()
+
+        assert not client.is_alive
+    finally:
+        subprocess.run([*tmux, "kill-server"], check=False)
+
+
+class TestClaudeMonitorBackend:
+    def _make_monitor(self, backend: str) -> ClaudeMonitor:
+        session_manager = MagicMock()
+        session_manager.session_name = "test_session"
+        session_manager.get_claude_pane.return_value = MagicMock(pane_id="%1")
+
+        return ClaudeMonitor(session_manager, MagicMock(), MagicMock(), monitor_backend=backend, hub=MagicMock())
+
+    def test_polling_backend_never_uses_control_mode(self) -> None:
+        monitor = self._make_monitor("polling")
+
+        async def run() -> None:
+            with patch.object(TmuxControlMonitor, "watch") as mock_watch:
+                monitor._start_pane_watch()
+                mock_watch.assert_not_called()
+
+        asyncio.run(run())
+        assert monitor.active_backend == "polling"
+
+    def test_control_backend_falls_back_to_polling(self) -> None:
+        monitor = self._make_monitor("control")
+
+        async def run() -> None:
+            with patch.object(TmuxControlMonitor, "watch", return_value=False):
+                monitor._start_pane_watch()
+
+        asyncio.run(run())
+        assert monitor.active_backend == "polling"
+
+    def test_control_backend_wakes_on_pane_output(self) -> None:
+        monitor = self._make_monitor("control")
+        monitor.CONTROL_HEARTBEAT_INTERVAL = 0.05
+
+        async def run() -> tuple[bool, bool]:
+            with (
+                patch.object(TmuxControlMonitor, "watch", return_value=True),
+                patch.object(TmuxControlMonitor, "is_watching", return_value=True),
+            ):
+                monitor._start_pane_watch()
+                # Initial capture happens immediately
+                first = await monitor._wait_for_pane_change()
+                # No output afterwards: heartbeat only
+                second = await monitor._wait_for_pane_change()
+                return first, second
+
+        first, second = asyncio.run(run())
+        assert monitor.active_backend == "control"
+        assert first
+        assert not second
+
+    def test_control_backend_falls_back_on_heartbeat_after_disconnect(self) -> None:
+        monitor = self._make_monitor("control")
+        monitor.CONTROL_HEARTBEAT_INTERVAL = 0.05
+
+        async def run() -> bool:
+            with (
+                patch.object(TmuxControlMonitor, "watch", return_value=True),
+                patch.object(TmuxControlMonitor, "unwatch"),
+                patch.object(TmuxControlMonitor, "is_watching", return_value=False),
+            ):
+                monitor._start_pane_watch()
+                # The disconnect wake-up was consumed by an earlier wait
+                monitor._pane_changed.clear()
+                return await monitor._wait_for_pane_change()
+
+        assert asyncio.run(run())
+        assert monitor.active_backend == "polling"
@@ -0,0 +1,138 @@
+# Copyright notice.
+
+import shutil
+import subprocess
+import uuid
+from unittest.mock import MagicMock
+
+import libtmux
+import pytest
+
+from libs.tmux_snapshot import FIELD_SEPARATOR, PANE_FORMAT_FIELDS, PaneSnapshot, TmuxSnapshot
+
+# Copyright (c) 2024 Yesman Claude Project
+# Licensed under the MIT License
+
+"""Test bulk tmux snapshots and batched pane capture."""
+
+
+def _format_line(**overrides: str) -> str:
+    values = dict.fromkeys(PANE_FORMAT_FIELDS, "")
+    values.update(
+        session_name="proj",
+        session_id="$0",
+        window_id="@0",
+        window_index="0",
+        window_name="main",
+        window_active="1",
+        pane_id="%0",
+        pane_index="0",
+        pane_pid="1234",
+        pane_current_command="claude",
+        pane_activity="1700000000",
+        pane_active="1",
+        pane_width="80",
+        pane_height="24",
+    )
+    values.update(overrides)
+    return FIELD_SEPARATOR.join(values[name] for name in PANE_FORMAT_FIELDS)
+
+
+class TestPaneSnapshot:
+    def test_from_format_line(self) -> None:
+        pane = PaneSnapshot.from_format_line(_format_line())
+
+        assert pane is not None
+        assert pane.pane_id == "%0"
+        assert pane.pane_pid == 1234
+        assert pane.pane_activity == 1700000000
+        assert pane.pane_active
+        assert pane.pane_width == 80
+
+    def test_pane_activity_falls_back_to_window_activity(self) -> None:
+        pane = PaneSnapshot.from_format_line(_format_line(pane_activity="", window_activity="1700000100"))
+
+        assert pane.pane_activity == 1700000100
+
+    def test_malformed_line_is_ignored(self) -> None:
+        assert PaneSnapshot.from_format_line("not a pane line") is None
+
+
+class TestTmuxSnapshot:
+    def test_take_uses_single_list_panes_call(self) -> None:
+        server = MagicMock()
+        server.cmd.return_value = MagicMock(
+            returncode=0,
+            stdout=[
+                _format_line(pane_id="%0"),
+                _format_line(pane_id="%1", window_index="1", window_name="logs"),
+                _format_line(pane_id="%2", session_name="other"),
+            ],
+        )
+
+        snapshot = TmuxSnapshot.take(server)
+
+        server.cmd.assert_called_once()
+        assert server.cmd.call_args.args[:2] == ("list-panes", "-a")
+        assert snapshot.session_names == {"proj", "other"}
+        assert list(snapshot.windows_for_session("proj")) == ["0", "1"]
+
+        info = snapshot.session_dict("proj")
+        assert info["exists"]
+        assert [window["window_name"] for window in info["windows"]] == ["main", "logs"]
+        assert snapshot.session_dict("missing") == {"exists": False, "session_name": "missing"}
+
+    def test_capture_batches_panes_into_one_command(self) -> None:
+        server = MagicMock()
+        snapshot = TmuxSnapshot(server=server)
+
+        def fake_cmd(*args: str) -> MagicMock:
+            marker = args[args.index("display-message") + 2]
+            targets = [args[i + 1] for i, arg in enumerate(args) if arg == "-t"]
+            stdout: list[str] = []
+            for target in targets:
+                stdout.extend([f"content of {target}", marker])
+            return MagicMock(returncode=0, stdout=stdout)
+
+        server.cmd.side_effect = fake_cmd
+
+        contents = snapshot.capture(["%0", "%1", "%2"])
+
+        server.cmd.assert_called_once()
+        assert contents == {pane: [f"content of {pane}"] for pane in ["%0", "%1", "%2"]}
+
+        # Already captured panes are served from the snapshot
+        snapshot.capture(["%1"])
+        server.cmd.assert_called_once()
+
+    def test_capture_falls_back_to_single_panes_on_failure(self) -> None:
+        server = MagicMock()
+        server.cmd.side_effect = [
+            MagicMock(returncode=1, stdout=[], stderr=["can't find pane: %9"]),
+            MagicMock(returncode=0, stdout=["first"]),
+            MagicMock(returncode=0, stdout=["second"]),
+        ]
+        snapshot = TmuxSnapshot(server=server)
+
+        contents = snapshot.capture(["%0", "%9"])
+
+        assert contents == {"%0": ["first"], "%9": ["second"]}
+        assert server.cmd.call_count == 3
+
+
+@pytest.mark.skipif(shutil.which("tmux") is None, reason="tmux not installed")
+def test_snapshot_against_real_tmux() -> None:
+    socket_name = f"yesman-test-{uuid.uuid4().hex[:8]}"
+    tmux = ["tmux", "-L", socket_name]
+    subprocess.run([*tmux, "new-session", "-d", "-s", "snap", "-x", "80", "-y", "24"], check=True)
+    subprocess.run([*tmux, "split-window", "-t", "snap"], check=True)
+
+    try:
+        snapshot = TmuxSnapshot.take(libtmux.Server(socket_name=socket_name))
+        panes = snapshot.panes_for_session("snap")
+        assert len(panes) == 2
+
+        contents = snapshot.capture(pane.pane_id for pane in panes)
+        assert set(contents) == {pane.pane_id for pane in panes}
+    finally:
+        subprocess.run([*tmux, "kill-server"], check=False)
@@ -0,0 +1,121 @@
+# Copyright notice.
+
+import threading
+import time
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+from libs.core.models import SessionInfo
+from libs.core.session_snapshot import SessionSnapshotService, etag_matches
+
+# Copyright (c) 2024 Yesman Claude Project
+# Licensed under the MIT License
+
+"""Test the shared session snapshot service."""
+
+
+def _session(name: str, exists: bool = True) -> SessionInfo:  # noqa: FBT001, FBT002
+    return SessionInfo(
+        project_name=name,
+        session_name=name,
+        template="none",
+        exists=exists,
+        status="running" if exists else "stopped",
+        windows=[],
+        controller_status="unknown",
+    )
+
+
+class FakeSessionManager:
+    """Session manager stand-in that counts tmux queries."""
+
+    def __init__(self, sessions_path: Path) -> None:
+        self.tmux_manager = Mock(sessions_path=sessions_path)
+        self.tmux_manager.load_projects.side_effect = lambda: {"sessions": {path.stem: {} for path in sessions_path.glob("*.yaml")}}
+        self.calls = 0
+        self.delay = 0.0
+        self.exists = True
+
+    def get_all_sessions(self, projects: dict[str, object] | None = None) -> list[SessionInfo]:
+        self.calls += 1
+        time.sleep(self.delay)
+        return [_session(name, self.exists) for name in sorted(projects)]
+
+
+@pytest.fixture
+def manager(tmp_path: Path) -> FakeSessionManager:
+    (tmp_path / "alpha.yaml").write_text("{}\n", encoding="utf-8")
+    return FakeSessionManager(tmp_path)
+
+
+class TestSessionSnapshotService:
+    def test_callers_share_one_refresh_per_interval(self, manager: FakeSessionManager) -> None:
+        service = SessionSnapshotService(manager, max_age=60)
+
+        snapshots = [service.get() for _ in range(50)]
+
+        assert manager.calls == 1
+        assert all(snapshot is snapshots[0] for snapshot in snapshots)
+        assert [session.session_name for session in snapshots[0].sessions] == ["alpha"]
+
+    def test_concurrent_stale_callers_wait_for_a_single_refresh(self, manager: FakeSessionManager) -> None:
+        manager.delay = 0.05
+        service = SessionSnapshotService(manager, max_age=60)
+        results = []
+
+        threads = [threading.Thread(target=lambda: results.append(service.get())) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert manager.calls == 1
+        assert len({id(snapshot) for snapshot in results}) == 1
+
+    def test_etag_and_version_follow_content(self, manager: FakeSessionManager) -> None:
+        service = SessionSnapshotService(manager, max_age=60)
+        first = service.get()
+
+        same = service.get(max_age=0)
+        assert same is not first
+        assert (same.etag, same.version) == (first.etag, first.version)
+
+        manager.exists = False
+        service.invalidate()
+        changed = service.get()
+        assert changed.etag != first.etag
+        assert changed.version == first.version + 1
+        assert changed.get("alpha").status == "stopped"
+        assert changed.get("missing") is None
+
+    def test_projects_are_reloaded_only_when_files_change(self, manager: FakeSessionManager, tmp_path: Path) -> None:
+        service = SessionSnapshotService(manager, max_age=0)
+        service.get()
+        service.get()
+        assert service.stats["project_loads"] == 1
+
+        (tmp_path / "beta.yaml").write_text("{}\n", encoding="utf-8")
+        snapshot = service.get()
+
+        assert service.stats["project_loads"] == 2
+        assert [session.session_name for session in snapshot.sessions] == ["alpha", "beta"]
+
+    @pytest.mark.asyncio
+    async def test_get_async(self, manager: FakeSessionManager) -> None:
+        service = SessionSnapshotService(manager, max_age=60)
+
+        first = await service.get_async()
+        second = await service.get_async()
+
+        assert first is second
+        assert manager.calls == 1
+
+
+def test_etag_matches() -> None:
+    assert etag_matches('"abc"', '"abc"')
+    assert etag_matches('"abc"', 'W/"abc", "def"')
+    assert etag_matches('"abc"', "*")
+    assert not etag_matches('"abc"', '"def"')
+    assert not etag_matches('"abc"', None)
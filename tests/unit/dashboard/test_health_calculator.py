@@ -0,0 +1,192 @@
+# Copyright notice.
+
+import asyncio
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from libs.dashboard.health_calculator import CategorySchedule, HealthCalculator, HealthCategory, HealthMetric
+
+# Copyright (c) 2024 Yesman Claude Project
+# Licensed under the MIT License
+
+"""Test concurrent, per-category health assessment."""
+
+
+class FakeAssessors:
+    """Replaces the assessment coroutines with slow fakes that count calls."""
+
+    def __init__(self, calculator: HealthCalculator, delay: float = 0.0) -> None:
+        self.calls: dict[HealthCategory, int] = dict.fromkeys(HealthCategory, 0)
+        self.delays = dict.fromkeys(HealthCategory, delay)
+        calculator._assessors = {category: self._assessor(category) for category in HealthCategory}
+
+    def _assessor(self, category: HealthCategory) -> object:
+        async def assess() -> list[HealthMetric]:
+            self.calls[category] += 1
+            await asyncio.sleep(self.delays[category])
+            return [HealthMetric(category=category, name=category.value, score=50 + self.calls[category])]
+
+        return assess
+
+
+@pytest.fixture
+def calculator(tmp_path: Path) -> HealthCalculator:
+    (tmp_path / "main.py").write_text('"""Module."""\n', encoding="utf-8")
+    return HealthCalculator(project_path=tmp_path)
+
+
+class TestHealthCalculator:
+    def test_categories_are_assessed_concurrently(self, calculator: HealthCalculator) -> None:
+        fakes = FakeAssessors(calculator, delay=0.2)
+
+        started = time.perf_counter()
+        health = asyncio.run(calculator.calculate_health())
+        elapsed = time.perf_counter() - started
+
+        assert elapsed < 0.2 * len(HealthCategory) / 2
+        assert [metric.category for metric in health.metrics] == list(HealthCategory)
+        assert all(count == 1 for count in fakes.calls.values())
+
+    def test_partial_results_are_streamed(self, calculator: HealthCalculator) -> None:
+        fakes = FakeAssessors(calculator)
+        fakes.delays[HealthCategory.TESTS] = 0.3
+
+        async def collect() -> list[set[HealthCategory]]:
+            return [{metric.category for metric in health.metrics} async for health in calculator.stream_health()]
+
+        snapshots = asyncio.run(collect())
+
+        assert len(snapshots) == len(HealthCategory)
+        assert HealthCategory.TESTS not in snapshots[-2]
+        assert snapshots[-1] == set(HealthCategory)
+
+    def test_fresh_categories_are_served_from_cache(self, calculator: HealthCalculator) -> None:
+        fakes = FakeAssessors(calculator)
+        asyncio.run(calculator.calculate_health())
+
+        # Git is due again, everything else is still fresh
+        calculator._results[HealthCategory.GIT].last_updated -= calculator.SCHEDULES[HealthCategory.GIT].refresh_interval
+        health = asyncio.run(calculator.calculate_health())
+
+        assert fakes.calls[HealthCategory.GIT] == 2
+        assert fakes.calls[HealthCategory.BUILD] == 1
+        assert len(health.metrics) == len(HealthCategory)
+
+    def test_build_and_tests_rerun_when_sources_change(self, calculator: HealthCalculator) -> None:
+        fakes = FakeAssessors(calculator)
+        calculator.TREE_SCAN_INTERVAL = 0
+        asyncio.run(calculator.calculate_health())
+        asyncio.run(calculator.calculate_health())
+        assert fakes.calls[HealthCategory.BUILD] == 1
+
+        (calculator.project_path / "feature.py").write_text("x = 1\n", encoding="utf-8")
+        # Output written by builds and test runs does not count as a change
+        (calculator.project_path / "__pycache__").mkdir()
+        (calculator.project_path / "__pycache__" / "cached.py").write_text("", encoding="utf-8")
+        asyncio.run(calculator.calculate_health())
+
+        assert fakes.calls[HealthCategory.BUILD] == 2
+        assert fakes.calls[HealthCategory.TESTS] == 2
+        assert fakes.calls[HealthCategory.DEPENDENCIES] == 1
+
+        (calculator.project_path / "__pycache__" / "other.py").write_text("", encoding="utf-8")
+        asyncio.run(calculator.calculate_health())
+        assert fakes.calls[HealthCategory.BUILD] == 2
+
+    def test_source_tree_is_walked_at_most_once_per_interval(self, calculator: HealthCalculator) -> None:
+        FakeAssessors(calculator)
+        with patch("libs.dashboard.health_calculator.os.walk", side_effect=lambda path: iter([(str(path), [], ["main.py"])])) as mock_walk:
+            asyncio.run(calculator.calculate_health())
+            asyncio.run(calculator.calculate_health())
+            assert mock_walk.call_count == 1
+
+            asyncio.run(calculator.calculate_health(force_refresh=True))
+            assert mock_walk.call_count == 2
+
+    def test_timed_out_category_keeps_previous_metrics(self, calculator: HealthCalculator, monkeypatch: pytest.MonkeyPatch) -> None:
+        fakes = FakeAssessors(calculator)
+        asyncio.run(calculator.calculate_health())
+
+        schedules = dict(calculator.SCHEDULES)
+        schedules[HealthCategory.GIT] = CategorySchedule(refresh_interval=0, timeout=0.05)
+        monkeypatch.setattr(calculator, "SCHEDULES", schedules)
+        fakes.delays[HealthCategory.GIT] = 1.0
+
+        health = asyncio.run(calculator.calculate_health())
+
+        git_metrics = [metric for metric in health.metrics if metric.category == HealthCategory.GIT]
+        assert [metric.score for metric in git_metrics] == [51]
+        assert calculator.get_category_status()["git"]["timed_out"]
+
+    def test_force_refresh_reassesses_everything(self, calculator: HealthCalculator) -> None:
+        fakes = FakeAssessors(calculator)
+        asyncio.run(calculator.calculate_health())
+        asyncio.run(calculator.calculate_health(force_refresh=True))
+
+        assert all(count == 2 for count in fakes.calls.values())
+
+
+class TestRunCommand:
+    def test_command_does_not_block_the_event_loop(self, calculator: HealthCalculator) -> None:
+        async def scenario() -> tuple[tuple[int, str] | None, int]:
+            ticks = 0
+
+            async def ticker() -> None:
+                nonlocal ticks
+                while True:
+                    ticks += 1
+                    await asyncio.sleep(0.01)
+
+            ticker_task = asyncio.create_task(ticker())
+            result = await calculator._run_command(["sh", "-c", "sleep 0.3; echo done"], timeout=5)
+            ticker_task.cancel()
+            return result, ticks
+
+        result, ticks = asyncio.run(scenario())
+
+        assert result == (0, "done\n")
+        assert ticks >= 10
+
+    def test_command_is_killed_on_timeout(self, calculator: HealthCalculator) -> None:
+        started = time.perf_counter()
+        result = asyncio.run(calculator._run_command(["sleep", "5"], timeout=0.1))
+
+        assert result is None
+        assert time.perf_counter() - started < 2
+
+    def test_missing_command(self, calculator: HealthCalculator) -> None:
+        assert asyncio.run(calculator._run_command(["yesman-no-such-command"], timeout=1)) is None
+
+
+def test_git_health_uses_async_subprocesses(tmp_path: Path) -> None:
+    calculator = HealthCalculator(project_path=tmp_path)
+    (tmp_path / ".git").mkdir()
+    outputs = {"status": (0, " M a.py\n?? b.py\n"), "log": (0, "abc first\ndef second\n")}
+
+    async def fake_run(cmd: list[str], timeout: float) -> tuple[int, str]:
+        return outputs[cmd[1]]
+
+    calculator._run_command = fake_run
+    metrics = asyncio.run(calculator._assess_git_health())
+
+    assert {metric.name: metric.details for metric in metrics} == {
+        "Git Status": {"uncommitted_files": 2},
+        "Recent Activity": {"recent_commits": 2},
+    }
+
+
+def test_code_documentation_uses_the_source_index(tmp_path: Path) -> None:
+    (tmp_path / "documented.py").write_text('"""Module."""\n', encoding="utf-8")
+    (tmp_path / "plain.py").write_text("x = 1\n", encoding="utf-8")
+    (tmp_path / "node_modules").mkdir()
+    (tmp_path / "node_modules" / "vendored.js").write_text("var x;\n", encoding="utf-8")
+    calculator = HealthCalculator(project_path=tmp_path)
+
+    assert asyncio.run(calculator._assess_code_documentation()) == 50
+
+    with patch("libs.source_index.Path.read_text") as mock_read:
+        assert asyncio.run(calculator._assess_code_documentation()) == 50
+    mock_read.assert_not_called()
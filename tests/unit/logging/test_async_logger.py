@@ -0,0 +1,148 @@
+# Copyright notice.
+
+import asyncio
+import logging
+import timeit
+from pathlib import Path
+
+import pytest
+
+from libs.logging.async_logger import AsyncLogger, AsyncLoggerConfig, LogEntry, LogLevel
+
+# Copyright (c) 2024 Yesman Claude Project
+# Licensed under the MIT License
+
+"""Test the AsyncLogger hot path."""
+
+
+@pytest.fixture
+def async_logger(tmp_path: Path) -> AsyncLogger:
+    config = AsyncLoggerConfig(
+        name="yesman.test_async_logger",
+        level=LogLevel.INFO,
+        max_queue_size=100_000,
+        enable_console=False,
+        enable_batch_processor=False,
+        output_dir=tmp_path,
+    )
+    return AsyncLogger(config)
+
+
+def _drain(async_logger: AsyncLogger) -> list[LogEntry]:
+    entries = []
+    while not async_logger.log_queue.empty():
+        entries.append(async_logger.log_queue.get_nowait())
+    return entries
+
+
+class Unprintable:
+    def __str__(self) -> str:
+        raise AssertionError("formatted eagerly")
+
+
+class TestAsyncLogger:
+    def test_filtered_levels_are_not_queued(self, async_logger: AsyncLogger) -> None:
+        async_logger.debug("hidden %s", Unprintable())
+        async_logger.log(LogLevel.TRACE, "hidden")
+
+        assert async_logger.log_queue.empty()
+        assert async_logger.stats["entries_queued"] == 0
+
+        async_logger.set_level(LogLevel.DEBUG)
+        async_logger.debug("shown")
+        assert [entry.get_message() for entry in _drain(async_logger)] == ["shown"]
+
+    def test_formatting_is_deferred_to_the_consumer(self, async_logger: AsyncLogger) -> None:
+        argument = Unprintable()
+        async_logger.info("value: %s", argument)
+
+        (entry,) = _drain(async_logger)
+        assert entry.args == (argument,)
+        assert LogEntry(LogLevel.INFO, "%d of %d", (3, 5)).get_message() == "3 of 5"
+        assert LogEntry(LogLevel.INFO, "no placeholders", (1,)).get_message() == "no placeholders (1,)"
+
+    def test_call_site_points_at_the_caller(self, async_logger: AsyncLogger) -> None:
+        def wrapper(message: str) -> None:
+            async_logger.log(LogLevel.INFO, message, stacklevel=2)
+
+        async_logger.info("direct")
+        wrapper("wrapped")
+
+        direct, wrapped = _drain(async_logger)
+        assert direct.module == __name__
+        assert direct.function == "test_call_site_points_at_the_caller"
+        assert wrapped.function == "test_call_site_points_at_the_caller"
+        assert wrapped.line_number == direct.line_number + 1
+
+    def test_call_sites_are_cached(self, async_logger: AsyncLogger) -> None:
+        for _ in range(3):
+            async_logger.info("repeated")
+
+        first, *rest = _drain(async_logger)
+        assert all(entry.call_site is first.call_site for entry in rest)
+
+    def test_call_site_capture_can_be_disabled(self, async_logger: AsyncLogger) -> None:
+        async_logger.config.capture_call_site = False
+        async_logger.info("anonymous")
+
+        (entry,) = _drain(async_logger)
+        assert entry.call_site is None
+        assert entry.to_dict()["function"] == ""
+
+    def test_exception_is_formatted_lazily(self, async_logger: AsyncLogger) -> None:
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            async_logger.error("failed")
+        async_logger.error("no exception")
+
+        with_exception, without_exception = _drain(async_logger)
+        assert with_exception.exc_info is not None
+        assert "ValueError: boom" in with_exception.to_dict()["exception_info"]
+        assert with_exception.exc_info is None
+        assert without_exception.exception_info is None
+
+    def test_full_queue_drops_oldest_entry(self, async_logger: AsyncLogger) -> None:
+        async_logger.log_queue = asyncio.Queue(maxsize=2)
+        for index in range(4):
+            async_logger.info("entry %d", index)
+
+        assert [entry.get_message() for entry in _drain(async_logger)] == ["entry 2", "entry 3"]
+        assert async_logger.stats["entries_dropped"] == 2
+        assert async_logger.stats["queue_full_events"] == 2
+
+    def test_standard_logger_output(self, async_logger: AsyncLogger, caplog: pytest.LogCaptureFixture) -> None:
+        async_logger.info("saved %s", "file.py", size=10)
+        (entry,) = _drain(async_logger)
+
+        with caplog.at_level(logging.INFO, logger=async_logger.config.name):
+            asyncio.run(async_logger._log_to_standard(entry))
+
+        assert caplog.messages == ["saved file.py | size=10"]
+
+
+def _calls_per_second(func: object, count: int = 20_000) -> float:
+    return count / min(timeit.repeat(func, number=count, repeat=3))
+
+
+def test_log_call_benchmark(async_logger: AsyncLogger) -> None:
+    """Filtered calls should be nearly free and errors no dearer than info calls."""
+
+    def info() -> None:
+        async_logger.info("processed item", index=1)
+
+    def debug() -> None:
+        async_logger.debug("processed item", index=1)
+
+    def error() -> None:
+        async_logger.error("failed item", index=1)
+
+    info_rate = _calls_per_second(info)
+    filtered_rate = _calls_per_second(debug)
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        error_rate = _calls_per_second(error)
+
+    assert filtered_rate >= 5 * info_rate, f"Filtered calls only {filtered_rate / info_rate:.1f}x faster than enabled calls"
+    assert error_rate >= info_rate / 2, f"Error calls {info_rate / error_rate:.1f}x slower than info calls"
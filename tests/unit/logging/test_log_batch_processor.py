@@ -0,0 +1,149 @@
+# Copyright notice.
+
+import asyncio
+import gzip
+import json
+import os
+import threading
+from pathlib import Path
+
+import pytest
+
+from libs.logging.batch_processor import BatchProcessor
+from libs.logging.log_sink import StreamingLogSink, iter_json_lines
+
+# Copyright (c) 2024 Yesman Claude Project
+# Licensed under the MIT License
+
+"""Test the streaming log sink and the batch processor built on it."""
+
+
+def _line(index: int) -> bytes:
+    return (json.dumps({"index": index, "message": f"entry {index} " + "x" * 40}) + "\n").encode("utf-8")
+
+
+class TestStreamingLogSink:
+    def test_lines_are_appended_to_one_gzip_stream(self, tmp_path: Path) -> None:
+        sink = StreamingLogSink(tmp_path)
+        for index in range(50):
+            sink.write(_line(index))
+        sink.close()
+
+        (log_file,) = tmp_path.glob("yesman_logs_*.jsonl.gz")
+        lines = gzip.decompress(log_file.read_bytes()).decode("utf-8").splitlines()
+        assert [json.loads(line)["index"] for line in lines] == list(range(50))
+        assert sink.get_statistics()["compression_ratio"] < 1.0
+
+    def test_io_runs_on_the_writer_thread(self, tmp_path: Path) -> None:
+        sink = StreamingLogSink(tmp_path)
+        threads = []
+        original = sink._write
+        sink._write = lambda payload: threads.append(threading.current_thread().name) or original(payload)
+
+        sink.write(_line(0)).result(timeout=5)
+        sink.close()
+
+        assert threads == ["yesman-log-writer"]
+
+    def test_flushed_data_is_readable_while_open(self, tmp_path: Path) -> None:
+        sink = StreamingLogSink(tmp_path, flush_interval=60.0)
+        for index in range(10):
+            sink.write(_line(index))
+        sink.flush().result(timeout=5)
+
+        assert [record["index"] for record in iter_json_lines(sink.current_file)] == list(range(10))
+        sink.close()
+
+    def test_rotates_on_size(self, tmp_path: Path) -> None:
+        sink = StreamingLogSink(tmp_path, compression=None, max_file_size=200)
+        for index in range(10):
+            sink.write(_line(index))
+            sink.flush()
+        sink.close()
+
+        files = sorted(tmp_path.glob("yesman_logs_*.jsonl"), key=lambda path: path.stat().st_mtime_ns)
+        assert len(files) > 1
+        assert sink.stats["files_created"] == len(files)
+        records = [record["index"] for path in files for record in iter_json_lines(path)]
+        assert sorted(records) == list(range(10))
+
+    def test_rotates_on_age(self, tmp_path: Path) -> None:
+        sink = StreamingLogSink(tmp_path, max_file_age=0.0)
+        for index in range(3):
+            sink.write(_line(index)).result(timeout=5)
+        sink.close()
+
+        assert len(list(tmp_path.glob("yesman_logs_*.jsonl.gz"))) == 3
+
+    def test_torn_tail_is_ignored(self, tmp_path: Path) -> None:
+        sink = StreamingLogSink(tmp_path, flush_interval=60.0)
+        for index in range(5):
+            sink.write(_line(index))
+        sink.flush().result(timeout=5)
+        # Incompressible lines written after the flush point partly reach the
+        # disk without a flush, as they would when the process crashes
+        for _ in range(20):
+            future = sink.write((json.dumps({"noise": os.urandom(2048).hex()}) + "\n").encode("utf-8"))
+        future.result(timeout=5)
+
+        assert sink.current_file_size > 0
+        indexes = [record["index"] for record in iter_json_lines(sink.current_file) if "index" in record]
+        assert indexes == list(range(5))
+        sink.close()
+
+    def test_closed_sink_rejects_writes(self, tmp_path: Path) -> None:
+        sink = StreamingLogSink(tmp_path)
+        sink.close()
+
+        with pytest.raises(RuntimeError, match="closed"):
+            sink.write(_line(0)).result(timeout=5)
+
+    def test_rejects_unknown_compression(self, tmp_path: Path) -> None:
+        with pytest.raises(ValueError, match="Unsupported compression"):
+            StreamingLogSink(tmp_path, compression="lz4")
+
+
+class TestBatchProcessor:
+    def test_batches_are_streamed_and_read_back(self, tmp_path: Path) -> None:
+        processor = BatchProcessor(max_batch_size=10, output_dir=tmp_path)
+
+        async def run() -> None:
+            await processor.start()
+            for index in range(35):
+                processor.add_entry({"index": index})
+            await processor.stop()
+
+        asyncio.run(run())
+
+        (log_file,) = tmp_path.glob("yesman_logs_*.jsonl.gz")
+        batches = asyncio.run(processor.read_batch_file(log_file))
+        assert [len(batch.entries) for batch in batches] == [10, 10, 10, 5]
+        assert [entry["index"] for batch in processor.iter_batch_file(log_file) for entry in batch.entries] == list(range(35))
+        assert processor.stats["files_created"] == 1
+        assert processor.stats["bytes_written"] == log_file.stat().st_size
+
+    def test_failed_write_requeues_entries(self, tmp_path: Path) -> None:
+        processor = BatchProcessor(max_batch_size=10, output_dir=tmp_path)
+        for index in range(3):
+            processor.add_entry({"index": index})
+
+        async def run() -> None:
+            processor._get_sink().close()
+            await processor._flush_pending_entries()
+
+        asyncio.run(run())
+
+        assert [entry["index"] for entry in processor.pending_entries] == [0, 1, 2]
+
+    def test_uncompressed_output(self, tmp_path: Path) -> None:
+        processor = BatchProcessor(output_dir=tmp_path, compression_enabled=False)
+        processor.add_entry({"message": "plain"})
+
+        async def run() -> None:
+            await processor._flush_pending_entries()
+            await processor._close_sink()
+
+        asyncio.run(run())
+
+        (log_file,) = tmp_path.glob("yesman_logs_*.jsonl")
+        assert json.loads(log_file.read_text(encoding="utf-8"))["entries"][0]["message"] == "plain"
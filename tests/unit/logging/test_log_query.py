@@ -0,0 +1,183 @@
+# Copyright notice.
+
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from libs.logging.log_query import LogFilter, LogQueryService, parse_log_line
+
+# Copyright (c) 2024 Yesman Claude Project
+# Licensed under the MIT License
+
+"""Test reverse-reading log queries and the sparse block index."""
+
+BASE_TIME = time.time() - 100_000
+
+
+def _line(index: int, level: str = "INFO", source: str | None = None) -> str:
+    timestamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(BASE_TIME + index))
+    return f"{timestamp},000 - {source or f'yesman.module{index % 3}'} - {level} - message {index} " + "x" * (index % 90)
+
+
+def _write_log(path: Path, count: int, error_every: int = 1000) -> list[str]:
+    lines = []
+    for index in range(count):
+        lines.append(_line(index, "ERROR" if index % error_every == 7 else "INFO"))
+        if index % 250 == 0:
+            lines.append("    continuation without a timestamp")
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return lines
+
+
+def _reference(lines: list[str]) -> list[str]:
+    return [line.strip() for line in reversed(lines)]
+
+
+@pytest.fixture
+def log_file(tmp_path: Path) -> Path:
+    return tmp_path / "yesman.log"
+
+
+def _all_pages(service: LogQueryService, files: list[Path], limit: int, **filters: str) -> list[str]:
+    raws, cursor = [], None
+    while True:
+        page = service.query(files, limit=limit, cursor=cursor, **filters)
+        raws.extend(entry.raw for entry in page.entries)
+        cursor = page.next_cursor
+        if cursor is None:
+            return raws
+
+
+class TestParseLogLine:
+    def test_formats(self) -> None:
+        bracketed = parse_log_line("[2025-07-10 14:22:01] [ERROR] [api] request failed")
+        assert (bracketed.level, bracketed.source, bracketed.message) == ("error", "api", "request failed")
+        assert bracketed.time is not None
+
+        standard = parse_log_line("2025-07-10 14:22:01,161 - yesman.monitor - WARNING - slow capture")
+        assert (standard.level, standard.source, standard.message) == ("warning", "yesman.monitor", "slow capture")
+
+        simple = parse_log_line("[2025-07-10T14:22:01] [DEBUG] polling")
+        assert (simple.level, simple.source) == ("debug", "yesman")
+
+        structured = parse_log_line('{"timestamp": 1752157321.0, "level": "ERROR", "logger_name": "async", "message": "boom"}')
+        assert (structured.level, structured.source, structured.time) == ("error", "async", 1752157321.0)
+
+        unstructured = parse_log_line("plain text")
+        assert (unstructured.level, unstructured.source, unstructured.time) == ("info", "unknown", None)
+        assert parse_log_line("   ") is None
+
+
+class TestLogQueryService:
+    def test_newest_entries_first(self, log_file: Path) -> None:
+        lines = _write_log(log_file, 2000)
+        service = LogQueryService(log_file.parent, block_size=4096)
+
+        page = service.query([log_file], limit=20)
+
+        assert [entry.raw for entry in page.entries] == _reference(lines)[:20]
+        assert service.stats["bytes_read"] < log_file.stat().st_size / 10
+
+    def test_pagination_covers_every_line_once(self, log_file: Path) -> None:
+        lines = _write_log(log_file, 2000)
+        service = LogQueryService(log_file.parent, block_size=4096)
+
+        assert _all_pages(service, [log_file], limit=333) == _reference(lines)
+
+    def test_cursor_is_stable_when_lines_are_appended(self, log_file: Path) -> None:
+        lines = _write_log(log_file, 500)
+        service = LogQueryService(log_file.parent, block_size=1024)
+        first = service.query([log_file], limit=100)
+
+        with open(log_file, "a", encoding="utf-8") as f:
+            f.write(_line(501) + "\n")
+        second = service.query([log_file], limit=100, cursor=first.next_cursor)
+
+        assert [entry.raw for entry in second.entries] == _reference(lines)[100:200]
+
+    def test_level_filter_uses_block_index(self, log_file: Path) -> None:
+        lines = _write_log(log_file, 5000)
+        service = LogQueryService(log_file.parent, block_size=4096)
+        expected = [line for line in _reference(lines) if " - ERROR - " in line]
+
+        assert _all_pages(service, [log_file], limit=100, level="error") == expected
+        blocks_read = service.stats["blocks_read"]
+
+        assert _all_pages(service, [log_file], limit=100, level="ERROR") == expected
+        assert service.stats["blocks_read"] - blocks_read <= len(expected) + 1
+        assert service.stats["blocks_skipped"] > 0
+
+    def test_source_and_search_filters(self, log_file: Path) -> None:
+        lines = _write_log(log_file, 600)
+        service = LogQueryService(log_file.parent, block_size=2048)
+
+        by_source = service.query([log_file], limit=1000, source="yesman.module1").entries
+        assert [entry.raw for entry in by_source] == [line for line in _reference(lines) if "yesman.module1 " in line]
+
+        by_search = service.query([log_file], limit=1000, search="MESSAGE 42").entries
+        assert [entry.raw for entry in by_search] == [line for line in _reference(lines) if "message 42" in line]
+
+    def test_since_stops_at_older_blocks(self, log_file: Path) -> None:
+        _write_log(log_file, 5000)
+        service = LogQueryService(log_file.parent, block_size=4096)
+        list(service.iter_entries(log_file))
+        blocks_read = service.stats["blocks_read"]
+
+        recent = list(service.iter_entries(log_file, log_filter=LogFilter(since=BASE_TIME // 1 + 4900)))
+
+        assert [entry.time for entry in recent if entry.time is not None] == [BASE_TIME // 1 + index for index in range(4999, 4899, -1)]
+        assert service.stats["blocks_read"] - blocks_read <= 5
+
+    def test_files_are_merged_by_time(self, tmp_path: Path) -> None:
+        main, dashboard = tmp_path / "yesman.log", tmp_path / "dashboard.log"
+        main.write_text("".join(_line(index) + "\n" for index in range(0, 100, 2)), encoding="utf-8")
+        dashboard.write_text("".join(_line(index, source="dashboard") + "\n" for index in range(1, 100, 2)), encoding="utf-8")
+        service = LogQueryService(tmp_path, block_size=512)
+
+        entries = _all_pages(service, [main, dashboard, tmp_path / "missing.log"], limit=7)
+
+        assert [int(raw.split("message ")[1].split()[0]) for raw in entries] == list(range(99, -1, -1))
+
+    def test_index_resets_after_truncation(self, log_file: Path) -> None:
+        _write_log(log_file, 2000)
+        service = LogQueryService(log_file.parent, block_size=1024)
+        list(service.iter_entries(log_file))
+
+        log_file.write_text(_line(1, "ERROR") + "\n", encoding="utf-8")
+
+        assert [entry.level for entry in service.query([log_file], level="error").entries] == ["error"]
+
+    def test_unterminated_last_line_and_tail(self, log_file: Path) -> None:
+        lines = _write_log(log_file, 300)
+        with open(log_file, "a", encoding="utf-8") as f:
+            f.write("partial line")
+        service = LogQueryService(log_file.parent, block_size=256)
+
+        assert service.tail(log_file, 3) == [*lines[-2:], "partial line"]
+        assert service.tail(log_file, 10_000) == [*lines, "partial line"]
+        assert next(service.iter_entries(log_file)).raw == "partial line"
+
+    def test_invalid_cursor(self, log_file: Path) -> None:
+        _write_log(log_file, 10)
+
+        with pytest.raises(ValueError, match="Invalid log cursor"):
+            LogQueryService(log_file.parent).query([log_file], cursor="not-a-cursor")
+
+
+def test_logs_page_endpoint(tmp_path: Path) -> None:
+    from fastapi import HTTPException
+
+    from api.routers import logs
+
+    lines = _write_log(tmp_path / "yesman.log", 50)
+    with patch.object(logs, "get_config", return_value={"log_path": str(tmp_path)}):
+        first = logs.get_logs_page(limit=30)
+        second = logs.get_logs_page(limit=30, cursor=first.next_cursor)
+        with pytest.raises(HTTPException) as error:
+            logs.get_logs_page(cursor="bad")
+
+    assert [entry.raw for entry in first.entries + second.entries] == _reference(lines)
+    assert second.next_cursor is None
+    assert error.value.status_code == 400
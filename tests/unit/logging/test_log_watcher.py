@@ -0,0 +1,127 @@
+# Copyright notice.
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from libs.logging.log_watcher import LogWatcher
+
+# Copyright (c) 2024 Yesman Claude Project
+# Licensed under the MIT License
+
+"""Test following growing, rotating and new log files."""
+
+BACKENDS = ["poll", pytest.param("inotify", marks=pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux only"))]
+
+
+def _append(path: Path, *lines: str) -> None:
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("".join(f"{line}\n" for line in lines))
+
+
+@pytest.fixture(params=BACKENDS)
+def watcher(request: pytest.FixtureRequest, tmp_path: Path) -> LogWatcher:
+    (tmp_path / "yesman.log").write_text("old line\n", encoding="utf-8")
+    log_watcher = LogWatcher(tmp_path, patterns=("*.log",), poll_interval=0.05, backend=request.param)
+    log_watcher.open()
+    yield log_watcher
+    log_watcher.close()
+
+
+def _lines(watcher: LogWatcher) -> dict[str, list[str]]:
+    return {path.name: lines for path, lines in watcher.poll()}
+
+
+class TestLogWatcher:
+    def test_starts_at_the_end_and_reports_new_lines(self, watcher: LogWatcher) -> None:
+        assert watcher.uses_inotify == (watcher.backend == "inotify")
+        assert _lines(watcher) == {}
+
+        _append(watcher.directory / "yesman.log", "first", "second")
+
+        assert _lines(watcher) == {"yesman.log": ["first", "second"]}
+        assert _lines(watcher) == {}
+
+    def test_partial_lines_wait_for_their_newline(self, watcher: LogWatcher) -> None:
+        log_file = watcher.directory / "yesman.log"
+        with open(log_file, "a", encoding="utf-8") as f:
+            f.write("half")
+        assert _lines(watcher) == {}
+
+        _append(log_file, " done")
+        assert _lines(watcher) == {"yesman.log": ["half done"]}
+
+    def test_rotation_by_rename(self, watcher: LogWatcher) -> None:
+        log_file = watcher.directory / "yesman.log"
+        _append(log_file, "before rotation")
+        log_file.rename(watcher.directory / "yesman.log.1")
+        _append(log_file, "after rotation")
+
+        assert _lines(watcher) == {"yesman.log": ["before rotation", "after rotation"]}
+        assert watcher.stats["rotations"] == 1
+
+    def test_truncation(self, watcher: LogWatcher) -> None:
+        log_file = watcher.directory / "yesman.log"
+        log_file.write_text("fresh\n", encoding="utf-8")
+
+        assert _lines(watcher) == {"yesman.log": ["fresh"]}
+
+    def test_new_files_are_followed_from_the_start(self, watcher: LogWatcher) -> None:
+        _append(watcher.directory / "dashboard.log", "dashboard started")
+        _append(watcher.directory / "ignored.txt", "not a log")
+
+        assert _lines(watcher) == {"dashboard.log": ["dashboard started"]}
+        assert [path.name for path in watcher.followed_files] == ["dashboard.log", "yesman.log"]
+
+    def test_follow_yields_lines(self, watcher: LogWatcher) -> None:
+        _append(watcher.directory / "yesman.log", "followed")
+        received = []
+
+        for path, line in watcher.follow(stop=lambda: bool(received)):
+            received.append((path.name, line))
+
+        assert received == [("yesman.log", "followed")]
+
+    def test_watch_pushes_lines(self, watcher: LogWatcher) -> None:
+        received: list[tuple[str, list[str]]] = []
+
+        async def run() -> float:
+            task = asyncio.create_task(watcher.watch(lambda path, lines: received.append((path.name, lines))))
+            await asyncio.sleep(0.01)
+            started = time.perf_counter()
+            _append(watcher.directory / "yesman.log", "pushed")
+            while not received:
+                await asyncio.sleep(0.001)
+            latency = time.perf_counter() - started
+            task.cancel()
+            return latency
+
+        latency = asyncio.run(run())
+
+        assert received == [("yesman.log", ["pushed"])]
+        if watcher.uses_inotify:
+            assert latency < 0.05
+
+
+def test_idle_inotify_watch_does_not_wake_up(tmp_path: Path) -> None:
+    if not sys.platform.startswith("linux"):
+        pytest.skip("inotify is Linux only")
+    watcher = LogWatcher(tmp_path, backend="inotify")
+
+    async def run() -> None:
+        task = asyncio.create_task(watcher.watch(lambda path, lines: None))
+        await asyncio.sleep(0.2)
+        task.cancel()
+
+    asyncio.run(run())
+    watcher.close()
+
+    assert watcher.stats["wakeups"] == 0
+
+
+def test_rejects_unknown_backend(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="Unsupported watch backend"):
+        LogWatcher(tmp_path, backend="kqueue")
@@ -0,0 +1,140 @@
+# Copyright notice.
+
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from libs.source_index import SourceFileIndex, doc_stats
+
+# Copyright (c) 2024 Yesman Claude Project
+# Licensed under the MIT License
+
+"""Test the persistent, incremental source file index."""
+
+
+@pytest.fixture
+def project(tmp_path: Path) -> Path:
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "__init__.py").write_text('"""Package."""\n', encoding="utf-8")
+    (tmp_path / "pkg" / "core.py").write_text("def run():\n    return 1\n", encoding="utf-8")
+    (tmp_path / "web.ts").write_text("/** Entry point. */\nexport const x = 1;\n", encoding="utf-8")
+    (tmp_path / "notes.txt").write_text("not source", encoding="utf-8")
+    for ignored in ("node_modules/lib", ".venv/lib", "pkg/__pycache__"):
+        (tmp_path / ignored).mkdir(parents=True)
+        (tmp_path / ignored / "vendored.py").write_text("x = 1\n", encoding="utf-8")
+    return tmp_path
+
+
+def _touch(path: Path, content: str) -> None:
+    path.write_text(content, encoding="utf-8")
+    stat = path.stat()
+    # Make sure the change is visible even on coarse mtime file systems
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+class TestSourceFileIndex:
+    def test_refresh_indexes_source_files_only(self, project: Path) -> None:
+        index = SourceFileIndex(project)
+        summary = index.refresh()
+
+        assert summary.added == 3
+        assert [entry.path for entry in index.files()] == ["pkg/__init__.py", "pkg/core.py", "web.ts"]
+        assert [entry.path for entry in index.files((".py",))] == ["pkg/__init__.py", "pkg/core.py"]
+
+    def test_ignored_directories_are_not_descended(self, project: Path) -> None:
+        scanned = []
+        real_scandir = os.scandir
+
+        def tracking_scandir(path: object) -> object:
+            scanned.append(Path(path).relative_to(project).as_posix())
+            return real_scandir(path)
+
+        with patch("libs.source_index.os.scandir", side_effect=tracking_scandir):
+            SourceFileIndex(project).refresh()
+
+        assert sorted(scanned) == [".", "pkg"]
+
+    def test_listing_reads_no_files(self, project: Path) -> None:
+        index = SourceFileIndex(project)
+        with patch.object(SourceFileIndex, "_analyze") as mock_analyze:
+            index.refresh()
+            paths = [entry.path for entry in index.files((".py",))]
+
+        mock_analyze.assert_not_called()
+        assert paths == ["pkg/__init__.py", "pkg/core.py"]
+
+    def test_only_changed_files_are_read_again(self, project: Path) -> None:
+        index = SourceFileIndex(project)
+        index.refresh()
+        index.files(analyzers=("doc",))
+        _touch(project / "pkg" / "core.py", 'def run():\n    """Run."""\n    return 1\n')
+        (project / "web.ts").unlink()
+
+        summary = index.refresh()
+        with patch.object(SourceFileIndex, "_analyze", autospec=True, side_effect=SourceFileIndex._analyze) as mock_analyze:
+            entries = index.files(analyzers=("doc",))
+
+        assert summary.to_dict() == {"added": 0, "changed": 1, "removed": 1, "unchanged": 1}
+        assert [call.args[1].path for call in mock_analyze.call_args_list] == ["pkg/core.py"]
+        assert entries[1].stats["doc"]["missing_docstrings"] == []
+
+    def test_index_persists_across_instances(self, project: Path) -> None:
+        index = SourceFileIndex(project)
+        index.refresh()
+        index.files(analyzers=("doc",))
+
+        reopened = SourceFileIndex(project)
+        with patch.object(SourceFileIndex, "_analyze") as mock_analyze:
+            summary = reopened.refresh()
+            reopened.files(analyzers=("doc",))
+
+        mock_analyze.assert_not_called()
+        assert summary.unchanged == 3
+        assert (project / ".scripton" / "yesman" / "source_index.json").exists()
+
+    def test_get_refreshes_a_single_file(self, project: Path) -> None:
+        index = SourceFileIndex(project)
+        assert index.get("pkg/core.py").stats["doc"]["missing_docstrings"] == [["FunctionDef", "run", 1]]
+
+        _touch(project / "pkg" / "core.py", "class Runner:\n    pass\n")
+
+        assert index.get("pkg/core.py").stats["doc"]["missing_docstrings"] == [["ClassDef", "Runner", 1]]
+        assert index.get("node_modules/lib/vendored.py") is None
+        assert index.get("missing.py") is None
+
+    def test_registered_analyzer_runs_for_existing_entries(self, project: Path) -> None:
+        index = SourceFileIndex(project)
+        index.refresh()
+        index.files(analyzers=("doc",))
+        index.register_analyzer("size", lambda _path, content: len(content))
+
+        entry = index.files(("web.ts",), analyzers=("size",))[0]
+
+        assert entry.stats["size"] == len((project / "web.ts").read_text(encoding="utf-8"))
+        assert "doc" in entry.stats
+
+    def test_unreadable_files_are_kept_but_flagged(self, project: Path) -> None:
+        (project / "binary.py").write_bytes(b"\xff\xfe\x00")
+        index = SourceFileIndex(project)
+        index.refresh()
+
+        entry = index.get("binary.py")
+        assert entry is not None
+        assert not entry.readable
+
+    def test_for_root_shares_instances(self, project: Path) -> None:
+        assert SourceFileIndex.for_root(project) is SourceFileIndex.for_root(str(project / "pkg" / ".."))
+
+
+def test_doc_stats() -> None:
+    content = '# Helpers\n\n\nclass Public:\n    def _private(self):\n        pass\n\n    def __repr__(self):\n        return ""\n'
+
+    stats = doc_stats("helpers.py", content)
+
+    assert stats["code_lines"] == 6
+    assert stats["comment_lines"] == 1
+    assert not stats["documented"]
+    assert stats["missing_docstrings"] == [["ClassDef", "Public", 4], ["FunctionDef", "__repr__", 8]]
+    assert doc_stats("broken.py", "def (")["missing_docstrings"] is None